@@ -1,59 +1,352 @@
+import bisect
+import hashlib
+import ipaddress
 import json
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 import logging
 
+try:
+    import fcntl
+except ImportError:  # Windows - sadece süreç içi kilit kullanılır
+    fcntl = None
+
+from .sqlite_db import SQLITE_SUFFIXES, SQLiteStore
+from .utils.metrics import db_json_parse_duration, db_operation_duration
+
 # Logging setup
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-DB_PATH = Path(__file__).parent / "db.json"
+DB_PATH = Path(os.getenv("DATABASE_PATH", str(Path(__file__).parent / "db.json")))
 
-def read_db() -> Dict:
-    """JSON veritabanını okur, yoksa boş yapı döner"""
+# WAL bu kadar kayda ulaşınca snapshot'a sıkıştırılır
+WAL_COMPACT_THRESHOLD = int(os.getenv("DATABASE_WAL_COMPACT_THRESHOLD", "1000"))
+
+# Storage backend seçimi: DATABASE_BACKEND=json|sqlite, verilmezse DATABASE_PATH uzantısına bakılır
+DATABASE_BACKEND = os.getenv(
+    "DATABASE_BACKEND",
+    "sqlite" if DB_PATH.suffix.lower() in SQLITE_SUFFIXES else "json"
+).lower()
+
+_sqlite_store: Optional[SQLiteStore] = None
+
+def _sqlite() -> Optional[SQLiteStore]:
+    """SQLite backend seçiliyse store'u (tembel olarak) döner, değilse None"""
+    global _sqlite_store
+    if DATABASE_BACKEND != "sqlite":
+        return None
+    if _sqlite_store is None or _sqlite_store.path != DB_PATH:
+        _sqlite_store = SQLiteStore(DB_PATH)
+        logger.info(f"Using SQLite storage backend at {DB_PATH}")
+    return _sqlite_store
+
+def _wal_path() -> Path:
+    return DB_PATH.with_name(DB_PATH.name + ".wal")
+
+def _lock_path() -> Path:
+    return DB_PATH.with_name(DB_PATH.name + ".lock")
+
+def _type_key(device: Dict) -> str:
+    return str(device.get("type", "")).lower()
+
+def _sorted_remove(values: List[int], value) -> None:
+    index = bisect.bisect_left(values, value) if isinstance(value, int) else len(values)
+    if index < len(values) and values[index] == value:
+        del values[index]
+
+class _DBCache:
+    """db.json snapshot'ı + WAL'ın bellek içi hali ve id/name/ip indeksleri"""
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.path: Optional[Path] = None
+        self.signature: Optional[Tuple] = None
+        self.extra: Dict = {}
+        self.devices_by_id: Dict[int, Dict] = {}
+        self.devices_by_name: Dict[str, List[Dict]] = {}
+        self.devices_by_ip: Dict[str, List[Dict]] = {}
+        # Cursor sayfalama için sıralı id listeleri (tümü ve tip bazında)
+        self.sorted_ids: List[int] = []
+        self.ids_by_type: Dict[str, List[int]] = {}
+        self.users_by_id: Dict[int, Dict] = {}
+        self.users_by_username: Dict[str, Dict] = {}
+        self.next_device_id = 1
+        self.next_user_id = 1
+        self.wal_entries = 0
+
+    def rebuild(self, data: Dict):
+        """Snapshot verisini cache'e alır ve indeksleri yeniden oluşturur"""
+        self.extra = {k: v for k, v in data.items() if k not in ("devices", "users")}
+        self.devices_by_id = {}
+        self.devices_by_name = {}
+        self.devices_by_ip = {}
+        self.sorted_ids = []
+        self.ids_by_type = {}
+        self.users_by_id = {}
+        self.users_by_username = {}
+        self.next_device_id = 1
+        self.next_user_id = 1
+        for device in data.get("devices", []):
+            self.put_device(device)
+        for user in data.get("users", []):
+            self.put_user(user)
+        self.wal_entries = 0
+
+    def snapshot(self) -> Dict:
+        """Cache'in diske yazılacak hali"""
+        return {
+            **self.extra,
+            "devices": [dict(d) for d in self.devices_by_id.values()],
+            "users": [dict(u) for u in self.users_by_id.values()]
+        }
+
+    def put_device(self, device: Dict):
+        device_id = device.get("id")
+        previous = self.devices_by_id.get(device_id)
+        if previous is not None:
+            self._unindex_device(previous)
+        elif isinstance(device_id, int):
+            bisect.insort(self.sorted_ids, device_id)
+        # Mevcut anahtar güncellenirse dict sırası (liste sırası) korunur
+        self.devices_by_id[device_id] = device
+        self.devices_by_name.setdefault(device.get("name"), []).append(device)
+        self.devices_by_ip.setdefault(device.get("ip"), []).append(device)
+        if isinstance(device_id, int):
+            bisect.insort(self.ids_by_type.setdefault(_type_key(device), []), device_id)
+            self.next_device_id = max(self.next_device_id, device_id + 1)
+
+    def drop_device(self, device_id) -> Optional[Dict]:
+        device = self.devices_by_id.pop(device_id, None)
+        if device is not None:
+            self._unindex_device(device)
+            _sorted_remove(self.sorted_ids, device_id)
+        return device
+
+    def _unindex_device(self, device: Dict):
+        for index, key in ((self.devices_by_name, device.get("name")), (self.devices_by_ip, device.get("ip"))):
+            bucket = index.get(key, [])
+            if device in bucket:
+                bucket.remove(device)
+            if not bucket:
+                index.pop(key, None)
+        type_ids = self.ids_by_type.get(_type_key(device), [])
+        _sorted_remove(type_ids, device.get("id"))
+        if not type_ids:
+            self.ids_by_type.pop(_type_key(device), None)
+
+    def put_user(self, user: Dict):
+        previous = self.users_by_id.pop(user.get("id"), None)
+        if previous is not None:
+            self.users_by_username.pop(previous.get("username"), None)
+        self.users_by_id[user.get("id")] = user
+        self.users_by_username[user.get("username")] = user
+        if isinstance(user.get("id"), int):
+            self.next_user_id = max(self.next_user_id, user["id"] + 1)
+
+    def apply(self, record: Dict):
+        """
+        Tek bir WAL kaydını uygular
+        Kayıtlar mutlak değer taşır (idempotent); snapshot'a zaten yansımış bir
+        kaydın tekrar uygulanması aynı sonucu verir
+        """
+        op = record.get("op")
+        if op == "put_device":
+            self.put_device(dict(record["device"]))
+        elif op == "delete_device":
+            self.drop_device(record["id"])
+        elif op == "put_user":
+            self.put_user(dict(record["user"]))
+        else:
+            raise ValueError(f"Unknown WAL operation: {op}")
+        self.wal_entries += 1
+
+_cache = _DBCache()
+
+def _file_signature(path: Path) -> Optional[Tuple[int, int]]:
+    """Dosyanın değişip değişmediğini anlamak için (mtime_ns, size) döner"""
+    try:
+        stat = path.stat()
+        return stat.st_mtime_ns, stat.st_size
+    except FileNotFoundError:
+        return None
+
+def _current_signature() -> Tuple:
+    return _file_signature(DB_PATH), _file_signature(_wal_path())
+
+def _load_snapshot() -> Dict:
+    """JSON veritabanı snapshot'ını diskten okur, yoksa boş yapı döner"""
     try:
         if not DB_PATH.exists():
             logger.info(f"Database file not found at {DB_PATH}, creating empty structure")
             default_db = {"devices": [], "users": []}
-            write_db(default_db)
+            _write_snapshot(default_db)
             return default_db
-        
+
         with open(DB_PATH, "r", encoding="utf-8") as f:
             content = f.read()
             if not content.strip():
                 logger.warning("Database file is empty, returning default structure")
                 return {"devices": [], "users": []}
-            
-            data = json.loads(content)
+
+            with db_json_parse_duration.time():
+                data = json.loads(content)
             logger.info(f"Successfully read database with {len(data.get('devices', []))} devices and {len(data.get('users', []))} users")
             return data
-            
+
     except json.JSONDecodeError as e:
         logger.error(f"JSON decode error: {e}")
         # Bozuk JSON dosyasını yedekle ve yeni oluştur
         backup_path = DB_PATH.with_suffix('.json.backup')
         DB_PATH.rename(backup_path)
         logger.info(f"Corrupted database backed up to {backup_path}")
-        
+
         default_db = {"devices": [], "users": []}
-        write_db(default_db)
+        _write_snapshot(default_db)
         return default_db
-        
+
     except Exception as e:
         logger.error(f"Unexpected error reading database: {e}")
         return {"devices": [], "users": []}
 
-def write_db(data: Dict):
-    """JSON veritabanına veri yazar"""
+def _replay_wal(cache: _DBCache):
+    """WAL kayıtlarını snapshot üzerine uygular; yarım yazılmış son satırı keser"""
+    wal_path = _wal_path()
+    if not wal_path.exists():
+        return
+
+    good_offset = 0
+    with open(wal_path, "rb") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                logger.warning(f"Discarding torn WAL record at offset {good_offset}")
+                break
+            try:
+                cache.apply(json.loads(line))
+            except (json.JSONDecodeError, KeyError, ValueError) as e:
+                logger.error(f"Skipping invalid WAL record at offset {good_offset}: {e}")
+            good_offset += len(line)
+
+    if good_offset != wal_path.stat().st_size:
+        with open(wal_path, "r+b") as f:
+            f.truncate(good_offset)
+
+    if cache.wal_entries:
+        logger.info(f"Replayed {cache.wal_entries} WAL records from {wal_path}")
+
+def _ensure_fresh() -> _DBCache:
+    """Snapshot veya WAL dışarıdan değiştiyse cache'i yeniler"""
+    with _cache.lock:
+        signature = _current_signature()
+        if _cache.path != DB_PATH or signature[0] is None or signature != _cache.signature:
+            with db_operation_duration.time("json", "reload"):
+                _cache.rebuild(_load_snapshot())
+                _replay_wal(_cache)
+            _cache.path = DB_PATH
+            _cache.signature = _current_signature()
+        return _cache
+
+@contextmanager
+def _write_lock():
+    """
+    Mutasyon kilidi: süreç içi RLock + (varsa) dosya kilidi
+    Kilit alındıktan sonra cache tazelenir, böylece başka bir worker'ın
+    yazdıkları kaybolmaz
+    """
+    with _cache.lock:
+        lock_file = None
+        if fcntl is not None:
+            DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+            lock_file = open(_lock_path(), "a")
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield _ensure_fresh()
+        finally:
+            if lock_file is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+                lock_file.close()
+
+def _append_wal(cache: _DBCache, record: Dict):
+    """Mutasyonu WAL'a ekler (fsync) ve cache'e uygular - O(kayıt boyutu) byte"""
+    line = json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+    with db_operation_duration.time("json", "wal_append"), open(_wal_path(), "a", encoding="utf-8") as f:
+        f.write(line)
+        f.flush()
+        os.fsync(f.fileno())
+
+    cache.apply(record)
+    cache.signature = _current_signature()
+
+    if cache.wal_entries >= WAL_COMPACT_THRESHOLD:
+        _compact(cache)
+
+def _write_snapshot(data: Dict):
+    """Snapshot'ı temp dosya + os.replace ile atomik yazar"""
+    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(dir=DB_PATH.parent, prefix=f".{DB_PATH.name}.", suffix=".tmp")
     try:
-        # Dizin yoksa oluştur
-        DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(DB_PATH, "w", encoding="utf-8") as f:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
             json.dump(data, f, indent=2, ensure_ascii=False)
-        
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, DB_PATH)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+def _compact(cache: _DBCache):
+    """Cache'i snapshot olarak yazar ve WAL'ı sıfırlar"""
+    with db_operation_duration.time("json", "compact"):
+        _write_snapshot(cache.snapshot())
+    # Bu noktada çökme olursa WAL snapshot üzerine tekrar uygulanır - kayıtlar idempotent
+    with open(_wal_path(), "w", encoding="utf-8"):
+        pass
+    logger.info(f"Compacted {cache.wal_entries} WAL records into {DB_PATH}")
+    cache.wal_entries = 0
+    cache.signature = _current_signature()
+
+def compact_db():
+    """WAL'ı hemen snapshot'a sıkıştırır (örn. kapanışta)"""
+    store = _sqlite()
+    if store is not None:
+        store.checkpoint()
+        return
+
+    with _write_lock() as cache:
+        if cache.wal_entries:
+            _compact(cache)
+
+def read_db() -> Dict:
+    """JSON veritabanını okur (cache'ten), yoksa boş yapı döner"""
+    with db_operation_duration.time(DATABASE_BACKEND, "read_db"):
+        store = _sqlite()
+        if store is not None:
+            return store.read_db()
+
+        cache = _ensure_fresh()
+        with cache.lock:
+            return cache.snapshot()
+
+def write_db(data: Dict):
+    """Tüm veritabanını yeni snapshot olarak yazar (WAL sıfırlanır)"""
+    try:
+        with db_operation_duration.time(DATABASE_BACKEND, "write_db"):
+            store = _sqlite()
+            if store is not None:
+                store.write_db(data)
+            else:
+                with _write_lock() as cache:
+                    cache.rebuild(json.loads(json.dumps(data)))
+                    _compact(cache)
+
         logger.info(f"Database written successfully to {DB_PATH}")
-        
+
     except Exception as e:
         logger.error(f"Error writing database: {e}")
         raise
@@ -61,77 +354,260 @@ def write_db(data: Dict):
 def get_devices() -> List[Dict]:
     """Tüm cihazları döner"""
     try:
-        db = read_db()
-        devices = db.get("devices", [])
+        store = _sqlite()
+        if store is not None:
+            devices = store.get_devices()
+        else:
+            cache = _ensure_fresh()
+            with cache.lock:
+                devices = [dict(d) for d in cache.devices_by_id.values()]
         logger.info(f"Retrieved {len(devices)} devices")
         return devices
     except Exception as e:
         logger.error(f"Error getting devices: {e}")
         return []
 
+def get_device_by_id(device_id: int) -> Optional[Dict]:
+    """ID'ye göre cihazı indeksten döner (O(1))"""
+    store = _sqlite()
+    if store is not None:
+        return store.get_device_by_id(device_id)
+
+    cache = _ensure_fresh()
+    with cache.lock:
+        device = cache.devices_by_id.get(device_id)
+        return dict(device) if device else None
+
+def get_devices_by_name(name: str) -> List[Dict]:
+    """İsme göre cihazları indeksten döner"""
+    store = _sqlite()
+    if store is not None:
+        return store.get_devices_by_name(name)
+
+    cache = _ensure_fresh()
+    with cache.lock:
+        return [dict(d) for d in cache.devices_by_name.get(name, [])]
+
+def get_devices_by_ip(ip: str) -> List[Dict]:
+    """IP adresine göre cihazları indeksten döner"""
+    store = _sqlite()
+    if store is not None:
+        return store.get_devices_by_ip(ip)
+
+    cache = _ensure_fresh()
+    with cache.lock:
+        return [dict(d) for d in cache.devices_by_ip.get(ip, [])]
+
+def get_devices_revision() -> str:
+    """Cihaz envanterinin değişip değişmediğini gösteren kısa sürüm etiketi (ETag için)"""
+    store = _sqlite()
+    if store is not None:
+        return f"sqlite-{store.get_devices_revision()}"
+
+    cache = _ensure_fresh()
+    with cache.lock:
+        return "json-" + hashlib.sha1(repr(cache.signature).encode()).hexdigest()[:16]
+
+def _matches_network(device: Dict, network) -> bool:
+    try:
+        return ipaddress.ip_address(device.get("ip", "")) in network
+    except ValueError:
+        return False
+
+def query_devices(
+    device_type: Optional[str] = None,
+    name_prefix: Optional[str] = None,
+    ip: Optional[str] = None,
+    after_id: int = 0,
+    limit: Optional[int] = None
+) -> Tuple[List[Dict], Optional[int]]:
+    """
+    Filtrelenmiş, id sıralı cihaz sayfası döner
+    ip tek adres ("10.0.0.1") veya CIDR ("10.0.0.0/24") olabilir
+    Returns: (devices, next_after_id | None)
+    """
+    network = ipaddress.ip_network(ip, strict=False) if ip and "/" in ip else None
+    exact_ip = ip if ip and network is None else None
+
+    def accept(device: Dict) -> bool:
+        if name_prefix and not str(device.get("name", "")).startswith(name_prefix):
+            return False
+        if exact_ip and device.get("ip") != exact_ip:
+            return False
+        if network is not None and not _matches_network(device, network):
+            return False
+        return True
+
+    store = _sqlite()
+    if store is not None:
+        candidates = store.iter_devices(after_id=after_id, device_type=device_type, name_prefix=name_prefix, ip=exact_ip)
+        page = []
+        for device in candidates:
+            if network is not None and not _matches_network(device, network):
+                continue
+            page.append(device)
+            if limit is not None and len(page) > limit:
+                break
+    else:
+        cache = _ensure_fresh()
+        with cache.lock:
+            # En seçici indeksten başla: tam IP > tip > tüm id'ler
+            if exact_ip:
+                ids = sorted(d.get("id") for d in cache.devices_by_ip.get(exact_ip, []) if isinstance(d.get("id"), int))
+            elif device_type:
+                ids = cache.ids_by_type.get(device_type.lower(), [])
+            else:
+                ids = cache.sorted_ids
+
+            page = []
+            for index in range(bisect.bisect_right(ids, after_id), len(ids)):
+                device = cache.devices_by_id[ids[index]]
+                if device_type and _type_key(device) != device_type.lower():
+                    continue
+                if not accept(device):
+                    continue
+                page.append(dict(device))
+                if limit is not None and len(page) > limit:
+                    break
+
+    # limit+1 kayıt okunur; fazlası sonraki sayfanın varlığını gösterir
+    if limit is not None and len(page) > limit:
+        page = page[:limit]
+        return page, page[-1]["id"]
+    return page, None
+
 def get_users() -> List[Dict]:
     """Tüm kullanıcıları döner"""
     try:
-        db = read_db()
-        users = db.get("users", [])
+        store = _sqlite()
+        if store is not None:
+            users = store.get_users()
+        else:
+            cache = _ensure_fresh()
+            with cache.lock:
+                users = [dict(u) for u in cache.users_by_id.values()]
         logger.info(f"Retrieved {len(users)} users")
         return users
     except Exception as e:
         logger.error(f"Error getting users: {e}")
         return []
 
+def get_user_by_username(username: str) -> Optional[Dict]:
+    """Kullanıcı adına göre kullanıcıyı indeksten döner (O(1))"""
+    store = _sqlite()
+    if store is not None:
+        return store.get_user_by_username(username)
+
+    cache = _ensure_fresh()
+    with cache.lock:
+        user = cache.users_by_username.get(username)
+        return dict(user) if user else None
+
 def add_device(device: Dict):
     """Yeni cihaz ekler, otomatik ID atar"""
     try:
-        db = read_db()
-        
-        # Auto-increment ID
-        existing_devices = db.get("devices", [])
-        max_id = max([d.get("id", 0) for d in existing_devices], default=0)
-        device["id"] = max_id + 1
-        
         # Validation
         required_fields = ["name", "ip", "type"]
         for field in required_fields:
             if field not in device or not device[field]:
                 raise ValueError(f"Required field '{field}' is missing or empty")
-        
-        db["devices"].append(device)
-        write_db(db)
-        
+
+        store = _sqlite()
+        if store is not None:
+            store.add_device(device)
+        else:
+            with _write_lock() as cache:
+                # Auto-increment ID
+                device["id"] = cache.next_device_id
+                _append_wal(cache, {"op": "put_device", "device": device})
+
         logger.info(f"Added device: {device['name']} (ID: {device['id']})")
         return device
-        
+
     except Exception as e:
         logger.error(f"Error adding device: {e}")
         raise
 
+def _split_duplicates(devices: List[Dict], name_taken, ip_taken) -> Tuple[List[Dict], List[Dict]]:
+    """ip veya name çakışanları ayırır - hem mevcut envanter hem de liste içi tekrarlar"""
+    accepted, duplicates = [], []
+    seen_names, seen_ips = set(), set()
+    for device in devices:
+        name, ip = device["name"], device["ip"]
+        if name in seen_names or ip in seen_ips or name_taken(name) or ip_taken(ip):
+            duplicates.append(device)
+            continue
+        seen_names.add(name)
+        seen_ips.add(ip)
+        accepted.append(device)
+    return accepted, duplicates
+
+def add_devices(devices: List[Dict], skip_duplicates: bool = True) -> Tuple[List[Dict], List[Dict]]:
+    """
+    Çok sayıda cihazı tek işlemde ekler - hepsi yazılır ya da hiçbiri
+    ip veya name'i mevcut bir cihazla (ya da listede öncekiyle) çakışanlar eklenmez;
+    skip_duplicates=False ise çakışma varsa hiçbir şey yazılmadan ValueError fırlatılır
+    Returns: (added, duplicates)
+    """
+    for device in devices:
+        for field in ("name", "ip", "type"):
+            if not device.get(field):
+                raise ValueError(f"Required field '{field}' is missing or empty")
+
+    store = _sqlite()
+    if store is not None:
+        added, duplicates = store.add_devices(devices, skip_duplicates)
+    else:
+        with _write_lock() as cache:
+            added, duplicates = _split_duplicates(
+                devices,
+                lambda name: bool(cache.devices_by_name.get(name)),
+                lambda ip: bool(cache.devices_by_ip.get(ip))
+            )
+            if duplicates and not skip_duplicates:
+                raise ValueError(f"{len(duplicates)} devices conflict with existing ip/name")
+
+            next_id = cache.next_device_id
+            for offset, device in enumerate(added):
+                device["id"] = next_id + offset
+            try:
+                for device in added:
+                    cache.put_device(device)
+                # Tek snapshot yazımı - os.replace ile atomik, O(N) toplam I/O
+                _compact(cache)
+            except BaseException:
+                # Disk yazılamadıysa cache bir sonraki erişimde diskten yeniden yüklensin
+                cache.signature = None
+                raise
+
+    logger.info(f"Bulk added {len(added)} devices ({len(duplicates)} duplicates skipped)")
+    return added, duplicates
+
 def add_user(user: Dict):
     """Yeni kullanıcı ekler, otomatik ID atar"""
     try:
-        db = read_db()
-        
-        # Auto-increment ID
-        existing_users = db.get("users", [])
-        max_id = max([u.get("id", 0) for u in existing_users], default=0)
-        user["id"] = max_id + 1
-        
         # Validation
         required_fields = ["username", "role"]
         for field in required_fields:
             if field not in user or not user[field]:
                 raise ValueError(f"Required field '{field}' is missing or empty")
-        
-        # Username unique check
-        if any(u.get("username") == user["username"] for u in existing_users):
-            raise ValueError(f"Username '{user['username']}' already exists")
-        
-        db["users"].append(user)
-        write_db(db)
-        
+
+        store = _sqlite()
+        if store is not None:
+            store.add_user(user)
+        else:
+            with _write_lock() as cache:
+                # Username unique check
+                if user["username"] in cache.users_by_username:
+                    raise ValueError(f"Username '{user['username']}' already exists")
+
+                # Auto-increment ID
+                user["id"] = cache.next_user_id
+                _append_wal(cache, {"op": "put_user", "user": user})
+
         logger.info(f"Added user: {user['username']} (ID: {user['id']})")
         return user
-        
+
     except Exception as e:
         logger.error(f"Error adding user: {e}")
         raise
@@ -139,43 +615,73 @@ def add_user(user: Dict):
 def delete_device(device_id: int):
     """Cihaz siler"""
     try:
-        db = read_db()
-        devices = db.get("devices", [])
-        
-        device_to_remove = None
-        for i, device in enumerate(devices):
-            if device.get("id") == device_id:
-                device_to_remove = devices.pop(i)
-                break
-        
-        if device_to_remove is None:
-            raise ValueError(f"Device with ID {device_id} not found")
-        
-        write_db(db)
+        store = _sqlite()
+        if store is not None:
+            device_to_remove = store.delete_device(device_id)
+            if device_to_remove is None:
+                raise ValueError(f"Device with ID {device_id} not found")
+        else:
+            with _write_lock() as cache:
+                device_to_remove = cache.devices_by_id.get(device_id)
+                if device_to_remove is None:
+                    raise ValueError(f"Device with ID {device_id} not found")
+
+                device_to_remove = dict(device_to_remove)
+                _append_wal(cache, {"op": "delete_device", "id": device_id})
+
         logger.info(f"Deleted device: {device_to_remove['name']} (ID: {device_id})")
         return device_to_remove
-        
+
     except Exception as e:
         logger.error(f"Error deleting device: {e}")
         raise
 
+def update_user(username: str, updated_data: Dict) -> Dict:
+    """Kullanıcı günceller - id ve username değiştirilemez"""
+    try:
+        updated_data = {k: v for k, v in updated_data.items() if k not in ("id", "username")}
+        store = _sqlite()
+        if store is not None:
+            updated = store.update_user(username, updated_data)
+            if updated is None:
+                raise ValueError(f"User '{username}' not found")
+        else:
+            with _write_lock() as cache:
+                user = cache.users_by_username.get(username)
+                if user is None:
+                    raise ValueError(f"User '{username}' not found")
+                updated = {**user, **updated_data}
+                _append_wal(cache, {"op": "put_user", "user": updated})
+
+        logger.info(f"Updated user {username}")
+        return dict(updated)
+
+    except Exception as e:
+        logger.error(f"Error updating user: {e}")
+        raise
+
 def update_device(device_id: int, updated_data: Dict):
     """Cihaz günceller"""
     try:
-        db = read_db()
-        devices = db.get("devices", [])
-        
-        for device in devices:
-            if device.get("id") == device_id:
+        store = _sqlite()
+        if store is not None:
+            updated = store.update_device(device_id, updated_data)
+            if updated is None:
+                raise ValueError(f"Device with ID {device_id} not found")
+        else:
+            with _write_lock() as cache:
+                device = cache.devices_by_id.get(device_id)
+                if device is None:
+                    raise ValueError(f"Device with ID {device_id} not found")
+
                 # ID değiştirilemez
                 updated_data.pop("id", None)
-                device.update(updated_data)
-                write_db(db)
-                logger.info(f"Updated device ID {device_id}")
-                return device
-        
-        raise ValueError(f"Device with ID {device_id} not found")
-        
+                updated = {**device, **updated_data}
+                _append_wal(cache, {"op": "put_device", "device": updated})
+
+        logger.info(f"Updated device ID {device_id}")
+        return dict(updated)
+
     except Exception as e:
         logger.error(f"Error updating device: {e}")
-        raise
\ No newline at end of file
+        raise
@@ -1,15 +1,67 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from .json_db import get_devices, add_device, get_users, delete_device
-from .routers import connections  # Yeni router
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from .json_db import (
+    get_devices, add_device, add_devices, get_users, delete_device, compact_db, query_devices, get_devices_revision
+)
+from .routers import connections, health, backups, audit, auth  # Yeni router
+from .routers.auth import request_actor
+from .utils.connection_pool import ssh_pool
+from .utils.reachability import reachability
+from .utils.shell_sessions import shell_sessions
+from .utils.result_cache import result_cache
+from .utils.single_flight import command_flights
+from .utils.admission import admission, AdmissionRejected
+from .utils.circuit_breaker import circuit_breaker, CircuitOpenError
+from .utils.audit_log import audit_log
+from .utils.bulk_import import (
+    BulkImportError, BULK_IMPORT_MAX_REPORTED, detect_format, parse_devices, format_export_row, export_header
+)
+from .utils.health_monitor import health_monitor, HEALTH_MONITOR_ENABLED
+from .utils.config_backup import config_backups, CONFIG_BACKUP_ENABLED
+from .utils.metrics import metrics, MetricsMiddleware
 from pydantic import BaseModel
 from typing import Optional
+from contextlib import asynccontextmanager
+import base64
+import hashlib
 import json
+import time
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Uygulama başlangıç/kapanış işlemleri"""
+    # SSH havuzunda boşta kalan bağlantıları periyodik olarak temizle
+    ssh_pool.start_reaper()
+    # Denetim kayıtları toplu olarak segment dosyalarına yazılır
+    audit_log.start()
+    shell_sessions.start_reaper()
+    # REACHABILITY_SWEEP_INTERVAL > 0 ise periyodik TCP/banner taraması
+    reachability.start()
+    # Arka plan sağlık yoklaması - UI sorguları cihazlara değil önbelleğe gider
+    if HEALTH_MONITOR_ENABLED:
+        health_monitor.start()
+    # Periyodik konfigürasyon yedeği (varsayılan günde bir)
+    if CONFIG_BACKUP_ENABLED:
+        config_backups.start()
+    yield
+    await config_backups.stop()
+    await health_monitor.stop()
+    await reachability.stop()
+    # Shell oturumları havuzdaki transport'ları kullandığından havuzdan önce kapatılır
+    await shell_sessions.stop_reaper()
+    await ssh_pool.stop_reaper()
+    # Kapanış sırasında üretilen kayıtlar dahil kuyruktakileri yaz
+    await audit_log.stop()
+    # Bekleyen WAL kayıtlarını snapshot'a yaz
+    compact_db()
 
 app = FastAPI(
     title="PAM Network Device Management",
     description="Centralized network device management with PAM integration",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS middleware ekle (frontend için)
@@ -21,8 +73,59 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# İstek süresi histogramı - route şablonu, method ve status etiketleriyle
+app.add_middleware(MetricsMiddleware)
+
+# Scrape anında okunan durum göstergeleri
+metrics.gauge_callback(
+    "pam_ssh_pool_connections", "SSH pool transports by state", ("state",),
+    lambda: [(("idle",), ssh_pool.get_stats()["idle_connections"]),
+             (("open",), ssh_pool.get_stats()["open_connections"])]
+)
+metrics.gauge_callback(
+    "pam_ssh_pool_requests", "SSH pool lookups since start", ("result",),
+    lambda: [(("hit",), ssh_pool.stats["hits"]), (("miss",), ssh_pool.stats["misses"])]
+)
+metrics.gauge_callback(
+    "pam_shell_sessions_active", "Interactive shell sessions", (),
+    lambda: [((), shell_sessions.get_stats()["active_sessions"])]
+)
+metrics.gauge_callback(
+    "pam_result_cache_bytes", "Command result cache size in bytes", (),
+    lambda: [((), result_cache.get_stats()["bytes"])]
+)
+metrics.gauge_callback(
+    "pam_result_cache_lookups", "Command result cache lookups since start", ("result",),
+    lambda: [(("hit",), result_cache.stats["hits"]), (("miss",), result_cache.stats["misses"])]
+)
+
+metrics.gauge_callback(
+    "pam_command_executions", "Read-only device executions since start by coalescing role", ("role",),
+    lambda: [(("leader",), command_flights.stats["executions"]), (("coalesced",), command_flights.stats["coalesced"])]
+)
+
+metrics.gauge_callback(
+    "pam_admission_sessions", "Device session slots in use and requests waiting for one", ("state",),
+    lambda: [(("in_use",), admission.get_stats()["in_use"]), (("queued",), admission.get_stats()["queue_depth"])]
+)
+
+metrics.gauge_callback(
+    "pam_circuit_breakers", "Device and credential circuits that are not closed", ("state",),
+    lambda: [(("open",), circuit_breaker.get_stats()["open"]), (("half_open",), circuit_breaker.get_stats()["half_open"])]
+)
+
+metrics.gauge_callback(
+    "pam_audit_records", "Audit records since start by writer state", ("state",),
+    lambda: [(("written",), audit_log.stats["written"]), (("pending",), audit_log.pending),
+             (("dropped",), audit_log.stats["dropped"])]
+)
+
 # Routers ekle
 app.include_router(connections.router)
+app.include_router(health.router)
+app.include_router(backups.router)
+app.include_router(audit.router)
+app.include_router(auth.router)
 
 class Device(BaseModel):
     name: str
@@ -34,6 +137,27 @@ class User(BaseModel):
     username: str
     role: str
 
+# Cihaz oturum slotu alınamadı - istemci Retry-After sonrası tekrar denemeli
+@app.exception_handler(AdmissionRejected)
+async def admission_rejected_handler(request: Request, exc: AdmissionRejected):
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"detail": str(exc), "device_id": exc.device_id, "retry_after": round(exc.retry_after, 2)},
+        headers=exc.headers()
+    )
+
+# Cihaz/kimlik bilgisi için devre açık - bağlantı denenmedi, Retry-After sonrası probe yapılır
+@app.exception_handler(CircuitOpenError)
+async def circuit_open_handler(request: Request, exc: CircuitOpenError):
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={
+            "detail": str(exc), "device_id": exc.device_id,
+            "failure_class": exc.failure_class, "retry_after": round(exc.retry_after, 2)
+        },
+        headers=exc.headers()
+    )
+
 # Root endpoint - health check
 @app.get("/")
 async def root():
@@ -69,28 +193,160 @@ async def health_check():
         raise HTTPException(status_code=500, detail=f"Health check failed: {str(e)}")
 
 # Device endpoints
+def encode_cursor(last_id: int) -> str:
+    """Sayfalama cursor'ı - istemci için opak"""
+    return base64.urlsafe_b64encode(f"id:{last_id}".encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        prefix, value = base64.urlsafe_b64decode(padded.encode()).decode().split(":", 1)
+        if prefix != "id":
+            raise ValueError(prefix)
+        return int(value)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
 @app.get("/devices")
-async def list_devices():
+async def list_devices(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    type: Optional[str] = None,
+    name_prefix: Optional[str] = None,
+    ip: Optional[str] = Query(None, description="Tek IP veya CIDR (örn. 10.0.0.0/24)"),
+    fields: Optional[str] = Query(None, description="Virgülle ayrılmış alan listesi (örn. id,name,ip)")
+):
     try:
-        devices = get_devices()
-        return {"devices": devices, "count": len(devices)}
+        # Envanter ve sorgu değişmediyse gövde göndermeden 304 dön
+        query_key = hashlib.sha1(str(sorted(request.query_params.multi_items())).encode()).hexdigest()[:12]
+        etag = f'W/"{get_devices_revision()}-{query_key}"'
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        
+        after_id = decode_cursor(cursor) if cursor else 0
+        try:
+            devices, next_id = query_devices(
+                device_type=type,
+                name_prefix=name_prefix,
+                ip=ip,
+                after_id=after_id,
+                limit=limit
+            )
+        except ValueError as ve:
+            raise HTTPException(status_code=400, detail=f"Invalid ip filter: {ve}")
+        
+        # Alan projeksiyonu - id her zaman döner
+        if fields:
+            wanted = {f.strip() for f in fields.split(",") if f.strip()} | {"id"}
+            devices = [{k: v for k, v in d.items() if k in wanted} for d in devices]
+        
+        body = {"devices": devices, "count": len(devices)}
+        if limit is not None:
+            body["next_cursor"] = encode_cursor(next_id) if next_id is not None else None
+        
+        return JSONResponse(content=body, headers={"ETag": etag})
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get devices: {str(e)}")
 
 @app.post("/devices")
-async def create_device(device: Device):
+async def create_device(device: Device, request: Request):
     try:
         # ID ataması json_db.py'de yapılacak
         device_dict = device.dict()
         add_device(device_dict)
+        user, client_ip = request_actor(request)
+        audit_log.record("device.create", user=user, device=device_dict, client_ip=client_ip)
         return {"status": "success", "message": "Device added successfully", "device": device_dict}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to add device: {str(e)}")
 
+@app.post("/devices/bulk")
+async def bulk_create_devices(
+    request: Request,
+    format: Optional[str] = Query(None, description="csv | ndjson - verilmezse Content-Type'tan belirlenir"),
+    strict: bool = Query(False, description="Hatalı veya tekrar eden satır varsa hiçbir cihaz eklenmez")
+):
+    """CSV/NDJSON gövdesini akış halinde ayrıştırır, doğrular ve tek işlemde ekler"""
+    start_time = time.perf_counter()
+    try:
+        fmt = detect_format(format, request.headers.get("content-type"))
+        devices, line_numbers, errors, error_count = await parse_devices(
+            request.stream(), fmt, lambda record: Device(**record).dict()
+        )
+    except BulkImportError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+    if strict and error_count:
+        raise HTTPException(status_code=422, detail={
+            "message": f"{error_count} invalid rows, nothing imported",
+            "errors": errors,
+            "error_count": error_count
+        })
+
+    try:
+        added, duplicates = await run_in_threadpool(add_devices, devices, not strict)
+    except ValueError as ve:
+        raise HTTPException(status_code=409, detail=f"{ve}, nothing imported")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to import devices: {str(e)}")
+
+    user, client_ip = request_actor(request)
+    audit_log.record(
+        "device.bulk_import", user=user, client_ip=client_ip,
+        detail=f"{len(added)} imported, {len(duplicates)} duplicates, {error_count} invalid rows ({fmt})"
+    )
+    line_of = {id(device): line for device, line in zip(devices, line_numbers)}
+    return {
+        "status": "success",
+        "format": fmt,
+        "imported": len(added),
+        "duplicate_count": len(duplicates),
+        "duplicates": [
+            {"line": line_of[id(d)], "name": d["name"], "ip": d["ip"]}
+            for d in duplicates[:BULK_IMPORT_MAX_REPORTED]
+        ],
+        "error_count": error_count,
+        "errors": errors,
+        "first_id": added[0]["id"] if added else None,
+        "last_id": added[-1]["id"] if added else None,
+        "execution_time": round(time.perf_counter() - start_time, 3)
+    }
+
+@app.get("/devices/export")
+async def export_devices(
+    format: str = Query("ndjson", pattern="^(csv|ndjson)$"),
+    type: Optional[str] = None
+):
+    """Tüm envanteri sayfa sayfa okuyarak akış halinde döner - bellek kullanımı sabit"""
+    async def rows():
+        yield export_header(format)
+        after_id = 0
+        while True:
+            devices, next_id = query_devices(device_type=type, after_id=after_id, limit=1000)
+            if devices:
+                yield "".join(format_export_row(device, format) for device in devices)
+            if next_id is None:
+                return
+            after_id = next_id
+
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        rows(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="devices.{format}"'}
+    )
+
 @app.delete("/devices/{device_id}")
-async def remove_device(device_id: int):
+async def remove_device(device_id: int, request: Request):
     try:
         deleted = delete_device(device_id)
+        result_cache.invalidate_device(device_id)
+        ssh_pool.evict_device(device_id)
+        user, client_ip = request_actor(request)
+        audit_log.record("device.delete", user=user, device=deleted, client_ip=client_ip)
         return {"status": "success", "message": "Device deleted successfully", "device": deleted}
     except ValueError as ve:
         raise HTTPException(status_code=404, detail=str(ve))
@@ -106,6 +362,11 @@ async def list_users():
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get users: {str(e)}")
 
+# Prometheus scrape endpoint
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    return Response(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
 # Info endpoint - API özellikleri
 @app.get("/api/info")
 async def api_info():
@@ -114,14 +375,32 @@ async def api_info():
         "version": "1.0.0",
         "description": "Centralized network device management with SSH connectivity",
         "endpoints": {
-            "device_management": ["/devices", "/devices/{id}"],
+            "device_management": ["/devices", "/devices/{id}", "/devices/bulk", "/devices/export"],
             "ssh_connections": [
                 "/connections/test/{device_id}",
                 "/connections/execute/{device_id}",
+                "/connections/execute-stream/{device_id}",
+                "/connections/fleet/execute",
                 "/connections/health-check/{device_id}",
-                "/connections/available-commands/{device_id}"
+                "/connections/available-commands/{device_id}",
+                "/connections/pool/stats",
+                "/connections/cache/stats",
+                "/connections/parsers",
+                "/connections/parse",
+                "/connections/reachability",
+                "/connections/reachability/sweep",
+                "/connections/shell/{device_id}",
+                "/connections/shell/{session_id}/ws"
+            ],
+            "device_health": ["/health/devices", "/health/devices/{device_id}"],
+            "config_backups": [
+                "/backups/run",
+                "/backups/stats",
+                "/backups/devices/{device_id}",
+                "/backups/devices/{device_id}/versions/{version}",
+                "/backups/devices/{device_id}/diff"
             ],
-            "system": ["/health", "/api/info"]
+            "system": ["/health", "/api/info", "/metrics"]
         },
         "supported_device_types": [
             "cisco_ios",
@@ -0,0 +1,47 @@
+"""
+Audit API Router - Sunucu tarafı denetim kayıtlarının filtreli, sayfalı sorgusu
+backend/app/routers/audit.py
+"""
+
+from fastapi import APIRouter, HTTPException, Query
+from datetime import datetime
+from typing import Optional
+import logging
+
+from ..utils.audit_log import audit_log, AUDIT_MAX_PAGE
+
+router = APIRouter(prefix="/audit", tags=["Audit"])
+logger = logging.getLogger(__name__)
+
+# Segment dosyası okuyan sorgular event loop'u bloklamasın diye endpoint'ler senkron (threadpool'da) çalışır
+
+@router.get("")
+def query_audit_log(
+    user: Optional[str] = Query(None, description="PAM kullanıcısı veya cihazda kullanılan hesap"),
+    device_id: Optional[int] = None,
+    action: Optional[str] = Query(None, description="Örn. command.execute, auth.login"),
+    status: Optional[str] = Query(None, description="success, failure veya rejected"),
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = Query(50, ge=1, le=AUDIT_MAX_PAGE),
+    cursor: Optional[str] = None
+):
+    """Denetim kayıtlarını yeniden eskiye döner - next_cursor ile sonraki sayfa istenir"""
+    try:
+        return audit_log.query(
+            user=user,
+            device_id=device_id,
+            action=action,
+            status=status,
+            since=since.timestamp() if since else None,
+            until=until.timestamp() if until else None,
+            limit=limit,
+            cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/stats")
+def audit_stats():
+    """Yazıcı sayaçları, segment sayısı ve toplam kayıt"""
+    return audit_log.get_stats()
@@ -3,19 +3,22 @@ Authentication API Router
 backend/app/routers/auth.py
 """
 
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel, EmailStr
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 import jwt
 import hashlib
-import secrets
 from datetime import datetime, timedelta
 import logging
 import json
 
 # Local imports
 from ..json_db import get_users, add_user, update_user, read_db, write_db
+from ..json_db import get_user_by_username as db_get_user_by_username
+from ..utils.auth_cache import auth_cache, CachedToken, CachedUser
+from ..utils.session_store import session_store
+from ..utils.audit_log import audit_log
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 logger = logging.getLogger(__name__)
@@ -151,7 +154,7 @@ def decode_access_token(token: str):
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token expired"
         )
-    except jwt.JWTError:
+    except jwt.InvalidTokenError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token"
@@ -159,39 +162,121 @@ def decode_access_token(token: str):
 
 def get_user_by_username(username: str) -> Optional[Dict]:
     """Kullanıcıyı kullanıcı adıyla bul"""
-    # Demo implementation - Production'da veritabanından alınacak
-    return DEMO_USERS.get(username)
+    # Demo kullanıcıları öncelikli; şifre hash'i olan veritabanı kullanıcıları da kabul edilir
+    user = DEMO_USERS.get(username)
+    if user is None:
+        user = db_get_user_by_username(username)
+        if user is not None and "password_hash" not in user:
+            return None
+    return user
+
+def save_user(user: Dict):
+    """Kullanıcı kaydını kaynağına yazar ve önbellekteki kaydı geçersiz kılar"""
+    if user["username"] in DEMO_USERS:
+        DEMO_USERS[user["username"]] = user
+    else:
+        update_user(user["username"], user)
+    auth_cache.invalidate_user(user["username"])
 
 def update_last_login(username: str):
     """Son giriş zamanını güncelle"""
-    # Demo implementation - Production'da veritabanını güncelleyecek
-    if username in DEMO_USERS:
-        DEMO_USERS[username]["last_login"] = datetime.utcnow().isoformat() + "Z"
+    user = get_user_by_username(username)
+    if user is not None:
+        save_user({**user, "last_login": datetime.utcnow().isoformat() + "Z"})
+
+def _unauthorized(detail: str = "Invalid token") -> HTTPException:
+    return HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=detail)
+
+def verify_token(token: str) -> CachedToken:
+    """
+    Token'ı doğrular; imza doğrulaması token başına bir kez yapılır, sonraki istekler
+    özet araması ve oturum deposunda O(1) üyelik kontrolü ile çözülür
+    Oturumu depoda bulunmayan token (ör. bellek modunda yeniden başlatma öncesi üretilmiş) reddedilir
+    Raises: HTTPException(401)
+    """
+    entry = auth_cache.get_token(token)
+    if entry is None:
+        payload = decode_access_token(token)
+        if not payload.get("sub") or "exp" not in payload or not payload.get("jti"):
+            raise _unauthorized()
+        entry = auth_cache.put_token(token, payload)
+
+    if not session_store.is_active(entry.session_id) or not auth_cache.is_token_current(entry):
+        raise _unauthorized("Token revoked or session unknown")
+    return entry
+
+async def get_current_token(credentials: HTTPAuthorizationCredentials = Depends(security)) -> CachedToken:
+    return verify_token(credentials.credentials)
+
+async def get_current_principal(entry: CachedToken = Depends(get_current_token)) -> CachedUser:
+    """Token sahibinin önbellekteki değişmez kaydını döner"""
+    try:
+        principal = auth_cache.get_user(entry.username, get_user_by_username)
+    except Exception as e:
+        logger.error(f"User lookup failed for {entry.username}: {e}")
+        raise _unauthorized()
+    if principal is None:
+        raise _unauthorized("User not found")
+    return principal
 
-async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+async def get_current_user(principal: CachedUser = Depends(get_current_principal)) -> Dict:
     """Mevcut kullanıcıyı token'dan al"""
+    return principal.to_dict()
+
+def request_token(request) -> Optional[str]:
+    """Bearer başlığındaki token - tarayıcı WebSocket'e başlık ekleyemediğinden orada ?token= okunur"""
+    header = request.headers.get("authorization", "")
+    if header[:7].lower() == "bearer ":
+        return header[7:]
+    if request.scope.get("type") == "websocket":
+        return request.query_params.get("token")
+    return None
+
+def resolve_principal(token: Optional[str]) -> Optional[CachedUser]:
+    """
+    Token'ı get_current_principal ile aynı kurallarla çözer (imza, exp, oturum, şifre değişimi)
+    Returns: aktif kullanıcı kaydı - token yok/geçersizse None (istisna atmaz)
+    """
+    if not token:
+        return None
     try:
-        payload = decode_access_token(credentials.credentials)
-        username = payload.get("sub")
-        if username is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token"
-            )
-        
-        user = get_user_by_username(username)
-        if user is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="User not found"
-            )
-        
-        return user
-    except Exception:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token"
-        )
+        entry = verify_token(token)
+        principal = auth_cache.get_user(entry.username, get_user_by_username)
+    except HTTPException:
+        return None
+    except Exception as e:
+        logger.error(f"Token resolution failed: {e}")
+        return None
+    if principal is None or not principal.is_active:
+        return None
+    return principal
+
+def request_actor(request) -> Tuple[Optional[str], Optional[str]]:
+    """
+    İsteği yapan PAM kullanıcısı ve istemci IP'si - denetim kaydı için
+    Kullanıcı doğrulanmış token'dan çözülür; token yoksa veya geçersizse None (yetkilendirme yapmaz)
+    """
+    principal = resolve_principal(request_token(request))
+    return (principal.username if principal is not None else None), _client_info(request)[0]
+
+def _client_info(request: Request):
+    """Oturum kaydı için istemci IP'si ve user agent"""
+    forwarded = request.headers.get("x-forwarded-for")
+    ip_address = forwarded.split(",")[0].strip() if forwarded else (request.client.host if request.client else None)
+    return ip_address, request.headers.get("user-agent")
+
+def open_session(username: str, role: str, request: Request) -> Dict:
+    """Oturum açar ve jti olarak oturum id'sini taşıyan token üretir"""
+    ip_address, user_agent = _client_info(request)
+    access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    session = session_store.create(
+        username, access_token_expires.total_seconds(), ip_address=ip_address, user_agent=user_agent
+    )
+    access_token = create_access_token(
+        data={"sub": username, "role": role, "jti": session.session_id},
+        expires_delta=access_token_expires
+    )
+    return {"access_token": access_token, "session_id": session.session_id}
 
 def check_permission(user: Dict, required_permission: str) -> bool:
     """Kullanıcının yetkisini kontrol et"""
@@ -202,43 +287,43 @@ def check_permission(user: Dict, required_permission: str) -> bool:
     return "all" in permissions or required_permission in permissions
 
 def require_permission(permission: str):
-    """Yetki kontrolü decorator'ı"""
-    async def permission_checker(user: Dict = Depends(get_current_user)):
-        if not check_permission(user, permission):
+    """Yetki kontrolü decorator'ı - önbellekteki frozenset üzerinden O(1)"""
+    async def permission_checker(principal: CachedUser = Depends(get_current_principal)):
+        if not principal.allows(permission):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"Permission '{permission}' required"
             )
-        return user
+        return principal.to_dict()
     return permission_checker
 
 # Routes
 
 @router.post("/login", response_model=LoginResponse)
-async def login(login_data: LoginRequest):
+async def login(login_data: LoginRequest, request: Request):
     """Kullanıcı girişi"""
     try:
         user = get_user_by_username(login_data.username)
         
         if not user or not verify_password(login_data.password, user["password_hash"]):
             logger.warning(f"Failed login attempt for username: {login_data.username}")
+            audit_log.record("auth.login", status="failure", user=login_data.username,
+                             detail="Invalid credentials", client_ip=_client_info(request)[0])
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Kullanıcı adı veya şifre hatalı"
             )
         
         if not user.get("is_active", False):
+            audit_log.record("auth.login", status="rejected", user=login_data.username,
+                             detail="Account disabled", client_ip=_client_info(request)[0])
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Hesap devre dışı"
             )
         
-        # JWT token oluştur
-        access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-        access_token = create_access_token(
-            data={"sub": user["username"], "role": user["role"]},
-            expires_delta=access_token_expires
-        )
+        # Oturum aç ve JWT token oluştur - jti ile oturum bazında iptal edilebilir
+        issued = open_session(user["username"], user["role"], request)
         
         # Son giriş zamanını güncelle
         update_last_login(login_data.username)
@@ -246,12 +331,14 @@ async def login(login_data: LoginRequest):
         # Şifreyi response'dan çıkar
         user_data = {k: v for k, v in user.items() if k != "password_hash"}
         user_data["login_time"] = datetime.utcnow().isoformat() + "Z"
-        user_data["session_id"] = f"session_{datetime.utcnow().timestamp()}_{secrets.token_hex(8)}"
+        user_data["session_id"] = issued["session_id"]
         
         logger.info(f"Successful login for user: {login_data.username}")
+        audit_log.record("auth.login", user=user["username"], client_ip=_client_info(request)[0],
+                         session_id=issued["session_id"][:8])
         
         return {
-            "access_token": access_token,
+            "access_token": issued["access_token"],
             "token_type": "bearer",
             "user": user_data,
             "expires_in": ACCESS_TOKEN_EXPIRE_MINUTES * 60
@@ -267,8 +354,15 @@ async def login(login_data: LoginRequest):
         )
 
 @router.post("/logout")
-async def logout(user: Dict = Depends(get_current_user)):
-    """Kullanıcı çıkışı"""
+async def logout(
+    request: Request,
+    token: CachedToken = Depends(get_current_token),
+    user: Dict = Depends(get_current_user)
+):
+    """Kullanıcı çıkışı - mevcut oturum iptal edilir"""
+    session_store.revoke(token.session_id)
+    audit_log.record("auth.logout", user=user["username"], client_ip=_client_info(request)[0],
+                     session_id=(token.session_id or "")[:8])
     logger.info(f"User logged out: {user['username']}")
     return {"message": "Çıkış başarılı"}
 
@@ -299,7 +393,7 @@ async def update_current_user(
         if user_update.permissions:
             updated_user["permissions"] = user_update.permissions
     
-    DEMO_USERS[user["username"]] = updated_user
+    save_user(updated_user)
     
     user_data = {k: v for k, v in updated_user.items() if k != "password_hash"}
     return user_data
@@ -322,8 +416,10 @@ async def change_password(
             detail="Yeni şifre en az 6 karakter olmalı"
         )
     
-    # Demo implementation - Production'da veritabanını güncelleyecek
-    DEMO_USERS[user["username"]]["password_hash"] = hash_password(password_data.new_password)
+    save_user({**user, "password_hash": hash_password(password_data.new_password)})
+    # Eski şifreyle alınmış token'lar artık kabul edilmez
+    auth_cache.revoke_user_tokens(user["username"])
+    session_store.revoke_user(user["username"])
     
     logger.info(f"Password changed for user: {user['username']}")
     return {"message": "Şifre başarıyla değiştirildi"}
@@ -402,7 +498,7 @@ async def update_user_by_username(
     if user_update.is_active is not None:
         target_user["is_active"] = user_update.is_active
     
-    DEMO_USERS[username] = target_user
+    save_user(target_user)
     
     logger.info(f"User updated: {username} by {current_user['username']}")
     
@@ -428,6 +524,8 @@ async def delete_user(
         )
     
     del DEMO_USERS[username]
+    auth_cache.revoke_user_tokens(username)
+    session_store.revoke_user(username)
     
     logger.info(f"User deleted: {username} by {current_user['username']}")
     
@@ -514,35 +612,57 @@ async def get_available_roles():
     }
 
 @router.post("/refresh-token")
-async def refresh_token(user: Dict = Depends(get_current_user)):
-    """Token yenile"""
-    access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": user["username"], "role": user["role"]},
-        expires_delta=access_token_expires
-    )
+async def refresh_token(
+    request: Request,
+    token: CachedToken = Depends(get_current_token),
+    user: Dict = Depends(get_current_user)
+):
+    """Token yenile - yeni oturum açılır, eskisi iptal edilir"""
+    issued = open_session(user["username"], user["role"], request)
+    session_store.revoke(token.session_id)
     
     return {
-        "access_token": access_token,
+        "access_token": issued["access_token"],
         "token_type": "bearer",
         "expires_in": ACCESS_TOKEN_EXPIRE_MINUTES * 60
     }
 
+@router.get("/cache/stats")
+async def get_auth_cache_stats(user: Dict = Depends(require_permission("user_manage"))):
+    """Token/kullanıcı önbelleği sayaçları"""
+    return auth_cache.get_stats()
+
 # Session management
+def _session_view(session, current_session_id: Optional[str] = None) -> Dict:
+    data = session.to_dict()
+    data["is_current"] = session.session_id == current_session_id
+    return data
+
 @router.get("/sessions")
-async def get_active_sessions(user: Dict = Depends(get_current_user)):
+async def get_active_sessions(
+    token: CachedToken = Depends(get_current_token),
+    user: Dict = Depends(get_current_user)
+):
     """Aktif oturumları listele"""
-    # Demo implementation - Production'da gerçek session store kullanılacak
     return {
         "sessions": [
-            {
-                "session_id": f"session_{datetime.utcnow().timestamp()}",
-                "user_id": user["id"],
-                "created_at": user.get("last_login", datetime.utcnow().isoformat() + "Z"),
-                "ip_address": "127.0.0.1",
-                "user_agent": "PAM Network Management",
-                "is_current": True
-            }
+            _session_view(session, token.session_id)
+            for session in session_store.list_user(user["username"])
+        ]
+    }
+
+@router.get("/users/{username}/sessions")
+async def get_user_sessions(
+    username: str,
+    include_revoked: bool = False,
+    current_user: Dict = Depends(require_permission("user_manage"))
+):
+    """Kullanıcının oturumlarını listele (sadece admin)"""
+    return {
+        "username": username,
+        "sessions": [
+            _session_view(session)
+            for session in session_store.list_user(username, include_revoked=include_revoked)
         ]
     }
 
@@ -552,6 +672,19 @@ async def revoke_session(
     user: Dict = Depends(get_current_user)
 ):
     """Oturumu sonlandır"""
-    # Demo implementation - Production'da session store'dan silinecek
+    session = session_store.get(session_id)
+    if session is None or (session.username != user["username"] and not check_permission(user, "user_manage")):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Oturum bulunamadı"
+        )
+    
+    session_store.revoke(session_id)
+    auth_cache.invalidate_session(session_id)
     logger.info(f"Session revoked: {session_id} by {user['username']}")
-    return {"message": "Oturum sonlandırıldı"}
\ No newline at end of file
+    return {"message": "Oturum sonlandırıldı"}
+
+@router.get("/sessions/stats")
+async def get_session_stats(user: Dict = Depends(require_permission("user_manage"))):
+    """Oturum deposu sayaçları"""
+    return session_store.get_stats()
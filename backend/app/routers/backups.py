@@ -0,0 +1,100 @@
+"""
+Config Backup API Router - Konfigürasyon yedekleri, sürüm listesi ve sürümler arası diff
+backend/app/routers/backups.py
+"""
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from typing import List, Optional
+import logging
+
+from ..utils.config_backup import config_backups, config_store
+from ..json_db import get_devices, get_device_by_id
+
+router = APIRouter(prefix="/backups", tags=["Config Backups"])
+logger = logging.getLogger(__name__)
+
+class BackupRunRequest(BaseModel):
+    # Boşsa tüm envanter yedeklenir
+    device_ids: Optional[List[int]] = None
+    # Boşsa CONFIG_BACKUP_USERNAME/PASSWORD kullanılır
+    username: Optional[str] = None
+    password: Optional[str] = None
+    port: Optional[int] = None
+
+def _require_device(device_id: int):
+    if get_device_by_id(device_id) is None:
+        raise HTTPException(status_code=404, detail=f"Device with ID {device_id} not found")
+
+@router.post("/run")
+async def run_backup(request: BackupRunRequest):
+    """Seçili cihazların (veya tümünün) konfigürasyonunu hemen yedekler"""
+    if not (request.username or config_backups.username) or not (request.password or config_backups.password):
+        raise HTTPException(status_code=400, detail="Credentials required (request body or CONFIG_BACKUP_USERNAME/PASSWORD)")
+
+    if request.device_ids:
+        devices = []
+        for device_id in request.device_ids:
+            device = get_device_by_id(device_id)
+            if device is None:
+                raise HTTPException(status_code=404, detail=f"Device with ID {device_id} not found")
+            devices.append(device)
+    else:
+        devices = get_devices()
+
+    result = await config_backups.run(devices, request.username, request.password, request.port)
+    return {"status": "completed", "total_devices": len(devices), **result}
+
+@router.get("/stats")
+async def backup_stats():
+    return config_backups.get_stats()
+
+@router.get("/devices/{device_id}")
+async def list_versions(device_id: int):
+    """Cihazın yedek sürümleri (en eski ilk)"""
+    versions = config_store.versions(device_id)
+    if not versions:
+        _require_device(device_id)
+    return {"device_id": device_id, "versions": versions, "count": len(versions)}
+
+@router.get("/devices/{device_id}/versions/{version}")
+async def get_version(device_id: int, version: int):
+    """Sürümün konfigürasyon metnini blob'dan açarak akış halinde döner"""
+    entry = config_store.get_version(device_id, version)
+    if entry is None:
+        raise HTTPException(status_code=404, detail=f"Version {version} not found for device {device_id}")
+    return StreamingResponse(
+        config_store.iter_blob(entry["hash"]),
+        media_type="text/plain; charset=utf-8",
+        headers={"ETag": f'"{entry["hash"]}"', "X-Config-Version": str(version)}
+    )
+
+@router.get("/devices/{device_id}/diff")
+async def diff_versions(
+    device_id: int,
+    from_version: Optional[int] = Query(None, alias="from", ge=1),
+    to_version: Optional[int] = Query(None, alias="to", ge=1),
+    context: int = Query(3, ge=0, le=100)
+):
+    """
+    İki sürüm arasındaki unified diff - satırlar üretildikçe gönderilir
+    Varsayılan: son sürüm ile bir önceki
+    """
+    versions = config_store.versions(device_id)
+    if not versions:
+        _require_device(device_id)
+        raise HTTPException(status_code=404, detail=f"No backups for device {device_id} yet")
+
+    to_version = to_version or len(versions)
+    from_version = from_version or max(1, to_version - 1)
+    try:
+        lines = config_store.diff(device_id, from_version, to_version, context)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e.args[0]))
+
+    return StreamingResponse(
+        (line if line.endswith("\n") else line + "\n" for line in lines),
+        media_type="text/x-diff; charset=utf-8",
+        headers={"X-Diff-From": str(from_version), "X-Diff-To": str(to_version)}
+    )
@@ -3,16 +3,35 @@ Device Connection API Router
 backend/app/routers/connections.py
 """
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 from pydantic import BaseModel
 from typing import List, Dict, Optional
 import asyncio
+import json
 import logging
+import os
+import time
 from datetime import datetime
 
 # Local imports
-from ..utils.ssh_connector import SSHConnector, NetworkDeviceManager
-from ..json_db import get_devices
+from ..utils.ssh_connector import NetworkDeviceManager
+from ..utils.drivers import list_drivers
+from ..utils.connection_pool import ssh_pool
+from ..utils.admission import admission, AdmissionRejected
+from ..utils.circuit_breaker import circuit_breaker, CircuitOpenError
+from ..utils.audit_log import audit_log
+from ..utils.health_monitor import health_monitor, evaluate_health, summarize_health, HEALTH_COMMAND_DELAY
+from ..utils.shell_sessions import shell_sessions, ShellSessionLimitReached
+from ..utils.result_cache import result_cache, is_mutating
+from ..utils.single_flight import command_flights, flight_key, is_coalescable
+from ..utils.parsers import get_parser, parse_output, summarize_interfaces, list_parsers
+from ..utils.reachability import reachability, REACHABILITY_TIMEOUT
+from ..utils.fleet import FleetExecutor, FLEET_DEVICE_TIMEOUT, FLEET_MAX_CONCURRENCY, summarize_fleet_results
+from ..json_db import get_devices, get_device_by_id as find_device_by_id
+from ..utils.auth_cache import CachedUser
+from .auth import get_current_principal, request_actor, request_token, resolve_principal
 
 router = APIRouter(prefix="/connections", tags=["Device Connections"])
 logger = logging.getLogger(__name__)
@@ -30,6 +49,26 @@ class CommandRequest(BaseModel):
     password: str
     command: str
     port: Optional[int] = 22
+    # True ise salt okunur komut için de önbellek atlanır ve cihaza gidilir
+    bypass_cache: Optional[bool] = False
+
+# Streaming çıktı için varsayılan üst sınır (byte)
+STREAM_MAX_BYTES = int(os.getenv("STREAM_MAX_BYTES", str(16 * 1024 * 1024)))
+
+class QuickInfoRequest(ConnectionRequest):
+    bypass_cache: Optional[bool] = False
+
+class StreamCommandRequest(CommandRequest):
+    max_bytes: Optional[int] = STREAM_MAX_BYTES
+    chunk_size: Optional[int] = 32768
+    timeout: Optional[int] = 30
+    # True ise bilinen komutlar için ayrıştırılan kayıtlar "records" olayı olarak gönderilir
+    parse: Optional[bool] = False
+
+class ParseRequest(BaseModel):
+    device_type: str
+    command: str
+    output: str
 
 class MultiCommandRequest(BaseModel):
     device_id: int
@@ -37,7 +76,8 @@ class MultiCommandRequest(BaseModel):
     password: str
     commands: List[str]
     port: Optional[int] = 22
-    delay: Optional[float] = 1.0
+    # None: cihaz profilindeki bekleme kullanılır (varsayılan 0 - kanallar paralel)
+    delay: Optional[float] = None
 
 class HealthCheckRequest(BaseModel):
     device_id: int
@@ -45,18 +85,79 @@ class HealthCheckRequest(BaseModel):
     password: str
     port: Optional[int] = 22
 
+class FleetExecuteRequest(BaseModel):
+    # Cihaz seçici - device_ids, device_type veya all_devices
+    device_ids: Optional[List[int]] = None
+    device_type: Optional[str] = None
+    all_devices: Optional[bool] = False
+    # Komutlar - ham komut listesi ve/veya NetworkDeviceManager şablon anahtarı (örn. "show_version")
+    commands: Optional[List[str]] = None
+    command_key: Optional[str] = None
+    username: str
+    password: str
+    port: Optional[int] = 22
+    delay: Optional[float] = None
+    max_concurrency: Optional[int] = FLEET_MAX_CONCURRENCY
+    per_type_concurrency: Optional[Dict[str, int]] = None
+    device_timeout: Optional[float] = FLEET_DEVICE_TIMEOUT
+    # Son erişilebilirlik taramasında kapalı görünen cihazları atla
+    skip_unreachable: Optional[bool] = True
+
+class ShellOpenRequest(ConnectionRequest):
+    cols: Optional[int] = 120
+    rows: Optional[int] = 40
+    term: Optional[str] = "xterm"
+
+class ReachabilitySweepRequest(BaseModel):
+    device_ids: Optional[List[int]] = None
+    device_type: Optional[str] = None
+    port: Optional[int] = 22
+    timeout: Optional[float] = REACHABILITY_TIMEOUT
+    read_banner: Optional[bool] = True
+
 # Helper function
 def get_device_by_id(device_id: int):
     """Device ID'ye göre cihaz bilgilerini döner"""
-    devices = get_devices()
-    device = next((d for d in devices if d.get("id") == device_id), None)
+    device = find_device_by_id(device_id)
     if not device:
         raise HTTPException(status_code=404, detail=f"Device with ID {device_id} not found")
     return device
 
+def audit_device_action(
+    action: str,
+    http_request: Request,
+    device_id: Optional[int],
+    username: Optional[str],
+    commands: Optional[List[str]] = None,
+    started: Optional[float] = None,
+    status: str = "success",
+    detail: Optional[str] = None,
+    exc: Optional[BaseException] = None,
+    **meta
+):
+    """Cihaz işlemini denetim kaydına ekler - exc verilirse durum ve detay hatadan türetilir"""
+    if exc is not None:
+        status = "rejected" if isinstance(exc, (AdmissionRejected, CircuitOpenError, ShellSessionLimitReached)) else "failure"
+        detail = str(exc.detail) if isinstance(exc, HTTPException) else str(exc)
+    user, client_ip = request_actor(http_request)
+    audit_log.record(
+        action,
+        status=status,
+        user=user,
+        device=find_device_by_id(device_id) if device_id is not None else None,
+        device_id=device_id,
+        device_username=username,
+        commands=commands,
+        detail=detail,
+        client_ip=client_ip,
+        duration=time.perf_counter() - started if started is not None else None,
+        **meta
+    )
+
 @router.post("/test/{device_id}")
-async def test_device_connection(device_id: int, connection: ConnectionRequest):
+async def test_device_connection(device_id: int, connection: ConnectionRequest, http_request: Request):
     """Cihaza SSH bağlantısını test eder - Tamamen dinamik"""
+    started = time.perf_counter()
     try:
         device = get_device_by_id(device_id)
         device_type = device.get("type", "unknown")
@@ -67,24 +168,25 @@ async def test_device_connection(device_id: int, connection: ConnectionRequest):
         
         logger.info(f"Testing SSH connection to {device['name']} ({device['ip']}) with user {connection.username}")
         
-        connector = SSHConnector()
-        
-        # Bağlantı testi
-        success, message = await connector.connect(
-            host=device["ip"],
+        # Bağlantı testi - havuzdan al veya yeni kur
+        async with ssh_pool.connection(
+            device,
             username=connection.username,
             password=connection.password,
             port=connection.port,
             timeout=15
-        )
+        ) as (connector, success, message):
+            if success:
+                # Cihaz tipine uygun test komutlarını çalıştır
+                logger.info(f"Connection successful, running {len(test_commands)} test commands")
+                test_results = await connector.execute_multiple_commands(test_commands[:3])  # İlk 3 komutu test et
         
         if success:
-            # Cihaz tipine uygun test komutlarını çalıştır
-            logger.info(f"Connection successful, running {len(test_commands)} test commands")
-            test_results = await connector.execute_multiple_commands(test_commands[:3])  # İlk 3 komutu test et
-            connector.disconnect()
-            
             successful_tests = sum(1 for r in test_results if r["success"])
+            audit_device_action(
+                "device.test", http_request, device_id, connection.username, test_commands[:3], started,
+                detail=f"{successful_tests}/{len(test_results)} tests passed"
+            )
             
             return {
                 "status": "success",
@@ -108,6 +210,10 @@ async def test_device_connection(device_id: int, connection: ConnectionRequest):
             }
         else:
             logger.warning(f"Connection failed to {device['name']}: {message}")
+            audit_device_action(
+                "device.test", http_request, device_id, connection.username, started=started,
+                status="failure", detail=message
+            )
             return {
                 "status": "error",
                 "message": f"SSH connection failed: {message}",
@@ -124,35 +230,66 @@ async def test_device_connection(device_id: int, connection: ConnectionRequest):
                 }
             }
             
+    except (HTTPException, AdmissionRejected, CircuitOpenError) as e:
+        audit_device_action("device.test", http_request, device_id, connection.username, started=started, exc=e)
+        raise
     except Exception as e:
+        audit_device_action("device.test", http_request, device_id, connection.username, started=started, exc=e)
         logger.error(f"Connection test error for device {device_id}: {e}")
         raise HTTPException(status_code=500, detail=f"Connection test failed: {str(e)}")
 
 @router.post("/execute/{device_id}")
-async def execute_command(device_id: int, request: CommandRequest):
+async def execute_command(device_id: int, request: CommandRequest, http_request: Request):
     """Cihazda tek komut çalıştırır"""
+    started = time.perf_counter()
     try:
         device = get_device_by_id(device_id)
+        start_time = datetime.now()
         
-        connector = SSHConnector()
-        
-        # Bağlantı kur
-        success, message = await connector.connect(
-            host=device["ip"],
-            username=request.username,
-            password=request.password,
-            port=request.port
-        )
+        # Durum değiştiren komut cihaza gitmeden önbelleği siler - yarıda kalsa da eski sonuç dönmesin
+        if is_mutating(request.command):
+            result_cache.invalidate_device(device_id)
         
-        if not success:
-            raise HTTPException(status_code=400, detail=f"Connection failed: {message}")
+        # Salt okunur komutun taze sonucu varsa cihaza gidilmez
+        cached = None
+        if request.bypass_cache:
+            result_cache.note_bypass()
+        else:
+            cached = result_cache.get(device_id, request.username, request.password, request.command)
         
-        # Komut çalıştır
-        start_time = datetime.now()
-        cmd_success, stdout, stderr = await connector.execute_command(request.command)
+        coalesced = False
+        if cached is not None:
+            cmd_success, stdout, stderr = True, cached["stdout"], cached["stderr"]
+        else:
+            async def run():
+                # Bağlantı kur - havuzda canlı oturum varsa yeniden kullanılır
+                async with ssh_pool.connection(
+                    device,
+                    username=request.username,
+                    password=request.password,
+                    port=request.port
+                ) as (connector, success, message):
+                    if not success:
+                        raise HTTPException(status_code=400, detail=f"Connection failed: {message}")
+                    
+                    # Komut çalıştır
+                    outcome = await connector.execute_command(request.command)
+                
+                result_cache.record(device_id, request.username, request.password, request.command, *outcome)
+                return outcome
+            
+            # Aynı salt okunur komut bu cihazda zaten çalışıyorsa sonucu beklenir
+            if is_coalescable(request.command):
+                key = flight_key("execute", device_id, request.username, request.password, request.port, request.command)
+                (cmd_success, stdout, stderr), coalesced = await command_flights.do(key, run)
+            else:
+                cmd_success, stdout, stderr = await run()
         execution_time = (datetime.now() - start_time).total_seconds()
-        
-        connector.disconnect()
+        audit_device_action(
+            "command.execute", http_request, device_id, request.username, [request.command], started,
+            status="success" if cmd_success else "failure", detail=stderr[:500] if not cmd_success else None,
+            cached=cached is not None, coalesced=coalesced
+        )
         
         return {
             "status": "completed",
@@ -168,41 +305,168 @@ async def execute_command(device_id: int, request: CommandRequest):
                 "stdout": stdout,
                 "stderr": stderr,
                 "execution_time": execution_time,
-                "timestamp": start_time.isoformat()
+                "timestamp": start_time.isoformat(),
+                "cached": cached is not None,
+                "cache_age": cached["cache_age"] if cached else None,
+                "coalesced": coalesced
             }
         }
         
-    except HTTPException:
+    except (HTTPException, AdmissionRejected, CircuitOpenError) as e:
+        audit_device_action("command.execute", http_request, device_id, request.username, [request.command], started, exc=e)
         raise
     except Exception as e:
+        audit_device_action("command.execute", http_request, device_id, request.username, [request.command], started, exc=e)
         logger.error(f"Command execution error: {e}")
         raise HTTPException(status_code=500, detail=f"Command execution failed: {str(e)}")
 
-@router.post("/execute-multiple/{device_id}")
-async def execute_multiple_commands(device_id: int, request: MultiCommandRequest):
-    """Cihazda birden fazla komut çalıştırır"""
+def format_sse(event: Dict) -> str:
+    """Olayı server-sent-events formatına çevirir"""
+    return f"event: {event['event']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+
+@router.post("/execute-stream/{device_id}")
+async def execute_command_stream(device_id: int, request: StreamCommandRequest, http_request: Request):
+    """Cihazda tek komut çalıştırır, çıktıyı server-sent-events olarak akıtır"""
+    started = time.perf_counter()
+    device = get_device_by_id(device_id)
+    max_bytes = min(request.max_bytes or STREAM_MAX_BYTES, STREAM_MAX_BYTES)
+    chunk_size = max(1024, min(request.chunk_size or 32768, 1024 * 1024))
+    
+    # Bağlantı hatası stream başlamadan HTTP hatası olarak dönsün
     try:
-        device = get_device_by_id(device_id)
-        
-        connector = SSHConnector()
-        
-        # Bağlantı kur
-        success, message = await connector.connect(
-            host=device["ip"],
+        entry, success, message = await ssh_pool.acquire(
+            device,
             username=request.username,
             password=request.password,
             port=request.port
         )
-        
         if not success:
             raise HTTPException(status_code=400, detail=f"Connection failed: {message}")
+    except (HTTPException, AdmissionRejected, CircuitOpenError) as e:
+        audit_device_action("command.stream", http_request, device_id, request.username, [request.command], started, exc=e)
+        raise
+    except Exception as e:
+        audit_device_action("command.stream", http_request, device_id, request.username, [request.command], started, exc=e)
+        logger.error(f"Command stream error: {e}")
+        raise HTTPException(status_code=500, detail=f"Command streaming failed: {str(e)}")
+    
+    outcome = {"exit_status": None, "error": None, "finished": False}
+    
+    def finish(completed: bool):
+        """
+        Bağlantıyı havuza döndürür ve akışı denetime yazar - yalnızca ilk çağrı etkilidir
+        Akış hiç başlamazsa veya istemci koparsa üreticinin finally'si çalışmayabilir; BackgroundTask da çağırır
+        """
+        if outcome["finished"]:
+            return
+        outcome["finished"] = True
+        # Yarıda kalan akışın bağlantısı yeniden kullanılmaz
+        ssh_pool.release(entry, reusable=completed)
+        exit_status = outcome["exit_status"]
+        if exit_status == 0:
+            detail = None
+        elif outcome["error"]:
+            detail = outcome["error"]
+        else:
+            detail = f"Exit status {exit_status}" if completed else "Stream interrupted before completion"
+        audit_device_action(
+            "command.stream", http_request, device_id, request.username, [request.command], started,
+            status="success" if exit_status == 0 else "failure", detail=detail, exit_status=exit_status
+        )
+    
+    async def release_unfinished():
+        finish(False)
+    
+    try:
+        # Akış önbelleğe yazılmaz ama durum değiştiren komut eski sonuçları geçersiz kılar
+        if is_mutating(request.command):
+            result_cache.invalidate_device(device_id)
         
-        # Komutları çalıştır
-        start_time = datetime.now()
-        results = await connector.execute_multiple_commands(request.commands, request.delay)
-        total_time = (datetime.now() - start_time).total_seconds()
+        parser = get_parser(device.get("type"), request.command) if request.parse else None
+    except Exception as e:
+        outcome["error"] = str(e)
+        finish(False)
+        logger.error(f"Command stream error: {e}")
+        raise HTTPException(status_code=500, detail=f"Command streaming failed: {str(e)}")
+    
+    async def event_stream():
+        completed = False
+        parse_stream = parser.stream() if parser else None
+        try:
+            yield format_sse({"event": "start", "command": request.command, "device_id": device_id,
+                              "parser": parser.name if parser else None,
+                              "timestamp": datetime.now().isoformat()})
+            async for event in entry.connector.stream_command(
+                request.command,
+                timeout=request.timeout,
+                chunk_size=chunk_size,
+                max_bytes=max_bytes
+            ):
+                if parse_stream is not None and event["event"] == "exit":
+                    records = parse_stream.close()
+                    if records:
+                        yield format_sse({"event": "records", "parser": parser.name, "data": records})
+                if event["event"] == "exit":
+                    outcome["exit_status"] = event.get("exit_status")
+                    completed = True
+                elif event["event"] == "error":
+                    outcome["error"] = event.get("data")
+                yield format_sse(event)
+                # Tamamlanan satırlar parça gelir gelmez kayda çevrilir
+                if parse_stream is not None and event["event"] == "stdout":
+                    records = parse_stream.feed(event["data"])
+                    if records:
+                        yield format_sse({"event": "records", "parser": parser.name, "data": records})
+        except Exception as e:
+            completed = False
+            outcome["error"] = f"Command streaming error: {str(e)}"
+            logger.error(outcome["error"])
+            yield format_sse({"event": "error", "data": outcome["error"]})
+        finally:
+            finish(completed)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        background=BackgroundTask(release_unfinished)
+    )
+
+@router.post("/execute-multiple/{device_id}")
+async def execute_multiple_commands(device_id: int, request: MultiCommandRequest, http_request: Request):
+    """Cihazda birden fazla komut çalıştırır"""
+    started = time.perf_counter()
+    try:
+        device = get_device_by_id(device_id)
+        if any(is_mutating(command) for command in request.commands):
+            result_cache.invalidate_device(device_id)
+        
+        # Bağlantı kur - havuzda canlı oturum varsa yeniden kullanılır
+        async with ssh_pool.connection(
+            device,
+            username=request.username,
+            password=request.password,
+            port=request.port
+        ) as (connector, success, message):
+            if not success:
+                raise HTTPException(status_code=400, detail=f"Connection failed: {message}")
+            
+            # Komutları çalıştır
+            start_time = datetime.now()
+            results = await connector.execute_multiple_commands(request.commands, request.delay)
+            total_time = (datetime.now() - start_time).total_seconds()
         
-        connector.disconnect()
+        for result in results:
+            result_cache.record(
+                device_id, request.username, request.password,
+                result["command"], result["success"], result["stdout"], result["stderr"]
+            )
+        failed = sum(1 for result in results if not result["success"])
+        audit_device_action(
+            "command.execute_multiple", http_request, device_id, request.username, request.commands, started,
+            status="failure" if failed else "success",
+            detail=f"{failed}/{len(results)} commands failed" if failed else None
+        )
         
         return {
             "status": "completed",
@@ -218,15 +482,115 @@ async def execute_multiple_commands(device_id: int, request: MultiCommandRequest
             "results": results
         }
         
-    except HTTPException:
+    except (HTTPException, AdmissionRejected, CircuitOpenError) as e:
+        audit_device_action("command.execute_multiple", http_request, device_id, request.username, request.commands, started, exc=e)
         raise
     except Exception as e:
+        audit_device_action("command.execute_multiple", http_request, device_id, request.username, request.commands, started, exc=e)
         logger.error(f"Multiple command execution error: {e}")
         raise HTTPException(status_code=500, detail=f"Multiple command execution failed: {str(e)}")
 
+def select_fleet_devices(request: FleetExecuteRequest):
+    """Fleet seçicisine göre cihazları ve bulunamayan ID'leri döner"""
+    if request.device_ids:
+        devices = []
+        missing = []
+        for device_id in request.device_ids:
+            try:
+                devices.append(get_device_by_id(device_id))
+            except HTTPException:
+                missing.append(device_id)
+        return devices, missing
+    
+    devices = get_devices()
+    if request.device_type:
+        device_type = request.device_type.lower()
+        devices = [d for d in devices if d.get("type", "").lower() == device_type]
+    return devices, []
+
+@router.post("/fleet/execute")
+async def execute_fleet_commands(request: FleetExecuteRequest, http_request: Request):
+    """Seçilen cihaz grubunda komutları paralel çalıştırır"""
+    if not (request.device_ids or request.device_type or request.all_devices):
+        raise HTTPException(status_code=400, detail="Specify device_ids, device_type or all_devices")
+    if not (request.commands or request.command_key):
+        raise HTTPException(status_code=400, detail="Specify commands or command_key")
+    
+    try:
+        devices, missing_ids = select_fleet_devices(request)
+        
+        logger.info(
+            f"Fleet execution on {len(devices)} devices "
+            f"(max_concurrency={request.max_concurrency}, timeout={request.device_timeout}s)"
+        )
+        
+        executor = FleetExecutor(
+            max_concurrency=request.max_concurrency,
+            per_type_limits=request.per_type_concurrency,
+            device_timeout=request.device_timeout,
+            skip_unreachable=request.skip_unreachable
+        )
+        
+        start_time = datetime.now()
+        results = await executor.run(
+            devices,
+            username=request.username,
+            password=request.password,
+            port=request.port,
+            commands=request.commands,
+            command_key=request.command_key,
+            delay=request.delay
+        )
+        total_time = (datetime.now() - start_time).total_seconds()
+        
+        # Bulunamayan cihazları da kısmi hata olarak raporla
+        for device_id in missing_ids:
+            results.append({
+                "device": {"id": device_id},
+                "status": "not_found",
+                "message": f"Device with ID {device_id} not found",
+                "results": [],
+                "execution_time": 0.0
+            })
+        
+        # Cihaz başına ayrı kayıt - cihaz indeksi üzerinden sorgulanabilsin
+        commands = request.commands or [f"command_key:{request.command_key}"]
+        for result in results:
+            audit_device_action(
+                "fleet.execute", http_request, result["device"].get("id"), request.username, commands,
+                status="success" if result["status"] == "success" else "failure",
+                detail=result.get("message") if result["status"] != "success" else None,
+                fleet_status=result["status"], execution_time=result.get("execution_time")
+            )
+        
+        summary = summarize_fleet_results(results)
+        if summary["success"] == summary["total"]:
+            status = "completed"
+        elif summary["success"] > 0:
+            status = "partial"
+        else:
+            status = "failed"
+        
+        return {
+            "status": status,
+            "summary": summary,
+            "total_execution_time": total_time,
+            "start_time": start_time.isoformat(),
+            "results": results
+        }
+        
+    except (HTTPException, AdmissionRejected, CircuitOpenError) as e:
+        audit_device_action("fleet.execute", http_request, None, request.username, request.commands, exc=e)
+        raise
+    except Exception as e:
+        audit_device_action("fleet.execute", http_request, None, request.username, request.commands, exc=e)
+        logger.error(f"Fleet execution error: {e}")
+        raise HTTPException(status_code=500, detail=f"Fleet execution failed: {str(e)}")
+
 @router.post("/health-check/{device_id}")
-async def health_check_device(device_id: int, request: HealthCheckRequest):
+async def health_check_device(device_id: int, request: HealthCheckRequest, http_request: Request):
     """Cihazın sağlık durumunu kontrol eder - Dinamik credentials"""
+    started = time.perf_counter()
     try:
         device = get_device_by_id(device_id)
         device_type = device.get("type", "unknown")
@@ -236,18 +600,38 @@ async def health_check_device(device_id: int, request: HealthCheckRequest):
         
         logger.info(f"Health check for {device['name']} ({device_type}) with {len(health_commands)} commands")
         
-        connector = SSHConnector()
+        async def run():
+            # Bağlantı kur - havuzda canlı oturum varsa yeniden kullanılır
+            async with ssh_pool.connection(
+                device,
+                username=request.username,
+                password=request.password,
+                port=request.port,
+                timeout=20
+            ) as (connector, success, message):
+                if not success:
+                    return False, message, []
+                # Sağlık komutlarını çalıştır
+                logger.info(f"Running health check commands: {health_commands}")
+                return True, message, await connector.execute_multiple_commands(health_commands, delay=HEALTH_COMMAND_DELAY)
         
-        # Bağlantı kur
-        success, message = await connector.connect(
-            host=device["ip"],
-            username=request.username,
-            password=request.password,
-            port=request.port,
-            timeout=20
-        )
+        # Eşzamanlı özdeş sağlık kontrolleri tek SSH oturumunu paylaşır
+        start_time = datetime.now()
+        key = flight_key("health-check", device_id, request.username, request.password, request.port, health_commands)
+        (success, message, shared_results), coalesced = await command_flights.do(key, run)
+        # parsed alanı istek başına eklenir - paylaşılan sonuç sözlükleri değiştirilmez
+        results = [dict(result) for result in shared_results]
         
         if not success:
+            # Anlık kontrol sonucu da sağlık önbelleğine yazılır
+            health_monitor.record(device_id, summarize_health(
+                device_id, "unhealthy", 0, [], "on_demand", error=message,
+                execution_time=(datetime.now() - start_time).total_seconds()
+            ))
+            audit_device_action(
+                "device.health_check", http_request, device_id, request.username, health_commands, started,
+                status="failure", detail=message, coalesced=coalesced
+            )
             return {
                 "status": "unhealthy",
                 "device": device,
@@ -257,27 +641,22 @@ async def health_check_device(device_id: int, request: HealthCheckRequest):
                 "health_score": 0
             }
         
-        # Sağlık komutlarını çalıştır
-        logger.info(f"Running health check commands: {health_commands}")
-        results = await connector.execute_multiple_commands(health_commands, delay=1.0)
-        connector.disconnect()
+        # Bilinen komut çıktıları yapılandırılmış kayda çevrilir
+        for result in results:
+            result["parsed"] = parse_output(device_type, result["command"], result["stdout"]) if result["success"] else None
         
         # Sağlık durumunu değerlendir
-        successful_commands = sum(1 for r in results if r["success"])
-        health_score = round((successful_commands / len(results)) * 100, 2)
-        
-        # Durum belirleme
-        if health_score >= 80:
-            status = "healthy"
-            status_icon = "💚"
-        elif health_score >= 50:
-            status = "degraded" 
-            status_icon = "💛"
-        else:
-            status = "unhealthy"
-            status_icon = "❤️"
+        status, status_icon, health_score, successful_commands = evaluate_health(results)
+        health_monitor.record(device_id, summarize_health(
+            device_id, status, health_score, results, "on_demand",
+            execution_time=(datetime.now() - start_time).total_seconds()
+        ))
         
         logger.info(f"Health check completed: {status} ({health_score}%)")
+        audit_device_action(
+            "device.health_check", http_request, device_id, request.username, health_commands, started,
+            detail=f"{status} ({health_score}%)", coalesced=coalesced
+        )
         
         return {
             "status": status,
@@ -293,11 +672,17 @@ async def health_check_device(device_id: int, request: HealthCheckRequest):
             "successful_commands": successful_commands,
             "failed_commands": len(results) - successful_commands,
             "timestamp": datetime.now().isoformat(),
+            "interfaces": summarize_interfaces([r["parsed"] for r in results]),
+            "coalesced": coalesced,
             "details": results,
             "summary": f"{status_icon} {status.upper()} - {health_score}% ({successful_commands}/{len(results)} commands successful)"
         }
         
+    except (HTTPException, AdmissionRejected, CircuitOpenError) as e:
+        audit_device_action("device.health_check", http_request, device_id, request.username, started=started, exc=e)
+        raise
     except Exception as e:
+        audit_device_action("device.health_check", http_request, device_id, request.username, started=started, exc=e)
         logger.error(f"Health check error for device {device_id}: {e}")
         raise HTTPException(status_code=500, detail=f"Health check failed: {str(e)}")
 
@@ -317,18 +702,20 @@ async def get_available_commands(device_id: int):
                 "type": device["type"]
             },
             "available_commands": available_commands,
-            "commands_count": len(available_commands)
+            "commands_count": len(available_commands),
+            "driver": list_drivers().get(device_type.lower(), {"mode": "exec", "prep_commands": [], "paging_handled": False})
         }
         
-    except HTTPException:
+    except (HTTPException, AdmissionRejected, CircuitOpenError):
         raise
     except Exception as e:
         logger.error(f"Get available commands error: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to get available commands: {str(e)}")
 
 @router.post("/quick-info/{device_id}")
-async def get_quick_device_info(device_id: int, connection: ConnectionRequest):
+async def get_quick_device_info(device_id: int, connection: QuickInfoRequest, http_request: Request):
     """Cihazdan hızlı bilgi toplar (version, interfaces vb.)"""
+    started = time.perf_counter()
     try:
         device = get_device_by_id(device_id)
         device_type = device.get("type", "unknown")
@@ -344,32 +731,353 @@ async def get_quick_device_info(device_id: int, connection: ConnectionRequest):
         else:
             info_commands = ["echo 'Device info not available for this type'"]
         
-        connector = SSHConnector()
-        
-        # Bağlantı kur
-        success, message = await connector.connect(
-            host=device["ip"],
-            username=connection.username,
-            password=connection.password,
-            port=connection.port
-        )
+        # Önbellekte taze sonucu olan komutlar cihaza gönderilmez - bypass istek başına bir kez sayılır
+        results: List[Optional[Dict]] = [None] * len(info_commands)
+        if connection.bypass_cache:
+            result_cache.note_bypass()
+        else:
+            for index, command in enumerate(info_commands):
+                cached = result_cache.get(device_id, connection.username, connection.password, command)
+                if cached is not None:
+                    results[index] = {"command": command, "timestamp": datetime.now().isoformat(), "execution_time": 0.0, **cached}
         
-        if not success:
-            raise HTTPException(status_code=400, detail=f"Connection failed: {message}")
+        pending = [index for index, result in enumerate(results) if result is None]
+        coalesced = False
+        if pending:
+            pending_commands = [info_commands[i] for i in pending]
+            
+            async def run():
+                # Bağlantı kur - havuzda canlı oturum varsa yeniden kullanılır
+                async with ssh_pool.connection(
+                    device,
+                    username=connection.username,
+                    password=connection.password,
+                    port=connection.port
+                ) as (connector, success, message):
+                    if not success:
+                        raise HTTPException(status_code=400, detail=f"Connection failed: {message}")
+                    
+                    # Bilgi komutlarını çalıştır
+                    fresh = await connector.execute_multiple_commands(pending_commands)
+                
+                for result in fresh:
+                    result_cache.record(
+                        device_id, connection.username, connection.password,
+                        result["command"], result["success"], result["stdout"], result["stderr"]
+                    )
+                return fresh
+            
+            # Aynı anda açılan özdeş quick-info istekleri tek çalıştırmaya bağlanır
+            key = flight_key("quick-info", device_id, connection.username, connection.password, connection.port, pending_commands)
+            fresh, coalesced = await command_flights.do(key, run)
+            for index, result in zip(pending, fresh):
+                results[index] = {**result, "cached": False}
         
-        # Bilgi komutlarını çalıştır
-        results = await connector.execute_multiple_commands(info_commands)
-        connector.disconnect()
+        for result in results:
+            result["parsed"] = parse_output(device_type, result["command"], result["stdout"]) if result["success"] else None
+        audit_device_action(
+            "device.quick_info", http_request, device_id, connection.username, info_commands, started,
+            cached=len(info_commands) - len(pending), coalesced=coalesced
+        )
         
         return {
             "status": "completed",
             "device": device,
             "info_collected": datetime.now().isoformat(),
+            "interfaces": summarize_interfaces([r["parsed"] for r in results]),
+            "coalesced": coalesced,
             "results": results
         }
         
-    except HTTPException:
+    except (HTTPException, AdmissionRejected, CircuitOpenError) as e:
+        audit_device_action("device.quick_info", http_request, device_id, connection.username, started=started, exc=e)
         raise
     except Exception as e:
+        audit_device_action("device.quick_info", http_request, device_id, connection.username, started=started, exc=e)
         logger.error(f"Quick info collection error: {e}")
-        raise HTTPException(status_code=500, detail=f"Quick info collection failed: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Quick info collection failed: {str(e)}")
+
+@router.get("/parsers")
+async def get_parsers():
+    """Cihaz tipine göre kayıtlı çıktı şablonları"""
+    return {"parsers": list_parsers()}
+
+@router.post("/parse")
+async def parse_command_output(request: ParseRequest):
+    """Daha önce alınmış bir komut çıktısını cihaza bağlanmadan ayrıştırır"""
+    parsed = parse_output(request.device_type, request.command, request.output)
+    if parsed is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No parser for '{request.command}' on device type '{request.device_type}'"
+        )
+    return parsed
+
+@router.get("/pool/stats")
+async def get_pool_stats():
+    """SSH bağlantı havuzu sayaçlarını döner (hit/miss, boşta bağlantılar)"""
+    return {
+        "pool": ssh_pool.get_stats(),
+        "timestamp": datetime.now().isoformat()
+    }
+
+@router.get("/cache/stats")
+async def get_result_cache_stats():
+    """Komut sonuç önbelleği sayaçları (hit rate, byte kullanımı)"""
+    return {
+        "cache": result_cache.get_stats(),
+        "timestamp": datetime.now().isoformat()
+    }
+
+@router.get("/admission")
+async def get_admission_stats(busy_only: bool = False):
+    """Cihaz başına oturum slotları, kuyruk derinliği ve bekleme süreleri"""
+    return {
+        "admission": admission.get_stats(),
+        "devices": admission.get_all_device_stats(busy_only=busy_only),
+        "timestamp": datetime.now().isoformat()
+    }
+
+@router.get("/admission/{device_id}")
+async def get_device_admission(device_id: int):
+    """Tek cihazın slot kullanımı ve kuyruk durumu"""
+    device = get_device_by_id(device_id)
+    stats = admission.get_device_stats(device_id) or {
+        "slots": admission.slots_for(device), "in_use": 0, "queue_depth": 0
+    }
+    return {"device_id": device_id, **stats}
+
+@router.get("/circuits")
+async def get_circuit_stats(open_only: bool = False):
+    """Cihaz devre kesici durumları - ardışık hatalar, sınıfları ve yeniden deneme süreleri"""
+    return {
+        "circuit_breaker": circuit_breaker.get_stats(),
+        "devices": circuit_breaker.get_all_device_stats(open_only=open_only),
+        "timestamp": datetime.now().isoformat()
+    }
+
+@router.get("/circuits/{device_id}")
+async def get_device_circuit(device_id: int):
+    """Tek cihazın transport ve kimlik bilgisi devreleri"""
+    get_device_by_id(device_id)
+    return {"device_id": device_id, **circuit_breaker.get_device_stats(device_id)}
+
+@router.post("/circuits/{device_id}/reset")
+async def reset_device_circuit(device_id: int, http_request: Request):
+    """Cihazın devrelerini kapatır - cihaz düzeltildikten veya şifre güncellendikten sonra beklemeden dener"""
+    get_device_by_id(device_id)
+    closed = circuit_breaker.reset(device_id)
+    audit_device_action("circuit.reset", http_request, device_id, None, detail=f"{closed} circuits closed")
+    return {"status": "success", "device_id": device_id, "closed": closed}
+
+@router.get("/coalesce/stats")
+async def get_coalesce_stats():
+    """Eşzamanlı özdeş istek birleştirme sayaçları"""
+    return {
+        "coalescing": command_flights.get_stats(),
+        "timestamp": datetime.now().isoformat()
+    }
+
+@router.delete("/cache/{device_id}")
+async def invalidate_result_cache(device_id: int, http_request: Request):
+    """Cihazın önbellekteki komut sonuçlarını siler"""
+    removed = result_cache.invalidate_device(device_id)
+    audit_device_action("cache.invalidate", http_request, device_id, None, detail=f"{removed} results invalidated")
+    return {"status": "success", "device_id": device_id, "invalidated": removed}
+
+@router.post("/reachability/sweep")
+async def sweep_reachability(request: ReachabilitySweepRequest):
+    """Cihazlara kimlik doğrulamasız TCP bağlantısı (ve SSH banner okuma) ile erişilebilirlik taraması"""
+    try:
+        if request.device_ids:
+            devices = [d for d in (find_device_by_id(i) for i in request.device_ids) if d]
+        else:
+            devices = get_devices()
+            if request.device_type:
+                device_type = request.device_type.lower()
+                devices = [d for d in devices if d.get("type", "").lower() == device_type]
+        
+        start_time = datetime.now()
+        results = await reachability.sweep(
+            devices,
+            port=request.port,
+            timeout=request.timeout,
+            read_banner=request.read_banner
+        )
+        
+        up = [device_id for device_id in results if not reachability.is_down(device_id)]
+        return {
+            "status": "completed",
+            "total": len(results),
+            "up": len(up),
+            "down": len(results) - len(up),
+            "total_time": (datetime.now() - start_time).total_seconds(),
+            "results": results
+        }
+    except Exception as e:
+        logger.error(f"Reachability sweep error: {e}")
+        raise HTTPException(status_code=500, detail=f"Reachability sweep failed: {str(e)}")
+
+@router.get("/reachability")
+async def get_reachability_states():
+    """Son taramadan cihaz başına up/down/stale durumu ve RTT"""
+    return {
+        "devices": reachability.get_all_states(),
+        "stats": reachability.get_stats(),
+        "timestamp": datetime.now().isoformat()
+    }
+
+@router.get("/reachability/{device_id}")
+async def get_device_reachability(device_id: int):
+    """Tek cihazın erişilebilirlik durumu - henüz taranmadıysa tek probe yapar"""
+    state = reachability.get_state(device_id)
+    if state is None:
+        device = get_device_by_id(device_id)
+        await reachability.probe_device(device)
+        state = reachability.get_state(device_id)
+    return {"device_id": device_id, **state}
+
+@router.post("/shell/{device_id}")
+async def open_shell_session(
+    device_id: int,
+    request: ShellOpenRequest,
+    http_request: Request,
+    principal: CachedUser = Depends(get_current_principal)
+):
+    """
+    Cihazda kalıcı PTY shell oturumu açar - giriş/çıkış WebSocket üzerinden akar
+    Oturum token'ı doğrulanan PAM kullanıcısına bağlanır; tam session_id yalnızca bu yanıtta döner
+    """
+    started = time.perf_counter()
+    device = get_device_by_id(device_id)
+    
+    try:
+        session, success, message = await shell_sessions.open(
+            device,
+            username=request.username,
+            password=request.password,
+            port=request.port,
+            cols=request.cols,
+            rows=request.rows,
+            term=request.term,
+            owner=principal.username
+        )
+    except (AdmissionRejected, CircuitOpenError) as e:
+        audit_device_action("shell.open", http_request, device_id, request.username, started=started, exc=e)
+        raise
+    except ShellSessionLimitReached as e:
+        audit_device_action("shell.open", http_request, device_id, request.username, started=started, exc=e)
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    if not success:
+        audit_device_action("shell.open", http_request, device_id, request.username, started=started,
+                            status="failure", detail=message)
+        raise HTTPException(status_code=400, detail=message)
+    audit_device_action("shell.open", http_request, device_id, request.username, started=started,
+                        session_id=session.handle)
+    
+    return {
+        "status": "opened",
+        "session_id": session.id,
+        "handle": session.handle,
+        "websocket_url": f"/connections/shell/{session.id}/ws",
+        "device": device,
+        "message": message,
+        "timestamp": datetime.now().isoformat()
+    }
+
+@router.get("/shell")
+async def list_shell_sessions(principal: CachedUser = Depends(get_current_principal)):
+    """Çağıranın açık shell oturumlarını listeler - oturum kimlikleri yalnızca önek (handle) olarak döner"""
+    return {
+        "sessions": shell_sessions.list_sessions(owner=principal.username),
+        "stats": shell_sessions.get_stats()
+    }
+
+@router.delete("/shell/{session_id}")
+async def close_shell_session(
+    session_id: str,
+    http_request: Request,
+    principal: CachedUser = Depends(get_current_principal)
+):
+    """Shell oturumunu kapatır - tam session_id ve oturumu açan kullanıcının token'ı gerekir"""
+    session = shell_sessions.get(session_id, principal.username)
+    if session is None or not shell_sessions.close(session_id):
+        raise HTTPException(status_code=404, detail="Shell session not found")
+    audit_device_action(
+        "shell.close", http_request, session.device.get("id"), session.username,
+        session_id=session.handle, bytes_in=session.bytes_in, bytes_out=session.bytes_out
+    )
+    return {"status": "closed", "session_id": session_id}
+
+@router.websocket("/shell/{session_id}/ws")
+async def shell_session_socket(websocket: WebSocket, session_id: str):
+    """
+    Shell oturumu için çift yönlü kanal
+    İstemci -> {"type": "input", "data"} | {"type": "resize", "cols", "rows"}
+    Sunucu  -> {"type": "output", "data"} | {"type": "closed", "reason"} | {"type": "error", "message"}
+    Soket kapanınca oturum açık kalır; aynı session_id ile yeniden bağlanılabilir
+    Oturumu açan PAM kullanıcısının token'ı (?token=) gerekir
+    """
+    await websocket.accept()
+    principal = resolve_principal(request_token(websocket))
+    if principal is None:
+        await websocket.send_json({"type": "error", "message": "Authentication required"})
+        await websocket.close(code=4401)
+        return
+    session = shell_sessions.get(session_id, principal.username)
+    if session is None:
+        await websocket.send_json({"type": "error", "message": "Shell session not found"})
+        await websocket.close(code=4404)
+        return
+    
+    _, client_ip = request_actor(websocket)
+    
+    def audit_shell(action: str, **meta):
+        # Token oturum boyunca bir kez doğrulandı - kullanıcı her satırda yeniden çözülmez
+        audit_log.record(
+            action, user=principal.username, device=session.device, device_username=session.username,
+            client_ip=client_ip, session_id=session.handle, **meta
+        )
+    
+    audit_shell("shell.attach")
+    queue = session.subscribe()
+    
+    async def pump_output():
+        while True:
+            message = await queue.get()
+            await websocket.send_json(message)
+            if message["type"] in ("closed", "error"):
+                return
+    
+    async def pump_input():
+        while True:
+            message = await websocket.receive_json()
+            if message.get("type") == "input":
+                data = message.get("data", "")
+                await session.write(data)
+                lines = session.take_input_lines(data)
+                for line in lines:
+                    audit_shell("shell.input", commands=[line])
+                # Shell'de (config modu dahil) girilen satırın ne değiştirdiği bilinemez
+                if lines:
+                    result_cache.invalidate_device(session.device.get("id"))
+            elif message.get("type") == "resize":
+                await session.resize(int(message.get("cols", 120)), int(message.get("rows", 40)))
+    
+    tasks = [asyncio.create_task(pump_output()), asyncio.create_task(pump_input())]
+    try:
+        done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            exc = task.exception()
+            if exc is not None and not isinstance(exc, WebSocketDisconnect):
+                logger.error(f"Shell session {session.handle} socket error: {exc}")
+    finally:
+        for task in tasks:
+            task.cancel()
+        session.unsubscribe(queue)
+        audit_shell("shell.detach", bytes_in=session.bytes_in, bytes_out=session.bytes_out)
+    
+    try:
+        await websocket.close()
+    except Exception:
+        pass
@@ -0,0 +1,46 @@
+"""
+Device Health API Router - Arka plan sağlık yoklaması önbelleğinden okur
+backend/app/routers/health.py
+"""
+
+from fastapi import APIRouter, HTTPException
+from typing import Optional
+import logging
+
+from ..utils.health_monitor import health_monitor
+from ..json_db import get_device_by_id
+
+router = APIRouter(prefix="/health", tags=["Device Health"])
+logger = logging.getLogger(__name__)
+
+@router.get("/devices")
+async def list_device_health(status: Optional[str] = None):
+    """Tüm cihazların son sağlık sonucunu döner - cihaza bağlanmaz"""
+    latest = health_monitor.latest_all()
+    if status:
+        latest = {device_id: entry for device_id, entry in latest.items() if entry["status"] == status}
+
+    summary = {"healthy": 0, "degraded": 0, "unhealthy": 0}
+    for entry in latest.values():
+        summary[entry["status"]] = summary.get(entry["status"], 0) + 1
+
+    return {
+        "devices": latest,
+        "count": len(latest),
+        "summary": summary,
+        "monitor": health_monitor.get_stats()
+    }
+
+@router.get("/devices/{device_id}")
+async def get_device_health(device_id: int, history: bool = False):
+    """Tek cihazın son sağlık sonucu - history=true ile ring buffer'ın tamamı"""
+    latest = health_monitor.latest(device_id)
+    if latest is None:
+        if get_device_by_id(device_id) is None:
+            raise HTTPException(status_code=404, detail=f"Device with ID {device_id} not found")
+        raise HTTPException(status_code=404, detail=f"No health data for device {device_id} yet")
+
+    response = {"device_id": device_id, "latest": latest}
+    if history:
+        response["history"] = health_monitor.history(device_id)
+    return response
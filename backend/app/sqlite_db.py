@@ -0,0 +1,332 @@
+"""
+SQLite Storage Backend - json_db ile aynı fonksiyon API'si
+backend/app/sqlite_db.py
+
+DATABASE_PATH .db/.sqlite/.sqlite3 ile bitiyorsa (veya DATABASE_BACKEND=sqlite)
+json_db bu modülü kullanır.
+
+db.json'dan taşıma:
+    python -m app.sqlite_db migrate app/db.json data/pam.db
+"""
+
+import json
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS devices (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    ip TEXT NOT NULL,
+    type TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_devices_ip ON devices(ip);
+CREATE INDEX IF NOT EXISTS idx_devices_type ON devices(type);
+CREATE INDEX IF NOT EXISTS idx_devices_name ON devices(name);
+
+-- Envanter sürüm sayacı (ETag için), trigger'larla O(1) güncellenir
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO meta (key, value) VALUES ('devices_revision', 0);
+CREATE TRIGGER IF NOT EXISTS devices_revision_insert AFTER INSERT ON devices
+BEGIN UPDATE meta SET value = value + 1 WHERE key = 'devices_revision'; END;
+CREATE TRIGGER IF NOT EXISTS devices_revision_update AFTER UPDATE ON devices
+BEGIN UPDATE meta SET value = value + 1 WHERE key = 'devices_revision'; END;
+CREATE TRIGGER IF NOT EXISTS devices_revision_delete AFTER DELETE ON devices
+BEGIN UPDATE meta SET value = value + 1 WHERE key = 'devices_revision'; END;
+
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY,
+    username TEXT NOT NULL UNIQUE,
+    role TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+"""
+
+class SQLiteStore:
+    """Thread başına bağlantı kullanan SQLite cihaz/kullanıcı deposu"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connection() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            # WAL: okuyucular yazarı, yazar okuyucuları bloklamaz
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+        return conn
+
+    # ===========================================
+    # SERIALIZATION
+    # ===========================================
+
+    @staticmethod
+    def _device_from_row(row: sqlite3.Row) -> Dict:
+        device = json.loads(row["data"])
+        device["id"] = row["id"]
+        return device
+
+    @staticmethod
+    def _user_from_row(row: sqlite3.Row) -> Dict:
+        user = json.loads(row["data"])
+        user["id"] = row["id"]
+        return user
+
+    @staticmethod
+    def _device_params(device: Dict):
+        payload = {k: v for k, v in device.items() if k != "id"}
+        return device.get("id"), device["name"], device["ip"], device["type"], json.dumps(payload, ensure_ascii=False)
+
+    @staticmethod
+    def _user_params(user: Dict):
+        payload = {k: v for k, v in user.items() if k != "id"}
+        return user.get("id"), user["username"], user["role"], json.dumps(payload, ensure_ascii=False)
+
+    # ===========================================
+    # DEVICES
+    # ===========================================
+
+    def get_devices(self) -> List[Dict]:
+        rows = self._connection().execute("SELECT id, data FROM devices ORDER BY id").fetchall()
+        return [self._device_from_row(r) for r in rows]
+
+    def get_device_by_id(self, device_id: int) -> Optional[Dict]:
+        row = self._connection().execute("SELECT id, data FROM devices WHERE id = ?", (device_id,)).fetchone()
+        return self._device_from_row(row) if row else None
+
+    def get_devices_by_name(self, name: str) -> List[Dict]:
+        rows = self._connection().execute("SELECT id, data FROM devices WHERE name = ? ORDER BY id", (name,)).fetchall()
+        return [self._device_from_row(r) for r in rows]
+
+    def get_devices_by_ip(self, ip: str) -> List[Dict]:
+        rows = self._connection().execute("SELECT id, data FROM devices WHERE ip = ? ORDER BY id", (ip,)).fetchall()
+        return [self._device_from_row(r) for r in rows]
+
+    def get_devices_revision(self) -> int:
+        row = self._connection().execute("SELECT value FROM meta WHERE key = 'devices_revision'").fetchone()
+        return row["value"] if row else 0
+
+    def iter_devices(
+        self,
+        after_id: int = 0,
+        device_type: Optional[str] = None,
+        name_prefix: Optional[str] = None,
+        ip: Optional[str] = None,
+        batch_size: int = 500
+    ):
+        """id sırasına göre filtrelenmiş cihazları parti parti üretir (keyset pagination)"""
+        clauses = ["id > ?"]
+        params: List = []
+        if device_type:
+            clauses.append("type = ?")
+            params.append(device_type.lower())
+        if name_prefix:
+            clauses.append("name >= ? AND name < ?")
+            params.extend([name_prefix, name_prefix + "\U0010ffff"])
+        if ip:
+            clauses.append("ip = ?")
+            params.append(ip)
+        sql = f"SELECT id, data FROM devices WHERE {' AND '.join(clauses)} ORDER BY id LIMIT ?"
+
+        last_id = after_id
+        while True:
+            rows = self._connection().execute(sql, (last_id, *params, batch_size)).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield self._device_from_row(row)
+            last_id = rows[-1]["id"]
+
+    def add_device(self, device: Dict) -> Dict:
+        with self._write_lock:
+            conn = self._connection()
+            with conn:
+                cursor = conn.execute(
+                    "INSERT INTO devices (id, name, ip, type, data) VALUES (?, ?, ?, ?, ?)",
+                    self._device_params({**device, "id": None})
+                )
+            device["id"] = cursor.lastrowid
+        return device
+
+    def add_devices(self, devices: List[Dict], skip_duplicates: bool = True) -> Tuple[List[Dict], List[Dict]]:
+        """Toplu ekleme - çakışma kontrolü ve insert tek transaction'da"""
+        with self._write_lock:
+            conn = self._connection()
+            with conn:
+                # BEGIN IMMEDIATE: kontrol ile insert arasında başka süreç yazamasın
+                conn.execute("BEGIN IMMEDIATE")
+                names = {d["name"] for d in devices}
+                ips = {d["ip"] for d in devices}
+                taken_names = self._existing_values("name", names)
+                taken_ips = self._existing_values("ip", ips)
+
+                added, duplicates, seen_names, seen_ips = [], [], set(), set()
+                for device in devices:
+                    name, ip = device["name"], device["ip"]
+                    if name in taken_names or ip in taken_ips or name in seen_names or ip in seen_ips:
+                        duplicates.append(device)
+                        continue
+                    seen_names.add(name)
+                    seen_ips.add(ip)
+                    added.append(device)
+                if duplicates and not skip_duplicates:
+                    raise ValueError(f"{len(duplicates)} devices conflict with existing ip/name")
+
+                next_id = conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM devices").fetchone()[0]
+                for offset, device in enumerate(added):
+                    device["id"] = next_id + offset
+                conn.executemany(
+                    "INSERT INTO devices (id, name, ip, type, data) VALUES (?, ?, ?, ?, ?)",
+                    (self._device_params(d) for d in added)
+                )
+        return added, duplicates
+
+    def _existing_values(self, column: str, values: set) -> set:
+        """Verilen değerlerden tabloda zaten bulunanları döner (indeksli IN sorguları)"""
+        found = set()
+        values = list(values)
+        for start in range(0, len(values), 500):
+            batch = values[start:start + 500]
+            placeholders = ",".join("?" * len(batch))
+            rows = self._connection().execute(
+                f"SELECT DISTINCT {column} FROM devices WHERE {column} IN ({placeholders})", batch
+            ).fetchall()
+            found.update(row[0] for row in rows)
+        return found
+
+    def update_device(self, device_id: int, updated_data: Dict) -> Optional[Dict]:
+        with self._write_lock:
+            conn = self._connection()
+            with conn:
+                current = self.get_device_by_id(device_id)
+                if current is None:
+                    return None
+                updated_data.pop("id", None)
+                current.update(updated_data)
+                _, name, ip, device_type, data = self._device_params(current)
+                conn.execute(
+                    "UPDATE devices SET name = ?, ip = ?, type = ?, data = ? WHERE id = ?",
+                    (name, ip, device_type, data, device_id)
+                )
+        return current
+
+    def delete_device(self, device_id: int) -> Optional[Dict]:
+        with self._write_lock:
+            conn = self._connection()
+            with conn:
+                current = self.get_device_by_id(device_id)
+                if current is None:
+                    return None
+                conn.execute("DELETE FROM devices WHERE id = ?", (device_id,))
+        return current
+
+    # ===========================================
+    # USERS
+    # ===========================================
+
+    def get_users(self) -> List[Dict]:
+        rows = self._connection().execute("SELECT id, data FROM users ORDER BY id").fetchall()
+        return [self._user_from_row(r) for r in rows]
+
+    def get_user_by_username(self, username: str) -> Optional[Dict]:
+        row = self._connection().execute("SELECT id, data FROM users WHERE username = ?", (username,)).fetchone()
+        return self._user_from_row(row) if row else None
+
+    def add_user(self, user: Dict) -> Dict:
+        with self._write_lock:
+            conn = self._connection()
+            try:
+                with conn:
+                    cursor = conn.execute(
+                        "INSERT INTO users (id, username, role, data) VALUES (?, ?, ?, ?)",
+                        self._user_params({**user, "id": None})
+                    )
+            except sqlite3.IntegrityError:
+                raise ValueError(f"Username '{user['username']}' already exists")
+            user["id"] = cursor.lastrowid
+        return user
+
+    def update_user(self, username: str, updated_data: Dict) -> Optional[Dict]:
+        with self._write_lock:
+            conn = self._connection()
+            with conn:
+                current = self.get_user_by_username(username)
+                if current is None:
+                    return None
+                current.update(updated_data)
+                user_id, _, role, data = self._user_params(current)
+                conn.execute("UPDATE users SET role = ?, data = ? WHERE id = ?", (role, data, user_id))
+        return current
+
+    # ===========================================
+    # WHOLE DATABASE
+    # ===========================================
+
+    def read_db(self) -> Dict:
+        return {"devices": self.get_devices(), "users": self.get_users()}
+
+    def write_db(self, data: Dict):
+        """Tüm içeriği tek transaction'da değiştirir"""
+        with self._write_lock:
+            conn = self._connection()
+            with conn:
+                conn.execute("DELETE FROM devices")
+                conn.execute("DELETE FROM users")
+                conn.executemany(
+                    "INSERT INTO devices (id, name, ip, type, data) VALUES (?, ?, ?, ?, ?)",
+                    (self._device_params(d) for d in data.get("devices", []))
+                )
+                conn.executemany(
+                    "INSERT INTO users (id, username, role, data) VALUES (?, ?, ?, ?)",
+                    (self._user_params(u) for u in data.get("users", []))
+                )
+
+    def checkpoint(self):
+        """SQLite WAL dosyasını ana veritabanına aktarır"""
+        self._connection().execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+
+def migrate_json_to_sqlite(json_path: Path, sqlite_path: Path) -> Dict:
+    """db.json içeriğini SQLite veritabanına taşır"""
+    with open(json_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    # Tekrarlanan ID'ler PRIMARY KEY'i bozmasın - son kayıt geçerli
+    devices = list({d.get("id"): d for d in data.get("devices", [])}.values())
+    users = list({u.get("username"): u for u in data.get("users", [])}.values())
+
+    store = SQLiteStore(sqlite_path)
+    store.write_db({"devices": devices, "users": users})
+    store.checkpoint()
+
+    logger.info(f"Migrated {len(devices)} devices and {len(users)} users from {json_path} to {sqlite_path}")
+    return {"devices": len(devices), "users": len(users)}
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 4 or sys.argv[1] != "migrate":
+        print("Usage: python -m app.sqlite_db migrate <db.json> <target.db>")
+        sys.exit(1)
+    logging.basicConfig(level=logging.INFO)
+    print(migrate_json_to_sqlite(Path(sys.argv[2]), Path(sys.argv[3])))
@@ -0,0 +1,284 @@
+"""
+Admission Control - Cihaz başına eşzamanlı SSH oturumu sınırı (VTY hattı) ve adil bekleme kuyruğu
+backend/app/utils/admission.py
+
+Her cihazın aynı anda kullanılan oturum sayısı, tipinin VTY varsayılanı veya
+cihaz kaydındaki 'max_sessions' alanı ile sınırlanır. Slot boşalmayı bekleyen
+istekler FIFO sırayla uyandırılır; bekleme süresi ADMISSION_QUEUE_TIMEOUT'u
+aşacaksa (tahmini veya gerçek) istek AdmissionRejected (429) ile reddedilir.
+"""
+
+import asyncio
+import logging
+import math
+import os
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Deque, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+ADMISSION_ENABLED = os.getenv("ADMISSION_ENABLED", "true").lower() in ("1", "true", "yes")
+# Slot bekleme üst sınırı (saniye)
+ADMISSION_QUEUE_TIMEOUT = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "15"))
+# Cihaz başına en fazla bekleyen istek
+ADMISSION_MAX_QUEUE = int(os.getenv("ADMISSION_MAX_QUEUE", "100"))
+ADMISSION_DEFAULT_SLOTS = int(os.getenv("ADMISSION_DEFAULT_SLOTS", "4"))
+
+# Cihaz tipine göre varsayılan eşzamanlı oturum sayısı - tipik VTY/MaxStartups limitlerinin altında
+DEVICE_TYPE_SLOTS = {
+    "cisco_ios": 4,
+    "cisco_asa": 4,
+    "juniper": 8,
+    "mikrotik": 8,
+    "ubuntu": 8,
+    "windows": 4
+}
+# ADMISSION_SLOTS="cisco_ios=2,mikrotik=4" ile tip varsayılanları değiştirilebilir
+for _item in filter(None, os.getenv("ADMISSION_SLOTS", "").split(",")):
+    _type, _, _slots = _item.partition("=")
+    DEVICE_TYPE_SLOTS[_type.strip().lower()] = int(_slots)
+
+# Tutma süresi tahmini için üstel ortalama katsayısı
+_EWMA_ALPHA = 0.2
+
+
+class AdmissionRejected(Exception):
+    """Cihazın slot kuyruğu dolu veya bekleme süresi aşıldı/aşılacak"""
+
+    def __init__(self, device_id: int, message: str, retry_after: float, status_code: int = 429):
+        super().__init__(message)
+        self.device_id = device_id
+        self.retry_after = retry_after
+        self.status_code = status_code
+
+    def headers(self) -> Dict[str, str]:
+        return {"Retry-After": str(max(1, math.ceil(self.retry_after)))}
+
+
+class _DeviceGate:
+    """Tek cihazın slot sayacı ve FIFO bekleme kuyruğu"""
+
+    def __init__(self, slots: int):
+        self.slots = slots
+        self.in_use = 0
+        self.waiters: Deque[asyncio.Future] = deque()
+        # Slot başına ortalama tutma süresi (saniye) - bekleme tahmininde kullanılır
+        self.hold_ewma: Optional[float] = None
+
+        self.admitted = 0
+        self.queued = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.last_wait = 0.0
+
+    def estimated_wait(self, position: int) -> float:
+        """Kuyruğun position. sırasındaki isteğin tahmini bekleme süresi"""
+        if self.hold_ewma is None:
+            return 0.0
+        return math.ceil(position / self.slots) * self.hold_ewma
+
+    def to_dict(self) -> Dict:
+        return {
+            "slots": self.slots,
+            "in_use": self.in_use,
+            "queue_depth": sum(1 for waiter in self.waiters if not waiter.done()),
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "rejected": self.rejected,
+            "timeouts": self.timeouts,
+            "avg_wait": round(self.total_wait / self.queued, 4) if self.queued else 0.0,
+            "max_wait": round(self.max_wait, 4),
+            "last_wait": round(self.last_wait, 4),
+            "avg_hold": round(self.hold_ewma, 4) if self.hold_ewma is not None else None
+        }
+
+
+class AdmissionController:
+    """device_id anahtarlı slot kapıları"""
+
+    def __init__(
+        self,
+        queue_timeout: float = ADMISSION_QUEUE_TIMEOUT,
+        max_queue: int = ADMISSION_MAX_QUEUE,
+        enabled: bool = ADMISSION_ENABLED
+    ):
+        self.queue_timeout = queue_timeout
+        self.max_queue = max_queue
+        self.enabled = enabled
+        self._gates: Dict[int, _DeviceGate] = {}
+
+    @staticmethod
+    def slots_for(device: Dict) -> int:
+        """Cihaz kaydındaki max_sessions, yoksa tip varsayılanı"""
+        override = device.get("max_sessions")
+        if override:
+            return max(1, int(override))
+        return DEVICE_TYPE_SLOTS.get((device.get("type") or "").lower(), ADMISSION_DEFAULT_SLOTS)
+
+    def _gate(self, device: Dict) -> _DeviceGate:
+        gate = self._gates.get(device["id"])
+        slots = self.slots_for(device)
+        if gate is None:
+            gate = self._gates[device["id"]] = _DeviceGate(slots)
+        elif gate.slots != slots:
+            # Envanterde max_sessions değişti - artış bekleyenleri hemen uyandırır
+            gate.slots = slots
+            while gate.in_use < gate.slots and self._hand_over(gate):
+                gate.in_use += 1
+        return gate
+
+    # ===========================================
+    # ACQUIRE / RELEASE
+    # ===========================================
+
+    async def acquire(self, device: Dict) -> float:
+        """
+        Cihaz için slot alır - gerekirse sırayla bekler
+        Returns: bekleme süresi (saniye)
+        Raises: AdmissionRejected
+        """
+        if not self.enabled:
+            return 0.0
+
+        device_id = device["id"]
+        gate = self._gate(device)
+        if gate.in_use < gate.slots and not gate.waiters:
+            gate.in_use += 1
+            gate.admitted += 1
+            return 0.0
+
+        position = len(gate.waiters) + 1
+        if position > self.max_queue:
+            gate.rejected += 1
+            raise AdmissionRejected(
+                device_id, f"Admission queue full for device {device_id} ({self.max_queue} waiting)",
+                gate.estimated_wait(position) or self.queue_timeout
+            )
+
+        estimate = gate.estimated_wait(position)
+        if estimate > self.queue_timeout:
+            # Beklese bile süre dolacak - slot tutmadan hemen reddet
+            gate.rejected += 1
+            raise AdmissionRejected(
+                device_id,
+                f"Device {device_id} is busy: estimated wait {estimate:.1f}s exceeds {self.queue_timeout:.0f}s "
+                f"({gate.in_use}/{gate.slots} sessions in use, {position - 1} queued)",
+                estimate
+            )
+
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        gate.waiters.append(waiter)
+        gate.queued += 1
+        start = time.monotonic()
+        timer = loop.call_later(self.queue_timeout, self._expire, gate, device_id, waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            # İstemci vazgeçti - slot zaten devredildiyse sıradakine aktar
+            if waiter.done() and not waiter.cancelled():
+                self._release_gate(gate)
+            elif waiter in gate.waiters:
+                gate.waiters.remove(waiter)
+            raise
+        finally:
+            timer.cancel()
+
+        waited = time.monotonic() - start
+        gate.admitted += 1
+        gate.total_wait += waited
+        gate.max_wait = max(gate.max_wait, waited)
+        gate.last_wait = waited
+        return waited
+
+    def release(self, device_id: int, held: Optional[float] = None):
+        """Slotu bırakır; held (saniye) verilirse tutma süresi tahmini güncellenir"""
+        if not self.enabled:
+            return
+        gate = self._gates.get(device_id)
+        if gate is None:
+            return
+        if held is not None:
+            gate.hold_ewma = held if gate.hold_ewma is None else (
+                _EWMA_ALPHA * held + (1 - _EWMA_ALPHA) * gate.hold_ewma
+            )
+        self._release_gate(gate)
+
+    @asynccontextmanager
+    async def slot(self, device: Dict):
+        """Havuz dışı kullanım için slot context manager'ı - bekleme süresini verir"""
+        waited = await self.acquire(device)
+        start = time.monotonic()
+        try:
+            yield waited
+        finally:
+            self.release(device["id"], time.monotonic() - start)
+
+    def _release_gate(self, gate: _DeviceGate):
+        # Slot doğrudan sıradaki bekleyene devredilir - araya yeni gelen istek giremez (FIFO)
+        if gate.in_use > gate.slots or not self._hand_over(gate):
+            gate.in_use = max(0, gate.in_use - 1)
+
+    @staticmethod
+    def _hand_over(gate: _DeviceGate) -> bool:
+        while gate.waiters:
+            waiter = gate.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return True
+        return False
+
+    def _expire(self, gate: _DeviceGate, device_id: int, waiter: asyncio.Future):
+        if waiter.done():
+            return
+        try:
+            gate.waiters.remove(waiter)
+        except ValueError:
+            pass
+        gate.timeouts += 1
+        gate.rejected += 1
+        waiter.set_exception(AdmissionRejected(
+            device_id,
+            f"Timed out after {self.queue_timeout:.0f}s waiting for a session slot on device {device_id} "
+            f"({gate.in_use}/{gate.slots} in use)",
+            gate.estimated_wait(len(gate.waiters) + 1) or self.queue_timeout
+        ))
+
+    # ===========================================
+    # STATS
+    # ===========================================
+
+    def get_device_stats(self, device_id: int) -> Optional[Dict]:
+        gate = self._gates.get(device_id)
+        return gate.to_dict() if gate is not None else None
+
+    def get_stats(self) -> Dict:
+        gates = list(self._gates.values())
+        return {
+            "enabled": self.enabled,
+            "queue_timeout": self.queue_timeout,
+            "max_queue": self.max_queue,
+            "devices": len(gates),
+            "in_use": sum(g.in_use for g in gates),
+            "queue_depth": sum(sum(1 for w in g.waiters if not w.done()) for g in gates),
+            "admitted": sum(g.admitted for g in gates),
+            "queued": sum(g.queued for g in gates),
+            "rejected": sum(g.rejected for g in gates),
+            "timeouts": sum(g.timeouts for g in gates),
+            "type_slots": dict(DEVICE_TYPE_SLOTS)
+        }
+
+    def get_all_device_stats(self, busy_only: bool = False) -> Dict[int, Dict]:
+        return {
+            device_id: gate.to_dict()
+            for device_id, gate in self._gates.items()
+            if not busy_only or gate.in_use or gate.waiters
+        }
+
+
+# Global instance
+admission = AdmissionController()
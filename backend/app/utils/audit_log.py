@@ -0,0 +1,578 @@
+"""
+Audit Log - Cihaz işlemleri ve girişler için sunucu tarafı, yalnızca eklenen denetim kaydı
+backend/app/utils/audit_log.py
+
+record() istek yolunda yalnızca bellekteki kuyruğa ekler; arka plan görevi
+kuyruğu toplu olarak (AUDIT_BATCH_SIZE / AUDIT_FLUSH_INTERVAL) tek yazıcı
+thread'inde saatlik (UTC) JSONL segment dosyalarına yazar. Segmentler
+yeniden yazılmaz; saat değişince kapanır ve indeksi diske yazılır.
+
+Sorgular iki seviyeli indeks kullanır:
+- manifest.jsonl: kapanmış her segmentin zaman aralığı ve içerdiği
+  kullanıcı/cihaz/aksiyon kümeleri - filtreye uymayan segment hiç açılmaz
+- <segment>.idx.json: satır ofsetleri, zaman damgaları ve
+  kullanıcı/cihaz/aksiyon posting listeleri (satır sıra numaraları)
+"""
+
+import asyncio
+import base64
+import binascii
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+AUDIT_ENABLED = os.getenv("AUDIT_ENABLED", "true").lower() in ("1", "true", "yes")
+AUDIT_LOG_DIR = Path(os.getenv(
+    "AUDIT_LOG_DIR", str(Path(__file__).resolve().parent.parent.parent / "data" / "audit")
+))
+AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "500"))
+AUDIT_FLUSH_INTERVAL = float(os.getenv("AUDIT_FLUSH_INTERVAL", "0.5"))
+# Yazılmayı bekleyen en fazla kayıt - aşılırsa kayıt düşürülür ve 'dropped' sayacı artar
+AUDIT_MAX_PENDING = int(os.getenv("AUDIT_MAX_PENDING", "100000"))
+AUDIT_FSYNC = os.getenv("AUDIT_FSYNC", "false").lower() in ("1", "true", "yes")
+# Bellekte tutulan kapanmış segment indeksi sayısı
+AUDIT_INDEX_CACHE = int(os.getenv("AUDIT_INDEX_CACHE", "64"))
+AUDIT_MAX_PAGE = 500
+
+SEGMENT_PREFIX = "audit-"
+MANIFEST_NAME = "manifest.jsonl"
+
+
+def segment_name(ts: float) -> str:
+    """Kaydın ait olduğu saatlik segment - isim sırası zaman sırasıdır"""
+    return SEGMENT_PREFIX + time.strftime("%Y%m%d%H", time.gmtime(ts))
+
+
+def encode_cursor(segment: str, ordinal: int) -> str:
+    return base64.urlsafe_b64encode(f"{segment}:{ordinal}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        segment, ordinal = raw.rsplit(":", 1)
+        if not segment.startswith(SEGMENT_PREFIX):
+            raise ValueError(segment)
+        return segment, int(ordinal)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("Invalid cursor")
+
+
+class _SegmentIndex:
+    """Tek segmentin satır ofsetleri, zaman damgaları ve posting listeleri"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.offsets: List[int] = []
+        self.ts: List[float] = []
+        self.users: Dict[str, List[int]] = {}
+        self.devices: Dict[str, List[int]] = {}
+        self.actions: Dict[str, List[int]] = {}
+        self.size = 0
+
+    @property
+    def count(self) -> int:
+        # Yazıcı thread'i offsets'e ts'den önce ekler - okuyucu yalnızca ikisinde de olan satırları görür
+        return min(len(self.offsets), len(self.ts))
+
+    def add(self, offset: int, entry: Dict):
+        ordinal = len(self.offsets)
+        self.offsets.append(offset)
+        self.ts.append(entry["ts"])
+        for user in _entry_users(entry):
+            self.users.setdefault(user, []).append(ordinal)
+        if entry.get("device_id") is not None:
+            self.devices.setdefault(str(entry["device_id"]), []).append(ordinal)
+        self.actions.setdefault(entry["action"], []).append(ordinal)
+
+    def summary(self) -> Dict:
+        return {
+            "segment": self.name,
+            "count": self.count,
+            "size": self.size,
+            "min_ts": self.ts[0] if self.ts else None,
+            "max_ts": self.ts[-1] if self.ts else None,
+            "users": sorted(self.users),
+            "devices": sorted(self.devices),
+            "actions": sorted(self.actions)
+        }
+
+    def to_dict(self) -> Dict:
+        return {
+            "segment": self.name, "size": self.size, "offsets": self.offsets, "ts": self.ts,
+            "users": self.users, "devices": self.devices, "actions": self.actions
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "_SegmentIndex":
+        index = cls(data["segment"])
+        index.size = data["size"]
+        index.offsets = data["offsets"]
+        index.ts = data["ts"]
+        index.users = data["users"]
+        index.devices = data["devices"]
+        index.actions = data["actions"]
+        return index
+
+    @classmethod
+    def build(cls, name: str, path: Path) -> "_SegmentIndex":
+        """Segment dosyasını tarayarak indeksi yeniden kurar - bozuk/yarım satırlar atlanır"""
+        index = cls(name)
+        offset = 0
+        with open(path, "rb") as f:
+            for line in f:
+                if line.endswith(b"\n"):
+                    try:
+                        index.add(offset, json.loads(line))
+                    except (ValueError, KeyError):
+                        logger.warning(f"Skipping unreadable audit record in {path.name} at byte {offset}")
+                offset += len(line)
+        index.size = offset
+        return index
+
+
+def _entry_users(entry: Dict) -> Iterable[str]:
+    """Kullanıcı filtresi hem PAM kullanıcısını hem cihazda kullanılan hesabı eşler"""
+    users = {entry.get("user"), entry.get("device_username")}
+    users.discard(None)
+    return users
+
+
+class AuditLog:
+    """Toplu yazan, zaman bölümlü, yalnızca eklenen denetim kaydı"""
+
+    def __init__(
+        self,
+        directory: Path = AUDIT_LOG_DIR,
+        batch_size: int = AUDIT_BATCH_SIZE,
+        flush_interval: float = AUDIT_FLUSH_INTERVAL,
+        max_pending: int = AUDIT_MAX_PENDING,
+        fsync: bool = AUDIT_FSYNC,
+        index_cache: int = AUDIT_INDEX_CACHE,
+        enabled: bool = AUDIT_ENABLED
+    ):
+        self.directory = Path(directory)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.fsync = fsync
+        self.index_cache = index_cache
+        self.enabled = enabled
+
+        self._pending: List[Dict] = []
+        self._wake: Optional[asyncio.Event] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        # Tek yazıcı thread'i - segment dosyalarına yazım sırası korunur
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="audit-writer")
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._loaded = False
+
+        # Kapanmış segmentler: isim -> manifest özeti (kümeler set olarak)
+        self._sealed: Dict[str, Dict] = {}
+        self._indexes: "OrderedDict[str, _SegmentIndex]" = OrderedDict()
+        self._active: Optional[_SegmentIndex] = None
+
+        self.stats = {
+            "recorded": 0,
+            "written": 0,
+            "dropped": 0,
+            "batches": 0,
+            "write_errors": 0,
+            "segments_sealed": 0,
+            "queries": 0,
+            "index_loads": 0
+        }
+        self._last_batch_ms = 0.0
+
+    # ===========================================
+    # RECORD
+    # ===========================================
+
+    def record(
+        self,
+        action: str,
+        status: str = "success",
+        user: Optional[str] = None,
+        device: Optional[Dict] = None,
+        device_id: Optional[int] = None,
+        device_username: Optional[str] = None,
+        commands: Optional[List[str]] = None,
+        detail: Optional[str] = None,
+        client_ip: Optional[str] = None,
+        duration: Optional[float] = None,
+        **meta
+    ):
+        """Kaydı yazma kuyruğuna ekler - I/O yapmaz, istek yolunda çağrılabilir"""
+        if not self.enabled:
+            return
+        if len(self._pending) >= self.max_pending:
+            self.stats["dropped"] += 1
+            if self.stats["dropped"] == 1 or self.stats["dropped"] % 1000 == 0:
+                logger.error(f"Audit queue full ({self.max_pending}); {self.stats['dropped']} records dropped")
+            return
+
+        now = time.time()
+        entry = {
+            "ts": now,
+            "timestamp": datetime.fromtimestamp(now).isoformat(),
+            "action": action,
+            "status": status,
+            "user": user,
+            "device_username": device_username,
+            "device_id": device["id"] if device else device_id,
+            "device_name": device.get("name") if device else None,
+            "device_ip": device.get("ip") if device else None,
+            "commands": commands,
+            "detail": detail,
+            "client_ip": client_ip,
+            "duration_ms": round(duration * 1000, 2) if duration is not None else None
+        }
+        if meta:
+            entry["meta"] = meta
+        self._pending.append(entry)
+        self.stats["recorded"] += 1
+        if self._wake is not None and len(self._pending) >= self.batch_size:
+            self._wake.set()
+
+    # ===========================================
+    # WRITER
+    # ===========================================
+
+    def start(self):
+        """Segmentleri yükler ve arka plan yazıcısını başlatır"""
+        if not self.enabled:
+            return
+        self.load()
+        if self._writer_task is None or self._writer_task.done():
+            self._wake = asyncio.Event()
+            self._writer_task = asyncio.create_task(self._writer_loop())
+
+    async def stop(self):
+        """Yazıcıyı durdurur ve kuyrukta kalanları yazar"""
+        if self._writer_task is not None:
+            self._writer_task.cancel()
+            try:
+                await self._writer_task
+            except asyncio.CancelledError:
+                pass
+            self._writer_task = None
+        await self._flush_async()
+        self._wake = None
+
+    def flush(self):
+        """Kuyruğu senkron yazar (yazıcı çalışmıyorken / benchmark)"""
+        self.load()
+        batch, self._pending = self._pending, []
+        if batch:
+            self._executor.submit(self._write, batch).result()
+
+    async def _flush_async(self):
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        try:
+            await asyncio.get_running_loop().run_in_executor(self._executor, self._write, batch)
+        except Exception as e:
+            # Kayıt kaybolmasın - sonraki turda tekrar denenir
+            self.stats["write_errors"] += 1
+            self._pending[:0] = batch
+            logger.error(f"Audit write failed, {len(batch)} records kept for retry: {e}")
+
+    async def _writer_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self._flush_async()
+
+    def _write(self, batch: List[Dict]):
+        """Yazıcı thread'i: kayıtları segmentlerine göre gruplayıp tek write ile ekler"""
+        start = time.perf_counter()
+        groups: Dict[str, List[Dict]] = {}
+        for entry in batch:
+            groups.setdefault(segment_name(entry["ts"]), []).append(entry)
+
+        for name in sorted(groups):
+            index = self._activate(name)
+            lines = [json.dumps(entry, ensure_ascii=False, separators=(",", ":")).encode() + b"\n"
+                     for entry in groups[name]]
+            with open(self._segment_path(name), "ab") as f:
+                f.write(b"".join(lines))
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+            offset = index.size
+            for line, entry in zip(lines, groups[name]):
+                index.add(offset, entry)
+                offset += len(line)
+            index.size = offset
+
+        self.stats["written"] += len(batch)
+        self.stats["batches"] += 1
+        self._last_batch_ms = (time.perf_counter() - start) * 1000
+
+    def _activate(self, name: str) -> _SegmentIndex:
+        active = self._active
+        if active is not None and name <= active.name:
+            # Saat geri kaydıysa (NTP) kayıt aktif segmente eklenir
+            return active
+        while name in self._sealed:
+            # Kapanmış segmente eklenmez - aynı saat için sıralamayı bozmayan yeni bir segment açılır
+            name += "-1"
+        if active is not None:
+            self._seal(active)
+
+        path = self._segment_path(name)
+        index = _SegmentIndex.build(name, path) if path.exists() else _SegmentIndex(name)
+        with self._lock:
+            self._active = index
+        return index
+
+    def _seal(self, index: _SegmentIndex):
+        """Segmenti kapatır: indeksini ve manifest satırını yazar"""
+        tmp = self._index_path(index.name).with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(index.to_dict(), f, separators=(",", ":"))
+        os.replace(tmp, self._index_path(index.name))
+
+        summary = index.summary()
+        with open(self.directory / MANIFEST_NAME, "a", encoding="utf-8") as f:
+            f.write(json.dumps(summary, separators=(",", ":")) + "\n")
+        with self._lock:
+            self._sealed[index.name] = _summary_sets(summary)
+            self._cache_index(index)
+            if self._active is index:
+                self._active = None
+        self.stats["segments_sealed"] += 1
+        logger.info(f"Sealed audit segment {index.name} ({summary['count']} records)")
+
+    # ===========================================
+    # LOAD / RECOVERY
+    # ===========================================
+
+    def load(self):
+        """Manifest'i okur; manifest'te olmayan segmentleri tarayıp kapatır veya aktif yapar"""
+        with self._load_lock:
+            if not self._loaded:
+                self._load()
+
+    def _load(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        manifest = self.directory / MANIFEST_NAME
+        if manifest.exists():
+            with open(manifest, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        summary = json.loads(line)
+                    except ValueError:
+                        continue
+                    self._sealed[summary["segment"]] = _summary_sets(summary)
+
+        current = segment_name(time.time())
+        for path in sorted(self.directory.glob(f"{SEGMENT_PREFIX}*.jsonl")):
+            name = path.name[:-len(".jsonl")]
+            if name in self._sealed:
+                continue
+            _terminate_partial_line(path)
+            index = _SegmentIndex.build(name, path)
+            if name < current:
+                self._seal(index)
+            else:
+                self._active = index
+        self._loaded = True
+        logger.info(f"Audit log loaded: {len(self._sealed)} sealed segments in {self.directory}")
+
+    def _segment_path(self, name: str) -> Path:
+        return self.directory / f"{name}.jsonl"
+
+    def _index_path(self, name: str) -> Path:
+        return self.directory / f"{name}.idx.json"
+
+    def _cache_index(self, index: _SegmentIndex):
+        self._indexes[index.name] = index
+        self._indexes.move_to_end(index.name)
+        while len(self._indexes) > self.index_cache:
+            self._indexes.popitem(last=False)
+
+    def _sealed_index(self, name: str) -> _SegmentIndex:
+        with self._lock:
+            index = self._indexes.get(name)
+            if index is not None:
+                self._indexes.move_to_end(name)
+                return index
+        path = self._index_path(name)
+        if path.exists():
+            with open(path, encoding="utf-8") as f:
+                index = _SegmentIndex.from_dict(json.load(f))
+        else:
+            index = _SegmentIndex.build(name, self._segment_path(name))
+        self.stats["index_loads"] += 1
+        with self._lock:
+            self._cache_index(index)
+        return index
+
+    # ===========================================
+    # QUERY
+    # ===========================================
+
+    def query(
+        self,
+        user: Optional[str] = None,
+        device_id: Optional[int] = None,
+        action: Optional[str] = None,
+        status: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Dict:
+        """
+        Yeniden eskiye filtreli sayfa döner
+        Returns: {entries, next_cursor, has_more, scanned_segments}
+        Raises: ValueError - geçersiz cursor
+        """
+        self.load()
+        self.stats["queries"] += 1
+        limit = max(1, min(limit, AUDIT_MAX_PAGE))
+        cursor_segment, cursor_ordinal = decode_cursor(cursor) if cursor else (None, None)
+        device_key = str(device_id) if device_id is not None else None
+
+        with self._lock:
+            active = self._active
+            segments: List[Tuple[str, Optional[Dict]]] = [(name, s) for name, s in self._sealed.items()]
+        if active is not None:
+            segments.append((active.name, None))
+        segments.sort(key=lambda item: item[0], reverse=True)
+
+        entries: List[Dict] = []
+        scanned = 0
+        for name, summary in segments:
+            if cursor_segment is not None and name > cursor_segment:
+                continue
+            if summary is not None:
+                if since is not None and summary["max_ts"] is not None and summary["max_ts"] < since:
+                    continue
+                if until is not None and summary["min_ts"] is not None and summary["min_ts"] > until:
+                    continue
+                if (user and user not in summary["users"]) or \
+                        (device_key and device_key not in summary["devices"]) or \
+                        (action and action not in summary["actions"]):
+                    continue
+                index = self._sealed_index(name)
+            else:
+                index = active
+
+            scanned += 1
+            count = index.count
+            lo = bisect_left(index.ts, since, 0, count) if since is not None else 0
+            hi = bisect_right(index.ts, until, 0, count) if until is not None else count
+            if name == cursor_segment:
+                hi = min(hi, cursor_ordinal)
+            if lo >= hi:
+                continue
+
+            with open(self._segment_path(name), "rb") as f:
+                for ordinal in _candidates(index, user, device_key, action, lo, hi):
+                    f.seek(index.offsets[ordinal])
+                    entry = json.loads(f.readline())
+                    if status and entry.get("status") != status:
+                        continue
+                    if len(entries) == limit:
+                        last = entries[-1]["id"].rsplit(":", 1)
+                        return {
+                            "entries": entries,
+                            "next_cursor": encode_cursor(last[0], int(last[1])),
+                            "has_more": True,
+                            "scanned_segments": scanned
+                        }
+                    entry["id"] = f"{name}:{ordinal}"
+                    entries.append(entry)
+
+        return {"entries": entries, "next_cursor": None, "has_more": False, "scanned_segments": scanned}
+
+    # ===========================================
+    # STATS
+    # ===========================================
+
+    @property
+    def pending(self) -> int:
+        """Yazıcı thread'ini bekleyen kayıt sayısı - segment taramaz, metrik toplamada ucuzdur"""
+        return len(self._pending)
+
+    def get_stats(self) -> Dict:
+        self.load()
+        with self._lock:
+            sealed = list(self._sealed.values())
+            active = self._active
+        return {
+            **self.stats,
+            "enabled": self.enabled,
+            "pending": self.pending,
+            "directory": str(self.directory),
+            "segments": len(sealed) + (1 if active is not None else 0),
+            "active_segment": active.name if active is not None else None,
+            "total_records": sum(s["count"] for s in sealed) + (active.count if active is not None else 0),
+            "total_bytes": sum(s["size"] for s in sealed) + (active.size if active is not None else 0),
+            "cached_indexes": len(self._indexes),
+            "last_batch_ms": round(self._last_batch_ms, 3)
+        }
+
+
+def _summary_sets(summary: Dict) -> Dict:
+    return {
+        **summary,
+        "users": set(summary["users"]),
+        "devices": set(summary["devices"]),
+        "actions": set(summary["actions"])
+    }
+
+
+def _terminate_partial_line(path: Path):
+    """Çökme sonrası yarım kalan son satırı kapatır - sonraki ekleme onunla birleşmesin"""
+    with open(path, "rb+") as f:
+        f.seek(0, os.SEEK_END)
+        if f.tell() == 0:
+            return
+        f.seek(-1, os.SEEK_END)
+        if f.read(1) != b"\n":
+            f.write(b"\n")
+
+
+def _candidates(index: _SegmentIndex, user: Optional[str], device_key: Optional[str],
+                action: Optional[str], lo: int, hi: int) -> Iterable[int]:
+    """[lo, hi) aralığındaki eşleşen satır sıra numaraları - yeniden eskiye"""
+    postings = []
+    for mapping, key in ((index.users, user), (index.devices, device_key), (index.actions, action)):
+        if key:
+            ordinals = mapping.get(key)
+            if not ordinals:
+                return ()
+            postings.append(ordinals)
+    if not postings:
+        return range(hi - 1, lo - 1, -1)
+
+    postings.sort(key=len)
+    smallest = postings[0]
+    window = smallest[bisect_left(smallest, lo):bisect_left(smallest, hi)]
+    if len(postings) == 1:
+        return reversed(window)
+    others = [set(p[bisect_left(p, lo):bisect_left(p, hi)]) for p in postings[1:]]
+    return (ordinal for ordinal in reversed(window) if all(ordinal in other for other in others))
+
+
+# Global instance
+audit_log = AuditLog()
@@ -0,0 +1,195 @@
+"""
+Auth Cache - Doğrulanmış JWT'lerin ve kullanıcı/yetki kayıtlarının önbelleği
+backend/app/utils/auth_cache.py
+
+Token'lar SHA-256 özetiyle saklanır ve 'exp' anında düşer; imza doğrulaması
+token başına bir kez yapılır. Kullanıcılar yetkileri frozenset'e çevrilmiş
+değişmez kayıtlar olarak tutulur ve güncellemede geçersiz kılınır.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, FrozenSet, Optional
+
+logger = logging.getLogger(__name__)
+
+AUTH_TOKEN_CACHE_SIZE = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "10000"))
+# Kullanıcı kaydı en fazla bu kadar saniye önbellekte kalır - dış kaynaktan (db) yapılan değişiklikler için
+AUTH_USER_CACHE_TTL = float(os.getenv("AUTH_USER_CACHE_TTL", "60"))
+
+
+@dataclass(frozen=True)
+class CachedUser:
+    """Kullanıcının değişmez görünümü - yetkiler O(1) üyelik kontrolü için frozenset"""
+    username: str
+    user: Dict = field(compare=False)
+    permissions: FrozenSet[str]
+    is_active: bool
+    expires_at: float
+
+    def allows(self, permission: str) -> bool:
+        return self.is_active and ("all" in self.permissions or permission in self.permissions)
+
+    def to_dict(self) -> Dict:
+        # Çağıran değiştirebilir - önbellekteki kayıt etkilenmesin
+        return dict(self.user)
+
+
+@dataclass(frozen=True)
+class CachedToken:
+    username: str
+    session_id: Optional[str]
+    issued_at: float
+    expires_at: float
+
+
+def token_key(token: str) -> bytes:
+    """Token'ın kendisi değil özeti saklanır"""
+    return hashlib.sha256(token.encode("utf-8")).digest()
+
+
+class AuthCache:
+    """Sınırlı (LRU) token doğrulama önbelleği ve kullanıcı kayıt önbelleği"""
+
+    def __init__(self, max_tokens: int = AUTH_TOKEN_CACHE_SIZE, user_ttl: float = AUTH_USER_CACHE_TTL):
+        self.max_tokens = max_tokens
+        self.user_ttl = user_ttl
+        self._tokens: "OrderedDict[bytes, CachedToken]" = OrderedDict()
+        self._users: Dict[str, CachedUser] = {}
+        # username -> bu zamandan (epoch) önce üretilmiş token'lar geçersiz (şifre değişimi)
+        self._not_before: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+        self.stats = {
+            "token_hits": 0,
+            "token_misses": 0,
+            "token_expirations": 0,
+            "token_evictions": 0,
+            "user_hits": 0,
+            "user_misses": 0,
+            "invalidations": 0
+        }
+
+    # ===========================================
+    # TOKENS
+    # ===========================================
+
+    def get_token(self, token: str) -> Optional[CachedToken]:
+        """Daha önce doğrulanmış ve süresi dolmamış token kaydını döner"""
+        key = token_key(token)
+        with self._lock:
+            entry = self._tokens.get(key)
+            if entry is None:
+                self.stats["token_misses"] += 1
+                return None
+            if time.time() >= entry.expires_at:
+                del self._tokens[key]
+                self.stats["token_expirations"] += 1
+                self.stats["token_misses"] += 1
+                return None
+            self._tokens.move_to_end(key)
+            self.stats["token_hits"] += 1
+            return entry
+
+    def put_token(self, token: str, payload: Dict) -> CachedToken:
+        """jwt.decode ile doğrulanmış payload'ı saklar - exp olmayan token saklanmaz"""
+        entry = CachedToken(
+            username=payload["sub"],
+            session_id=payload.get("jti"),
+            issued_at=float(payload.get("iat", 0)),
+            expires_at=float(payload.get("exp", 0))
+        )
+        if entry.expires_at <= time.time():
+            return entry
+        key = token_key(token)
+        with self._lock:
+            self._tokens[key] = entry
+            self._tokens.move_to_end(key)
+            while len(self._tokens) > self.max_tokens:
+                self._tokens.popitem(last=False)
+                self.stats["token_evictions"] += 1
+        return entry
+
+    def is_token_current(self, entry: CachedToken) -> bool:
+        """Şifre değişiminden önce üretilmiş token'lar reddedilir"""
+        not_before = self._not_before.get(entry.username)
+        return not_before is None or entry.issued_at >= not_before
+
+    # ===========================================
+    # USERS
+    # ===========================================
+
+    def get_user(self, username: str, loader: Callable[[str], Optional[Dict]]) -> Optional[CachedUser]:
+        """Kullanıcı kaydını önbellekten, yoksa loader ile yükleyip döner"""
+        entry = self._users.get(username)
+        now = time.monotonic()
+        if entry is not None and now < entry.expires_at:
+            self.stats["user_hits"] += 1
+            return entry
+
+        self.stats["user_misses"] += 1
+        user = loader(username)
+        if user is None:
+            self._users.pop(username, None)
+            return None
+        entry = CachedUser(
+            username=username,
+            user=dict(user),
+            permissions=frozenset(user.get("permissions") or ()),
+            is_active=bool(user.get("is_active", False)),
+            expires_at=now + self.user_ttl
+        )
+        self._users[username] = entry
+        return entry
+
+    # ===========================================
+    # INVALIDATION
+    # ===========================================
+
+    def invalidate_user(self, username: str):
+        """Kullanıcı kaydı bir sonraki istekte yeniden yüklenir (profil/yetki/rol güncellemesi)"""
+        if self._users.pop(username, None) is not None:
+            self.stats["invalidations"] += 1
+
+    def revoke_user_tokens(self, username: str):
+        """Kullanıcının şu ana kadar üretilmiş tüm token'larını geçersiz kılar (şifre değişimi)"""
+        # iat saniye çözünürlüklü - aynı saniyede üretilen yeni token kabul edilsin
+        self._not_before[username] = float(int(time.time()))
+        self._drop_tokens(lambda entry: entry.username == username)
+        self.invalidate_user(username)
+
+    def invalidate_session(self, session_id: str):
+        """Oturuma ait önbellekteki token'ları düşürür - sonraki istek yeniden doğrulanır"""
+        self._drop_tokens(lambda entry: entry.session_id == session_id)
+
+    def _drop_tokens(self, predicate: Callable[[CachedToken], bool]):
+        with self._lock:
+            keys = [key for key, entry in self._tokens.items() if predicate(entry)]
+            for key in keys:
+                del self._tokens[key]
+        self.stats["invalidations"] += len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._tokens.clear()
+        self._users.clear()
+
+    def get_stats(self) -> Dict:
+        lookups = self.stats["token_hits"] + self.stats["token_misses"]
+        return {
+            **self.stats,
+            "token_hit_rate": round(self.stats["token_hits"] / lookups, 4) if lookups else 0.0,
+            "tokens_cached": len(self._tokens),
+            "users_cached": len(self._users),
+            "max_tokens": self.max_tokens,
+            "user_ttl": self.user_ttl
+        }
+
+
+# Global instance
+auth_cache = AuthCache()
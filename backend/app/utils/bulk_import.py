@@ -0,0 +1,211 @@
+"""
+Bulk Import - CSV / NDJSON cihaz listelerinin akış halinde ayrıştırılması
+backend/app/utils/bulk_import.py
+
+Gövde parça parça okunur; bellekte yalnızca doğrulanmış satırlar tutulur.
+Yazma işlemi json_db.add_devices ile tek seferde yapılır.
+"""
+
+import codecs
+import csv
+import io
+import json
+import logging
+import os
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+BULK_IMPORT_MAX_ROWS = int(os.getenv("BULK_IMPORT_MAX_ROWS", "100000"))
+# Tek satır (veya çok satırlı CSV kaydı) için üst sınır - satır sonu olmayan gövdeye karşı
+BULK_IMPORT_MAX_LINE_BYTES = int(os.getenv("BULK_IMPORT_MAX_LINE_BYTES", str(64 * 1024)))
+# Yanıtta dönen en fazla hata/tekrar kaydı - sayılar her zaman tam döner
+BULK_IMPORT_MAX_REPORTED = int(os.getenv("BULK_IMPORT_MAX_REPORTED", "100"))
+
+SUPPORTED_FORMATS = ("csv", "ndjson")
+EXPORT_COLUMNS = ["id", "name", "ip", "type", "vault_path"]
+
+_CONTENT_TYPES = {
+    "text/csv": "csv",
+    "application/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+    "application/json": "ndjson",
+}
+
+
+class BulkImportError(Exception):
+    """Gövde bütünüyle reddedildiğinde (satır limiti, bozuk kodlama vb.)"""
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def detect_format(explicit: Optional[str], content_type: Optional[str]) -> str:
+    """Query parametresi öncelikli; yoksa Content-Type'tan format belirler"""
+    if explicit:
+        fmt = explicit.lower()
+        if fmt == "jsonl":
+            fmt = "ndjson"
+        if fmt not in SUPPORTED_FORMATS:
+            raise BulkImportError(f"Unsupported format '{explicit}' (expected csv or ndjson)", 415)
+        return fmt
+    media_type = (content_type or "").split(";", 1)[0].strip().lower()
+    if media_type in _CONTENT_TYPES:
+        return _CONTENT_TYPES[media_type]
+    raise BulkImportError("Cannot detect format - pass ?format=csv|ndjson or a matching Content-Type", 415)
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, str]]:
+    """Byte parçalarını (satır_no, satır) olarak üretir - UTF-8 artımlı çözülür, BOM atılır"""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="strict")
+    pending = ""
+    line_no = 0
+    try:
+        async for chunk in chunks:
+            pending += decoder.decode(chunk)
+            lines = pending.split("\n")
+            pending = lines.pop()
+            if len(pending) > BULK_IMPORT_MAX_LINE_BYTES:
+                raise BulkImportError(f"Line {line_no + len(lines) + 1} exceeds {BULK_IMPORT_MAX_LINE_BYTES} bytes")
+            for line in lines:
+                line_no += 1
+                yield line_no, line.rstrip("\r")
+        pending += decoder.decode(b"", final=True)
+    except UnicodeDecodeError as e:
+        raise BulkImportError(f"Body is not valid UTF-8 near line {line_no + 1}: {e.reason}")
+    if pending:
+        yield line_no + 1, pending.rstrip("\r")
+
+
+async def iter_csv_records(lines: AsyncIterator[Tuple[int, str]]) -> AsyncIterator[Tuple[int, Optional[Dict], Optional[str]]]:
+    """
+    İlk kayıt başlık satırıdır; tırnak içindeki satır sonları birleştirilir
+    Yields: (line_no, record | None, error | None)
+    """
+    header: Optional[List[str]] = None
+    buffer: List[str] = []
+    start_line = 0
+
+    async for line_no, line in lines:
+        if not buffer:
+            start_line = line_no
+            if not line.strip():
+                continue
+        buffer.append(line)
+        text = "\n".join(buffer)
+        # Tek sayıda tırnak - kayıt bir sonraki satırda devam ediyor
+        if text.count('"') % 2:
+            if len(text) > BULK_IMPORT_MAX_LINE_BYTES:
+                raise BulkImportError(f"Unterminated quoted field starting at line {start_line}")
+            continue
+        buffer = []
+
+        try:
+            values = next(csv.reader(io.StringIO(text)))
+        except (csv.Error, StopIteration) as e:
+            yield start_line, None, f"Malformed CSV: {e}"
+            continue
+
+        if header is None:
+            header = [column.strip().lower() for column in values]
+            if "name" not in header or "ip" not in header or "type" not in header:
+                raise BulkImportError("CSV header must contain name, ip and type columns")
+            continue
+
+        if len(values) > len(header):
+            yield start_line, None, f"Expected {len(header)} columns, got {len(values)}"
+            continue
+        # Boş hücre - alan verilmemiş sayılır (opsiyonel alanlar None kalır)
+        record = {column: value.strip() for column, value in zip(header, values) if column and value.strip()}
+        yield start_line, record, None
+
+    if buffer:
+        yield start_line, None, "Unterminated quoted field at end of input"
+    if header is None:
+        raise BulkImportError("CSV body is empty")
+
+
+async def iter_ndjson_records(lines: AsyncIterator[Tuple[int, str]]) -> AsyncIterator[Tuple[int, Optional[Dict], Optional[str]]]:
+    """Her boş olmayan satır bir JSON nesnesidir"""
+    async for line_no, line in lines:
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_no, None, f"Invalid JSON: {e.msg}"
+            continue
+        if not isinstance(record, dict):
+            yield line_no, None, "Expected a JSON object"
+            continue
+        yield line_no, record, None
+
+
+async def parse_devices(
+    chunks: AsyncIterator[bytes],
+    fmt: str,
+    validate: Callable[[Dict], Dict],
+    max_rows: int = BULK_IMPORT_MAX_ROWS
+) -> Tuple[List[Dict], List[int], List[Dict], int]:
+    """
+    Gövdeyi ayrıştırıp her kaydı validate ile doğrular (örn. Device(**r).dict())
+    Returns: (devices, line_numbers, errors[:MAX_REPORTED], error_count)
+    """
+    lines = iter_lines(chunks)
+    records = iter_csv_records(lines) if fmt == "csv" else iter_ndjson_records(lines)
+
+    devices: List[Dict] = []
+    line_numbers: List[int] = []
+    errors: List[Dict] = []
+    error_count = 0
+    rows = 0
+
+    async for line_no, record, error in records:
+        rows += 1
+        if rows > max_rows:
+            raise BulkImportError(f"Import exceeds {max_rows} rows", 413)
+
+        if error is None:
+            try:
+                devices.append(validate(record))
+                line_numbers.append(line_no)
+                continue
+            except Exception as e:
+                error = _validation_message(e)
+
+        error_count += 1
+        if len(errors) < BULK_IMPORT_MAX_REPORTED:
+            errors.append({"line": line_no, "error": error})
+
+    logger.info(f"Parsed {rows} {fmt} rows: {len(devices)} valid, {error_count} invalid")
+    return devices, line_numbers, errors, error_count
+
+
+def _validation_message(error: Exception) -> str:
+    """Pydantic hatasını tek satıra indirger: 'ip: Field required; type: ...'"""
+    details = getattr(error, "errors", None)
+    if callable(details):
+        parts = []
+        for item in details():
+            field = ".".join(str(p) for p in item.get("loc", ())) or "record"
+            parts.append(f"{field}: {item.get('msg')}")
+        return "; ".join(parts)
+    return str(error)
+
+
+def format_export_row(device: Dict, fmt: str) -> str:
+    """Tek cihazı dışa aktarım satırına çevirir"""
+    if fmt == "ndjson":
+        return json.dumps(device, ensure_ascii=False) + "\n"
+    out = io.StringIO()
+    csv.writer(out, lineterminator="\n").writerow(
+        ["" if device.get(column) is None else device.get(column) for column in EXPORT_COLUMNS]
+    )
+    return out.getvalue()
+
+
+def export_header(fmt: str) -> str:
+    return ",".join(EXPORT_COLUMNS) + "\n" if fmt == "csv" else ""
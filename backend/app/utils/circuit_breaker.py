@@ -0,0 +1,302 @@
+"""
+Circuit Breaker - Erişilemeyen veya kimlik doğrulaması başarısız cihazlara tekrarlanan bağlantı denemelerini keser
+backend/app/utils/circuit_breaker.py
+
+Ardışık bağlantı hataları sınıflarına göre (timeout, network, ssh, auth) sayılır.
+Eşik aşılınca devre açılır ve istekler cihaza gitmeden CircuitOpenError ile
+anında reddedilir. Bekleme süresi her açılışta katlanır; süre dolunca tek bir
+deneme (half-open probe) yapılır - başarılıysa devre kapanır, değilse daha uzun
+süre için yeniden açılır.
+
+Kimlik doğrulama hataları cihazın geneline değil, o kullanıcı adı/şifre
+çiftine uygulanır: hatalı şifre tekrar tekrar denenip TACACS/RADIUS hesabını
+kilitlemez, ama aynı cihaza doğru kimlik bilgisiyle gelen istekler etkilenmez.
+"""
+
+import logging
+import math
+import os
+import random
+import time
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CIRCUIT_BREAKER_ENABLED = os.getenv("CIRCUIT_BREAKER_ENABLED", "true").lower() in ("1", "true", "yes")
+# Devreyi açan ardışık hata sayısı - auth için daha düşük tutulur (hesap kilitleme)
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "3"))
+CIRCUIT_AUTH_THRESHOLD = int(os.getenv("CIRCUIT_AUTH_THRESHOLD", "2"))
+# İlk açılış süresi ve üst sınırı (saniye) - her başarısız probe'da katlanır
+CIRCUIT_BASE_BACKOFF = float(os.getenv("CIRCUIT_BASE_BACKOFF", "5"))
+CIRCUIT_MAX_BACKOFF = float(os.getenv("CIRCUIT_MAX_BACKOFF", "300"))
+# Probe'lar aynı anda düşmesin diye bekleme süresine eklenen rastgele pay (oran)
+_JITTER = 0.1
+
+# SSHConnector.last_error sınıfları
+FAILURE_CLASSES = ("timeout", "network", "ssh", "auth", "error")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Cihaz (veya kimlik bilgisi) için devre açık - bağlantı denenmedi"""
+
+    def __init__(self, device_id: int, message: str, retry_after: float, failure_class: str,
+                 status_code: int = 503):
+        super().__init__(message)
+        self.device_id = device_id
+        self.retry_after = retry_after
+        self.failure_class = failure_class
+        self.status_code = status_code
+
+    def headers(self) -> Dict[str, str]:
+        return {"Retry-After": str(max(1, math.ceil(self.retry_after)))}
+
+
+class _Circuit:
+    """Tek bir cihaz (transport) veya cihaz+kimlik bilgisi (auth) devresi"""
+
+    def __init__(self, threshold: int):
+        self.threshold = threshold
+        self.state = CLOSED
+        self.consecutive = 0
+        self.by_class: Dict[str, int] = {}
+        self.last_class: Optional[str] = None
+        self.last_message: Optional[str] = None
+        # Kaç kez üst üste açıldı - backoff üssü
+        self.trips = 0
+        self.open_until = 0.0
+        self.opened_at: Optional[float] = None
+        self.probe_in_flight = False
+        self.rejections = 0
+
+    def backoff(self, base: float, cap: float) -> float:
+        delay = min(cap, base * (2 ** max(0, self.trips - 1)))
+        return delay * (1 + random.uniform(0, _JITTER))
+
+    def to_dict(self, now: float) -> Dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive,
+            "failures_by_class": dict(self.by_class),
+            "last_failure_class": self.last_class,
+            "last_error": self.last_message,
+            "trips": self.trips,
+            "retry_after": round(max(0.0, self.open_until - now), 2) if self.state != CLOSED else 0.0,
+            "probe_in_flight": self.probe_in_flight,
+            "rejections": self.rejections
+        }
+
+
+class CircuitBreaker:
+    """device_id (transport hataları) ve (device_id, username, digest) (auth hataları) anahtarlı devreler"""
+
+    def __init__(
+        self,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        auth_threshold: int = CIRCUIT_AUTH_THRESHOLD,
+        base_backoff: float = CIRCUIT_BASE_BACKOFF,
+        max_backoff: float = CIRCUIT_MAX_BACKOFF,
+        enabled: bool = CIRCUIT_BREAKER_ENABLED
+    ):
+        self.failure_threshold = failure_threshold
+        self.auth_threshold = auth_threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.enabled = enabled
+        self._device: Dict[int, _Circuit] = {}
+        self._auth: Dict[Tuple[int, str, str], _Circuit] = {}
+
+        self.stats = {
+            "rejections": 0,
+            "trips": 0,
+            "probes": 0,
+            "probe_successes": 0
+        }
+
+    # ===========================================
+    # CHECK / RECORD
+    # ===========================================
+
+    def check(self, device_id: int, username: str, digest: str):
+        """
+        Devre açıksa bağlantı denemeden reddeder - slot beklemeden önce çağrılır
+        Raises: CircuitOpenError
+        """
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        for circuit in self._circuits(device_id, username, digest):
+            if circuit.state != CLOSED:
+                self._reject_if_blocked(circuit, device_id, username, now)
+
+    def begin(self, device_id: int, username: str, digest: str) -> bool:
+        """
+        Yeni transport kurmadan hemen önce çağrılır; süresi dolan açık devre için tek probe izni verir
+        Returns: True ise bu deneme probe'dur - sonucu record()/abandon() ile bildirilmeli
+        Raises: CircuitOpenError
+        """
+        if not self.enabled:
+            return False
+        now = time.monotonic()
+        probing = []
+        for circuit in self._circuits(device_id, username, digest):
+            if circuit.state == CLOSED:
+                continue
+            self._reject_if_blocked(circuit, device_id, username, now)
+            probing.append(circuit)
+
+        for circuit in probing:
+            circuit.state = HALF_OPEN
+            circuit.probe_in_flight = True
+        if probing:
+            self.stats["probes"] += 1
+            logger.info(f"Circuit half-open for device {device_id} - probing with a single connection attempt")
+        return bool(probing)
+
+    def record(self, device_id: int, username: str, digest: str, failure_class: Optional[str],
+               message: str = "", probe: bool = False):
+        """Bağlantı sonucunu işler - failure_class None ise başarılı, probe begin()'in dönüşüdür"""
+        if not self.enabled:
+            return
+
+        if failure_class is None:
+            self._succeed(self._device, device_id)
+            self._succeed(self._auth, (device_id, username, digest))
+            return
+
+        if probe:
+            # Sonuç hangi devreye yazılırsa yazılsın, bu denemenin probe'ları bitti
+            self.abandon(device_id, username, digest)
+        if failure_class == "auth":
+            # Cihaz yanıt verdi - transport devresi sağlıklı, hata yalnızca bu kimlik bilgisine ait
+            self._succeed(self._device, device_id)
+            key = (device_id, username, digest)
+            circuit = self._auth.get(key) or self._auth.setdefault(key, _Circuit(self.auth_threshold))
+        else:
+            circuit = self._device.get(device_id) or self._device.setdefault(
+                device_id, _Circuit(self.failure_threshold)
+            )
+        self._fail(circuit, device_id, failure_class, message)
+
+    def abandon(self, device_id: int, username: str, digest: str):
+        """Probe sonuçlanmadan iptal edildi - sonraki istek yeniden probe yapabilir"""
+        for circuit in self._circuits(device_id, username, digest):
+            if circuit.state == HALF_OPEN:
+                circuit.state = OPEN
+            circuit.probe_in_flight = False
+
+    def reset(self, device_id: int) -> int:
+        """Cihazın tüm devrelerini kapatır (ör. şifre düzeltildikten sonra) - kapatılan devre sayısı"""
+        keys = [key for key in self._auth if key[0] == device_id]
+        for key in keys:
+            del self._auth[key]
+        closed = len(keys) + (1 if self._device.pop(device_id, None) is not None else 0)
+        if closed:
+            logger.info(f"Circuit breaker reset for device {device_id} ({closed} circuits)")
+        return closed
+
+    # ===========================================
+    # STATS
+    # ===========================================
+
+    def get_device_stats(self, device_id: int) -> Dict:
+        now = time.monotonic()
+        circuit = self._device.get(device_id)
+        return {
+            "device": circuit.to_dict(now) if circuit is not None else {"state": CLOSED},
+            "credentials": [
+                {"username": key[1], **c.to_dict(now)}
+                for key, c in self._auth.items() if key[0] == device_id
+            ]
+        }
+
+    def get_all_device_stats(self, open_only: bool = False) -> Dict[int, Dict]:
+        device_ids = set(self._device) | {key[0] for key in self._auth}
+        stats = {device_id: self.get_device_stats(device_id) for device_id in sorted(device_ids)}
+        if open_only:
+            stats = {
+                device_id: entry for device_id, entry in stats.items()
+                if entry["device"]["state"] != CLOSED or any(c["state"] != CLOSED for c in entry["credentials"])
+            }
+        return stats
+
+    def get_stats(self) -> Dict:
+        circuits = list(self._device.values()) + list(self._auth.values())
+        return {
+            **self.stats,
+            "enabled": self.enabled,
+            "failure_threshold": self.failure_threshold,
+            "auth_threshold": self.auth_threshold,
+            "base_backoff": self.base_backoff,
+            "max_backoff": self.max_backoff,
+            "tracked": len(circuits),
+            "open": sum(1 for c in circuits if c.state == OPEN),
+            "half_open": sum(1 for c in circuits if c.state == HALF_OPEN)
+        }
+
+    # ===========================================
+    # INTERNAL
+    # ===========================================
+
+    def _circuits(self, device_id: int, username: str, digest: str):
+        circuit = self._device.get(device_id)
+        if circuit is not None:
+            yield circuit
+        circuit = self._auth.get((device_id, username, digest))
+        if circuit is not None:
+            yield circuit
+
+    def _reject_if_blocked(self, circuit: _Circuit, device_id: int, username: str, now: float):
+        if circuit.state == OPEN and now >= circuit.open_until:
+            return
+        # Açık ve süresi dolmamış, ya da probe zaten sürüyor
+        retry_after = max(circuit.open_until - now, 1.0)
+        circuit.rejections += 1
+        self.stats["rejections"] += 1
+        if circuit.last_class == "auth":
+            detail = f"authentication for {username} failed {circuit.consecutive} times"
+        else:
+            detail = f"{circuit.consecutive} consecutive {circuit.last_class} failures"
+        raise CircuitOpenError(
+            device_id,
+            f"Circuit open for device {device_id}: {detail}; retry in {math.ceil(retry_after)}s "
+            f"(last error: {circuit.last_message})",
+            retry_after,
+            circuit.last_class or "error"
+        )
+
+    def _fail(self, circuit: _Circuit, device_id: int, failure_class: str, message: str):
+        circuit.consecutive += 1
+        circuit.by_class[failure_class] = circuit.by_class.get(failure_class, 0) + 1
+        circuit.last_class = failure_class
+        circuit.last_message = message
+        # Açık devrede hata (başarısız probe) eşiği beklemeden daha uzun süre için yeniden açar
+        reopen = circuit.state != CLOSED
+
+        if reopen or circuit.consecutive >= circuit.threshold:
+            circuit.trips += 1
+            circuit.state = OPEN
+            now = time.monotonic()
+            delay = circuit.backoff(self.base_backoff, self.max_backoff)
+            circuit.open_until = now + delay
+            if circuit.opened_at is None:
+                circuit.opened_at = now
+            self.stats["trips"] += 1
+            logger.warning(
+                f"Circuit opened for device {device_id} after {circuit.consecutive} consecutive failures "
+                f"(last: {failure_class}); next attempt in {delay:.1f}s"
+            )
+
+    def _succeed(self, circuits: Dict, key):
+        circuit = circuits.pop(key, None)
+        if circuit is not None and circuit.state != CLOSED:
+            self.stats["probe_successes"] += 1
+            down = time.monotonic() - circuit.opened_at if circuit.opened_at is not None else 0.0
+            logger.info(f"Circuit closed for device {key if isinstance(key, int) else key[0]} after {down:.1f}s")
+
+
+# Global instance
+circuit_breaker = CircuitBreaker()
@@ -0,0 +1,440 @@
+"""
+Config Backup - Cihaz konfigürasyonlarının içerik adresli, tekilleştirilmiş yedeklenmesi
+backend/app/utils/config_backup.py
+
+Depolama düzeni (CONFIG_BACKUP_DIR altında):
+    objects/<sha256[:2]>/<sha256[2:]>.z   zlib sıkıştırılmış konfigürasyon (içerik adresli)
+    index/<device_id>.jsonl               cihazın sürüm listesi, satır başına bir sürüm
+
+Değişmeyen konfigürasyon yeni blob ya da sürüm satırı yazmaz.
+"""
+
+import asyncio
+import codecs
+import difflib
+import hashlib
+import json
+import logging
+import os
+import random
+import re
+import tempfile
+import threading
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from ..json_db import get_devices
+from .connection_pool import SSHConnectionPool, ssh_pool
+from .reachability import ReachabilityMonitor, reachability
+from .result_cache import result_cache
+from .ssh_connector import NetworkDeviceManager
+
+logger = logging.getLogger(__name__)
+
+CONFIG_BACKUP_ENABLED = os.getenv("CONFIG_BACKUP_ENABLED", "false").lower() in ("1", "true", "yes")
+CONFIG_BACKUP_DIR = Path(os.getenv(
+    "CONFIG_BACKUP_DIR", str(Path(__file__).resolve().parent.parent.parent / "data" / "backups")
+))
+CONFIG_BACKUP_USERNAME = os.getenv("CONFIG_BACKUP_USERNAME", "")
+CONFIG_BACKUP_PASSWORD = os.getenv("CONFIG_BACKUP_PASSWORD", "")
+CONFIG_BACKUP_PORT = int(os.getenv("CONFIG_BACKUP_PORT", "22"))
+CONFIG_BACKUP_INTERVAL = float(os.getenv("CONFIG_BACKUP_INTERVAL", "86400"))
+CONFIG_BACKUP_CONCURRENCY = int(os.getenv("CONFIG_BACKUP_CONCURRENCY", "10"))
+CONFIG_BACKUP_TIMEOUT = float(os.getenv("CONFIG_BACKUP_TIMEOUT", "120"))
+
+# Her çekimde değişen ama konfigürasyon olmayan satırlar - hash'e girerse tekilleştirme bozulur
+_VOLATILE_LINES = re.compile(
+    r"^(Building configuration\.\.\.|Current configuration : \d+ bytes|"
+    r"! (Last configuration change|NVRAM config last updated) at .*|"
+    r"ntp clock-period \d+|"
+    r": Written by .*|: Saved|Cryptochecksum:.*|"
+    r"## Last (commit|changed): .*|"
+    r"# (\w{3}/\d{2}/\d{4}|\d{4}-\d{2}-\d{2}) \d{2}:\d{2}:\d{2} by RouterOS.*)\s*$"
+)
+
+
+def normalize_config(raw: str) -> str:
+    """Satır sonlarını birleştirir, zaman damgası gibi değişken satırları ve baş/son boşlukları atar"""
+    lines = raw.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    kept = [line.rstrip() for line in lines if not _VOLATILE_LINES.match(line.strip())]
+    return "\n".join(kept).strip("\n") + "\n"
+
+
+# Sonuç durumu -> istatistik anahtarı
+_STATUS_STATS = {
+    "new_version": "new_versions",
+    "unchanged": "unchanged",
+    "failed": "failed",
+    "unsupported": "unsupported",
+    "unreachable": "unreachable"
+}
+
+
+class ConfigBackupStore:
+    """Dosya sistemi üzerinde blob deposu ve cihaz başına sürüm indeksi"""
+
+    def __init__(self, root: Path = CONFIG_BACKUP_DIR):
+        self.root = Path(root)
+        self._lock = threading.Lock()
+        # device_id -> sürüm listesi (index dosyasından tembel yüklenir)
+        self._index: Dict[int, List[Dict]] = {}
+
+    # ===========================================
+    # BLOBS
+    # ===========================================
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.root / "objects" / digest[:2] / f"{digest[2:]}.z"
+
+    def has_blob(self, digest: str) -> bool:
+        return self._blob_path(digest).exists()
+
+    def put_blob(self, content: str) -> Tuple[str, int]:
+        """
+        İçeriği hash'iyle saklar - aynı içerik zaten varsa hiçbir şey yazılmaz
+        Returns: (sha256 hex, yazılan byte sayısı)
+        """
+        data = content.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._blob_path(digest)
+        if path.exists():
+            return digest, 0
+
+        compressed = zlib.compress(data, 9)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(compressed)
+            # Aynı blob'u eşzamanlı yazan olsa da içerik aynı - replace güvenli
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        return digest, len(compressed)
+
+    def iter_blob(self, digest: str, chunk_size: int = 65536) -> Iterator[bytes]:
+        """Blob'u dosyadan parça parça açarak üretir - tamamı belleğe alınmaz"""
+        decompressor = zlib.decompressobj()
+        with open(self._blob_path(digest), "rb") as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                data = decompressor.decompress(chunk)
+                if data:
+                    yield data
+        tail = decompressor.flush()
+        if tail:
+            yield tail
+
+    def iter_blob_lines(self, digest: str) -> Iterator[str]:
+        """Blob'u satır satır (satır sonu dahil) üretir"""
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        pending = ""
+        for chunk in self.iter_blob(digest):
+            pending += decoder.decode(chunk)
+            lines = pending.split("\n")
+            pending = lines.pop()
+            for line in lines:
+                yield line + "\n"
+        if pending:
+            yield pending
+
+    # ===========================================
+    # VERSION INDEX
+    # ===========================================
+
+    def _index_path(self, device_id: int) -> Path:
+        return self.root / "index" / f"{device_id}.jsonl"
+
+    def versions(self, device_id: int) -> List[Dict]:
+        with self._lock:
+            return list(self._load_index(device_id))
+
+    def get_version(self, device_id: int, version: int) -> Optional[Dict]:
+        versions = self.versions(device_id)
+        if 1 <= version <= len(versions):
+            return versions[version - 1]
+        return None
+
+    def latest(self, device_id: int) -> Optional[Dict]:
+        versions = self.versions(device_id)
+        return versions[-1] if versions else None
+
+    def _load_index(self, device_id: int) -> List[Dict]:
+        versions = self._index.get(device_id)
+        if versions is None:
+            versions = []
+            path = self._index_path(device_id)
+            if path.exists():
+                with open(path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        line = line.strip()
+                        if not line:
+                            continue
+                        try:
+                            versions.append(json.loads(line))
+                        except json.JSONDecodeError:
+                            # Çökme sırasında yarım kalmış son satır
+                            logger.warning(f"Skipping corrupt backup index line for device {device_id}")
+            self._index[device_id] = versions
+        return versions
+
+    def save(self, device_id: int, config: str, command: str) -> Dict:
+        """
+        Normalize edilmiş konfigürasyonu saklar
+        Returns: {"changed": bool, "version": dict, "bytes_written": int}
+        """
+        digest, written = self.put_blob(config)
+        with self._lock:
+            versions = self._load_index(device_id)
+            if versions and versions[-1]["hash"] == digest:
+                return {"changed": False, "version": versions[-1], "bytes_written": written}
+
+            entry = {
+                "version": len(versions) + 1,
+                "hash": digest,
+                "size": len(config.encode("utf-8")),
+                "lines": config.count("\n"),
+                "command": command,
+                "collected_at": datetime.now().isoformat()
+            }
+            path = self._index_path(device_id)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            line = json.dumps(entry) + "\n"
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+            versions.append(entry)
+        return {"changed": True, "version": entry, "bytes_written": written + len(line)}
+
+    def diff(self, device_id: int, from_version: int, to_version: int, context: int = 3) -> Iterator[str]:
+        """İki sürüm arasındaki unified diff'i satır satır üretir"""
+        old = self.get_version(device_id, from_version)
+        new = self.get_version(device_id, to_version)
+        if old is None or new is None:
+            raise KeyError(f"Version not found for device {device_id}")
+        if old["hash"] == new["hash"]:
+            return iter(())
+        return difflib.unified_diff(
+            list(self.iter_blob_lines(old["hash"])),
+            list(self.iter_blob_lines(new["hash"])),
+            fromfile=f"device-{device_id}/v{from_version} ({old['collected_at']})",
+            tofile=f"device-{device_id}/v{to_version} ({new['collected_at']})",
+            n=context
+        )
+
+    def forget_cache(self, device_id: Optional[int] = None):
+        with self._lock:
+            if device_id is None:
+                self._index.clear()
+            else:
+                self._index.pop(device_id, None)
+
+    def disk_usage(self) -> Dict:
+        blobs = 0
+        blob_bytes = 0
+        objects = self.root / "objects"
+        if objects.exists():
+            for path in objects.glob("*/*.z"):
+                blobs += 1
+                blob_bytes += path.stat().st_size
+        return {"blobs": blobs, "blob_bytes": blob_bytes}
+
+
+class ConfigBackupCollector:
+    """Envanterdeki cihazlardan konfigürasyonu eşzamanlı çeker ve depoya yazar"""
+
+    def __init__(
+        self,
+        store: ConfigBackupStore,
+        pool: SSHConnectionPool = ssh_pool,
+        username: str = CONFIG_BACKUP_USERNAME,
+        password: str = CONFIG_BACKUP_PASSWORD,
+        port: int = CONFIG_BACKUP_PORT,
+        interval: float = CONFIG_BACKUP_INTERVAL,
+        max_concurrency: int = CONFIG_BACKUP_CONCURRENCY,
+        device_timeout: float = CONFIG_BACKUP_TIMEOUT,
+        reachability_monitor: Optional[ReachabilityMonitor] = reachability
+    ):
+        self.store = store
+        self.pool = pool
+        self.username = username
+        self.password = password
+        self.port = port
+        self.interval = interval
+        self.max_concurrency = max(1, max_concurrency)
+        self.device_timeout = device_timeout
+        self.reachability = reachability_monitor
+
+        self._task: Optional[asyncio.Task] = None
+        self._run_lock = asyncio.Lock()
+
+        self.stats = {
+            "runs": 0,
+            "collected": 0,
+            "new_versions": 0,
+            "unchanged": 0,
+            "failed": 0,
+            "unsupported": 0,
+            "unreachable": 0,
+            "bytes_written": 0,
+            "last_run_started": None,
+            "last_run_duration": None
+        }
+
+    # ===========================================
+    # COLLECTION
+    # ===========================================
+
+    async def backup_device(self, device: Dict, username: str, password: str, port: int) -> Dict:
+        """Tek cihazın konfigürasyonunu çeker ve saklar"""
+        result = {"device_id": device["id"], "device_name": device.get("name"), "status": "failed",
+                  "version": None, "hash": None, "error": None}
+        command = NetworkDeviceManager.get_config_backup_command(device.get("type", ""))
+        if command is None:
+            result["status"] = "unsupported"
+            result["error"] = f"No config command for device type '{device.get('type')}'"
+            return result
+
+        try:
+            async with self.pool.connection(
+                device, username=username, password=password, port=port, timeout=20
+            ) as (connector, success, message):
+                if not success:
+                    raise ConnectionError(message)
+                ok, stdout, stderr = await asyncio.wait_for(
+                    connector.execute_command(command, timeout=int(self.device_timeout)),
+                    timeout=self.device_timeout
+                )
+            if not ok or not stdout.strip():
+                raise RuntimeError(stderr.strip() or "Empty configuration output")
+
+            config = normalize_config(stdout)
+            saved = await asyncio.get_running_loop().run_in_executor(
+                None, self.store.save, device["id"], config, command
+            )
+            self.stats["bytes_written"] += saved["bytes_written"]
+            # Konfigürasyon cihaz dışından değişmiş - önbellekteki çıktılar eskidi
+            if saved["changed"]:
+                result_cache.invalidate_device(device["id"])
+            result.update(
+                status="new_version" if saved["changed"] else "unchanged",
+                version=saved["version"]["version"],
+                hash=saved["version"]["hash"],
+                bytes_written=saved["bytes_written"]
+            )
+        except asyncio.TimeoutError:
+            result["error"] = f"Config collection did not finish within {self.device_timeout}s"
+        except Exception as e:
+            result["error"] = str(e)
+
+        if result["error"]:
+            logger.warning(f"Config backup failed for {device.get('name')}: {result['error']}")
+        return result
+
+    async def run(
+        self,
+        devices: List[Dict],
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        port: Optional[int] = None
+    ) -> Dict:
+        """Bir yedekleme turu - sonuçları ve özet sayıları döner"""
+        username = username or self.username
+        password = password or self.password
+        port = port or self.port
+        start_time = datetime.now()
+
+        async with self._run_lock:
+            self.stats["last_run_started"] = start_time.isoformat()
+            results: List[Dict] = []
+
+            # Kapalı cihazlar için SSH timeout'u beklenmez
+            if self.reachability is not None:
+                await self.reachability.sweep(devices, port=port)
+                reachable = []
+                for device in devices:
+                    if self.reachability.is_down(device["id"]):
+                        results.append({"device_id": device["id"], "device_name": device.get("name"),
+                                        "status": "unreachable", "version": None, "hash": None,
+                                        "error": "Device unreachable in last sweep"})
+                    else:
+                        reachable.append(device)
+                devices = reachable
+
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+
+            async def run_one(device: Dict) -> Dict:
+                async with semaphore:
+                    return await self.backup_device(device, username, password, port)
+
+            results.extend(await asyncio.gather(*(run_one(device) for device in devices)))
+
+            summary: Dict[str, int] = {}
+            for result in results:
+                summary[result["status"]] = summary.get(result["status"], 0) + 1
+                self.stats[_STATUS_STATS[result["status"]]] += 1
+
+            duration = (datetime.now() - start_time).total_seconds()
+            self.stats["runs"] += 1
+            self.stats["collected"] += summary.get("new_version", 0) + summary.get("unchanged", 0)
+            self.stats["last_run_duration"] = duration
+            logger.info(f"Config backup run finished in {duration:.2f}s: {summary}")
+
+        return {"summary": summary, "results": results, "execution_time": duration}
+
+    # ===========================================
+    # SCHEDULER
+    # ===========================================
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> bool:
+        """Zamanlayıcıyı başlatır - kimlik bilgisi yoksa başlatmaz"""
+        if not self.username or not self.password:
+            logger.warning("Config backup not started: CONFIG_BACKUP_USERNAME/PASSWORD are not set")
+            return False
+        if not self.running:
+            self._task = asyncio.create_task(self._loop())
+            logger.info(f"Config backup scheduler started (interval={self.interval}s)")
+        return True
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _loop(self):
+        await asyncio.sleep(random.uniform(0, min(self.interval * 0.1, 300)))
+        while True:
+            try:
+                await self.run(get_devices())
+            except Exception as e:
+                logger.error(f"Config backup run error: {e}")
+            await asyncio.sleep(max(60.0, self.interval))
+
+    def get_stats(self) -> Dict:
+        return {
+            **self.stats,
+            "running": self.running,
+            "interval": self.interval,
+            "max_concurrency": self.max_concurrency,
+            "storage": {"root": str(self.store.root), **self.store.disk_usage()}
+        }
+
+
+# Global instances
+config_store = ConfigBackupStore()
+config_backups = ConfigBackupCollector(config_store)
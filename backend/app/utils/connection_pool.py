@@ -0,0 +1,430 @@
+"""
+SSH Connection Pool - Kimliği doğrulanmış SSH oturumlarını yeniden kullanır
+backend/app/utils/connection_pool.py
+"""
+
+import asyncio
+import hashlib
+import hmac
+import logging
+import os
+import secrets
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from .admission import AdmissionController, AdmissionRejected, admission
+from .circuit_breaker import CircuitBreaker, circuit_breaker
+from .drivers import get_driver
+from .ssh_connector import NetworkDeviceManager, SSHConnector
+
+logger = logging.getLogger(__name__)
+
+# (device_id, ip, username, port) - cihazın IP'si değişirse eski transport'lar eşleşmez
+PoolKey = Tuple[int, str, str, int]
+
+# Şifreler havuzda düz metin tutulmaz, süreç başına rastgele anahtarla HMAC'lenir
+_SECRET_KEY = secrets.token_bytes(32)
+
+
+def _credential_digest(username: str, password: str) -> str:
+    """Kullanıcı adı/şifre çiftinden havuz içi karşılaştırma özeti üretir"""
+    message = f"{username}\0{password}".encode("utf-8")
+    return hmac.new(_SECRET_KEY, message, hashlib.sha256).hexdigest()
+
+
+@dataclass
+class PooledConnection:
+    """Havuzdaki tek bir kimliği doğrulanmış SSH bağlantısı"""
+    key: PoolKey
+    connector: SSHConnector
+    credential_digest: str
+    created_at: float
+    last_used: float
+    uses: int = 0
+    # Admission slotunun alındığı an - release'te tutma süresi olarak raporlanır
+    checked_out_at: float = 0.0
+
+
+class SSHConnectionPool:
+    """(device_id, ip, username, port) anahtarına göre SSH transport havuzu"""
+
+    def __init__(self, idle_ttl: float = 300.0, max_per_host: int = 4, max_lifetime: float = 3600.0,
+                 admission: AdmissionController = admission, breaker: CircuitBreaker = circuit_breaker):
+        self.idle_ttl = idle_ttl
+        self.max_per_host = max_per_host
+        self.max_lifetime = max_lifetime
+        self.admission = admission
+        self.breaker = breaker
+
+        self._idle: Dict[PoolKey, List[PooledConnection]] = {}
+        # Açık + kurulmakta olan transport sayısı; max_per_host'a ulaşınca yeni istek bekler
+        self._open_per_host: Dict[int, int] = {}
+        self._room_waiters: Dict[int, List[asyncio.Future]] = {}
+        self._reaper_task: Optional[asyncio.Task] = None
+
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "probe_failures": 0,
+            "credential_mismatches": 0,
+            "overflow_closes": 0,
+            "abandoned_connects": 0,
+            "transport_waits": 0,
+            "transport_timeouts": 0,
+            "shell_resets": 0
+        }
+
+    # ===========================================
+    # ACQUIRE / RELEASE
+    # ===========================================
+
+    async def acquire(
+        self,
+        device: Dict,
+        username: str,
+        password: str,
+        port: int = 22,
+        timeout: int = 10
+    ) -> Tuple[Optional[PooledConnection], bool, str]:
+        """
+        Havuzdan canlı bir bağlantı alır, yoksa yenisini kurar
+        Cihazın oturum slotu dolu ise sırayla beklenir - slot release() ile bırakılır
+        Cihaza açık transport sayısı max_per_host'a ulaşmışsa ve boşta olan yoksa biri
+        havuza dönene veya kapanana kadar beklenir
+        Returns: (entry, success: bool, message: str)
+        Raises: CircuitOpenError - cihaz/kimlik bilgisi için devre açık (bağlantı denenmez)
+                AdmissionRejected - slot veya transport bekleme süresi aşıldı/aşılacak
+        """
+        self.prune()
+
+        key: PoolKey = (device["id"], device["ip"], username, port)
+        digest = _credential_digest(username, password)
+
+        # Açık devre slot beklemeden reddedilir
+        self.breaker.check(device["id"], username, digest)
+        await self.admission.acquire(device)
+        admitted_at = time.monotonic()
+        limit = min(self.max_per_host, self.admission.slots_for(device))
+        try:
+            entry = await self._take_idle(key, digest)
+            while entry is None and not self._reserve(device["id"], limit):
+                await self._wait_for_room(device["id"], limit, admitted_at)
+                entry = await self._take_idle(key, digest)
+        except BaseException:
+            self.admission.release(device["id"])
+            raise
+        if entry is not None:
+            self.stats["hits"] += 1
+            entry.uses += 1
+            entry.last_used = entry.checked_out_at = admitted_at
+            logger.info(f"Reusing pooled SSH connection to {device['ip']}:{port} as {username}")
+            return entry, True, f"Reusing pooled connection to {device['ip']}"
+
+        self.stats["misses"] += 1
+        try:
+            connector = SSHConnector(
+                profile=NetworkDeviceManager.get_device_profile(device.get("type"), device),
+                driver=get_driver(device.get("type"))
+            )
+            # Slot beklerken devre açılmış olabilir; süresi dolmuşsa bu istek probe olur
+            probe = self.breaker.begin(device["id"], username, digest)
+        except BaseException:
+            self._unreserve(device["id"])
+            self.admission.release(device["id"])
+            raise
+        # İptal (ör. fleet cihaz timeout'u) executor thread'indeki handshake'i durdurmaz;
+        # connect ayrı bir görevde sürer ve iptal edilirse bittiğinde transport kapatılır
+        connect = asyncio.ensure_future(connector.connect(
+            host=device["ip"],
+            username=username,
+            password=password,
+            port=port,
+            timeout=timeout
+        ))
+        try:
+            success, message = await asyncio.shield(connect)
+        except BaseException:
+            if probe:
+                self.breaker.abandon(device["id"], username, digest)
+            # Slot, handshake bitip transport kapanana kadar tutulur - cihaz VTY sınırı aşılmaz
+            self._discard_when_done(connect, connector, device["id"])
+            raise
+
+        self.breaker.record(device["id"], username, digest, connector.last_error, message, probe)
+        if not success:
+            connector.disconnect()
+            self._unreserve(device["id"])
+            self.admission.release(device["id"])
+            return None, False, message
+
+        now = time.monotonic()
+        entry = PooledConnection(
+            key=key,
+            connector=connector,
+            credential_digest=digest,
+            created_at=now,
+            last_used=now,
+            uses=1,
+            checked_out_at=admitted_at
+        )
+        return entry, True, message
+
+    def release(self, entry: PooledConnection, reusable: bool = True):
+        """Bağlantıyı havuza geri verir veya kapatır ve cihaz slotunu bırakır"""
+        device_id = entry.key[0]
+        entry.last_used = time.monotonic()
+        self.admission.release(device_id, entry.last_used - entry.checked_out_at)
+
+        if not reusable or not entry.connector.connected:
+            self._close(entry)
+            return
+
+        if entry.last_used - entry.created_at > self.max_lifetime:
+            self.stats["evictions"] += 1
+            self._close(entry)
+            return
+
+        if self._idle_count_for_host(device_id) >= self.max_per_host:
+            self.stats["overflow_closes"] += 1
+            self._close(entry)
+            return
+
+        # /execute durumsuzdur - config/enable modunda kalan shell bir sonraki isteğe taşınmaz
+        if entry.connector.reset_session():
+            self.stats["shell_resets"] += 1
+
+        self._idle.setdefault(entry.key, []).append(entry)
+        self._notify_room(device_id)
+
+    @asynccontextmanager
+    async def connection(
+        self,
+        device: Dict,
+        username: str,
+        password: str,
+        port: int = 22,
+        timeout: int = 10
+    ):
+        """
+        Havuzlanmış bağlantı için context manager
+        Yields: (connector | None, success: bool, message: str)
+        """
+        entry, success, message = await self.acquire(device, username, password, port, timeout)
+        if entry is None:
+            yield None, success, message
+            return
+
+        reusable = True
+        try:
+            yield entry.connector, success, message
+        except BaseException:
+            # Yarım kalmış kanal durumu bilinmediğinden bağlantıyı yeniden kullanma
+            reusable = False
+            raise
+        finally:
+            self.release(entry, reusable)
+
+    # ===========================================
+    # EVICTION
+    # ===========================================
+
+    def prune(self):
+        """Boşta kalma süresi veya ömrü dolan bağlantıları kapatır"""
+        now = time.monotonic()
+        for key in list(self._idle.keys()):
+            alive = []
+            for entry in self._idle[key]:
+                if now - entry.last_used > self.idle_ttl or now - entry.created_at > self.max_lifetime:
+                    self.stats["evictions"] += 1
+                    self._close(entry)
+                else:
+                    alive.append(entry)
+            if alive:
+                self._idle[key] = alive
+            else:
+                del self._idle[key]
+
+    def evict_device(self, device_id: int) -> int:
+        """Cihazın boştaki bağlantılarını kapatır - cihaz silindiğinde veya adresi değiştiğinde"""
+        closed = 0
+        for key in [key for key in self._idle if key[0] == device_id]:
+            for entry in self._idle.pop(key):
+                self._close(entry)
+                closed += 1
+        if closed:
+            self.stats["evictions"] += closed
+            logger.info(f"Evicted {closed} pooled SSH connections for device {device_id}")
+        return closed
+
+    def close_all(self):
+        """Havuzdaki tüm boşta bağlantıları kapatır"""
+        for entries in self._idle.values():
+            for entry in entries:
+                self._close(entry)
+        self._idle.clear()
+        logger.info("SSH connection pool closed")
+
+    def start_reaper(self, interval: float = 30.0):
+        """Periyodik eviction görevini başlatır"""
+        if self._reaper_task is None or self._reaper_task.done():
+            self._reaper_task = asyncio.create_task(self._reaper_loop(interval))
+
+    async def stop_reaper(self):
+        """Eviction görevini durdurur ve havuzu boşaltır"""
+        if self._reaper_task is not None:
+            self._reaper_task.cancel()
+            try:
+                await self._reaper_task
+            except asyncio.CancelledError:
+                pass
+            self._reaper_task = None
+        self.close_all()
+
+    async def _reaper_loop(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                self.prune()
+            except Exception as e:
+                logger.error(f"SSH pool reaper error: {e}")
+
+    # ===========================================
+    # STATS
+    # ===========================================
+
+    def get_stats(self) -> Dict:
+        """Havuz sayaçlarını ve anlık durumunu döner"""
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "hit_rate": round(self.stats["hits"] / lookups, 4) if lookups else 0.0,
+            "idle_connections": sum(len(entries) for entries in self._idle.values()),
+            "open_connections": sum(self._open_per_host.values()),
+            "pooled_keys": len(self._idle),
+            "idle_ttl": self.idle_ttl,
+            "max_per_host": self.max_per_host
+        }
+
+    # ===========================================
+    # INTERNAL
+    # ===========================================
+
+    async def _take_idle(self, key: PoolKey, digest: str) -> Optional[PooledConnection]:
+        """Anahtar için canlı ve aynı kimlik bilgisiyle açılmış bir bağlantı döner"""
+        entries = self._idle.get(key)
+        if not entries:
+            return None
+
+        # LIFO - en son kullanılan bağlantının canlı olma ihtimali en yüksek
+        for index in range(len(entries) - 1, -1, -1):
+            entry = entries[index]
+            if not hmac.compare_digest(entry.credential_digest, digest):
+                self.stats["credential_mismatches"] += 1
+                continue
+
+            entries.pop(index)
+            if not entries:
+                del self._idle[key]
+
+            if await entry.connector.is_alive():
+                return entry
+
+            self.stats["probe_failures"] += 1
+            self._close(entry)
+            return await self._take_idle(key, digest)
+
+        return None
+
+    def _reserve(self, device_id: int, limit: int) -> bool:
+        """
+        Cihaz için yeni transport yeri ayırır - limit doluysa en eski boşta bağlantılar kapatılır
+        Returns: False - tüm transport'lar kullanımda
+        """
+        while self._open_per_host.get(device_id, 0) >= limit:
+            candidates = [
+                entry
+                for key, entries in self._idle.items() if key[0] == device_id
+                for entry in entries
+            ]
+            if not candidates:
+                return False
+
+            oldest = min(candidates, key=lambda e: e.last_used)
+            self._idle[oldest.key].remove(oldest)
+            if not self._idle[oldest.key]:
+                del self._idle[oldest.key]
+            self.stats["evictions"] += 1
+            self._close(oldest)
+
+        self._open_per_host[device_id] = self._open_per_host.get(device_id, 0) + 1
+        return True
+
+    def _unreserve(self, device_id: int):
+        remaining = self._open_per_host.get(device_id, 0) - 1
+        if remaining > 0:
+            self._open_per_host[device_id] = remaining
+        else:
+            self._open_per_host.pop(device_id, None)
+        self._notify_room(device_id)
+
+    async def _wait_for_room(self, device_id: int, limit: int, admitted_at: float):
+        """Bir transport havuza dönene veya kapanana kadar bekler - süre admission kuyruk süresiyle sınırlı"""
+        remaining = admitted_at + self.admission.queue_timeout - time.monotonic()
+        waiter = asyncio.get_running_loop().create_future()
+        waiters = self._room_waiters.setdefault(device_id, [])
+        waiters.append(waiter)
+        self.stats["transport_waits"] += 1
+        try:
+            await asyncio.wait_for(waiter, max(0.0, remaining))
+        except asyncio.TimeoutError:
+            self.stats["transport_timeouts"] += 1
+            raise AdmissionRejected(
+                device_id,
+                f"All {limit} SSH transports to device {device_id} stayed busy for "
+                f"{self.admission.queue_timeout:.0f}s",
+                self.admission.queue_timeout
+            )
+        finally:
+            if waiter in waiters:
+                waiters.remove(waiter)
+            if not waiters and self._room_waiters.get(device_id) is waiters:
+                del self._room_waiters[device_id]
+
+    def _notify_room(self, device_id: int):
+        # Bekleyenler yeniden dener - boşta bağlantı alan veya yer ayıran devam eder, diğerleri tekrar bekler
+        for waiter in self._room_waiters.pop(device_id, []):
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def _discard_when_done(self, connect: asyncio.Future, connector: SSHConnector, device_id: int):
+        """Sonucu beklenmeyen connect bittiğinde açılmış olabilecek transport'u kapatır ve slotu bırakır"""
+        def close(task: asyncio.Future):
+            if not task.cancelled() and task.exception() is None and task.result()[0]:
+                self.stats["abandoned_connects"] += 1
+            connector.disconnect()
+            self._unreserve(device_id)
+            self.admission.release(device_id)
+
+        if connect.done():
+            close(connect)
+        else:
+            connect.add_done_callback(close)
+
+    def _idle_count_for_host(self, device_id: int) -> int:
+        return sum(len(entries) for key, entries in self._idle.items() if key[0] == device_id)
+
+    def _close(self, entry: PooledConnection):
+        device_id = entry.key[0]
+        entry.connector.disconnect()
+        self._unreserve(device_id)
+
+
+# Global instance
+ssh_pool = SSHConnectionPool(
+    idle_ttl=float(os.getenv("SSH_POOL_IDLE_TTL", "300")),
+    max_per_host=int(os.getenv("SSH_POOL_MAX_PER_HOST", "4")),
+    max_lifetime=float(os.getenv("SSH_POOL_MAX_LIFETIME", "3600"))
+)
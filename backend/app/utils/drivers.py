@@ -0,0 +1,272 @@
+"""
+Device Drivers - Cihaz tipine göre oturum hazırlığı, prompt tespiti ve sayfalama
+backend/app/utils/drivers.py
+
+Shell tabanlı sürücüler (Cisco IOS/ASA, Juniper) tek bir PTY kanalı açar, sayfalamayı
+kapatır ve her komutun çıktısını prompt geri geldiği anda döner - timeout beklenmez.
+Exec tabanlı sürücüler (Linux, Windows, MikroTik) exec_command kullanır.
+
+Yeni cihaz tipi eklemek için DeviceDriver alt sınıfı yazıp register_driver ile kaydedin.
+"""
+
+import codecs
+import logging
+import re
+import select
+import socket
+import threading
+import time
+from typing import Dict, List, Optional, Pattern, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Terminal kontrol dizileri (renk, imleç) ve backspace karakterleri
+_ANSI_ESCAPE = re.compile(r"\x1b\[[0-9;?]*[ -/]*[@-~]|\x1b[()][A-Za-z0-9]|\x08+")
+
+
+class DeviceDriver:
+    """Genel sürücü - exec kanalı, sayfalama yok"""
+
+    device_type = "generic"
+    # True ise komutlar kalıcı bir shell kanalında prompt ile sınırlandırılarak çalışır
+    use_shell = False
+    # Son satırın prompt olup olmadığını belirler (satır sonu boşlukları dahil tam eşleşme)
+    prompt_pattern: Pattern = re.compile(r"[^\r\n]*[>#$%]\s*")
+    # Sayfalama işareti - görülünce more_response gönderilir
+    more_pattern: Optional[Pattern] = None
+    more_response = " "
+    # Oturum açıldığında bir kez gönderilen hazırlık komutları
+    prep_commands: List[str] = []
+    # Shell modunda başarısız komutu belirleyen çıktı kalıpları
+    error_pattern: Optional[Pattern] = None
+    # Prompt'u değiştirmeden oturum ayarını değiştiren komutlar (terminal length vb.)
+    session_pattern: Optional[Pattern] = None
+
+    def prepare_command(self, command: str) -> str:
+        return command
+
+    def is_prompt(self, line: str) -> bool:
+        return bool(self.prompt_pattern.fullmatch(line))
+
+    def changes_session(self, command: str) -> bool:
+        return self.session_pattern is not None and bool(self.session_pattern.match(command))
+
+    def error_line(self, output: str) -> Optional[str]:
+        """Çıktıdaki cihaz hata satırını döner - hata yoksa None"""
+        if self.error_pattern is None:
+            return None
+        match = self.error_pattern.search(output)
+        if match is None:
+            return None
+        end = output.find("\n", match.start())
+        return output[match.start():end if end != -1 else None].strip()
+
+    def clean_output(self, raw: str, command: str) -> str:
+        """Komut yankısını, sayfalama kalıntılarını ve son prompt satırını temizler"""
+        text = _ANSI_ESCAPE.sub("", raw).replace("\r\n", "\n").replace("\r", "")
+        lines = text.split("\n")
+        if lines and lines[0].strip().endswith(command.strip()):
+            lines = lines[1:]
+        if lines and self.is_prompt(lines[-1]):
+            lines = lines[:-1]
+        return "\n".join(lines).strip()
+
+
+class CiscoIOSDriver(DeviceDriver):
+    device_type = "cisco_ios"
+    use_shell = True
+    # R1>  R1#  R1(config)#  R1(config-if)#
+    prompt_pattern = re.compile(r"[\w.\-@/:]+(\([\w.\-]+\))?[>#]\s*")
+    more_pattern = re.compile(r" ?--More-- ?")
+    prep_commands = ["terminal length 0", "terminal width 511"]
+    error_pattern = re.compile(r"^% (Invalid input|Incomplete command|Ambiguous command|Unknown command)", re.M)
+    session_pattern = re.compile(r"\s*term(i(n(a(l)?)?)?)?\b", re.I)
+
+
+class CiscoASADriver(CiscoIOSDriver):
+    device_type = "cisco_asa"
+    # ciscoasa>  ciscoasa#  fw/pri/act(config)#
+    prompt_pattern = re.compile(r"[\w.\-@/:]+(\([\w.\-]+\))?[>#]\s*")
+    more_pattern = re.compile(r"<--- More --->")
+    prep_commands = ["terminal pager 0"]
+    error_pattern = re.compile(r"^(ERROR: )?% (Invalid input|Incomplete command|Ambiguous command)", re.M)
+
+
+class JuniperDriver(DeviceDriver):
+    device_type = "juniper"
+    use_shell = True
+    # user@router>  user@router#  {master:0}user@router>
+    prompt_pattern = re.compile(r"(\{[\w:]+\})?[\w.\-]+@[\w.\-]+[>%#]\s*")
+    more_pattern = re.compile(r"---\(more( \d+%)?\)---")
+    prep_commands = ["set cli screen-length 0", "set cli screen-width 0"]
+    error_pattern = re.compile(r"^(syntax error|unknown command|error:)", re.M)
+    session_pattern = re.compile(r"\s*set\s+cli\s", re.I)
+
+
+class MikroTikDriver(DeviceDriver):
+    device_type = "mikrotik"
+    # [admin@MikroTik] >  [admin@MikroTik] /interface>
+    prompt_pattern = re.compile(r"\[[^\]\r\n]+\]\s*[^\r\n]*>\s*")
+    more_pattern = re.compile(r"-- \[Q quit\|D dump\|(C-z pause|down)\]")
+    error_pattern = re.compile(r"^(bad command name|syntax error|expected end of command|failure:)", re.M)
+
+    def prepare_command(self, command: str) -> str:
+        # PTY'siz exec kanalında bile print sonuçlarını tek seferde al
+        stripped = command.strip()
+        if stripped.endswith(" print") or stripped == "print":
+            return f"{stripped} without-paging"
+        return command
+
+
+class LinuxDriver(DeviceDriver):
+    device_type = "ubuntu"
+    prompt_pattern = re.compile(r"[^\r\n]*[$#]\s*")
+
+
+class WindowsDriver(DeviceDriver):
+    device_type = "windows"
+    # C:\Users\admin>  PS C:\Users\admin>
+    prompt_pattern = re.compile(r"(PS )?[A-Za-z]:\\[^\r\n]*>\s*")
+
+
+_DRIVERS: Dict[str, DeviceDriver] = {}
+
+
+def register_driver(device_type: str, driver: DeviceDriver):
+    """Cihaz tipi için sürücü kaydeder (mevcut olanın üzerine yazar)"""
+    _DRIVERS[device_type.lower()] = driver
+
+
+def get_driver(device_type: Optional[str]) -> DeviceDriver:
+    """Cihaz tipinin sürücüsünü döner - bilinmeyen tipler için genel sürücü"""
+    return _DRIVERS.get((device_type or "").lower(), _GENERIC_DRIVER)
+
+
+def list_drivers() -> Dict[str, Dict]:
+    return {
+        device_type: {
+            "mode": "shell" if driver.use_shell else "exec",
+            "prep_commands": driver.prep_commands,
+            "paging_handled": driver.more_pattern is not None
+        }
+        for device_type, driver in _DRIVERS.items()
+    }
+
+
+_GENERIC_DRIVER = DeviceDriver()
+for _driver in (CiscoIOSDriver(), CiscoASADriver(), JuniperDriver(), MikroTikDriver(), LinuxDriver(), WindowsDriver()):
+    register_driver(_driver.device_type, _driver)
+
+
+class DriverShell:
+    """
+    Sürücü kontrollü kalıcı shell kanalı - tüm metotlar bloklayıcıdır, executor thread'inde çağrılır
+    Komutlar tek kanalda sırayla çalışır; prompt görülünce çıktı tamamlanmış sayılır.
+    Bir komut prompt'u değiştirdiyse (configure terminal, enable) veya oturum ayarına
+    dokunduysa kanal 'dirty' olur - bağımsız bir sonraki istek bu modda çalışmamalıdır.
+    """
+
+    def __init__(self, channel, driver: DeviceDriver):
+        self.channel = channel
+        self.driver = driver
+        self.prompt: Optional[str] = None
+        self.dirty = False
+        self._lock = threading.Lock()
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+    @classmethod
+    def open(cls, transport, driver: DeviceDriver, timeout: float = 15) -> "DriverShell":
+        """Kanalı açar, ilk prompt'u bekler ve hazırlık komutlarını gönderir"""
+        channel = transport.open_session(timeout=timeout)
+        # Geniş terminal - satır kaydırma çıktıyı bozmasın
+        channel.get_pty(term="vt100", width=511, height=1000)
+        channel.invoke_shell()
+
+        shell = cls(channel, driver)
+        try:
+            # Bazı cihazlar giriş sonrası prompt'u ancak bir satır sonu alınca basar
+            initial = shell._read_until_prompt(timeout, nudge_after=1.0)
+            shell.prompt = initial.replace("\r", "").rsplit("\n", 1)[-1].strip()
+            for command in driver.prep_commands:
+                shell._send_line(command)
+                shell._read_until_prompt(timeout)
+        except Exception:
+            channel.close()
+            raise
+        return shell
+
+    @property
+    def closed(self) -> bool:
+        return self.channel.closed or self.channel.eof_received
+
+    def run(self, command: str, timeout: float = 30) -> Tuple[str, Optional[str]]:
+        """
+        Komutu gönderir ve prompt geri gelene kadar okur
+        Returns: (output: str, error_line: str | None)
+        """
+        with self._lock:
+            self._drain()
+            self._send_line(command)
+            raw = self._read_until_prompt(timeout)
+            last_line = _ANSI_ESCAPE.sub("", raw.rsplit("\n", 1)[-1]).replace("\r", "").strip()
+            if last_line != self.prompt or self.driver.changes_session(command):
+                self.dirty = True
+        output = self.driver.clean_output(raw, command)
+        return output, self.driver.error_line(output)
+
+    def close(self):
+        self.channel.close()
+
+    # ===========================================
+    # INTERNAL
+    # ===========================================
+
+    def _send_line(self, line: str):
+        self.channel.sendall((line + "\n").encode("utf-8"))
+
+    def _drain(self):
+        """Önceki komuttan kalan asenkron çıktıyı (log mesajları vb.) atar"""
+        while self.channel.recv_ready():
+            self.channel.recv(65536)
+
+    def _read_until_prompt(self, timeout: float, nudge_after: Optional[float] = None) -> str:
+        deadline = time.monotonic() + timeout
+        nudge_at = time.monotonic() + nudge_after if nudge_after else None
+        buffer = ""
+
+        while True:
+            if self.channel.recv_ready():
+                buffer += self._decoder.decode(self.channel.recv(65536))
+
+                # Sayfalama işareti - devam tuşu gönder ve işareti çıktıdan çıkar
+                if self.driver.more_pattern is not None:
+                    tail = buffer[-200:]
+                    match = self.driver.more_pattern.search(tail)
+                    if match:
+                        buffer = buffer[:len(buffer) - len(tail) + match.start()] + tail[match.end():]
+                        self.channel.sendall(self.driver.more_response.encode("utf-8"))
+                        continue
+
+                if self._ends_with_prompt(buffer):
+                    return buffer
+                continue
+
+            if self.closed:
+                raise EOFError("Shell channel closed by device")
+            now = time.monotonic()
+            if now > deadline:
+                raise socket.timeout(f"Prompt not seen within {timeout}s")
+            if nudge_at is not None and now > nudge_at:
+                self.channel.sendall(b"\n")
+                nudge_at = None
+            select.select([self.channel], [], [], min(0.5, max(0.0, deadline - now)))
+
+    def _ends_with_prompt(self, buffer: str) -> bool:
+        last_line = _ANSI_ESCAPE.sub("", buffer.rsplit("\n", 1)[-1]).replace("\r", "")
+        if not self.driver.is_prompt(last_line):
+            return False
+        if self.prompt is None:
+            return True
+        # Çıktı içindeki '>' veya '#' ile biten satırlar prompt sanılmasın - hostname de eşleşmeli
+        base = re.split(r"[(>#$%\s]", self.prompt, 1)[0]
+        return last_line.lstrip().startswith(base)
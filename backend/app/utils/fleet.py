@@ -0,0 +1,182 @@
+"""
+Fleet Executor - Çok sayıda cihaza paralel komut gönderimi
+backend/app/utils/fleet.py
+"""
+
+import asyncio
+import logging
+import os
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from .connection_pool import SSHConnectionPool, ssh_pool
+from .reachability import ReachabilityMonitor, reachability
+from .result_cache import result_cache, is_mutating
+from .ssh_connector import NetworkDeviceManager
+
+logger = logging.getLogger(__name__)
+
+FLEET_MAX_CONCURRENCY = int(os.getenv("FLEET_MAX_CONCURRENCY", "50"))
+FLEET_DEVICE_TIMEOUT = float(os.getenv("FLEET_DEVICE_TIMEOUT", "60"))
+
+
+def resolve_fleet_commands(device_type: str, commands: Optional[List[str]], command_key: Optional[str]) -> List[str]:
+    """
+    Cihaz için çalıştırılacak komutları belirler
+    command_key verilmişse NetworkDeviceManager şablonundan cihaz tipine uygun komut seçilir
+    """
+    resolved = list(commands or [])
+    if command_key:
+        template = NetworkDeviceManager.get_device_commands(device_type).get(command_key)
+        if template:
+            resolved.insert(0, template)
+    return resolved
+
+
+class FleetExecutor:
+    """Global ve cihaz tipi bazlı eşzamanlılık limitleriyle fleet komut çalıştırıcı"""
+
+    def __init__(
+        self,
+        pool: SSHConnectionPool = ssh_pool,
+        max_concurrency: int = FLEET_MAX_CONCURRENCY,
+        per_type_limits: Optional[Dict[str, int]] = None,
+        device_timeout: float = FLEET_DEVICE_TIMEOUT,
+        reachability_monitor: Optional[ReachabilityMonitor] = reachability,
+        skip_unreachable: bool = True
+    ):
+        self.pool = pool
+        self.device_timeout = device_timeout
+        self.reachability = reachability_monitor
+        self.skip_unreachable = skip_unreachable
+        self._global = asyncio.Semaphore(max(1, max_concurrency))
+        self._per_type = {
+            device_type.lower(): asyncio.Semaphore(max(1, limit))
+            for device_type, limit in (per_type_limits or {}).items()
+        }
+
+    async def run(
+        self,
+        devices: List[Dict],
+        username: str,
+        password: str,
+        port: int = 22,
+        commands: Optional[List[str]] = None,
+        command_key: Optional[str] = None,
+        delay: Optional[float] = None
+    ) -> List[Dict]:
+        """
+        Tüm cihazlarda komutları paralel çalıştırır
+        Returns: Cihaz sırasını koruyan sonuç listesi
+        """
+        tasks = [
+            self._run_device(device, username, password, port, commands, command_key, delay)
+            for device in devices
+        ]
+        return await asyncio.gather(*tasks)
+
+    async def _run_device(
+        self,
+        device: Dict,
+        username: str,
+        password: str,
+        port: int,
+        commands: Optional[List[str]],
+        command_key: Optional[str],
+        delay: Optional[float]
+    ) -> Dict:
+        device_type = device.get("type", "unknown").lower()
+        device_info = {
+            "id": device.get("id"),
+            "name": device.get("name"),
+            "ip": device.get("ip"),
+            "type": device.get("type")
+        }
+
+        device_commands = resolve_fleet_commands(device_type, commands, command_key)
+        if not device_commands:
+            return {
+                "device": device_info,
+                "status": "skipped",
+                "message": f"No command template '{command_key}' for device type {device_type}",
+                "results": [],
+                "execution_time": 0.0
+            }
+
+        # Son taramada kapalı görünen cihaza SSH bağlantı timeout'unu beklemeden geç
+        if self.skip_unreachable and self.reachability is not None and self.reachability.is_down(device_info["id"]):
+            state = self.reachability.get_state(device_info["id"])
+            return {
+                "device": device_info,
+                "status": "unreachable",
+                "message": f"Device unreachable in last sweep: {state.get('error')}",
+                "results": [],
+                "execution_time": 0.0
+            }
+
+        type_semaphore = self._per_type.get(device_type)
+        start_time = datetime.now()
+
+        # Önce tip limiti beklenir - global slot yalnızca gerçekten çalışan cihazlarca tutulur,
+        # sıkı limitli tek bir tipin kuyruğu diğer tipleri bekletmez
+        if type_semaphore is not None:
+            await type_semaphore.acquire()
+        try:
+            async with self._global:
+                status, message, results = await asyncio.wait_for(
+                    self._execute(device, username, password, port, device_commands, delay),
+                    timeout=self.device_timeout
+                )
+        except asyncio.TimeoutError:
+            status, message, results = "timeout", f"Device did not finish within {self.device_timeout}s", []
+        except Exception as e:
+            logger.error(f"Fleet execution error for device {device_info['id']}: {e}")
+            status, message, results = "error", str(e), []
+        finally:
+            if type_semaphore is not None:
+                type_semaphore.release()
+
+        return {
+            "device": device_info,
+            "status": status,
+            "message": message,
+            "results": results,
+            "timestamp": start_time.isoformat(),
+            "execution_time": (datetime.now() - start_time).total_seconds()
+        }
+
+    async def _execute(
+        self,
+        device: Dict,
+        username: str,
+        password: str,
+        port: int,
+        commands: List[str],
+        delay: Optional[float]
+    ):
+        if any(is_mutating(command) for command in commands):
+            result_cache.invalidate_device(device["id"])
+        async with self.pool.connection(device, username, password, port) as (connector, success, message):
+            if not success:
+                return "failed", message, []
+
+            results = await connector.execute_multiple_commands(commands, delay)
+
+        for result in results:
+            result_cache.record(
+                device["id"], username, password,
+                result["command"], result["success"], result["stdout"], result["stderr"]
+            )
+
+        failed = sum(1 for r in results if not r["success"])
+        if failed:
+            return "failed", f"{failed}/{len(results)} commands failed", results
+        return "success", f"{len(results)} commands executed", results
+
+
+def summarize_fleet_results(results: List[Dict]) -> Dict:
+    """Fleet sonuçlarını duruma göre sayar"""
+    summary = {"total": len(results), "success": 0, "failed": 0, "timeout": 0, "skipped": 0, "unreachable": 0, "error": 0, "not_found": 0}
+    for result in results:
+        summary[result["status"]] = summary.get(result["status"], 0) + 1
+    return summary
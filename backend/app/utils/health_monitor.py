@@ -0,0 +1,287 @@
+"""
+Health Monitor - Cihazları arka planda periyodik olarak yoklar ve sonuçları önbellekte tutar
+backend/app/utils/health_monitor.py
+"""
+
+import asyncio
+import logging
+import os
+import random
+from collections import deque
+from datetime import datetime
+from typing import Deque, Dict, List, Optional, Tuple
+
+from ..json_db import get_devices
+from .connection_pool import SSHConnectionPool, ssh_pool
+from .reachability import ReachabilityMonitor, reachability
+from .ssh_connector import NetworkDeviceManager
+
+logger = logging.getLogger(__name__)
+
+HEALTH_MONITOR_ENABLED = os.getenv("HEALTH_MONITOR_ENABLED", "false").lower() in ("1", "true", "yes")
+HEALTH_MONITOR_USERNAME = os.getenv("HEALTH_MONITOR_USERNAME", "")
+HEALTH_MONITOR_PASSWORD = os.getenv("HEALTH_MONITOR_PASSWORD", "")
+HEALTH_MONITOR_PORT = int(os.getenv("HEALTH_MONITOR_PORT", "22"))
+HEALTH_MONITOR_INTERVAL = float(os.getenv("HEALTH_MONITOR_INTERVAL", "300"))
+# Aralığın oranı olarak jitter (0.1 = ±%10)
+HEALTH_MONITOR_JITTER = float(os.getenv("HEALTH_MONITOR_JITTER", "0.1"))
+HEALTH_MONITOR_CONCURRENCY = int(os.getenv("HEALTH_MONITOR_CONCURRENCY", "20"))
+HEALTH_MONITOR_TIMEOUT = float(os.getenv("HEALTH_MONITOR_TIMEOUT", "60"))
+HEALTH_HISTORY_SIZE = int(os.getenv("HEALTH_HISTORY_SIZE", "20"))
+# Boşsa cihaz profilindeki bekleme kullanılır
+HEALTH_COMMAND_DELAY = float(os.getenv("HEALTH_COMMAND_DELAY")) if os.getenv("HEALTH_COMMAND_DELAY") else None
+
+
+def evaluate_health(results: List[Dict]) -> Tuple[str, str, float, int]:
+    """
+    Komut sonuçlarından sağlık durumunu hesaplar
+    Returns: (status, status_icon, health_score, successful_commands)
+    """
+    if not results:
+        return "unhealthy", "❤️", 0, 0
+
+    successful_commands = sum(1 for r in results if r["success"])
+    health_score = round((successful_commands / len(results)) * 100, 2)
+
+    if health_score >= 80:
+        return "healthy", "💚", health_score, successful_commands
+    if health_score >= 50:
+        return "degraded", "💛", health_score, successful_commands
+    return "unhealthy", "❤️", health_score, successful_commands
+
+
+def summarize_health(device_id: int, status: str, health_score: float, results: List[Dict],
+                     source: str, error: Optional[str] = None, execution_time: float = 0.0) -> Dict:
+    """Önbellekte tutulacak kompakt sağlık kaydı - komut çıktıları saklanmaz"""
+    successful_commands = sum(1 for r in results if r["success"])
+    return {
+        "device_id": device_id,
+        "status": status,
+        "health_score": health_score,
+        "connection_status": "failed" if error else "successful",
+        "error": error,
+        "commands_executed": len(results),
+        "successful_commands": successful_commands,
+        "failed_commands": len(results) - successful_commands,
+        "commands": [
+            {"command": r["command"], "success": r["success"], "execution_time": r.get("execution_time")}
+            for r in results
+        ],
+        "source": source,
+        "timestamp": datetime.now().isoformat(),
+        "execution_time": execution_time
+    }
+
+
+class HealthMonitor:
+    """Periyodik sağlık yoklaması ve cihaz başına ring buffer sonuç önbelleği"""
+
+    def __init__(
+        self,
+        pool: SSHConnectionPool = ssh_pool,
+        username: str = HEALTH_MONITOR_USERNAME,
+        password: str = HEALTH_MONITOR_PASSWORD,
+        port: int = HEALTH_MONITOR_PORT,
+        interval: float = HEALTH_MONITOR_INTERVAL,
+        jitter: float = HEALTH_MONITOR_JITTER,
+        max_concurrency: int = HEALTH_MONITOR_CONCURRENCY,
+        device_timeout: float = HEALTH_MONITOR_TIMEOUT,
+        history_size: int = HEALTH_HISTORY_SIZE,
+        command_delay: Optional[float] = HEALTH_COMMAND_DELAY,
+        reachability_monitor: Optional[ReachabilityMonitor] = reachability
+    ):
+        self.pool = pool
+        self.username = username
+        self.password = password
+        self.port = port
+        self.interval = interval
+        self.jitter = jitter
+        self.max_concurrency = max(1, max_concurrency)
+        self.device_timeout = device_timeout
+        self.history_size = max(1, history_size)
+        self.command_delay = command_delay
+        self.reachability = reachability_monitor
+
+        self._history: Dict[int, Deque[Dict]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+        self.stats = {
+            "cycles": 0,
+            "probes": 0,
+            "probe_errors": 0,
+            "unreachable_skips": 0,
+            "last_cycle_started": None,
+            "last_cycle_duration": None
+        }
+
+    # ===========================================
+    # CACHE
+    # ===========================================
+
+    def record(self, device_id: int, entry: Dict):
+        """Cihazın ring buffer'ına sonuç ekler - en eski kayıt otomatik düşer"""
+        history = self._history.get(device_id)
+        if history is None:
+            history = self._history[device_id] = deque(maxlen=self.history_size)
+        history.append(entry)
+
+    def latest(self, device_id: int) -> Optional[Dict]:
+        history = self._history.get(device_id)
+        return history[-1] if history else None
+
+    def history(self, device_id: int) -> List[Dict]:
+        return list(self._history.get(device_id, ()))
+
+    def latest_all(self) -> Dict[int, Dict]:
+        return {device_id: history[-1] for device_id, history in self._history.items() if history}
+
+    def forget(self, device_id: int):
+        self._history.pop(device_id, None)
+
+    # ===========================================
+    # PROBING
+    # ===========================================
+
+    async def probe_device(self, device: Dict, source: str = "scheduled") -> Dict:
+        """Tek cihazda sağlık komutlarını çalıştırır ve sonucu önbelleğe yazar"""
+        device_type = device.get("type", "unknown")
+        health_commands = NetworkDeviceManager.get_health_check_commands(device_type)
+        start_time = datetime.now()
+        results: List[Dict] = []
+        error = None
+
+        try:
+            async with self.pool.connection(
+                device,
+                username=self.username,
+                password=self.password,
+                port=self.port,
+                timeout=20
+            ) as (connector, success, message):
+                if success:
+                    results = await asyncio.wait_for(
+                        connector.execute_multiple_commands(health_commands, delay=self.command_delay),
+                        timeout=self.device_timeout
+                    )
+                else:
+                    error = message
+        except asyncio.TimeoutError:
+            error = f"Health probe did not finish within {self.device_timeout}s"
+        except Exception as e:
+            error = str(e)
+
+        if error:
+            self.stats["probe_errors"] += 1
+            status, health_score = "unhealthy", 0
+        else:
+            status, _, health_score, _ = evaluate_health(results)
+
+        self.stats["probes"] += 1
+        entry = summarize_health(
+            device["id"], status, health_score, results, source,
+            error=error, execution_time=(datetime.now() - start_time).total_seconds()
+        )
+        self.record(device["id"], entry)
+        return entry
+
+    def record_unreachable(self, device_id: int):
+        """SSH denemeden, erişilebilirlik taraması sonucuyla sağlıksız kaydı yazar"""
+        state = self.reachability.get_state(device_id) if self.reachability else None
+        error = f"Unreachable: {state.get('error') if state else 'unknown'}"
+        self.stats["unreachable_skips"] += 1
+        self.record(device_id, summarize_health(device_id, "unhealthy", 0, [], "reachability", error=error))
+
+    async def probe_all(self, devices: List[Dict]):
+        """Tüm cihazları eşzamanlılık limiti ve başlangıç dağılımıyla yoklar"""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        # Yoklamaları jitter penceresine yay - tüm cihazlara aynı anda bağlanılmasın
+        spread = self.interval * self.jitter
+
+        async def run(device: Dict):
+            if spread > 0:
+                await asyncio.sleep(random.uniform(0, spread))
+            async with semaphore:
+                await self.probe_device(device)
+
+        await asyncio.gather(*(run(device) for device in devices), return_exceptions=True)
+
+    async def run_cycle(self, devices: List[Dict]):
+        """Bir yoklama turu - envanterden silinen cihazların geçmişi de temizlenir"""
+        start_time = datetime.now()
+        self.stats["last_cycle_started"] = start_time.isoformat()
+
+        known_ids = {device["id"] for device in devices}
+        for device_id in list(self._history.keys()):
+            if device_id not in known_ids:
+                self.forget(device_id)
+
+        # Ucuz TCP/banner taraması - kapalı cihazlar için SSH timeout'u beklenmez
+        if self.reachability is not None:
+            await self.reachability.sweep(devices, port=self.port)
+            reachable = []
+            for device in devices:
+                if self.reachability.is_down(device["id"]):
+                    self.record_unreachable(device["id"])
+                else:
+                    reachable.append(device)
+            devices = reachable
+
+        await self.probe_all(devices)
+
+        self.stats["cycles"] += 1
+        self.stats["last_cycle_duration"] = (datetime.now() - start_time).total_seconds()
+        logger.info(f"Health monitor cycle probed {len(devices)} devices in {self.stats['last_cycle_duration']:.2f}s")
+
+    # ===========================================
+    # SCHEDULER
+    # ===========================================
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> bool:
+        """Zamanlayıcıyı başlatır - kimlik bilgisi yoksa başlatmaz"""
+        if not self.username or not self.password:
+            logger.warning("Health monitor not started: HEALTH_MONITOR_USERNAME/PASSWORD are not set")
+            return False
+        if not self.running:
+            self._task = asyncio.create_task(self._loop())
+            logger.info(f"Health monitor started (interval={self.interval}s, concurrency={self.max_concurrency})")
+        return True
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _loop(self):
+        # Uygulama açılışında tüm yoklamalar aynı anda başlamasın
+        await asyncio.sleep(random.uniform(0, self.interval * self.jitter))
+        while True:
+            try:
+                await self.run_cycle(get_devices())
+            except Exception as e:
+                logger.error(f"Health monitor cycle error: {e}")
+
+            delay = self.interval * (1 + random.uniform(-self.jitter, self.jitter))
+            await asyncio.sleep(max(1.0, delay))
+
+    def get_stats(self) -> Dict:
+        return {
+            **self.stats,
+            "running": self.running,
+            "interval": self.interval,
+            "jitter": self.jitter,
+            "max_concurrency": self.max_concurrency,
+            "history_size": self.history_size,
+            "devices_tracked": len(self._history)
+        }
+
+
+# Global instance
+health_monitor = HealthMonitor()
@@ -0,0 +1,285 @@
+"""
+Metrics - Süreç içi sayaç/gauge/histogram kayıt defteri ve Prometheus metin çıktısı
+backend/app/utils/metrics.py
+
+Harici bağımlılık yoktur; ölçüm başına maliyet bir kilit + sözlük güncellemesidir.
+GET /metrics çıktısı Prometheus text format 0.0.4 ile uyumludur.
+"""
+
+import bisect
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+LabelValues = Tuple[str, ...]
+
+# Saniye cinsinden varsayılan gecikme kovaları - ms altı DB işlemlerinden dakikalık SSH komutlarına
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    metric_type = "untyped"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+
+    def _key(self, label_values: Sequence) -> LabelValues:
+        if len(label_values) != len(self.label_names):
+            raise ValueError(f"{self.name} expects labels {self.label_names}, got {tuple(label_values)}")
+        return tuple(str(v) for v in label_values)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.metric_type}"]
+        lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    metric_type = "counter"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        super().__init__(name, documentation, label_names)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *label_values, amount: float = 1.0):
+        key = self._key(label_values)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, *label_values) -> float:
+        return self._values.get(self._key(label_values), 0.0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.label_names, key)} {_format_value(v)}" for key, v in items]
+
+
+class Gauge(Counter):
+    metric_type = "gauge"
+
+    def dec(self, *label_values, amount: float = 1.0):
+        self.inc(*label_values, amount=-amount)
+
+    def set(self, value: float, *label_values):
+        key = self._key(label_values)
+        with self._lock:
+            self._values[key] = value
+
+    @contextmanager
+    def track_inprogress(self, *label_values):
+        self.inc(*label_values)
+        try:
+            yield
+        finally:
+            self.dec(*label_values)
+
+
+class Histogram(_Metric):
+    metric_type = "histogram"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets))
+        # label -> [kova sayıları (kümülatif değil)..., +Inf sayısı], toplam
+        self._counts: Dict[LabelValues, List[int]] = {}
+        self._sums: Dict[LabelValues, float] = {}
+
+    def observe(self, value: float, *label_values):
+        key = self._key(label_values)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._counts.get(key)
+            if counts is None:
+                counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+                self._sums[key] = 0.0
+            counts[index] += 1
+            self._sums[key] += value
+
+    @contextmanager
+    def time(self, *label_values):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *label_values)
+
+    def count(self, *label_values) -> int:
+        return sum(self._counts.get(self._key(label_values), ()))
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = [(key, list(counts), self._sums[key]) for key, counts in self._counts.items()]
+        lines = []
+        for key, counts, total in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.label_names, key, le)} {cumulative}")
+            labels = _format_labels(self.label_names, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Metrik tanımları ve scrape anında değer üreten gauge callback'leri"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._callbacks: List[Tuple[str, str, Sequence[str], Callable[[], Iterable[Tuple[Sequence, float]]]]] = []
+
+    def _register(self, metric: _Metric) -> _Metric:
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, label_names))
+
+    def gauge(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, label_names))
+
+    def histogram(self, name: str, documentation: str, label_names: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, label_names, buckets))
+
+    def gauge_callback(self, name: str, documentation: str, label_names: Sequence[str],
+                       collect: Callable[[], Iterable[Tuple[Sequence, float]]]):
+        """Değeri scrape anında hesaplanan gauge (havuz boyutu, önbellek byte'ı vb.)"""
+        self._callbacks.append((name, documentation, tuple(label_names), collect))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        for name, documentation, label_names, collect in self._callbacks:
+            try:
+                samples = list(collect())
+            except Exception as e:
+                logger.error(f"Metrics callback {name} failed: {e}")
+                continue
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} gauge")
+            for label_values, value in samples:
+                lines.append(f"{name}{_format_labels(label_names, label_values)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """
+    Saf ASGI middleware - her HTTP isteğinin süresini route şablonuna göre ölçer
+    Etiket olarak ham path değil '/devices/{device_id}' gibi şablon kullanılır (sınırlı kardinalite)
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._route_paths: Dict[Callable, str] = {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        http_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            http_in_flight.dec()
+            route = self._route_template(scope)
+            http_request_duration.observe(
+                time.perf_counter() - start, scope["method"], route, str(status["code"])
+            )
+
+    def _route_template(self, scope) -> str:
+        # Router eşleşen endpoint'i scope'a yazar; şablon yol app.routes'tan bir kez çözülür
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return "unmatched"
+        path = self._route_paths.get(endpoint)
+        if path is None:
+            app = scope.get("app")
+            path = "unmatched"
+            for route in getattr(app, "routes", ()):
+                if getattr(route, "endpoint", None) is endpoint:
+                    path = route.path
+                    break
+            self._route_paths[endpoint] = path
+        return path
+
+
+# Global registry ve hot-path metrikleri
+metrics = MetricsRegistry()
+
+http_request_duration = metrics.histogram(
+    "pam_http_request_duration_seconds", "HTTP request latency by route template",
+    ("method", "route", "status")
+)
+http_in_flight = metrics.gauge("pam_http_requests_in_flight", "HTTP requests currently being served")
+
+ssh_connect_duration = metrics.histogram(
+    "pam_ssh_connect_duration_seconds", "SSH connect + auth latency", ("device_type", "result")
+)
+ssh_command_duration = metrics.histogram(
+    "pam_ssh_command_duration_seconds", "SSH command latency", ("device_type", "result")
+)
+ssh_sessions_active = metrics.gauge(
+    "pam_ssh_sessions_active", "Open SSH transports (pooled and in use)", ("device_type",)
+)
+ssh_commands_in_flight = metrics.gauge(
+    "pam_ssh_commands_in_flight", "SSH commands currently executing", ("device_type",)
+)
+ssh_auth_failures = metrics.counter(
+    "pam_ssh_auth_failures_total", "SSH authentication failures", ("device_type",)
+)
+ssh_connect_errors = metrics.counter(
+    "pam_ssh_connect_errors_total", "SSH connection failures other than authentication", ("device_type", "reason")
+)
+
+db_operation_duration = metrics.histogram(
+    "pam_db_operation_duration_seconds", "Storage operation latency", ("backend", "operation")
+)
+db_json_parse_duration = metrics.histogram(
+    "pam_db_json_parse_seconds", "Time spent parsing the JSON snapshot from disk"
+)
@@ -0,0 +1,382 @@
+"""
+Output Parsers - Bilinen komut çıktılarını yapılandırılmış kayıtlara çevirir
+backend/app/utils/parsers.py
+
+Şablonlar modül yüklenirken bir kez derlenir ve cihaz tipine göre kaydedilir.
+Her ayrıştırma bir ParseStream üzerinden satır satır ilerler; çıktı parça parça
+(SSE akışı gibi) beslenebilir ve tamamlanan kayıtlar hemen döner.
+"""
+
+import logging
+import re
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Pattern, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Terminal kontrol dizileri - bazı cihazlar exec çıktısına da renk kodu ekler
+_ANSI_ESCAPE = re.compile(r"\x1b\[[0-9;?]*[ -/]*[@-~]")
+
+
+def _to_int(value: Optional[str]) -> Optional[int]:
+    try:
+        return int(value) if value not in (None, "") else None
+    except ValueError:
+        return None
+
+
+class OutputParser:
+    """Derlenmiş şablon - durum tutmaz, her çıktı için stream() ile yeni ParseStream açılır"""
+
+    kind = "table"
+
+    def __init__(self, name: str, command: str):
+        self.name = name
+        # Komut eşleşmesi (kısaltmalar dahil), ör. r"sh(ow)?\s+ip\s+int(erface)?\s+br(ief)?"
+        self.command_pattern: Pattern = re.compile(rf"^{command}$", re.IGNORECASE)
+
+    def matches(self, command: str) -> bool:
+        return bool(self.command_pattern.match(command))
+
+    def stream(self) -> "ParseStream":
+        return ParseStream(self)
+
+    def parse(self, output: str) -> List[Dict]:
+        stream = self.stream()
+        records = stream.feed(output)
+        records.extend(stream.close())
+        return records
+
+    # Alt sınıfların uyguladığı satır arayüzü - state: stream başına sözlük
+    def parse_line(self, state: Dict, line: str) -> List[Dict]:
+        raise NotImplementedError
+
+    def finish(self, state: Dict) -> List[Dict]:
+        return []
+
+
+class ParseStream:
+    """Parça parça gelen çıktıyı tam satırlara böler ve şablona verir"""
+
+    def __init__(self, parser: OutputParser):
+        self.parser = parser
+        self.state: Dict = {}
+        self.records_emitted = 0
+        self._pending = ""
+
+    def feed(self, chunk: str) -> List[Dict]:
+        """Parçadaki tamamlanmış satırları işler - son yarım satır bir sonraki parçaya kalır"""
+        if not chunk:
+            return []
+        data = self._pending + chunk
+        cut = data.rfind("\n")
+        if cut == -1:
+            self._pending = data
+            return []
+        self._pending = data[cut + 1:]
+        records: List[Dict] = []
+        parse_line = self.parser.parse_line
+        state = self.state
+        for line in data[:cut].split("\n"):
+            if "\x1b" in line:
+                line = _ANSI_ESCAPE.sub("", line)
+            records.extend(parse_line(state, line.rstrip("\r")))
+        self.records_emitted += len(records)
+        return records
+
+    def close(self) -> List[Dict]:
+        records: List[Dict] = []
+        if self._pending:
+            records.extend(self.parser.parse_line(self.state, self._pending.rstrip("\r")))
+            self._pending = ""
+        records.extend(self.parser.finish(self.state))
+        self.records_emitted += len(records)
+        return records
+
+
+class RegexTableParser(OutputParser):
+    """Her satırı tek regex ile eşleyen tablolar - başlık ve eşleşmeyen satırlar atlanır"""
+
+    def __init__(self, name: str, command: str, line_pattern: str,
+                 transform: Optional[Callable[[Dict], Dict]] = None):
+        super().__init__(name, command)
+        self.line_pattern = re.compile(line_pattern)
+        self.transform = transform
+
+    def parse_line(self, state: Dict, line: str) -> List[Dict]:
+        match = self.line_pattern.match(line)
+        if match is None:
+            return []
+        record = match.groupdict()
+        return [self.transform(record) if self.transform else record]
+
+
+class ColumnTableParser(OutputParser):
+    """
+    Başlık satırıyla tanımlanan tablolar (MikroTik print)
+    Bayrak sütunu '#' ile ilk isimli sütun arasındaki alandan okunur, kalan değerler
+    başlık sırasıyla atanır. ';;; yorum' satırları sonraki kayda eklenir.
+    """
+
+    def __init__(self, name: str, command: str, first_column: str,
+                 transform: Optional[Callable[[Dict], Dict]] = None):
+        super().__init__(name, command)
+        self.first_column = first_column
+        self.header_pattern = re.compile(rf"^\s*#\s+.*\b{re.escape(first_column)}\b")
+        self.row_pattern = re.compile(r"^\s*(\d+)\s")
+        self.transform = transform
+
+    def parse_line(self, state: Dict, line: str) -> List[Dict]:
+        columns = state.get("columns")
+        if columns is None:
+            if self.header_pattern.match(line):
+                state["name_offset"] = line.index(self.first_column)
+                state["columns"] = [c.lower().replace("-", "_") for c in line[state["name_offset"]:].split()]
+            return []
+
+        stripped = line.strip()
+        if stripped.startswith(";;;"):
+            state["comment"] = stripped[3:].strip()
+            return []
+        match = self.row_pattern.match(line)
+        if match is None:
+            return []
+
+        offset = state["name_offset"]
+        record: Dict = {"index": int(match.group(1)), "flags": line[match.end():offset].strip()}
+        values = line[offset:].split()
+        for column, value in zip(columns, values):
+            record[column] = value
+        if "comment" in state:
+            record["comment"] = state.pop("comment")
+        return [self.transform(record) if self.transform else record]
+
+
+class BlockParser(OutputParser):
+    """
+    Başlık satırıyla başlayan çok satırlı bloklar (ip addr show)
+    Blok, bir sonraki başlık görülünce veya çıktı bitince kayıt olarak döner
+    """
+
+    def __init__(self, name: str, command: str, start_pattern: str,
+                 field_patterns: List[Tuple[str, str]], list_fields: Tuple[str, ...] = ()):
+        super().__init__(name, command)
+        self.start_pattern = re.compile(start_pattern)
+        # (alan, regex) - list_fields içindekiler her eşleşmede listeye eklenir
+        self.field_patterns = [(field, re.compile(pattern)) for field, pattern in field_patterns]
+        self.list_fields = list_fields
+
+    def parse_line(self, state: Dict, line: str) -> List[Dict]:
+        match = self.start_pattern.match(line)
+        if match is not None:
+            completed = self.finish(state)
+            record = {k: v for k, v in match.groupdict().items() if v is not None}
+            for field in self.list_fields:
+                record[field] = []
+            state["current"] = record
+            return completed
+
+        current = state.get("current")
+        if current is None:
+            return []
+        for field, pattern in self.field_patterns:
+            match = pattern.match(line)
+            if match is None:
+                continue
+            values = {k: v for k, v in match.groupdict().items() if v is not None}
+            if field in self.list_fields:
+                current[field].append(values)
+            else:
+                current.update(values)
+            break
+        return []
+
+    def finish(self, state: Dict) -> List[Dict]:
+        current = state.pop("current", None)
+        return [self.transform(current)] if current is not None else []
+
+    def transform(self, record: Dict) -> Dict:
+        return record
+
+
+class FactsParser(OutputParser):
+    """Serbest metinden tek kayıt çıkarır (show version) - her alanın ilk eşleşmesi geçerli"""
+
+    kind = "facts"
+
+    def __init__(self, name: str, command: str, field_patterns: List[str], key_value: bool = False):
+        super().__init__(name, command)
+        self.field_patterns = [re.compile(pattern) for pattern in field_patterns]
+        # "anahtar: değer" satırlarını da kayda ekle (MikroTik print, lsb_release)
+        self.key_value = key_value
+        self._key_value_pattern = re.compile(r"^\s*([\w][\w .\-/]*?)\s*:\s+(.*?)\s*$")
+
+    def parse_line(self, state: Dict, line: str) -> List[Dict]:
+        facts = state.setdefault("facts", {})
+        for pattern in self.field_patterns:
+            match = pattern.search(line)
+            if match is not None:
+                for key, value in match.groupdict().items():
+                    if value is not None and key not in facts:
+                        facts[key] = value.strip()
+        if self.key_value:
+            match = self._key_value_pattern.match(line)
+            if match is not None:
+                key = match.group(1).lower().replace(" ", "_").replace("-", "_")
+                facts.setdefault(key, match.group(2))
+        return []
+
+    def finish(self, state: Dict) -> List[Dict]:
+        facts = state.pop("facts", None)
+        return [facts] if facts else []
+
+
+# ===========================================
+# TEMPLATES
+# ===========================================
+
+def _cisco_interface(record: Dict) -> Dict:
+    record["up"] = record["status"] == "up" and record["protocol"] == "up"
+    return record
+
+
+def _mikrotik_interface(record: Dict) -> Dict:
+    flags = record.get("flags", "")
+    record["disabled"] = "X" in flags
+    record["running"] = "R" in flags
+    record["up"] = record["running"] and not record["disabled"]
+    for key in ("actual_mtu", "l2mtu", "max_l2mtu", "mtu"):
+        if key in record:
+            record[key] = _to_int(record[key])
+    return record
+
+
+class _LinuxAddrParser(BlockParser):
+    def transform(self, record: Dict) -> Dict:
+        flags = record.get("flags", "")
+        record["flags"] = flags.split(",") if flags else []
+        record["mtu"] = _to_int(record.get("mtu"))
+        record["index"] = _to_int(record.get("index"))
+        record["up"] = "UP" in record["flags"] and "LOWER_UP" in record["flags"]
+        for address in record.get("ipv4", []) + record.get("ipv6", []):
+            address["prefix"] = _to_int(address.get("prefix"))
+        return record
+
+
+_IOS_BRIEF = (
+    r"^(?P<interface>\S+)\s+(?P<ip_address>\S+)\s+(?P<ok>YES|NO)\s+(?P<method>\S+)\s+"
+    r"(?P<status>administratively down|\S+)\s+(?P<protocol>\S+)\s*$"
+)
+
+_SHOW_VERSION = r"sh(ow?)?\s+ver(sion?)?"
+
+_PARSERS: Dict[str, List[OutputParser]] = {
+    "cisco_ios": [
+        RegexTableParser("cisco_ios_ip_interface_brief", r"sh(ow?)?\s+ip\s+int(e(r(f(a(ce?)?)?)?)?)?\s+br(ief?)?",
+                         _IOS_BRIEF, _cisco_interface),
+        FactsParser("cisco_ios_show_version", _SHOW_VERSION, [
+            r"Cisco IOS.*Software.*Version (?P<version>[^,\s]+)",
+            r"^(?P<hostname>\S+) uptime is (?P<uptime>.+)$",
+            r"System image file is \"(?P<image>[^\"]+)\"",
+            r"^[Cc]isco (?P<model>\S+) .*(processor|bytes of memory)",
+            r"Processor board ID (?P<serial>\S+)",
+            r"^Configuration register is (?P<config_register>\S+)",
+        ]),
+    ],
+    "cisco_asa": [
+        RegexTableParser("cisco_asa_interface_ip_brief", r"sh(ow?)?\s+int(e(r(f(a(ce?)?)?)?)?)?\s+ip\s+br(ief?)?",
+                         _IOS_BRIEF, _cisco_interface),
+        FactsParser("cisco_asa_show_version", _SHOW_VERSION, [
+            r"Adaptive Security Appliance Software Version (?P<version>\S+)",
+            r"^(?P<hostname>\S+) up (?P<uptime>.+)$",
+            r"^Hardware:\s+(?P<model>[^,]+)",
+            r"^Serial Number: (?P<serial>\S+)",
+        ]),
+    ],
+    "juniper": [
+        FactsParser("juniper_show_version", _SHOW_VERSION, [
+            r"^Hostname: (?P<hostname>\S+)",
+            r"^Model: (?P<model>\S+)",
+            r"^Junos: (?P<version>\S+)",
+            r"JUNOS .*\[(?P<version>[^\]]+)\]",
+        ]),
+    ],
+    "mikrotik": [
+        ColumnTableParser("mikrotik_interface_print", r"/interface\s+print(\s+without-paging)?", "NAME",
+                          _mikrotik_interface),
+        FactsParser("mikrotik_system_resource", r"/system\s+resource\s+print(\s+without-paging)?", [], key_value=True),
+    ],
+    "ubuntu": [
+        _LinuxAddrParser(
+            "linux_ip_addr_show", r"ip\s+(-\w+\s+)*a(d(dr?)?)?(\s+show?)?",
+            r"^(?P<index>\d+):\s+(?P<name>[^:@\s]+)(@\S+)?:\s+<(?P<flags>[^>]*)>(.*\bmtu (?P<mtu>\d+))?"
+            r"(.*\bstate (?P<state>\S+))?",
+            [
+                ("mac", r"^\s+link/\S+\s+(?P<mac>[0-9a-f:]+)"),
+                ("ipv4", r"^\s+inet (?P<address>[\d.]+)/(?P<prefix>\d+)(\s+brd (?P<broadcast>[\d.]+))?"),
+                ("ipv6", r"^\s+inet6 (?P<address>[0-9a-f:]+)/(?P<prefix>\d+)"),
+            ],
+            list_fields=("ipv4", "ipv6")
+        ),
+        FactsParser("linux_lsb_release", r"lsb_release\s+-a", [], key_value=True),
+    ],
+}
+
+
+def register_parser(device_type: str, parser: OutputParser):
+    """Cihaz tipine şablon ekler - aynı komutla eşleşen önceki şablonlardan önce denenir"""
+    _PARSERS.setdefault(device_type.lower(), []).insert(0, parser)
+    get_parser.cache_clear()
+
+
+@lru_cache(maxsize=1024)
+def get_parser(device_type: Optional[str], command: str) -> Optional[OutputParser]:
+    """(cihaz tipi, komut) için şablonu döner - sonuç önbelleklenir"""
+    normalized = " ".join((command or "").split())
+    for parser in _PARSERS.get((device_type or "").lower(), ()):
+        if parser.matches(normalized):
+            return parser
+    return None
+
+
+def parse_output(device_type: Optional[str], command: str, output: str) -> Optional[Dict]:
+    """
+    Komut çıktısını ayrıştırır - şablon yoksa None
+    Returns: {parser, kind, records, count}
+    """
+    parser = get_parser(device_type, command)
+    if parser is None or not output:
+        return None
+    try:
+        records = parser.parse(output)
+    except Exception as e:
+        logger.warning(f"Parser {parser.name} failed for '{command}': {e}")
+        return None
+    return {"parser": parser.name, "kind": parser.kind, "records": records, "count": len(records)}
+
+
+def summarize_interfaces(parsed_results: List[Optional[Dict]]) -> Optional[Dict]:
+    """Ayrıştırılmış arayüz tablolarından up/down sayıları - arayüz tablosu yoksa None"""
+    total = up = 0
+    found = False
+    for parsed in parsed_results:
+        if not parsed or parsed["kind"] != "table":
+            continue
+        for record in parsed["records"]:
+            if "up" not in record:
+                continue
+            found = True
+            total += 1
+            up += bool(record["up"])
+    if not found:
+        return None
+    return {"total": total, "up": up, "down": total - up}
+
+
+def list_parsers() -> Dict[str, List[Dict]]:
+    return {
+        device_type: [
+            {"name": p.name, "kind": p.kind, "command": p.command_pattern.pattern[1:-1]} for p in parsers
+        ]
+        for device_type, parsers in _PARSERS.items()
+    }
@@ -0,0 +1,228 @@
+"""
+Reachability - Kimlik doğrulamasız TCP/SSH banner erişilebilirlik taraması
+backend/app/utils/reachability.py
+"""
+
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from ..json_db import get_devices
+
+logger = logging.getLogger(__name__)
+
+REACHABILITY_TIMEOUT = float(os.getenv("REACHABILITY_TIMEOUT", "2.0"))
+REACHABILITY_CONCURRENCY = int(os.getenv("REACHABILITY_CONCURRENCY", "2000"))
+REACHABILITY_READ_BANNER = os.getenv("REACHABILITY_READ_BANNER", "true").lower() in ("1", "true", "yes")
+# Bu süreden eski durum bilgisi "bilinmiyor" sayılır, cihaz atlanmaz
+REACHABILITY_STATE_TTL = float(os.getenv("REACHABILITY_STATE_TTL", "120"))
+# 0 ise periyodik tarama kapalı
+REACHABILITY_SWEEP_INTERVAL = float(os.getenv("REACHABILITY_SWEEP_INTERVAL", "0"))
+
+
+def _socket_budget(requested: int) -> int:
+    """Eşzamanlı soket sayısını süreç dosya tanımlayıcı limitinin altında tutar"""
+    if resource is None:
+        return requested
+    soft, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft == resource.RLIM_INFINITY:
+        return requested
+    # Havuzdaki SSH oturumları, DB ve HTTP soketleri için pay bırak
+    return max(1, min(requested, soft - 256))
+
+
+async def probe_host(host: str, port: int = 22, timeout: float = REACHABILITY_TIMEOUT,
+                     read_banner: bool = REACHABILITY_READ_BANNER) -> Dict:
+    """
+    TCP bağlantısı kurar, istenirse SSH banner'ını okur - kimlik doğrulama yapılmaz
+    Returns: {reachable, ssh, rtt_ms, banner, error, checked_at}
+    """
+    start = time.perf_counter()
+    result = {
+        "reachable": False,
+        "ssh": None,
+        "rtt_ms": None,
+        "banner": None,
+        "error": None,
+        "checked_at": datetime.now().isoformat()
+    }
+
+    writer = None
+    try:
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout=timeout)
+        result["reachable"] = True
+        result["rtt_ms"] = round((time.perf_counter() - start) * 1000, 2)
+
+        if read_banner:
+            remaining = max(0.1, timeout - (time.perf_counter() - start))
+            line = await asyncio.wait_for(reader.readline(), timeout=remaining)
+            banner = line.decode("utf-8", errors="replace").strip()
+            result["banner"] = banner[:255] or None
+            result["ssh"] = banner.startswith("SSH-")
+            if not result["ssh"]:
+                result["error"] = "Port open but no SSH banner received"
+    except asyncio.TimeoutError:
+        if result["reachable"]:
+            result["ssh"] = False
+            result["error"] = "SSH banner timeout"
+        else:
+            result["error"] = f"TCP connect timeout after {timeout}s"
+    except OSError as e:
+        result["error"] = e.strerror or str(e)
+    finally:
+        if writer is not None:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except Exception:
+                pass
+
+    return result
+
+
+class ReachabilityMonitor:
+    """Cihaz envanteri için toplu TCP/SSH erişilebilirlik taraması ve durum önbelleği"""
+
+    def __init__(
+        self,
+        timeout: float = REACHABILITY_TIMEOUT,
+        max_concurrency: int = REACHABILITY_CONCURRENCY,
+        read_banner: bool = REACHABILITY_READ_BANNER,
+        state_ttl: float = REACHABILITY_STATE_TTL
+    ):
+        self.timeout = timeout
+        self.max_concurrency = _socket_budget(max(1, max_concurrency))
+        self.read_banner = read_banner
+        self.state_ttl = state_ttl
+
+        # device_id -> son probe sonucu (+ monotonic zaman damgası)
+        self._state: Dict[int, Dict] = {}
+        self._task: Optional[asyncio.Task] = None
+
+        self.stats = {
+            "sweeps": 0,
+            "probes": 0,
+            "last_sweep_duration": None,
+            "last_sweep_devices": 0
+        }
+
+    # ===========================================
+    # SWEEP
+    # ===========================================
+
+    async def sweep(
+        self,
+        devices: List[Dict],
+        port: int = 22,
+        timeout: Optional[float] = None,
+        read_banner: Optional[bool] = None
+    ) -> Dict[int, Dict]:
+        """Tüm cihazları eşzamanlı yoklar, durumu günceller ve sonuçları döner"""
+        timeout = timeout or self.timeout
+        read_banner = self.read_banner if read_banner is None else read_banner
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        start = time.perf_counter()
+
+        async def run(device: Dict):
+            async with semaphore:
+                result = await probe_host(device["ip"], port, timeout, read_banner)
+            self._update(device["id"], result)
+            return device["id"], result
+
+        results = dict(await asyncio.gather(*(run(device) for device in devices)))
+
+        self.stats["sweeps"] += 1
+        self.stats["last_sweep_devices"] = len(devices)
+        self.stats["last_sweep_duration"] = round(time.perf_counter() - start, 3)
+        up = sum(1 for r in results.values() if self._is_up(r))
+        logger.info(f"Reachability sweep: {up}/{len(devices)} devices up in {self.stats['last_sweep_duration']}s")
+        return results
+
+    async def probe_device(self, device: Dict, port: int = 22) -> Dict:
+        result = await probe_host(device["ip"], port, self.timeout, self.read_banner)
+        self._update(device["id"], result)
+        return result
+
+    # ===========================================
+    # STATE
+    # ===========================================
+
+    def get_state(self, device_id: int) -> Optional[Dict]:
+        state = self._state.get(device_id)
+        if state is None:
+            return None
+        return {**state["result"], "state": self._state_label(state)}
+
+    def get_all_states(self) -> Dict[int, Dict]:
+        return {device_id: self.get_state(device_id) for device_id in self._state}
+
+    def is_down(self, device_id: int) -> bool:
+        """Yalnızca taze bir 'down' sonucu varsa True - bilinmeyen cihazlar atlanmaz"""
+        state = self._state.get(device_id)
+        return state is not None and self._state_label(state) == "down"
+
+    def forget(self, device_id: int):
+        self._state.pop(device_id, None)
+
+    def _update(self, device_id: int, result: Dict):
+        self.stats["probes"] += 1
+        self._state[device_id] = {"result": result, "updated": time.monotonic()}
+
+    def _state_label(self, state: Dict) -> str:
+        if time.monotonic() - state["updated"] > self.state_ttl:
+            return "stale"
+        return "up" if self._is_up(state["result"]) else "down"
+
+    @staticmethod
+    def _is_up(result: Dict) -> bool:
+        # Banner okunduysa SSH servisinin gerçekten cevap vermesi gerekir
+        return result["reachable"] and result["ssh"] is not False
+
+    # ===========================================
+    # SCHEDULER
+    # ===========================================
+
+    def start(self, interval: float = REACHABILITY_SWEEP_INTERVAL):
+        if interval > 0 and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._loop(interval))
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _loop(self, interval: float):
+        while True:
+            try:
+                await self.sweep(get_devices())
+            except Exception as e:
+                logger.error(f"Reachability sweep error: {e}")
+            await asyncio.sleep(interval)
+
+    def get_stats(self) -> Dict:
+        states = [self._state_label(s) for s in self._state.values()]
+        return {
+            **self.stats,
+            "tracked_devices": len(states),
+            "up": states.count("up"),
+            "down": states.count("down"),
+            "stale": states.count("stale"),
+            "max_concurrency": self.max_concurrency,
+            "timeout": self.timeout
+        }
+
+
+# Global instance
+reachability = ReachabilityMonitor()
@@ -0,0 +1,232 @@
+"""
+Command Result Cache - Salt okunur komut çıktıları için TTL + LRU önbellek
+backend/app/utils/result_cache.py
+"""
+
+import hmac
+import logging
+import os
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from .connection_pool import _credential_digest
+
+logger = logging.getLogger(__name__)
+
+RESULT_CACHE_ENABLED = os.getenv("RESULT_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+RESULT_CACHE_MAX_BYTES = int(os.getenv("RESULT_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+RESULT_CACHE_DEFAULT_TTL = float(os.getenv("RESULT_CACHE_DEFAULT_TTL", "30"))
+
+# Durum değiştiren komutlar - asla önbelleğe alınmaz, çalıştırıldığında cihazın önbelleği silinir
+_MUTATING = re.compile(
+    r"^\s*("
+    r"conf(ig(ure)?)?\b|write\b|wr\b|copy\b|reload\b|erase\b|delete\b|clear\b|debug\b|undebug\b|"
+    r"no\s|shut(down)?\b|commit\b|rollback\b|set\b|request\b|restart\b|"
+    r"/.*\b(add|set|remove|enable|disable|reset|reboot|shutdown|import|run)\b|"
+    r"(sudo\s+)?(rm|mv|cp|kill|killall|reboot|systemctl|service|apt|apt-get|yum|dnf|chmod|chown|tee|dd|mkfs)\b"
+    r")|[;&|]\s*(rm|reboot|shutdown|redirect|tee|append|save)\b|>",
+    re.IGNORECASE
+)
+
+# Önbelleğe alınabilecek salt okunur komutlar ve TTL'leri (saniye) - ilk eşleşen kural geçerli
+_TTL_RULES: List[Tuple[re.Pattern, float]] = [
+    (re.compile(r"^(show|sh)\s+(version|ver|inventory|inv|module|chassis\s+hardware|license)\b", re.I), 300),
+    (re.compile(r"^/system\s+(resource|identity|routerboard|package)\s+print\b", re.I), 300),
+    (re.compile(r"^(uname|lsb_release|hostnamectl|ver|systeminfo|whoami|hostname)\b", re.I), 300),
+    (re.compile(r"^(show|sh)\s+(run|running-config|startup-config|configuration)\b", re.I), 60),
+    (re.compile(r"^/export\b", re.I), 60),
+    (re.compile(r"^(uptime|free|df|ps|top\s+-bn1|tasklist|netstat|ss)\b", re.I), 10),
+    (re.compile(r"^(show|sh|display|dis)\s", re.I), RESULT_CACHE_DEFAULT_TTL),
+    (re.compile(r"^/.*\bprint\b", re.I), RESULT_CACHE_DEFAULT_TTL),
+    (re.compile(r"^(ip\s+(addr|a|route|r|link)(\s+show)?|ipconfig|route\s+print|cat\s+/(etc|proc)/|ls|pwd|echo)\b", re.I),
+     RESULT_CACHE_DEFAULT_TTL),
+]
+
+
+def normalize_command(command: str) -> str:
+    """Boşlukları sadeleştirir - 'show  version ' ile 'show version' aynı anahtar olur"""
+    return " ".join(command.split())
+
+
+def is_mutating(command: str) -> bool:
+    return bool(_MUTATING.search(normalize_command(command)))
+
+
+def command_ttl(command: str) -> Optional[float]:
+    """Komutun TTL'ini döner - önbelleğe alınamıyorsa None"""
+    normalized = normalize_command(command)
+    if not normalized or is_mutating(normalized):
+        return None
+    for pattern, ttl in _TTL_RULES:
+        if pattern.search(normalized):
+            return ttl
+    return None
+
+
+@dataclass
+class CachedResult:
+    """Önbellekteki tek komut çıktısı"""
+    stdout: str
+    stderr: str
+    credential_digest: str
+    stored_at: float
+    expires_at: float
+    size: int
+
+
+# (device_id, username, normalized command)
+CacheKey = Tuple[int, str, str]
+
+
+class CommandResultCache:
+    """(device_id, kullanıcı, komut) anahtarlı, toplam byte sınırlı LRU önbellek"""
+
+    def __init__(self, max_bytes: int = RESULT_CACHE_MAX_BYTES, enabled: bool = RESULT_CACHE_ENABLED):
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self._entries: "OrderedDict[CacheKey, CachedResult]" = OrderedDict()
+        self._bytes = 0
+
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "bypasses": 0,
+            "uncacheable": 0,
+            "stores": 0,
+            "expirations": 0,
+            "evictions": 0,
+            "invalidations": 0,
+            "credential_mismatches": 0
+        }
+
+    # ===========================================
+    # LOOKUP / STORE
+    # ===========================================
+
+    def get(self, device_id: int, username: str, password: str, command: str) -> Optional[Dict]:
+        """
+        Geçerli bir önbellek kaydı varsa sonucu döner
+        Kayıt yalnızca aynı kimlik bilgileriyle doğrulanmış isteklere verilir
+        Returns: {success, stdout, stderr, cached, cache_age, ttl_remaining} | None
+        """
+        if not self.enabled or command_ttl(command) is None:
+            self.stats["uncacheable"] += 1
+            return None
+
+        key = (device_id, username, normalize_command(command))
+        entry = self._entries.get(key)
+        now = time.monotonic()
+
+        if entry is None:
+            self.stats["misses"] += 1
+            return None
+        if now >= entry.expires_at:
+            self.stats["expirations"] += 1
+            self.stats["misses"] += 1
+            self._remove(key)
+            return None
+        if not hmac.compare_digest(entry.credential_digest, _credential_digest(username, password)):
+            # Şifre doğrulanmadan çıktı verilmez - istek cihaza gider
+            self.stats["credential_mismatches"] += 1
+            self.stats["misses"] += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.stats["hits"] += 1
+        return {
+            "success": True,
+            "stdout": entry.stdout,
+            "stderr": entry.stderr,
+            "cached": True,
+            "cache_age": round(now - entry.stored_at, 3),
+            "ttl_remaining": round(entry.expires_at - now, 3)
+        }
+
+    def record(self, device_id: int, username: str, password: str, command: str,
+               success: bool, stdout: str, stderr: str):
+        """
+        Cihazda çalıştırılmış komutun sonucunu işler
+        Mutating komut cihazın önbelleğini siler; başarılı salt okunur komut saklanır
+        """
+        if not self.enabled:
+            return
+        if is_mutating(command):
+            self.invalidate_device(device_id)
+            return
+
+        ttl = command_ttl(command)
+        if ttl is None or not success:
+            return
+
+        size = len(stdout) + len(stderr)
+        if size > self.max_bytes:
+            return
+
+        key = (device_id, username, normalize_command(command))
+        if key in self._entries:
+            self._remove(key)
+
+        now = time.monotonic()
+        self._entries[key] = CachedResult(
+            stdout=stdout,
+            stderr=stderr,
+            credential_digest=_credential_digest(username, password),
+            stored_at=now,
+            expires_at=now + ttl,
+            size=size
+        )
+        self._bytes += size
+        self.stats["stores"] += 1
+
+        # LRU - toplam boyut sınırın altına inene kadar en eski kayıtları at
+        while self._bytes > self.max_bytes and self._entries:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.stats["evictions"] += 1
+
+    def note_bypass(self):
+        self.stats["bypasses"] += 1
+
+    # ===========================================
+    # INVALIDATION
+    # ===========================================
+
+    def invalidate_device(self, device_id: int) -> int:
+        keys = [key for key in self._entries if key[0] == device_id]
+        for key in keys:
+            self._remove(key)
+        if keys:
+            self.stats["invalidations"] += len(keys)
+            logger.info(f"Invalidated {len(keys)} cached results for device {device_id}")
+        return len(keys)
+
+    def clear(self):
+        self._entries.clear()
+        self._bytes = 0
+
+    def _remove(self, key: CacheKey):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    # ===========================================
+    # STATS
+    # ===========================================
+
+    def get_stats(self) -> Dict:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "hit_rate": round(self.stats["hits"] / lookups, 4) if lookups else 0.0,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "enabled": self.enabled
+        }
+
+
+# Global instance
+result_cache = CommandResultCache()
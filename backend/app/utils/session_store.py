@@ -0,0 +1,367 @@
+"""
+Session Store - Oturum (jti) kayıtları ve O(1) iptal kontrolü
+backend/app/utils/session_store.py
+
+Her girişte bir oturum açılır; oturum id'si token'a 'jti' olarak yazılır.
+İptal edilen jti'ler bir hash set'te tutulur, süresi dolan kayıtlar bir
+min-heap üzerinden temizlenir. SESSION_STORE_PATH verilirse kayıtlar
+SQLite (.db/.sqlite/.sqlite3) veya JSONL append-log dosyasına yazılır ve
+yeniden başlatmada geri yüklenir; verilmezse yalnızca bellekte tutulur.
+Depoda kaydı olmayan jti geçersizdir - bellek modunda yeniden başlatma tüm
+oturumları sonlandırır, iptal edilemeyen token kalmaz.
+"""
+
+import heapq
+import json
+import logging
+import os
+import secrets
+import sqlite3
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+SESSION_STORE_PATH = os.getenv("SESSION_STORE_PATH", "")
+# Kullanıcı başına en fazla açık oturum - aşılırsa en eskisi iptal edilir
+SESSION_MAX_PER_USER = int(os.getenv("SESSION_MAX_PER_USER", "50"))
+# JSONL log'u canlı kayıt sayısının bu katına ulaşınca yeniden yazılır
+SESSION_LOG_COMPACT_RATIO = int(os.getenv("SESSION_LOG_COMPACT_RATIO", "4"))
+
+SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    username TEXT NOT NULL,
+    ip_address TEXT,
+    user_agent TEXT,
+    created_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    revoked_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_username ON sessions(username);
+CREATE INDEX IF NOT EXISTS idx_sessions_expires ON sessions(expires_at);
+"""
+
+
+@dataclass
+class Session:
+    session_id: str
+    username: str
+    ip_address: Optional[str]
+    user_agent: Optional[str]
+    created_at: float
+    expires_at: float
+    revoked_at: Optional[float] = None
+
+    def to_dict(self) -> Dict:
+        return {
+            "session_id": self.session_id,
+            "username": self.username,
+            "ip_address": self.ip_address,
+            "user_agent": self.user_agent,
+            "created_at": _iso(self.created_at),
+            "expires_at": _iso(self.expires_at),
+            "revoked": self.revoked_at is not None
+        }
+
+
+def _iso(ts: float) -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(ts)) + "Z"
+
+
+def new_session_id() -> str:
+    return secrets.token_urlsafe(16)
+
+
+# ===========================================
+# BACKING STORES
+# ===========================================
+
+class _SQLiteBacking:
+    """Oturum tablosu - yazmalar seyrek (giriş/iptal), okuma yalnızca açılışta"""
+
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def load(self, now: float) -> List[Session]:
+        self._conn.execute("DELETE FROM sessions WHERE expires_at <= ?", (now,))
+        self._conn.commit()
+        rows = self._conn.execute(
+            "SELECT session_id, username, ip_address, user_agent, created_at, expires_at, revoked_at FROM sessions"
+        ).fetchall()
+        return [Session(*row) for row in rows]
+
+    def save(self, session: Session):
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sessions VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (session.session_id, session.username, session.ip_address, session.user_agent,
+                 session.created_at, session.expires_at, session.revoked_at)
+            )
+
+    def revoke(self, session_ids: List[str], revoked_at: float):
+        with self._conn:
+            self._conn.executemany(
+                "UPDATE sessions SET revoked_at = ? WHERE session_id = ?",
+                [(revoked_at, session_id) for session_id in session_ids]
+            )
+
+    def purge(self, now: float, live: Dict[str, Session]):
+        with self._conn:
+            self._conn.execute("DELETE FROM sessions WHERE expires_at <= ?", (now,))
+
+
+class _FileBacking:
+    """JSONL append-log: create/revoke kayıtları sırayla eklenir, açılışta tekrar oynatılır"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.entries = 0
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+    def load(self, now: float) -> List[Session]:
+        sessions: Dict[str, Session] = {}
+        if not self.path.exists():
+            return []
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # Yarım yazılmış son satır (çökme) - atlanır
+                    continue
+                self.entries += 1
+                if record["op"] == "create":
+                    sessions[record["session"]["session_id"]] = Session(**record["session"])
+                elif record["op"] == "revoke":
+                    for session_id in record["session_ids"]:
+                        if session_id in sessions:
+                            sessions[session_id].revoked_at = record["revoked_at"]
+        live = [s for s in sessions.values() if s.expires_at > now]
+        self._rewrite(live)
+        return live
+
+    def _append(self, record: Dict):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, separators=(",", ":")) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.entries += 1
+
+    def save(self, session: Session):
+        self._append({"op": "create", "session": asdict(session)})
+
+    def revoke(self, session_ids: List[str], revoked_at: float):
+        self._append({"op": "revoke", "session_ids": session_ids, "revoked_at": revoked_at})
+
+    def purge(self, now: float, live: Dict[str, Session]):
+        if self.entries > SESSION_LOG_COMPACT_RATIO * max(len(live), 64):
+            self._rewrite(list(live.values()))
+
+    def _rewrite(self, sessions: List[Session]):
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                for session in sessions:
+                    f.write(json.dumps({"op": "create", "session": asdict(session)}, separators=(",", ":")) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+        self.entries = len(sessions)
+
+
+# ===========================================
+# SESSION STORE
+# ===========================================
+
+class SessionStore:
+    """
+    Bellek içi oturum indeksi:
+    - _sessions: jti -> Session, _by_user: username -> {jti}
+    - _revoked: iptal edilmiş jti kümesi (istek başına tek üyelik kontrolü)
+    - _expiry: (expires_at, jti) min-heap - süresi dolanlar yazma anında temizlenir
+    """
+
+    def __init__(self, path: str = SESSION_STORE_PATH, max_per_user: int = SESSION_MAX_PER_USER):
+        self.max_per_user = max_per_user
+        self._sessions: Dict[str, Session] = {}
+        self._by_user: Dict[str, Set[str]] = {}
+        self._revoked: Set[str] = set()
+        self._expiry: List[Tuple[float, str]] = []
+        self._lock = threading.Lock()
+        self._backing = None
+
+        self.stats = {
+            "created": 0,
+            "revoked": 0,
+            "expired": 0,
+            "revocation_hits": 0,
+            "unknown_sessions": 0
+        }
+
+        if path:
+            backing_path = Path(path)
+            if backing_path.suffix.lower() in SQLITE_SUFFIXES:
+                self._backing = _SQLiteBacking(backing_path)
+            else:
+                self._backing = _FileBacking(backing_path)
+            for session in self._backing.load(time.time()):
+                self._index(session)
+            logger.info(f"Loaded {len(self._sessions)} sessions from {backing_path}")
+        else:
+            logger.info("Session store is in memory only; tokens issued before a restart will be rejected")
+
+    def _index(self, session: Session):
+        self._sessions[session.session_id] = session
+        self._by_user.setdefault(session.username, set()).add(session.session_id)
+        if session.revoked_at is not None:
+            self._revoked.add(session.session_id)
+        heapq.heappush(self._expiry, (session.expires_at, session.session_id))
+
+    # ===========================================
+    # HOT PATH
+    # ===========================================
+
+    def is_revoked(self, session_id: str) -> bool:
+        """Her istekte çağrılır - tek hash set üyelik kontrolü, kilit yok"""
+        if session_id in self._revoked:
+            self.stats["revocation_hits"] += 1
+            return True
+        return False
+
+    def is_active(self, session_id: Optional[str]) -> bool:
+        """
+        Token'ın oturumu geçerli mi - iptal edilmemiş ve depoda kayıtlı olmalı
+        Bilinmeyen jti (yeniden başlatma öncesi veya başka sunucuda üretilmiş) iptal edilemeyeceği için reddedilir
+        """
+        if session_id is None or self.is_revoked(session_id):
+            return False
+        if session_id not in self._sessions:
+            self.stats["unknown_sessions"] += 1
+            return False
+        return True
+
+    # ===========================================
+    # LIFECYCLE
+    # ===========================================
+
+    def create(self, username: str, ttl_seconds: float, ip_address: Optional[str] = None,
+               user_agent: Optional[str] = None) -> Session:
+        """Yeni oturum açar - dönen session_id token'ın 'jti' claim'i olur"""
+        now = time.time()
+        session = Session(
+            session_id=new_session_id(),
+            username=username,
+            ip_address=ip_address,
+            user_agent=(user_agent or "")[:256] or None,
+            created_at=now,
+            expires_at=now + ttl_seconds
+        )
+        with self._lock:
+            self._purge_expired(now)
+            self._index(session)
+            self.stats["created"] += 1
+            if self._backing:
+                self._backing.save(session)
+            overflow = self._overflow(username)
+        if overflow:
+            self.revoke_many(overflow)
+        return session
+
+    def _overflow(self, username: str) -> List[str]:
+        active = [self._sessions[sid] for sid in self._by_user.get(username, ()) if sid not in self._revoked]
+        if len(active) <= self.max_per_user:
+            return []
+        active.sort(key=lambda s: s.created_at)
+        return [s.session_id for s in active[:len(active) - self.max_per_user]]
+
+    def get(self, session_id: str) -> Optional[Session]:
+        return self._sessions.get(session_id)
+
+    def revoke(self, session_id: str) -> bool:
+        """Oturumu iptal eder - bilinmeyen veya zaten iptal edilmişse False"""
+        return self.revoke_many([session_id]) > 0
+
+    def revoke_many(self, session_ids: List[str]) -> int:
+        now = time.time()
+        with self._lock:
+            targets = [sid for sid in session_ids if sid in self._sessions and sid not in self._revoked]
+            for sid in targets:
+                self._sessions[sid].revoked_at = now
+                self._revoked.add(sid)
+            if targets and self._backing:
+                self._backing.revoke(targets, now)
+        self.stats["revoked"] += len(targets)
+        return len(targets)
+
+    def revoke_user(self, username: str, keep: Optional[str] = None) -> int:
+        """Kullanıcının tüm oturumlarını iptal eder (şifre değişimi, hesap silme)"""
+        session_ids = [sid for sid in list(self._by_user.get(username, ())) if sid != keep]
+        return self.revoke_many(session_ids)
+
+    def list_user(self, username: str, include_revoked: bool = False) -> List[Session]:
+        now = time.time()
+        sessions = [
+            self._sessions[sid] for sid in list(self._by_user.get(username, ()))
+            if sid in self._sessions and self._sessions[sid].expires_at > now
+            and (include_revoked or sid not in self._revoked)
+        ]
+        sessions.sort(key=lambda s: s.created_at, reverse=True)
+        return sessions
+
+    # ===========================================
+    # CLEANUP
+    # ===========================================
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            return self._purge_expired(time.time())
+
+    def _purge_expired(self, now: float) -> int:
+        """Heap başından süresi dolanları düşürür - O(k log n), k = dolan kayıt sayısı"""
+        removed = 0
+        while self._expiry and self._expiry[0][0] <= now:
+            _, sid = heapq.heappop(self._expiry)
+            session = self._sessions.pop(sid, None)
+            if session is None:
+                continue
+            self._revoked.discard(sid)
+            user_sessions = self._by_user.get(session.username)
+            if user_sessions is not None:
+                user_sessions.discard(sid)
+                if not user_sessions:
+                    del self._by_user[session.username]
+            removed += 1
+        if removed:
+            self.stats["expired"] += removed
+            if self._backing:
+                self._backing.purge(now, self._sessions)
+        return removed
+
+    def get_stats(self) -> Dict:
+        return {
+            **self.stats,
+            "sessions": len(self._sessions),
+            "revoked_active": len(self._revoked),
+            "users": len(self._by_user),
+            "backing": type(self._backing).__name__.strip("_") if self._backing else "memory"
+        }
+
+
+# Global instance
+session_store = SessionStore()
@@ -0,0 +1,349 @@
+"""
+Shell Sessions - Sunucu tarafında kalıcı etkileşimli SSH shell oturumları
+backend/app/utils/shell_sessions.py
+"""
+
+import asyncio
+import codecs
+import logging
+import os
+import re
+import secrets
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+from .connection_pool import PooledConnection, SSHConnectionPool, ssh_pool
+from .ssh_connector import run_blocking
+
+logger = logging.getLogger(__name__)
+
+SHELL_MAX_SESSIONS = int(os.getenv("SHELL_MAX_SESSIONS", "100"))
+SHELL_IDLE_TIMEOUT = float(os.getenv("SHELL_IDLE_TIMEOUT", "900"))
+SHELL_SCROLLBACK_BYTES = int(os.getenv("SHELL_SCROLLBACK_BYTES", str(64 * 1024)))
+# Yavaş istemci başına bekleyen en fazla çıktı mesajı
+SHELL_SUBSCRIBER_QUEUE = int(os.getenv("SHELL_SUBSCRIBER_QUEUE", "1024"))
+# Listelerde ve loglarda gösterilen oturum kimliği öneki - tam kimlik yalnızca açana döner
+SHELL_HANDLE_LENGTH = 8
+# Denetim için biriktirilen girdi satırının üst sınırı - fazlası kesilir
+SHELL_AUDIT_LINE_LENGTH = int(os.getenv("SHELL_AUDIT_LINE_LENGTH", "1024"))
+# Cihaz şifre sorarken yazılan satır denetime maskeli yazılır
+_SECRET_PROMPT = re.compile(r"(password|passphrase|secret)\s*:\s*$", re.IGNORECASE)
+_ESCAPE_SEQUENCE = re.compile(r"\x1b(\[[0-?]*[ -/]*[@-~]|O.|.)")
+
+
+class ShellSessionOwnerRequired(Exception):
+    """Shell oturumu doğrulanmış bir PAM kullanıcısı olmadan açılamaz"""
+
+    def __init__(self, status_code: int = 401):
+        super().__init__("Shell sessions require an authenticated user")
+        self.status_code = status_code
+
+
+class ShellSessionLimitReached(Exception):
+    """Sunucudaki açık shell oturumu sayısı SHELL_MAX_SESSIONS'a ulaştı"""
+
+    def __init__(self, max_sessions: int, status_code: int = 503):
+        super().__init__(f"Shell session limit reached ({max_sessions})")
+        self.max_sessions = max_sessions
+        self.status_code = status_code
+
+
+class ShellSession:
+    """Tek bir invoke_shell PTY kanalı - çıktı abonelere ve scrollback'e dağıtılır"""
+
+    def __init__(self, session_id: str, device: Dict, username: str, entry: PooledConnection, channel,
+                 owner: str):
+        self.id = session_id
+        self.device = device
+        self.username = username
+        # Oturumu açan PAM kullanıcısı - bağlanma/kapatma yalnızca ona izinli
+        self.owner = owner
+        self.entry = entry
+        self.channel = channel
+        self.created_at = datetime.now()
+        self.last_activity = time.monotonic()
+        self.closed = False
+        self.close_reason: Optional[str] = None
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+        self._scrollback = bytearray()
+        self._input_line: List[str] = []
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    # ===========================================
+    # OUTPUT
+    # ===========================================
+
+    def start(self):
+        """Kanal pipe'ını event loop'a bağlar - okuma için thread tutulmaz"""
+        self._loop = asyncio.get_running_loop()
+        self._loop.add_reader(self.channel.fileno(), self._on_readable)
+
+    def _on_readable(self):
+        try:
+            while self.channel.recv_ready():
+                data = self.channel.recv(32768)
+                if not data:
+                    break
+                self._publish(data)
+        except Exception as e:
+            logger.error(f"Shell session {self.id} read error: {e}")
+            self._mark_closed("read error")
+            return
+
+        if self.channel.closed or self.channel.eof_received:
+            self._mark_closed("remote closed")
+
+    def _publish(self, data: bytes):
+        self.last_activity = time.monotonic()
+        self.bytes_out += len(data)
+
+        self._scrollback.extend(data)
+        if len(self._scrollback) > SHELL_SCROLLBACK_BYTES:
+            del self._scrollback[:len(self._scrollback) - SHELL_SCROLLBACK_BYTES]
+
+        text = self._decoder.decode(data)
+        if text:
+            self._broadcast({"type": "output", "data": text})
+
+    def _broadcast(self, message: Dict):
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # Yetişemeyen istemciyi düşür - yeniden bağlanınca scrollback'i alır
+                self._subscribers.discard(queue)
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait({"type": "error", "message": "Output buffer overflow, reconnect to resume"})
+
+    def subscribe(self) -> asyncio.Queue:
+        """Yeni bir çıktı kuyruğu döner - önce mevcut scrollback gönderilir"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SHELL_SUBSCRIBER_QUEUE)
+        if self._scrollback:
+            queue.put_nowait({"type": "output", "data": self._scrollback.decode("utf-8", errors="replace")})
+        if self.closed:
+            queue.put_nowait({"type": "closed", "reason": self.close_reason})
+        else:
+            self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self._subscribers.discard(queue)
+
+    # ===========================================
+    # INPUT
+    # ===========================================
+
+    def take_input_lines(self, data: str) -> List[str]:
+        """
+        Tuş vuruşlarını satır satır biriktirir - Enter ile tamamlanan satırları döner
+        Backspace uygulanır, terminal kaçış dizileri atılır; şifre isteminden sonra yazılan satır maskelenir
+        """
+        lines = []
+        for char in _ESCAPE_SEQUENCE.sub("", data):
+            if char in "\r\n":
+                line = "".join(self._input_line)
+                self._input_line.clear()
+                if line.strip():  # boş Enter (ve \r\n'in ikinci yarısı) kaydedilmez
+                    lines.append("********" if self._awaiting_secret() else line)
+            elif char in "\x7f\b":
+                if self._input_line:
+                    self._input_line.pop()
+            elif char == "\x15":  # Ctrl-U
+                self._input_line.clear()
+            elif char >= " " and len(self._input_line) < SHELL_AUDIT_LINE_LENGTH:
+                self._input_line.append(char)
+        return lines
+
+    def _awaiting_secret(self) -> bool:
+        tail = self._scrollback[-128:].decode("utf-8", errors="replace").rstrip("\r\n").rsplit("\n", 1)[-1]
+        return bool(_SECRET_PROMPT.search(tail))
+
+    async def write(self, data: str):
+        if self.closed:
+            raise RuntimeError("Shell session is closed")
+        payload = data.encode("utf-8")
+        self.last_activity = time.monotonic()
+        self.bytes_in += len(payload)
+        await run_blocking(self.channel.sendall, payload)
+
+    async def resize(self, cols: int, rows: int):
+        if not self.closed:
+            await run_blocking(self.channel.resize_pty, width=cols, height=rows)
+
+    # ===========================================
+    # LIFECYCLE
+    # ===========================================
+
+    def _mark_closed(self, reason: str):
+        if self.closed:
+            return
+        self.closed = True
+        self.close_reason = reason
+        if self._loop is not None:
+            self._loop.remove_reader(self.channel.fileno())
+        self._broadcast({"type": "closed", "reason": reason})
+        self._subscribers.clear()
+
+    def close(self, reason: str = "closed"):
+        self._mark_closed(reason)
+        self.channel.close()
+
+    def idle_seconds(self) -> float:
+        return time.monotonic() - self.last_activity
+
+    @property
+    def handle(self) -> str:
+        return self.id[:SHELL_HANDLE_LENGTH]
+
+    def to_dict(self) -> Dict:
+        # Tam session_id WebSocket'e bağlanmak için yeterli olduğundan burada yalnızca önek döner
+        return {
+            "handle": self.handle,
+            "device": self.device,
+            "username": self.username,
+            "owner": self.owner,
+            "created_at": self.created_at.isoformat(),
+            "idle_seconds": round(self.idle_seconds(), 1),
+            "subscribers": len(self._subscribers),
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "closed": self.closed,
+            "close_reason": self.close_reason
+        }
+
+
+class ShellSessionManager:
+    """Oturum kimliğiyle shell oturumlarını açar, bulur ve boşta kalanları temizler"""
+
+    def __init__(
+        self,
+        pool: SSHConnectionPool = ssh_pool,
+        max_sessions: int = SHELL_MAX_SESSIONS,
+        idle_timeout: float = SHELL_IDLE_TIMEOUT
+    ):
+        self.pool = pool
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self._sessions: Dict[str, ShellSession] = {}
+        self._reaper_task: Optional[asyncio.Task] = None
+
+    async def open(
+        self,
+        device: Dict,
+        username: str,
+        password: str,
+        port: int = 22,
+        cols: int = 120,
+        rows: int = 40,
+        term: str = "xterm",
+        owner: Optional[str] = None
+    ) -> Tuple[Optional[ShellSession], bool, str]:
+        """
+        Cihazda PTY'li shell açar - oturum owner'a (PAM kullanıcısı) bağlanır
+        Returns: (session | None, success: bool, message: str)
+        Raises: ShellSessionOwnerRequired, ShellSessionLimitReached
+        """
+        if not owner:
+            raise ShellSessionOwnerRequired()
+        self.reap()
+        if len(self._sessions) >= self.max_sessions:
+            raise ShellSessionLimitReached(self.max_sessions)
+
+        # Transport havuzdan alınır; oturum kapanınca kanal kapatılıp havuza geri verilir
+        entry, success, message = await self.pool.acquire(device, username, password, port, timeout=20)
+        if entry is None:
+            return None, False, message
+
+        try:
+            channel = await entry.connector.open_shell(term=term, cols=cols, rows=rows)
+        except Exception as e:
+            self.pool.release(entry, reusable=False)
+            logger.error(f"Failed to open shell on {device['ip']}: {e}")
+            return None, False, f"Failed to open shell: {str(e)}"
+
+        session_id = secrets.token_urlsafe(24)
+        device_info = {k: device.get(k) for k in ("id", "name", "ip", "type")}
+        session = ShellSession(session_id, device_info, username, entry, channel, owner)
+        session.start()
+        self._sessions[session_id] = session
+
+        logger.info(f"Opened shell session {session.handle} on {device['name']} as {username}")
+        return session, True, f"Shell opened on {device['name']}"
+
+    def get(self, session_id: str, user: Optional[str] = None) -> Optional[ShellSession]:
+        """
+        Tam kimlikle oturumu yalnızca açan PAM kullanıcısına döner
+        Sahibi olmayan çağırana oturumun varlığı da gösterilmez (None); sahipsiz oturum kimseye verilmez
+        """
+        session = self._sessions.get(session_id)
+        if session is None or not user or session.owner != user:
+            return None
+        return session
+
+    def list_sessions(self, owner: Optional[str] = None) -> List[Dict]:
+        """owner verilirse yalnızca o kullanıcının oturumları"""
+        return [
+            session.to_dict() for session in self._sessions.values()
+            if owner is None or session.owner == owner
+        ]
+
+    def close(self, session_id: str, reason: str = "closed by client") -> bool:
+        session = self._sessions.pop(session_id, None)
+        if session is None:
+            return False
+        session.close(reason)
+        # Kanal temiz kapandıysa transport başka işlerde yeniden kullanılabilir
+        self.pool.release(session.entry, reusable=session.entry.connector.connected)
+        logger.info(f"Closed shell session {session.handle} ({reason})")
+        return True
+
+    def reap(self):
+        """Boşta kalan veya uzak uçta kapanan oturumları kapatır"""
+        for session_id, session in list(self._sessions.items()):
+            if session.closed:
+                self.close(session_id, session.close_reason or "remote closed")
+            elif session.idle_seconds() > self.idle_timeout:
+                self.close(session_id, "idle timeout")
+
+    def close_all(self):
+        for session_id in list(self._sessions.keys()):
+            self.close(session_id, "server shutdown")
+
+    def start_reaper(self, interval: float = 30.0):
+        if self._reaper_task is None or self._reaper_task.done():
+            self._reaper_task = asyncio.create_task(self._reaper_loop(interval))
+
+    async def stop_reaper(self):
+        if self._reaper_task is not None:
+            self._reaper_task.cancel()
+            try:
+                await self._reaper_task
+            except asyncio.CancelledError:
+                pass
+            self._reaper_task = None
+        self.close_all()
+
+    async def _reaper_loop(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                self.reap()
+            except Exception as e:
+                logger.error(f"Shell session reaper error: {e}")
+
+    def get_stats(self) -> Dict:
+        return {
+            "active_sessions": len(self._sessions),
+            "max_sessions": self.max_sessions,
+            "idle_timeout": self.idle_timeout
+        }
+
+
+# Global instance
+shell_sessions = ShellSessionManager()
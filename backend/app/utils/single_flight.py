@@ -0,0 +1,106 @@
+"""
+Single Flight - Aynı anda gelen özdeş salt okunur cihaz işlemlerini tek çalıştırmada birleştirir
+backend/app/utils/single_flight.py
+
+Aynı cihaza, aynı kimlik bilgileriyle aynı (normalize edilmiş) komut(lar) için
+eşzamanlı gelen istekler, o an süren tek çalıştırmanın sonucunu bekler.
+Çalıştırma ayrı bir task'ta yürür; isteği başlatan istemcinin bağlantısı
+kopsa bile bekleyen diğer istekler sonucu alır.
+"""
+
+import asyncio
+import logging
+import os
+from typing import Awaitable, Callable, Dict, Hashable, Tuple, TypeVar
+
+from .connection_pool import _credential_digest
+from .result_cache import command_ttl, normalize_command
+
+logger = logging.getLogger(__name__)
+
+SINGLE_FLIGHT_ENABLED = os.getenv("SINGLE_FLIGHT_ENABLED", "true").lower() in ("1", "true", "yes")
+
+T = TypeVar("T")
+
+
+def is_coalescable(command: str) -> bool:
+    """Yalnızca önbellek kurallarınca salt okunur bilinen komutlar birleştirilir"""
+    return command_ttl(command) is not None
+
+
+def flight_key(operation: str, device_id: int, username: str, password: str, port: int, commands) -> Tuple:
+    """Anahtar kimlik bilgisinin özetini içerir - farklı şifreyle gelen istek başka bir sonuca bağlanamaz"""
+    if isinstance(commands, str):
+        commands = (commands,)
+    return (
+        operation, device_id, port, username, _credential_digest(username, password),
+        tuple(normalize_command(c) for c in commands)
+    )
+
+
+class SingleFlight:
+    """Anahtar başına tek uçuştaki çalıştırma - sonuç (veya hata) tüm bekleyenlere dağıtılır"""
+
+    def __init__(self, enabled: bool = SINGLE_FLIGHT_ENABLED):
+        self.enabled = enabled
+        self._flights: Dict[Hashable, asyncio.Task] = {}
+        self._waiters: Dict[Hashable, int] = {}
+
+        self.stats = {
+            "executions": 0,
+            "coalesced": 0,
+            "errors": 0,
+            "max_waiters": 0
+        }
+        self._by_operation: Dict[str, Dict[str, int]] = {}
+
+    async def do(self, key: Tuple, factory: Callable[[], Awaitable[T]]) -> Tuple[T, bool]:
+        """
+        Anahtar için süren çalıştırma varsa ona katılır, yoksa factory() ile başlatır
+        Returns: (sonuç, shared) - shared=True ise sonuç başka bir isteğin çalıştırmasından geldi
+        """
+        if not self.enabled:
+            return await factory(), False
+
+        operation = key[0]
+        counters = self._by_operation.setdefault(operation, {"executions": 0, "coalesced": 0})
+        task = self._flights.get(key)
+        shared = task is not None
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._flights[key] = task
+            self._waiters[key] = 0
+            task.add_done_callback(lambda done, key=key: self._finish(key, done))
+            self.stats["executions"] += 1
+            counters["executions"] += 1
+        else:
+            self.stats["coalesced"] += 1
+            counters["coalesced"] += 1
+            logger.info(f"Coalesced {operation} request onto in-flight execution for device {key[1]}")
+
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        self.stats["max_waiters"] = max(self.stats["max_waiters"], self._waiters[key])
+        # shield: bekleyen bir isteğin iptali ortak çalıştırmayı iptal etmez
+        return await asyncio.shield(task), shared
+
+    def _finish(self, key: Tuple, task: asyncio.Task):
+        if self._flights.get(key) is task:
+            del self._flights[key]
+            self._waiters.pop(key, None)
+        if not task.cancelled() and task.exception() is not None:
+            self.stats["errors"] += 1
+
+    def get_stats(self) -> Dict:
+        executions = self.stats["executions"]
+        total = executions + self.stats["coalesced"]
+        return {
+            **self.stats,
+            "enabled": self.enabled,
+            "in_flight": len(self._flights),
+            "coalesce_rate": round(self.stats["coalesced"] / total, 4) if total else 0.0,
+            "by_operation": {name: dict(counters) for name, counters in self._by_operation.items()}
+        }
+
+
+# Global instance
+command_flights = SingleFlight()
@@ -5,36 +5,80 @@ backend/app/utils/ssh_connector.py
 
 import paramiko
 import asyncio
-from typing import Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+import codecs
 import logging
 from datetime import datetime
+import os
+import select
 import socket
 import time
 
+from .drivers import DeviceDriver, DriverShell, get_driver
+from .metrics import (
+    ssh_auth_failures, ssh_command_duration, ssh_commands_in_flight, ssh_connect_duration,
+    ssh_connect_errors, ssh_sessions_active
+)
+
 # Logging setup
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Paramiko çağrıları bloklayıcıdır; event loop'u dondurmamak için sınırlı bir
+# thread havuzunda çalıştırılır. Havuz dolduğunda yeni işler sırada bekler.
+SSH_EXECUTOR_WORKERS = int(os.getenv("SSH_EXECUTOR_WORKERS", "32"))
+_ssh_executor = ThreadPoolExecutor(max_workers=SSH_EXECUTOR_WORKERS, thread_name_prefix="ssh-io")
+
+
+# execute_command'ın kanal açma reddi için döndüğü stderr öneki
+CHANNEL_REFUSED_PREFIX = "Channel open refused"
+
+
+async def run_blocking(func, *args, **kwargs):
+    """Bloklayıcı bir SSH çağrısını sınırlı executor'da çalıştırır"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_ssh_executor, partial(func, *args, **kwargs))
+
+
 class SSHConnector:
     """SSH bağlantısı ve komut çalıştırma sınıfı"""
     
-    def __init__(self):
+    def __init__(self, profile: Optional[Dict] = None, driver: Optional[DeviceDriver] = None):
         self.client = None
         self.connected = False
+        # Cihaz profili - kanal sayısı ve komutlar arası bekleme (NetworkDeviceManager.get_device_profile)
+        self.profile = profile or NetworkDeviceManager.get_device_profile("unknown")
+        # Cihaz tipi sürücüsü - shell tabanlıysa komutlar tek PTY kanalında prompt ile sınırlandırılır
+        self.driver = driver or get_driver(None)
+        self._shell: Optional[DriverShell] = None
+        # Son connect() hatasının sınıfı (timeout/network/ssh/auth/error) - başarılıysa None
+        self.last_error: Optional[str] = None
         
     async def connect(self, host: str, username: str, password: str, port: int = 22, timeout: int = 10) -> Tuple[bool, str]:
         """
         SSH bağlantısı kurar
         Returns: (success: bool, message: str)
         """
+        start = time.perf_counter()
+        success, message = await self._connect(host, username, password, port, timeout)
+        device_type = self.driver.device_type
+        ssh_connect_duration.observe(time.perf_counter() - start, device_type, "success" if success else "failure")
+        if success:
+            ssh_sessions_active.inc(device_type)
+        return success, message
+    
+    async def _connect(self, host: str, username: str, password: str, port: int, timeout: int) -> Tuple[bool, str]:
         try:
             self.client = paramiko.SSHClient()
             self.client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
             
             logger.info(f"Connecting to {host}:{port} as {username}")
             
-            # Bağlantı kur
-            self.client.connect(
+            # Bağlantı kur - handshake ve auth executor'da yapılır
+            await run_blocking(
+                self.client.connect,
                 hostname=host,
                 port=port,
                 username=username,
@@ -45,25 +89,35 @@ class SSHConnector:
             )
             
             self.connected = True
+            self.last_error = None
             logger.info(f"Successfully connected to {host}")
             return True, f"Successfully connected to {host}"
             
         except paramiko.AuthenticationException:
+            ssh_auth_failures.inc(self.driver.device_type)
+            self.last_error = "auth"
             error_msg = f"Authentication failed for {username}@{host}"
             logger.error(error_msg)
             return False, error_msg
             
         except paramiko.SSHException as e:
+            ssh_connect_errors.inc(self.driver.device_type, "ssh")
+            self.last_error = "ssh"
             error_msg = f"SSH connection error: {str(e)}"
             logger.error(error_msg)
             return False, error_msg
             
         except socket.timeout:
+            ssh_connect_errors.inc(self.driver.device_type, "timeout")
+            self.last_error = "timeout"
             error_msg = f"Connection timeout to {host}:{port}"
             logger.error(error_msg)
             return False, error_msg
             
         except Exception as e:
+            ssh_connect_errors.inc(self.driver.device_type, type(e).__name__)
+            # Bağlantı reddi / rota yok (NoValidConnectionsError dahil) ağ hatası sayılır
+            self.last_error = "network" if isinstance(e, OSError) else "error"
             error_msg = f"Unexpected error: {str(e)}"
             logger.error(error_msg)
             return False, error_msg
@@ -73,20 +127,27 @@ class SSHConnector:
         SSH komut çalıştırır
         Returns: (success: bool, stdout: str, stderr: str)
         """
+        device_type = self.driver.device_type
+        start = time.perf_counter()
+        with ssh_commands_in_flight.track_inprogress(device_type):
+            success, stdout, stderr = await self._execute_command(command, timeout)
+        ssh_command_duration.observe(time.perf_counter() - start, device_type, "success" if success else "failure")
+        return success, stdout, stderr
+    
+    async def _execute_command(self, command: str, timeout: int) -> Tuple[bool, str, str]:
         if not self.connected or not self.client:
             return False, "", "No SSH connection established"
         
+        if self.driver.use_shell:
+            return await self._execute_via_shell(command, timeout)
+        
+        command = self.driver.prepare_command(command)
         try:
             logger.info(f"Executing command: {command}")
             
-            stdin, stdout, stderr = self.client.exec_command(command, timeout=timeout)
-            
-            # Output'ları oku
-            stdout_content = stdout.read().decode('utf-8').strip()
-            stderr_content = stderr.read().decode('utf-8').strip()
-            
-            # Exit code kontrol et
-            exit_status = stdout.channel.recv_exit_status()
+            exit_status, stdout_content, stderr_content = await run_blocking(
+                self._execute_command_blocking, command, timeout
+            )
             
             if exit_status == 0:
                 logger.info(f"Command executed successfully: {command}")
@@ -95,41 +156,239 @@ class SSHConnector:
                 logger.warning(f"Command failed with exit code {exit_status}: {command}")
                 return False, stdout_content, stderr_content
                 
+        except paramiko.ChannelException as e:
+            # Cihaz eşzamanlı kanal limitine ulaştı - çağıran sıralı olarak tekrar deneyebilir
+            error_msg = f"{CHANNEL_REFUSED_PREFIX}: {e.args[-1] if e.args else e}"
+            logger.warning(f"{error_msg} ({command})")
+            return False, "", error_msg
+            
         except Exception as e:
             error_msg = f"Command execution error: {str(e)}"
             logger.error(error_msg)
             return False, "", error_msg
     
-    async def execute_multiple_commands(self, commands: List[str], delay: float = 1.0) -> List[Dict]:
+    async def _execute_via_shell(self, command: str, timeout: int) -> Tuple[bool, str, str]:
+        """Sürücünün kalıcı shell kanalında komut çalıştırır - prompt görülünce döner"""
+        try:
+            if self._shell is None or self._shell.closed:
+                self._shell = await run_blocking(
+                    DriverShell.open, self.client.get_transport(), self.driver, timeout
+                )
+            
+            logger.info(f"Executing command via {self.driver.device_type} shell: {command}")
+            output, error_line = await run_blocking(self._shell.run, command, timeout)
+            
+            if error_line is None:
+                return True, output, ""
+            logger.warning(f"Command reported an error on device: {command} ({error_line})")
+            return False, output, error_line
+            
+        except Exception as e:
+            # Yarım kalan çıktı sonraki komuta karışmasın - kanal bir sonraki çağrıda yeniden açılır
+            self._close_shell()
+            error_msg = f"Command execution error: {str(e) or type(e).__name__}"
+            logger.error(error_msg)
+            return False, "", error_msg
+    
+    def reset_session(self) -> bool:
         """
-        Birden fazla komut çalıştırır
-        Returns: List[{command, success, stdout, stderr, timestamp}]
+        Kalıcı shell'in modu/ayarı değiştiyse kanalı kapatır - transport açık kalır,
+        sonraki istek temel prompt'ta yeni bir shell ile başlar
+        Returns: shell kapatıldıysa True
+        """
+        if self._shell is not None and (self._shell.dirty or self._shell.closed):
+            self._close_shell()
+            return True
+        return False
+    
+    def _close_shell(self):
+        if self._shell is not None:
+            try:
+                self._shell.close()
+            except Exception:
+                pass
+            self._shell = None
+    
+    def _execute_command_blocking(self, command: str, timeout: int) -> Tuple[int, str, str]:
+        """exec_command + output okuma - executor thread'inde çalışır"""
+        stdin, stdout, stderr = self.client.exec_command(command, timeout=timeout)
+        
+        # Output'ları oku
+        stdout_content = stdout.read().decode('utf-8').strip()
+        stderr_content = stderr.read().decode('utf-8').strip()
+        
+        # Exit code kontrol et
+        exit_status = stdout.channel.recv_exit_status()
+        return exit_status, stdout_content, stderr_content
+    
+    async def stream_command(
+        self,
+        command: str,
+        timeout: int = 30,
+        chunk_size: int = 32768,
+        max_bytes: Optional[int] = None
+    ) -> AsyncIterator[Dict]:
         """
-        results = []
+        Komut çıktısını kanal ürettikçe parça parça döner
+        Yields: {event: stdout|stderr, data} ... ve son olarak {event: exit, exit_status, bytes, truncated}
         
-        for command in commands:
-            start_time = datetime.now()
-            success, stdout, stderr = await self.execute_command(command)
+        Bir sonraki parça ancak tüketici istediğinde okunur; okunmayan veri SSH
+        penceresini doldurur ve cihaz tarafında gönderimi durdurur (backpressure).
+        """
+        if not self.connected or not self.client:
+            yield {"event": "error", "data": "No SSH connection established"}
+            return
+        
+        logger.info(f"Streaming command: {command}")
+        
+        channel = None
+        total_bytes = 0
+        truncated = False
+        decoders = {
+            "stdout": codecs.getincrementaldecoder("utf-8")(errors="replace"),
+            "stderr": codecs.getincrementaldecoder("utf-8")(errors="replace")
+        }
+        
+        try:
+            channel = await run_blocking(self._open_exec_channel, command, timeout)
+            
+            while True:
+                stream, data = await run_blocking(_read_channel_chunk, channel, chunk_size, timeout)
+                if stream == "eof":
+                    break
+                
+                if max_bytes is not None and total_bytes + len(data) > max_bytes:
+                    data = data[:max_bytes - total_bytes]
+                    truncated = True
+                
+                total_bytes += len(data)
+                text = decoders[stream].decode(data)
+                if text:
+                    yield {"event": stream, "data": text}
+                
+                if truncated:
+                    logger.warning(f"Output of '{command}' truncated at {max_bytes} bytes")
+                    break
             
-            result = {
-                "command": command,
-                "success": success,
-                "stdout": stdout,
-                "stderr": stderr,
-                "timestamp": start_time.isoformat(),
-                "execution_time": (datetime.now() - start_time).total_seconds()
+            exit_status = -1 if truncated else await run_blocking(channel.recv_exit_status)
+            yield {
+                "event": "exit",
+                "exit_status": exit_status,
+                "success": exit_status == 0,
+                "bytes": total_bytes,
+                "truncated": truncated
             }
             
-            results.append(result)
+        except Exception as e:
+            error_msg = f"Command streaming error: {str(e)}"
+            logger.error(error_msg)
+            yield {"event": "error", "data": error_msg}
             
-            # Komutlar arası bekleme
-            if delay > 0 and command != commands[-1]:
-                await asyncio.sleep(delay)
+        finally:
+            if channel is not None:
+                channel.close()
+    
+    def _open_exec_channel(self, command: str, timeout: int):
+        """Yeni bir exec kanalı açar - executor thread'inde çalışır"""
+        channel = self.client.get_transport().open_session(timeout=timeout)
+        channel.settimeout(timeout)
+        channel.exec_command(command)
+        return channel
+    
+    async def open_shell(self, term: str = "xterm", cols: int = 120, rows: int = 40, timeout: int = 10):
+        """PTY'li etkileşimli shell kanalı açar - prompt ve mod durumu kanal boyunca korunur"""
+        if not self.connected or not self.client:
+            raise paramiko.SSHException("Not connected to device")
+        return await run_blocking(self._open_shell_channel, term, cols, rows, timeout)
+    
+    def _open_shell_channel(self, term: str, cols: int, rows: int, timeout: int):
+        """Yeni bir shell kanalı açar - executor thread'inde çalışır"""
+        channel = self.client.get_transport().open_session(timeout=timeout)
+        channel.get_pty(term=term, width=cols, height=rows)
+        channel.invoke_shell()
+        return channel
+    
+    async def execute_multiple_commands(
+        self,
+        commands: List[str],
+        delay: Optional[float] = None,
+        max_channels: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Birden fazla komut çalıştırır
+        Bekleme yoksa komutlar aynı transport üzerinde eşzamanlı kanallarda çalışır;
+        delay (veya cihaz profilinin command_delay'i) > 0 ise sıralı ve aralıklı çalışır.
+        Shell sürücüleri (driver.use_shell) tek bir shell kanalını paylaştığından max_channels
+        yok sayılır ve komutlar her zaman sıralı çalışır - eşzamanlı yazım çıktıları karıştırır.
+        Returns: List[{command, success, stdout, stderr, timestamp, execution_time}] - komut sırasıyla
+        """
+        if delay is None:
+            delay = self.profile.get("command_delay", 0.0)
+        if self.driver.use_shell:
+            max_channels = 1
+        elif max_channels is None:
+            max_channels = self.profile.get("max_channels", 1)
         
-        return results
+        # Rate limit isteyen cihazlar - sıralı ve komutlar arası bekleme ile
+        if delay > 0 or max_channels <= 1 or len(commands) <= 1:
+            results = []
+            for index, command in enumerate(commands):
+                if index > 0 and delay > 0:
+                    await asyncio.sleep(delay)
+                results.append(await self._timed_command(command))
+            return results
+        
+        semaphore = asyncio.Semaphore(max_channels)
+        
+        async def run(command: str) -> Dict:
+            async with semaphore:
+                return await self._timed_command(command)
+        
+        results = await asyncio.gather(*(run(command) for command in commands))
+        
+        # Kanal açma reddedilen komutları tek tek tekrar dene
+        for index, result in enumerate(results):
+            if not result["success"] and result["stderr"].startswith(CHANNEL_REFUSED_PREFIX):
+                results[index] = await self._timed_command(result["command"])
+        
+        return list(results)
     
+    async def _timed_command(self, command: str) -> Dict:
+        start_time = datetime.now()
+        success, stdout, stderr = await self.execute_command(command)
+        return {
+            "command": command,
+            "success": success,
+            "stdout": stdout,
+            "stderr": stderr,
+            "timestamp": start_time.isoformat(),
+            "execution_time": (datetime.now() - start_time).total_seconds()
+        }
+    
+    async def is_alive(self, timeout: float = 5.0) -> bool:
+        """Transport'un hâlâ kullanılabilir olup olmadığını tek RTT'lik bir probe ile kontrol eder"""
+        if not self.connected or not self.client:
+            return False
+
+        transport = self.client.get_transport()
+        if transport is None or not transport.is_active():
+            return False
+
+        try:
+            # keepalive@openssh.com - sunucu başarı ya da hata ile cevap verir,
+            # ikisi de transport'un canlı olduğunu gösterir
+            await asyncio.wait_for(
+                run_blocking(transport.global_request, "keepalive@openssh.com", wait=True),
+                timeout=timeout
+            )
+            return transport.is_active()
+        except Exception as e:
+            logger.warning(f"SSH liveness probe failed: {e}")
+            return False
+
     def disconnect(self):
         """SSH bağlantısını kapatır"""
+        self._close_shell()
         if self.client:
             try:
                 self.client.close()
@@ -137,6 +396,8 @@ class SSHConnector:
             except Exception as e:
                 logger.error(f"Error closing SSH connection: {e}")
             finally:
+                if self.connected:
+                    ssh_sessions_active.dec(self.driver.device_type)
                 self.connected = False
                 self.client = None
     
@@ -145,6 +406,25 @@ class SSHConnector:
         self.disconnect()
 
 
+def _read_channel_chunk(channel, chunk_size: int, timeout: float) -> Tuple[str, bytes]:
+    """
+    Kanaldan bir sonraki stdout/stderr parçasını bekler - executor thread'inde çalışır
+    Returns: (stream: stdout|stderr|eof, data: bytes)
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        if channel.recv_ready():
+            return "stdout", channel.recv(chunk_size)
+        if channel.recv_stderr_ready():
+            return "stderr", channel.recv_stderr(chunk_size)
+        if channel.eof_received or channel.closed:
+            return "eof", b""
+        if time.monotonic() > deadline:
+            raise socket.timeout(f"No output within {timeout}s")
+        # Kanal pipe'ı veri geldiğinde uyanır; stderr için kısa aralıklarla tekrar kontrol edilir
+        select.select([channel], [], [], 0.05)
+
+
 class NetworkDeviceManager:
     """Ağ cihazları için özel komutlar ve konfigürasyonlar"""
     
@@ -158,6 +438,22 @@ class NetworkDeviceManager:
             "save_config": "write memory",
             "show_inventory": "show inventory"
         },
+        "cisco_asa": {
+            "show_version": "show version",
+            "show_interfaces": "show interface ip brief",
+            "show_running_config": "show running-config",
+            "show_routes": "show route",
+            "save_config": "write memory",
+            "show_failover": "show failover"
+        },
+        "juniper": {
+            "show_version": "show version",
+            "show_interfaces": "show interfaces terse",
+            "show_running_config": "show configuration | display set",
+            "show_routes": "show route summary",
+            "show_alarms": "show system alarms",
+            "show_chassis": "show chassis hardware"
+        },
         "mikrotik": {
             "show_version": "/system resource print",
             "show_interfaces": "/interface print",
@@ -183,16 +479,48 @@ class NetworkDeviceManager:
         }
     }
     
+    # Cihaz tipine göre çoklu komut davranışı
+    # max_channels: aynı transport üzerinde eşzamanlı exec kanalı sayısı (shell sürücülerinde her zaman 1)
+    # command_delay: komutlar arası bekleme (saniye) - > 0 ise komutlar sıralı çalışır
+    DEVICE_PROFILES = {
+        "cisco_ios": {"max_channels": 1, "command_delay": 0.0},
+        "cisco_asa": {"max_channels": 1, "command_delay": 0.0},
+        "juniper": {"max_channels": 1, "command_delay": 0.0},
+        "mikrotik": {"max_channels": 1, "command_delay": 0.0},
+        "ubuntu": {"max_channels": 8, "command_delay": 0.0},
+        "windows": {"max_channels": 4, "command_delay": 0.0}
+    }
+    DEFAULT_PROFILE = {"max_channels": 4, "command_delay": 0.0}
+    
+    @staticmethod
+    def get_device_profile(device_type: str, overrides: Optional[Dict] = None) -> Dict:
+        """Cihaz tipinin profilini döner - cihaz kaydındaki max_channels/command_delay alanları önceliklidir"""
+        profile = dict(NetworkDeviceManager.DEVICE_PROFILES.get(
+            (device_type or "unknown").lower(), NetworkDeviceManager.DEFAULT_PROFILE
+        ))
+        for key in profile:
+            if overrides and overrides.get(key) is not None:
+                profile[key] = overrides[key]
+        return profile
+    
     @staticmethod
     def get_device_commands(device_type: str) -> Dict[str, str]:
         """Cihaz tipine göre kullanılabilir komutları döner"""
         return NetworkDeviceManager.DEVICE_COMMANDS.get(device_type.lower(), {})
     
+    @staticmethod
+    def get_config_backup_command(device_type: str) -> Optional[str]:
+        """Konfigürasyon yedeği için komut - tanımlı değilse None"""
+        commands = NetworkDeviceManager.get_device_commands(device_type or "")
+        return commands.get("show_running_config") or commands.get("export_config")
+    
     @staticmethod
     def get_health_check_commands(device_type: str) -> List[str]:
         """Cihaz sağlığını kontrol etmek için temel komutlar"""
         commands_map = {
             "cisco_ios": ["show version", "show ip interface brief"],
+            "cisco_asa": ["show version", "show interface ip brief"],
+            "juniper": ["show version", "show interfaces terse"],
             "mikrotik": ["/system resource print", "/interface print"],
             "ubuntu": ["uptime", "ip addr show"],
             "windows": ["ver", "ipconfig"]
@@ -273,6 +601,10 @@ def get_test_commands_for_device_type(device_type: str) -> List[str]:
             "show ip interface brief | count",
             "show users"
         ],
+        "cisco_asa": [
+            "show version | include Version",
+            "show interface ip brief"
+        ],
         "mikrotik": [
             "/system identity print",
             "/system resource print",
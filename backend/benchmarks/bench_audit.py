@@ -0,0 +1,169 @@
+"""
+Audit Log Benchmark
+backend/benchmarks/bench_audit.py
+
+Geçici bir dizine --hours saate yayılmış --records kadar sentetik denetim
+kaydı yazar (yazıcı thread'inin toplu yazma yolu), ardından GET /audit'in
+kullandığı sorguları ölçer: filtresiz ilk sayfa, kullanıcı/cihaz/aksiyon
+filtreleri, zaman aralığı, seyrek cihaz ve cursor ile derin sayfalama.
+Her sorgu önce soğuk (indeks diskten), sonra sıcak (indeks önbellekte) ölçülür.
+Ayrıca record() çağrısının istek yolundaki maliyeti raporlanır.
+
+Kullanım (backend dizininden):
+    python -m benchmarks.bench_audit --records 2000000 --hours 720
+    python -m benchmarks.bench_audit --records 20000000 --hours 2160 --dir /data/audit-bench --keep
+"""
+
+import argparse
+import logging
+import random
+import shutil
+import statistics
+import tempfile
+import time
+
+from app.utils.audit_log import AuditLog
+
+ACTIONS = ["command.execute"] * 6 + ["command.execute_multiple", "device.quick_info", "device.health_check",
+                                     "fleet.execute", "command.stream", "shell.open", "auth.login"]
+COMMANDS = ["show version", "show ip interface brief", "show running-config", "show interfaces",
+            "/interface print", "ip addr show", "uptime"]
+
+
+def _populate(log: AuditLog, records: int, hours: int, users: int, devices: int, batch: int) -> float:
+    """Kayıtları zaman sırasıyla ve toplu olarak yazar - kayıt başına süreyi döner"""
+    rng = random.Random(7)
+    start_ts = time.time() - hours * 3600
+    step = hours * 3600 / records
+    start = time.perf_counter()
+    written = 0
+    while written < records:
+        count = min(batch, records - written)
+        entries = []
+        for i in range(written, written + count):
+            ts = start_ts + i * step
+            # Kullanıcı ve cihaz dağılımı çarpık - birkaç yoğun hesap, uzun kuyruk
+            user = f"user{min(int(rng.paretovariate(1.2)), users) - 1}"
+            device_id = min(int(rng.paretovariate(0.8)), devices)
+            entries.append({
+                "ts": ts,
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(ts)),
+                "action": rng.choice(ACTIONS),
+                "status": "success" if rng.random() > 0.05 else "failure",
+                "user": user,
+                "device_username": "admin",
+                "device_id": device_id,
+                "device_name": f"dev{device_id}",
+                "device_ip": f"10.{device_id >> 16 & 255}.{device_id >> 8 & 255}.{device_id & 255}",
+                "commands": [rng.choice(COMMANDS)],
+                "detail": None,
+                "client_ip": "10.0.0.1",
+                "duration_ms": round(rng.uniform(20, 900), 2)
+            })
+        log._write(entries)
+        written += count
+        if written % (batch * 200) == 0:
+            print(f"  {written:>12,} records written", flush=True)
+    # Son saat dışındaki tüm segmentler kapandı; sonuncusu da kapatılır (gerçekte saat dönünce)
+    log._seal(log._active)
+    return (time.perf_counter() - start) / records
+
+
+def _measure(log: AuditLog, label: str, runs: int, **filters):
+    cold = None
+    samples = []
+    result = None
+    for run in range(runs + 1):
+        if run == 0:
+            # Soğuk: indeks önbelleği boş
+            with log._lock:
+                log._indexes.clear()
+        start = time.perf_counter()
+        result = log.query(**filters)
+        elapsed = time.perf_counter() - start
+        if run == 0:
+            cold = elapsed
+        else:
+            samples.append(elapsed)
+    print(f"{label:<34} {len(result['entries']):>6} {result['scanned_segments']:>8} "
+          f"{cold * 1000:>10.2f} {statistics.median(samples) * 1000:>10.2f}")
+    return result
+
+
+def _deep_pages(log: AuditLog, pages: int, **filters) -> float:
+    cursor = None
+    start = time.perf_counter()
+    for _ in range(pages):
+        result = log.query(cursor=cursor, **filters)
+        cursor = result["next_cursor"]
+        if cursor is None:
+            break
+    return (time.perf_counter() - start) / pages
+
+
+def run_benchmark(args):
+    directory = args.dir or tempfile.mkdtemp(prefix="pam-audit-bench-")
+    try:
+        writer = AuditLog(directory=directory)
+        writer.load()
+        print(f"Writing {args.records:,} records over {args.hours} hours to {directory}")
+        per_record = _populate(writer, args.records, args.hours, args.users, args.devices, args.batch)
+        stats = writer.get_stats()
+        print(f"generate + write: {per_record * 1e6:.2f} us/record, {stats['segments']} segments, "
+              f"{stats['total_bytes'] / 1e6:.0f} MB")
+
+        # Yeniden açılış - manifest okuma süresi
+        start = time.perf_counter()
+        log = AuditLog(directory=directory, index_cache=args.index_cache)
+        log.load()
+        print(f"reopen: {log.get_stats()['total_records']:,} records, manifest loaded in "
+              f"{(time.perf_counter() - start) * 1000:.1f} ms\n")
+
+        newest = time.time()
+        window_end = newest - args.hours * 3600 / 2
+        print(f"{'query':<34} {'rows':>6} {'segments':>8} {'cold ms':>10} {'warm ms':>10}")
+        _measure(log, "newest page", args.runs, limit=50)
+        _measure(log, "user (busy)", args.runs, user="user0", limit=50)
+        _measure(log, "user (rare)", args.runs, user=f"user{args.users - 1}", limit=50)
+        _measure(log, "device (busy)", args.runs, device_id=1, limit=50)
+        _measure(log, "device (rare)", args.runs, device_id=300, limit=50)
+        _measure(log, "user + device", args.runs, user="user1", device_id=2, limit=50)
+        _measure(log, "action + status", args.runs, action="shell.open", status="failure", limit=50)
+        _measure(log, "1h window mid-range", args.runs, since=window_end - 3600, until=window_end, limit=50)
+        _measure(log, "device + 1h window", args.runs, device_id=3, since=window_end - 3600, until=window_end,
+                 limit=50)
+        _measure(log, "absent user", args.runs, user="nobody", limit=50)
+
+        per_page = _deep_pages(log, args.pages, limit=100)
+        print(f"\ndeep pagination: {args.pages} pages x 100 newest-first, {per_page * 1000:.2f} ms/page")
+        per_page = _deep_pages(log, args.pages, device_id=2, limit=100)
+        print(f"deep pagination (device 2): {per_page * 1000:.2f} ms/page")
+
+        # İstek yolundaki maliyet - yalnızca kuyruğa ekleme
+        recorder = AuditLog(directory=directory, max_pending=args.records)
+        device = {"id": 1, "name": "dev1", "ip": "10.0.0.1"}
+        start = time.perf_counter()
+        for _ in range(100000):
+            recorder.record("command.execute", user="user0", device=device, device_username="admin",
+                            commands=["show version"], client_ip="10.0.0.1", duration=0.1)
+        print(f"record(): {(time.perf_counter() - start) / 100000 * 1e6:.2f} us/call (enqueue only, writer not started)")
+    finally:
+        if not args.keep:
+            shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Audit log write/query benchmark")
+    parser.add_argument("--records", type=int, default=2000000)
+    parser.add_argument("--hours", type=int, default=720, help="Kayıtların yayıldığı süre (saatlik segment sayısı)")
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--devices", type=int, default=20000)
+    parser.add_argument("--batch", type=int, default=5000, help="Yazıcı batch boyutu")
+    parser.add_argument("--index-cache", type=int, default=64)
+    parser.add_argument("--runs", type=int, default=5, help="Sıcak ölçüm tekrar sayısı")
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--dir", default="", help="Boş: geçici dizin")
+    parser.add_argument("--keep", action="store_true", help="Dizini silme")
+    logging.basicConfig(level=logging.WARNING)
+    args = parser.parse_args()
+    run_benchmark(args)
@@ -0,0 +1,142 @@
+"""
+Circuit Breaker Benchmark
+backend/benchmarks/bench_circuit.py
+
+Hatalı cihazlara ardışık istekleri SSH havuzu üzerinden devre kesici açık ve
+kapalı olarak gönderir; istek başına süreyi ve cihaza ulaşan bağlantı denemesi
+sayısını karşılaştırır. Senaryolar:
+    auth    - simüle cihaz, yanlış şifre (hesap kilitleme riski)
+    refused - kapalı port (bağlantı reddi)
+    silent  - TCP kabul edip SSH banner göndermeyen port (deneme başına ~30s)
+--recover ile auth senaryosu sonunda cihaz şifresi düzeltilir ve half-open
+probe'un devreyi ne kadar sürede kapattığı ölçülür.
+
+Kullanım (backend dizininden):
+    python -m benchmarks.bench_circuit --requests 50
+    python -m benchmarks.bench_circuit --scenarios auth,refused,silent --requests 10
+"""
+
+import argparse
+import asyncio
+import logging
+import socket
+import statistics
+import time
+from typing import Dict, List, Tuple
+
+from app.utils.admission import AdmissionController
+from app.utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+from app.utils.connection_pool import SSHConnectionPool
+from benchmarks.device_simulator import DEFAULT_PASSWORD, DEFAULT_USERNAME, DeviceSimulator, SimulatorSettings
+
+WRONG_PASSWORD = "not-the-password"
+
+
+def _closed_port() -> int:
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+async def _silent_server() -> Tuple[asyncio.AbstractServer, int]:
+    """Bağlantıyı kabul eder, hiçbir şey göndermez"""
+    held = []
+
+    async def handle(reader, writer):
+        held.append(writer)
+        try:
+            await reader.read()
+        except (asyncio.CancelledError, ConnectionError):
+            pass
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    return server, server.sockets[0].getsockname()[1]
+
+
+def _percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))] if ordered else 0.0
+
+
+async def _run(pool: SSHConnectionPool, device: Dict, port: int, password: str, requests: int) -> Dict:
+    attempted: List[float] = []
+    rejected: List[float] = []
+    start = time.perf_counter()
+    for _ in range(requests):
+        t0 = time.perf_counter()
+        try:
+            entry, success, _ = await pool.acquire(device, DEFAULT_USERNAME, password, port, timeout=5)
+            if entry is not None:
+                pool.release(entry, reusable=False)
+            attempted.append(time.perf_counter() - t0)
+        except CircuitOpenError:
+            rejected.append(time.perf_counter() - t0)
+    return {"attempted": attempted, "rejected": rejected, "elapsed": time.perf_counter() - start}
+
+
+def _print_row(scenario: str, mode: str, result: Dict):
+    attempted, rejected = result["attempted"], result["rejected"]
+    print(f"{scenario:<8} {mode:<8} {len(attempted):>9} {len(rejected):>9} "
+          f"{statistics.mean(attempted) * 1000 if attempted else 0:>13.1f} "
+          f"{_percentile(rejected, 0.5) * 1e6:>13.1f} {result['elapsed']:>9.2f}")
+
+
+async def _main(args):
+    simulator = DeviceSimulator(SimulatorSettings(latency=args.latency))
+    sim_device = await simulator.add_device("cisco_ios")
+    silent, silent_port = await _silent_server()
+
+    targets = {
+        "auth": (sim_device.port, WRONG_PASSWORD),
+        "refused": (_closed_port(), DEFAULT_PASSWORD),
+        "silent": (silent_port, DEFAULT_PASSWORD)
+    }
+
+    print(f"{'scenario':<8} {'breaker':<8} {'attempted':>9} {'rejected':>9} "
+          f"{'attempt ms':>13} {'reject p50 us':>13} {'total s':>9}")
+    for scenario in args.scenarios.split(","):
+        port, password = targets[scenario]
+        for enabled in (False, True):
+            breaker = CircuitBreaker(base_backoff=args.base_backoff, enabled=enabled)
+            pool = SSHConnectionPool(admission=AdmissionController(), breaker=breaker)
+            device = {"id": 1, "name": scenario, "ip": "127.0.0.1", "type": "cisco_ios"}
+            logins_before = sim_device.stats.connections
+            result = await _run(pool, device, port, password, args.requests)
+            _print_row(scenario, "on" if enabled else "off", result)
+            if scenario == "auth":
+                logins = sim_device.stats.connections - logins_before
+                print(f"{'':<17} login attempts seen by device: {logins}")
+
+            if scenario == "auth" and enabled and args.recover:
+                # Cihaz tarafında şifre denenen değere çevrilir - bir sonraki probe başarılı olmalı
+                sim_device.settings.password = WRONG_PASSWORD
+                t0 = time.perf_counter()
+                while True:
+                    try:
+                        entry, success, _ = await pool.acquire(device, DEFAULT_USERNAME, password, port)
+                        pool.release(entry, reusable=False)
+                        break
+                    except CircuitOpenError as e:
+                        await asyncio.sleep(min(e.retry_after, 0.05))
+                print(f"{'':<17} recovered via half-open probe after {time.perf_counter() - t0:.2f}s "
+                      f"(stats: {breaker.get_stats()})")
+                sim_device.settings.password = DEFAULT_PASSWORD
+
+    silent.close()
+    simulator.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Circuit breaker benchmark")
+    parser.add_argument("--scenarios", default="auth,refused", help="auth,refused,silent")
+    parser.add_argument("--requests", type=int, default=50, help="Senaryo başına ardışık istek")
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--base-backoff", type=float, default=1.0, help="İlk açılış süresi (saniye)")
+    parser.add_argument("--recover", action="store_true", help="Auth senaryosunda probe ile kapanmayı ölç")
+    # ssh_connector import sırasında INFO ile basicConfig çağırır
+    logging.getLogger().setLevel(logging.WARNING)
+    logging.getLogger("paramiko").setLevel(logging.CRITICAL)
+    args = parser.parse_args()
+    asyncio.run(_main(args))
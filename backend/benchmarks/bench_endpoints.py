@@ -0,0 +1,356 @@
+"""
+End-to-End Endpoint Benchmark
+backend/benchmarks/bench_endpoints.py
+
+Simüle cihaz filosunu (device_simulator) başlatır, API'yi ayrı bir uvicorn
+sürecinde geçici bir veritabanıyla çalıştırır ve connections.py endpoint'lerini
+N eşzamanlı istemci x M cihaz ile yükler. Senaryo başına p50/p99 gecikme ve
+throughput raporlanır; --max-p99 / --max-error-rate aşılırsa çıkış kodu 1'dir (CI).
+
+Kullanım (backend dizininden):
+    python -m benchmarks.bench_endpoints --clients 50 --devices 9 --requests 20
+    python -m benchmarks.bench_endpoints --scenarios execute,health-check --json result.json --max-p99 2.0
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.utils.ssh_connector import NetworkDeviceManager
+from benchmarks.device_simulator import (
+    DEFAULT_PASSWORD, DEFAULT_USERNAME, DeviceSimulator, SimulatedDevice,
+    add_simulator_arguments, settings_from_args
+)
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+# ===========================================
+# MINIMAL HTTP CLIENT
+# ===========================================
+
+class _HTTPConnection:
+    """Keep-alive HTTP/1.1 istemcisi - yalnızca benchmark için (Content-Length ve chunked gövde)"""
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    async def request(self, method: str, path: str, payload=None, body: bytes = b"",
+                      content_type: str = "application/json") -> Tuple[int, bytes]:
+        if payload is not None:
+            body = json.dumps(payload).encode("utf-8")
+        head = (f"{method} {path} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n"
+                f"Content-Type: {content_type}\r\nContent-Length: {len(body)}\r\n\r\n")
+        for attempt in range(2):
+            if self._writer is None:
+                self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+            try:
+                self._writer.write(head.encode("latin-1") + body)
+                return await self._read_response()
+            except (ConnectionError, asyncio.IncompleteReadError):
+                # Sunucu boşta kalan keep-alive bağlantısını kapatmış olabilir - bir kez yeniden bağlan
+                self.close()
+                if attempt:
+                    raise
+        raise ConnectionError("unreachable")
+
+    async def _read_response(self) -> Tuple[int, bytes]:
+        header_block = await self._reader.readuntil(b"\r\n\r\n")
+        lines = header_block.decode("latin-1").split("\r\n")
+        status = int(lines[0].split(" ", 2)[1])
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await self._reader.readline()).split(b";")[0], 16)
+                chunk = await self._reader.readexactly(size + 2)
+                if size == 0:
+                    break
+                chunks.append(chunk[:-2])
+            body = b"".join(chunks)
+        else:
+            body = await self._reader.readexactly(int(headers.get("content-length", "0")))
+
+        if headers.get("connection", "").lower() == "close":
+            self.close()
+        return status, body
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+            self._reader = None
+
+
+# ===========================================
+# SCENARIOS
+# ===========================================
+
+def _credentials(device: SimulatedDevice, device_id: int) -> Dict:
+    return {"device_id": device_id, "username": DEFAULT_USERNAME, "password": DEFAULT_PASSWORD, "port": device.port}
+
+
+def _show_interfaces(device: SimulatedDevice) -> str:
+    return NetworkDeviceManager.get_device_commands(device.device_type)["show_interfaces"]
+
+
+# senaryo adı -> (device, device_id) için (path, payload)
+SCENARIOS: Dict[str, Callable[[SimulatedDevice, int], Tuple[str, Dict]]] = {
+    # Her istek cihaza gider (sonuç önbelleği atlanır)
+    "execute": lambda d, i: (f"/connections/execute/{i}", {
+        **_credentials(d, i), "command": _show_interfaces(d), "bypass_cache": True
+    }),
+    # Salt okunur komut - önbellekten dönebilir
+    "execute-cached": lambda d, i: (f"/connections/execute/{i}", {
+        **_credentials(d, i), "command": _show_interfaces(d)
+    }),
+    "execute-multiple": lambda d, i: (f"/connections/execute-multiple/{i}", {
+        **_credentials(d, i),
+        "commands": list(NetworkDeviceManager.get_device_commands(d.device_type).values())[:3]
+    }),
+    "health-check": lambda d, i: (f"/connections/health-check/{i}", _credentials(d, i)),
+    "quick-info": lambda d, i: (f"/connections/quick-info/{i}", {**_credentials(d, i), "bypass_cache": True}),
+}
+
+
+@dataclass
+class ScenarioResult:
+    scenario: str
+    latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+    # Sunucuda süren özdeş bir çalıştırmaya bağlanan yanıtlar
+    coalesced: int = 0
+    status_codes: Dict[int, int] = field(default_factory=dict)
+    elapsed: float = 0.0
+
+    def _percentile(self, pct: float) -> float:
+        ordered = sorted(self.latencies)
+        if not ordered:
+            return 0.0
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+    def summary(self) -> Dict:
+        count = len(self.latencies)
+        return {
+            "scenario": self.scenario,
+            "requests": count,
+            "errors": self.errors,
+            "error_rate": round(self.errors / count, 4) if count else 0.0,
+            "coalesced": self.coalesced,
+            "p50": round(self._percentile(0.50), 4),
+            "p99": round(self._percentile(0.99), 4),
+            "max": round(max(self.latencies, default=0.0), 4),
+            "throughput": round(count / self.elapsed, 2) if self.elapsed else 0.0,
+            "status_codes": {str(k): v for k, v in sorted(self.status_codes.items())}
+        }
+
+
+def _inspect(status: int, body: bytes) -> Tuple[bool, bool]:
+    """(hata mı, birleştirildi mi) - HTTP hatası veya cihaz tarafında başarısız sonuç hata sayılır"""
+    if status >= 400:
+        return True, False
+    try:
+        data = json.loads(body)
+    except ValueError:
+        return True, False
+    result = data.get("result")
+    if isinstance(result, dict):
+        if result.get("success") is False:
+            return True, bool(result.get("coalesced"))
+        return False, bool(result.get("coalesced"))
+    return data.get("status") in ("failed", "error"), bool(data.get("coalesced"))
+
+
+async def _client(conn: _HTTPConnection, scenario: str, targets: List[Tuple[SimulatedDevice, int]],
+                  offset: int, requests: int, result: ScenarioResult):
+    build = SCENARIOS[scenario]
+    for n in range(requests):
+        device, device_id = targets[(offset + n) % len(targets)]
+        path, payload = build(device, device_id)
+        start = time.perf_counter()
+        try:
+            status, body = await conn.request("POST", path, payload)
+        except (ConnectionError, asyncio.IncompleteReadError, OSError):
+            status, body = 599, b""
+        result.latencies.append(time.perf_counter() - start)
+        result.status_codes[status] = result.status_codes.get(status, 0) + 1
+        is_error, coalesced = _inspect(status, body)
+        result.errors += is_error
+        result.coalesced += coalesced
+
+
+async def run_scenario(host: str, port: int, scenario: str, targets: List[Tuple[SimulatedDevice, int]],
+                       clients: int, requests: int) -> ScenarioResult:
+    result = ScenarioResult(scenario)
+    connections = [_HTTPConnection(host, port) for _ in range(clients)]
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*[
+            _client(conn, scenario, targets, i, requests, result) for i, conn in enumerate(connections)
+        ])
+    finally:
+        result.elapsed = time.perf_counter() - start
+        for conn in connections:
+            conn.close()
+    return result
+
+
+# ===========================================
+# API PROCESS
+# ===========================================
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def _start_api(port: int, workdir: str, extra_env: Dict[str, str], show_logs: bool) -> subprocess.Popen:
+    """API'yi boş bir JSON veritabanıyla ayrı süreçte başlatır ve hazır olmasını bekler"""
+    env = {
+        **os.environ,
+        "DATABASE_PATH": os.path.join(workdir, "db.json"),
+        "CONFIG_BACKUP_DIR": os.path.join(workdir, "backups"),
+        **extra_env
+    }
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env,
+        stdout=None if show_logs else subprocess.DEVNULL,
+        stderr=None if show_logs else subprocess.DEVNULL
+    )
+    conn = _HTTPConnection("127.0.0.1", port)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"API process exited with code {process.returncode}")
+        try:
+            status, _ = await conn.request("GET", "/")
+            if status == 200:
+                conn.close()
+                return process
+        except OSError:
+            pass
+        await asyncio.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("API did not become ready within 30s")
+
+
+async def _register_devices(port: int, devices: List[SimulatedDevice]) -> List[Tuple[SimulatedDevice, int]]:
+    """Simüle cihazları envantere ekler ve (cihaz, device_id) eşlemesini döner"""
+    conn = _HTTPConnection("127.0.0.1", port)
+    body = "\n".join(
+        json.dumps({"name": device.hostname, "ip": device.host, "type": device.device_type}) for device in devices
+    ).encode("utf-8")
+    # Tüm simüle cihazlar aynı IP'de (farklı portlarda) - toplu içe aktarma ip tekrarını reddettiği için tek tek eklenir
+    for line in body.split(b"\n"):
+        status, response = await conn.request("POST", "/devices", body=line)
+        if status != 200:
+            raise RuntimeError(f"Device registration failed: {status} {response[:200]!r}")
+
+    status, response = await conn.request("GET", "/devices?fields=id,name")
+    conn.close()
+    data = json.loads(response)
+    listed = data if isinstance(data, list) else data.get("devices", [])
+    ids = {item["name"]: item["id"] for item in listed}
+    return [(device, ids[device.hostname]) for device in devices]
+
+
+# ===========================================
+# MAIN
+# ===========================================
+
+def _print_report(summaries: List[Dict], simulator_stats: Dict, clients: int, device_count: int):
+    print(f"\nclients={clients} devices={device_count}")
+    print(f"{'scenario':<18} {'reqs':>6} {'errors':>7} {'shared':>7} {'p50 s':>8} {'p99 s':>8} {'max s':>8} {'req/s':>8}")
+    for s in summaries:
+        print(f"{s['scenario']:<18} {s['requests']:>6} {s['errors']:>7} {s['coalesced']:>7} {s['p50']:>8.3f} "
+              f"{s['p99']:>8.3f} {s['max']:>8.3f} {s['throughput']:>8.1f}")
+    print(f"simulator: {simulator_stats}")
+
+
+async def run_benchmark(args) -> int:
+    simulator = DeviceSimulator(settings_from_args(args))
+    devices = await simulator.start_fleet(args.devices, args.types.split(","))
+    api_port = args.api_port or _free_port()
+
+    with tempfile.TemporaryDirectory(prefix="pam-bench-") as workdir:
+        extra_env = dict(item.split("=", 1) for item in args.env)
+        api = await _start_api(api_port, workdir, extra_env, args.api_logs)
+        try:
+            targets = await _register_devices(api_port, devices)
+            summaries = []
+            for scenario in args.scenarios.split(","):
+                if scenario not in SCENARIOS:
+                    raise SystemExit(f"Unknown scenario: {scenario} (choices: {', '.join(SCENARIOS)})")
+                if args.warmup:
+                    await run_scenario("127.0.0.1", api_port, scenario, targets, len(targets), 1)
+                result = await run_scenario("127.0.0.1", api_port, scenario, targets, args.clients, args.requests)
+                summaries.append(result.summary())
+        finally:
+            api.terminate()
+            api.wait(timeout=10)
+            simulator.close()
+
+    _print_report(summaries, simulator.get_stats(), args.clients, len(devices))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({
+                "clients": args.clients,
+                "devices": len(devices),
+                "requests_per_client": args.requests,
+                "simulator": {**simulator.get_stats(), "latency": args.latency, "output_size": args.output_size},
+                "scenarios": summaries
+            }, f, indent=2)
+
+    # CI eşikleri
+    failed = []
+    for s in summaries:
+        if args.max_p99 is not None and s["p99"] > args.max_p99:
+            failed.append(f"{s['scenario']}: p99 {s['p99']}s > {args.max_p99}s")
+        if args.max_error_rate is not None and s["error_rate"] > args.max_error_rate:
+            failed.append(f"{s['scenario']}: error rate {s['error_rate']} > {args.max_error_rate}")
+    for line in failed:
+        print(f"THRESHOLD FAILED {line}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="End-to-end connections endpoint benchmark")
+    add_simulator_arguments(parser)
+    parser.add_argument("--clients", type=int, default=20, help="Eşzamanlı HTTP istemcisi")
+    parser.add_argument("--requests", type=int, default=10, help="İstemci başına istek")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--warmup", action=argparse.BooleanOptionalAction, default=True,
+                        help="Ölçümden önce her cihaza bir istek (bağlantı havuzunu ısıtır)")
+    parser.add_argument("--api-port", type=int, default=0)
+    parser.add_argument("--env", action="append", default=[], help="API sürecine ek ortam değişkeni (KEY=VALUE)")
+    parser.add_argument("--api-logs", action="store_true", help="API sürecinin log çıktısını göster")
+    parser.add_argument("--json", help="Sonuçların yazılacağı JSON dosyası")
+    parser.add_argument("--max-p99", type=float, default=None, help="Senaryo p99 üst sınırı (saniye)")
+    parser.add_argument("--max-error-rate", type=float, default=None)
+    logging.basicConfig(level=logging.WARNING)
+    # asyncssh kanal açma/kapama başına INFO log basar
+    logging.getLogger("asyncssh").setLevel(logging.WARNING)
+    sys.exit(asyncio.run(run_benchmark(parser.parse_args())))
@@ -0,0 +1,122 @@
+"""
+json_db Lookup Benchmark
+backend/benchmarks/bench_json_db.py
+
+Eski yöntem (her çağrıda json.loads + doğrusal tarama) ile cache'li,
+indeksli json_db aramalarının gecikmesini; tüm dosyanın yeniden yazılması
+ile WAL'a ekleme yapan mutasyonların gecikmesini karşılaştırır.
+
+Kullanım (backend dizininden):
+    python -m benchmarks.bench_json_db --devices 10000 --lookups 2000 --writes 200
+"""
+
+import argparse
+import json
+import logging
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from app import json_db
+
+
+def _make_db(path: Path, device_count: int):
+    devices = [
+        {
+            "id": i,
+            "name": f"device-{i}",
+            "ip": f"10.{(i >> 16) & 255}.{(i >> 8) & 255}.{i & 255}",
+            "type": random.choice(["cisco_ios", "mikrotik", "ubuntu", "juniper"]),
+            "vault_path": None
+        }
+        for i in range(1, device_count + 1)
+    ]
+    path.write_text(json.dumps({"devices": devices, "users": []}), encoding="utf-8")
+
+
+def _legacy_lookup(path: Path, device_id: int):
+    """Önceki davranış: dosyayı oku, parse et, doğrusal tara"""
+    with open(path, "r", encoding="utf-8") as f:
+        devices = json.loads(f.read()).get("devices", [])
+    return next((d for d in devices if d.get("id") == device_id), None)
+
+
+def _legacy_add(path: Path, device: dict):
+    """Önceki davranış: dosyayı oku, ekle, tamamını yeniden yaz"""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.loads(f.read())
+    device["id"] = max([d.get("id", 0) for d in data["devices"]], default=0) + 1
+    data["devices"].append(device)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def _report(label: str, samples):
+    samples.sort()
+    p50 = samples[len(samples) // 2]
+    p99 = samples[int(len(samples) * 0.99) - 1]
+    print(f"{label:<22} p50={p50 * 1e6:10.1f} us   p99={p99 * 1e6:10.1f} us")
+
+
+def run_benchmark(device_count: int, lookups: int, writes: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "db.json"
+        _make_db(path, device_count)
+        json_db.DB_PATH = path
+        ids = [random.randint(1, device_count) for _ in range(lookups)]
+
+        legacy = []
+        for device_id in ids[: max(lookups // 20, 10)]:
+            start = time.perf_counter()
+            _legacy_lookup(path, device_id)
+            legacy.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        json_db.get_device_by_id(1)
+        cold = time.perf_counter() - start
+
+        indexed = []
+        for device_id in ids:
+            start = time.perf_counter()
+            json_db.get_device_by_id(device_id)
+            indexed.append(time.perf_counter() - start)
+
+        by_ip = []
+        for device_id in ids:
+            ip = f"10.{(device_id >> 16) & 255}.{(device_id >> 8) & 255}.{device_id & 255}"
+            start = time.perf_counter()
+            json_db.get_devices_by_ip(ip)
+            by_ip.append(time.perf_counter() - start)
+
+        legacy_writes = []
+        legacy_path = Path(tmp) / "legacy.json"
+        _make_db(legacy_path, device_count)
+        for i in range(max(writes // 10, 5)):
+            start = time.perf_counter()
+            _legacy_add(legacy_path, {"name": f"new-{i}", "ip": "192.0.2.1", "type": "ubuntu"})
+            legacy_writes.append(time.perf_counter() - start)
+
+        wal_writes = []
+        for i in range(writes):
+            start = time.perf_counter()
+            json_db.add_device({"name": f"new-{i}", "ip": "192.0.2.1", "type": "ubuntu"})
+            wal_writes.append(time.perf_counter() - start)
+
+    print(f"devices: {device_count}, lookups: {lookups}")
+    print(f"{'cold load':<22} {cold * 1e3:.1f} ms")
+    _report("legacy parse+scan", legacy)
+    _report("indexed by id", indexed)
+    _report("indexed by ip", by_ip)
+    _report("legacy full rewrite", legacy_writes)
+    _report("WAL append (fsync)", wal_writes)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="json_db lookup benchmark")
+    parser.add_argument("--devices", type=int, default=10000)
+    parser.add_argument("--lookups", type=int, default=2000)
+    parser.add_argument("--writes", type=int, default=200)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+    run_benchmark(args.devices, args.lookups, args.writes)
@@ -0,0 +1,80 @@
+"""
+Reachability Sweep Benchmark
+backend/benchmarks/bench_reachability.py
+
+Yalnızca SSH banner'ı gönderen hafif bir TCP sunucusuna karşı N cihazlık
+envanteri tarar. Kapalı port için de aynı sayıda cihaz eklenebilir.
+
+Kullanım (backend dizininden):
+    python -m benchmarks.bench_reachability --devices 5000 --down 1000
+"""
+
+import argparse
+import asyncio
+import logging
+import socket
+import time
+from collections import Counter
+
+from app.utils.reachability import ReachabilityMonitor
+
+
+async def _banner_handler(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    writer.write(b"SSH-2.0-BenchBanner\r\n")
+    try:
+        await writer.drain()
+        # İstemci banner'ı okuyup bağlantıyı kapatana kadar bekle
+        await reader.read()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+def _closed_port() -> int:
+    """Üzerinde dinleyen olmayan bir port bulur"""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def run_benchmark(devices: int, down: int, port: int, timeout: float, concurrency: int):
+    server = await asyncio.start_server(_banner_handler, "127.0.0.1", port, backlog=4096)
+    monitor = ReachabilityMonitor(timeout=timeout, max_concurrency=concurrency)
+    inventory = [{"id": i, "ip": "127.0.0.1"} for i in range(devices)]
+    dead_port = _closed_port()
+
+    try:
+        start = time.perf_counter()
+        up_results = await monitor.sweep(inventory, port=port)
+        down_results = await monitor.sweep(
+            [{"id": devices + i, "ip": "127.0.0.1"} for i in range(down)], port=dead_port
+        )
+        wall = time.perf_counter() - start
+    finally:
+        server.close()
+
+    rtts = sorted(r["rtt_ms"] for r in up_results.values() if r["rtt_ms"] is not None)
+    outcomes = Counter("up" if r["ssh"] else (r["error"] or "down") for r in up_results.values())
+    down_ok = sum(1 for r in down_results.values() if not r["reachable"])
+
+    print(f"devices:            {devices} (+{down} closed port)")
+    print(f"effective sockets:  {monitor.max_concurrency}")
+    print(f"wall time:          {wall * 1000:.1f} ms")
+    print(f"probes/second:      {(devices + down) / wall:.0f}")
+    if rtts:
+        print(f"rtt p50 / p99:      {rtts[len(rtts) // 2]:.2f} / {rtts[int(len(rtts) * 0.99) - 1]:.2f} ms")
+    print(f"outcomes:           {dict(outcomes)}")
+    print(f"closed detected:    {down_ok}/{down}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reachability sweep benchmark")
+    parser.add_argument("--devices", type=int, default=5000)
+    parser.add_argument("--down", type=int, default=1000)
+    parser.add_argument("--port", type=int, default=2223)
+    parser.add_argument("--timeout", type=float, default=2.0)
+    parser.add_argument("--concurrency", type=int, default=2000)
+    logging.basicConfig(level=logging.WARNING)
+    args = parser.parse_args()
+    asyncio.run(run_benchmark(args.devices, args.down, args.port, args.timeout, args.concurrency))
@@ -0,0 +1,109 @@
+"""
+Session Store Load Benchmark
+backend/benchmarks/bench_sessions.py
+
+Binlerce eşzamanlı token ile get_current_token'daki kontrol zincirini
+(token önbelleği + iptal kümesi) çalıştırır ve iptal kontrolünün ek
+maliyetini ölçer. Oturum açma/iptal yazma hızı için --backing ile
+SQLite (.db) veya JSONL dosyası verilebilir.
+
+Kullanım (backend dizininden):
+    python -m benchmarks.bench_sessions --tokens 5000 --users 200 --clients 1000
+    python -m benchmarks.bench_sessions --backing /tmp/sessions.db
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import secrets
+import statistics
+import time
+from typing import List
+
+from app.utils.auth_cache import AuthCache
+from app.utils.session_store import SessionStore
+
+
+def _percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+async def _client(tokens: List[str], cache: AuthCache, store: SessionStore, requests: int,
+                  check_revocation: bool, samples: List[float]) -> int:
+    rejected = 0
+    for _ in range(requests):
+        token = random.choice(tokens)
+        start = time.perf_counter()
+        entry = cache.get_token(token)
+        if (check_revocation and store.is_revoked(entry.session_id)) or not cache.is_token_current(entry):
+            rejected += 1
+        samples.append(time.perf_counter() - start)
+        # Diğer istemcilere sıra ver - gerçek sunucudaki istek araları gibi
+        await asyncio.sleep(0)
+    return rejected
+
+
+async def _load(tokens, cache, store, clients, requests, check_revocation):
+    samples: List[float] = []
+    start = time.perf_counter()
+    rejected = await asyncio.gather(*[
+        _client(tokens, cache, store, requests, check_revocation, samples) for _ in range(clients)
+    ])
+    return samples, sum(rejected), time.perf_counter() - start
+
+
+def run_benchmark(token_count: int, users: int, clients: int, requests: int, revoke_ratio: float, backing: str):
+    store = SessionStore(path=backing, max_per_user=token_count)
+    cache = AuthCache(max_tokens=token_count * 2)
+    now = time.time()
+
+    start = time.perf_counter()
+    tokens = []
+    for i in range(token_count):
+        username = f"user{i % users}"
+        session = store.create(username, 3600, ip_address=f"10.0.{i >> 8 & 255}.{i & 255}", user_agent="bench")
+        token = secrets.token_urlsafe(96)
+        cache.put_token(token, {"sub": username, "jti": session.session_id, "iat": int(now), "exp": now + 3600})
+        tokens.append(token)
+    create_elapsed = time.perf_counter() - start
+
+    revoked_ids = [s.session_id for s in random.sample(list(store._sessions.values()), int(token_count * revoke_ratio))]
+    start = time.perf_counter()
+    for session_id in revoked_ids:
+        store.revoke(session_id)
+    revoke_elapsed = time.perf_counter() - start
+
+    print(f"backing: {store.get_stats()['backing']}")
+    print(f"create: {token_count} sessions in {create_elapsed:.2f}s "
+          f"({create_elapsed / token_count * 1e6:.1f} us/session)")
+    print(f"revoke: {len(revoked_ids)} sessions in {revoke_elapsed:.2f}s")
+
+    start = time.perf_counter()
+    listed = sum(len(store.list_user(f"user{u}")) for u in range(users))
+    print(f"list_user: {users} users, {listed} active sessions in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    print(f"\n{'mode':<22} {'checks':>8} {'rejected':>9} {'p50 us':>8} {'p99 us':>8} {'mean us':>8}")
+    results = {}
+    for label, check in (("token cache only", False), ("+ revocation check", True)):
+        samples, rejected, _ = asyncio.run(_load(tokens, cache, store, clients, requests, check))
+        results[label] = statistics.mean(samples)
+        print(f"{label:<22} {len(samples):>8} {rejected:>9} {_percentile(samples, 0.5) * 1e6:>8.2f} "
+              f"{_percentile(samples, 0.99) * 1e6:>8.2f} {results[label] * 1e6:>8.2f}")
+
+    overhead = results["+ revocation check"] - results["token cache only"]
+    print(f"\nrevocation check overhead: {overhead * 1e9:.0f} ns/request")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Session store load benchmark")
+    parser.add_argument("--tokens", type=int, default=5000)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--clients", type=int, default=1000, help="Eşzamanlı istemci (asyncio task) sayısı")
+    parser.add_argument("--requests", type=int, default=100, help="İstemci başına istek")
+    parser.add_argument("--revoke-ratio", type=float, default=0.1)
+    parser.add_argument("--backing", default="", help="Boş: yalnızca bellek; .db: SQLite; diğer: JSONL")
+    logging.basicConfig(level=logging.WARNING)
+    args = parser.parse_args()
+    run_benchmark(args.tokens, args.users, args.clients, args.requests, args.revoke_ratio, args.backing)
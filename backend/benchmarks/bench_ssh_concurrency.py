@@ -0,0 +1,78 @@
+"""
+SSHConnector Concurrency Benchmark
+backend/benchmarks/bench_ssh_concurrency.py
+
+Yerel test sunucusuna N eşzamanlı bağlantı açıp komut çalıştırır ve
+event loop'un bu sırada bloklanıp bloklanmadığını ölçer.
+
+Kullanım (backend dizininden):
+    python -m benchmarks.bench_ssh_concurrency --clients 20 --latency 0.2
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+
+from app.utils.ssh_connector import SSHConnector
+from benchmarks.ssh_test_server import DEFAULT_PASSWORD, DEFAULT_USERNAME, start_server
+
+
+async def _one_session(host: str, port: int, command: str) -> float:
+    connector = SSHConnector()
+    start = time.perf_counter()
+    success, message = await connector.connect(host, DEFAULT_USERNAME, DEFAULT_PASSWORD, port=port)
+    if not success:
+        raise RuntimeError(message)
+    ok, _, stderr = await connector.execute_command(command)
+    connector.disconnect()
+    if not ok:
+        raise RuntimeError(stderr)
+    return time.perf_counter() - start
+
+
+async def _loop_lag_probe(stop: asyncio.Event, interval: float = 0.01) -> float:
+    """Event loop'un en uzun takılma süresini ölçer"""
+    max_lag = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        max_lag = max(max_lag, time.perf_counter() - start - interval)
+    return max_lag
+
+
+async def run_benchmark(clients: int, latency: float, port: int, output_size: int):
+    server = await start_server(port=port, latency=latency, output_size=output_size)
+    try:
+        stop = asyncio.Event()
+        lag_task = asyncio.create_task(_loop_lag_probe(stop))
+
+        wall_start = time.perf_counter()
+        durations = await asyncio.gather(
+            *(_one_session("127.0.0.1", port, f"show version {i}") for i in range(clients))
+        )
+        wall = time.perf_counter() - wall_start
+
+        stop.set()
+        max_lag = await lag_task
+    finally:
+        server.close()
+
+    serial = sum(durations)
+    print(f"clients:            {clients}")
+    print(f"per-session mean:   {serial / clients * 1000:.1f} ms")
+    print(f"wall time:          {wall * 1000:.1f} ms")
+    print(f"serial equivalent:  {serial * 1000:.1f} ms")
+    print(f"overlap factor:     {serial / wall:.1f}x")
+    print(f"max event-loop lag: {max_lag * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SSHConnector concurrency benchmark")
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--port", type=int, default=2222)
+    parser.add_argument("--output-size", type=int, default=4096)
+    logging.basicConfig(level=logging.WARNING)
+    args = parser.parse_args()
+    asyncio.run(run_benchmark(args.clients, args.latency, args.port, args.output_size))
@@ -0,0 +1,90 @@
+"""
+Storage Backend Benchmark - JSON (snapshot + WAL) ve SQLite karşılaştırması
+backend/benchmarks/bench_storage.py
+
+Her boyut için veritabanı önceden doldurulur, ardından json_db fonksiyon
+API'si üzerinden ekleme ve id/ip arama throughput'u ölçülür.
+
+Kullanım (backend dizininden):
+    python -m benchmarks.bench_storage --sizes 1000,10000,100000 --inserts 500 --lookups 5000
+"""
+
+import argparse
+import logging
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from app import json_db
+from app.sqlite_db import migrate_json_to_sqlite
+
+
+def _device(i: int) -> dict:
+    return {
+        "id": i,
+        "name": f"device-{i}",
+        "ip": f"10.{(i >> 16) & 255}.{(i >> 8) & 255}.{i & 255}",
+        "type": random.choice(["cisco_ios", "mikrotik", "ubuntu", "juniper"]),
+        "vault_path": None
+    }
+
+
+def _use_backend(backend: str, path: Path):
+    json_db.DATABASE_BACKEND = backend
+    json_db.DB_PATH = path
+
+
+def _measure(size: int, inserts: int, lookups: int) -> dict:
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = Path(tmp) / "db.json"
+        sqlite_path = Path(tmp) / "db.sqlite"
+
+        _use_backend("json", json_path)
+        start = time.perf_counter()
+        json_db.write_db({"devices": [_device(i) for i in range(1, size + 1)], "users": []})
+        populate_json = time.perf_counter() - start
+
+        start = time.perf_counter()
+        migrate_json_to_sqlite(json_path, sqlite_path)
+        migrate = time.perf_counter() - start
+
+        ids = [random.randint(1, size) for _ in range(lookups)]
+        for backend, path in (("json", json_path), ("sqlite", sqlite_path)):
+            _use_backend(backend, path)
+            json_db.get_device_by_id(1)  # cache/bağlantı ısıtma
+
+            start = time.perf_counter()
+            for i in range(inserts):
+                json_db.add_device({"name": f"new-{i}", "ip": "192.0.2.1", "type": "ubuntu"})
+            insert_rate = inserts / (time.perf_counter() - start)
+
+            start = time.perf_counter()
+            for device_id in ids:
+                json_db.get_device_by_id(device_id)
+            id_rate = lookups / (time.perf_counter() - start)
+
+            start = time.perf_counter()
+            for device_id in ids:
+                json_db.get_devices_by_ip(_device(device_id)["ip"])
+            ip_rate = lookups / (time.perf_counter() - start)
+
+            results[backend] = (insert_rate, id_rate, ip_rate)
+
+    print(f"\n== {size} devices (populate json {populate_json:.2f}s, migrate->sqlite {migrate:.2f}s)")
+    print(f"{'backend':<8} {'inserts/s':>12} {'id lookups/s':>14} {'ip lookups/s':>14}")
+    for backend, (insert_rate, id_rate, ip_rate) in results.items():
+        print(f"{backend:<8} {insert_rate:>12,.0f} {id_rate:>14,.0f} {ip_rate:>14,.0f}")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="JSON vs SQLite storage benchmark")
+    parser.add_argument("--sizes", default="1000,10000,100000")
+    parser.add_argument("--inserts", type=int, default=500)
+    parser.add_argument("--lookups", type=int, default=5000)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+    for size in (int(s) for s in args.sizes.split(",")):
+        _measure(size, args.inserts, args.lookups)
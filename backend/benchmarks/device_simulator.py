@@ -0,0 +1,546 @@
+"""
+Device Simulator - cisco_ios / mikrotik / ubuntu cihazlarını taklit eden asyncssh sunucuları
+backend/benchmarks/device_simulator.py
+
+Her simüle cihaz kendi portunda dinler ve NetworkDeviceManager.DEVICE_COMMANDS
+ile sağlık kontrolü komutlarına cihaz tipine uygun prompt ve çıktıyla yanıt verir.
+cisco_ios, sürücüsündeki gibi kalıcı shell (prompt + yankı) ile, mikrotik ve
+ubuntu exec kanalıyla çalışır. Gecikme, çıktı boyutu ve hata oranları ayarlanabilir.
+
+Kullanım (backend dizininden):
+    python -m benchmarks.device_simulator --devices 30 --types cisco_ios,mikrotik,ubuntu \\
+        --base-port 2300 --latency 0.05 --output-size 4096 --command-failure-rate 0.01
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import re
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+import asyncssh
+
+from app.utils.ssh_connector import NetworkDeviceManager
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USERNAME = "bench"
+DEFAULT_PASSWORD = "bench"
+SUPPORTED_TYPES = ("cisco_ios", "mikrotik", "ubuntu")
+
+
+@dataclass
+class SimulatorSettings:
+    # Komut başına gecikme (saniye) ve ± rastgele sapma
+    latency: float = 0.05
+    jitter: float = 0.0
+    # Ölçeklenebilir çıktıların (arayüz tabloları, config, ps) yaklaşık boyutu (byte)
+    output_size: int = 4096
+    # Oturum açma reddi (yanlış şifre gibi)
+    auth_failure_rate: float = 0.0
+    # Komutun cihaz hatasıyla dönmesi
+    command_failure_rate: float = 0.0
+    # Komut sırasında bağlantının kopması
+    drop_rate: float = 0.0
+    # Cihaz başına eşzamanlı oturum (VTY hattı) sınırı - 0: sınırsız; aşılınca giriş reddedilir
+    vty_lines: int = 0
+    username: str = DEFAULT_USERNAME
+    password: str = DEFAULT_PASSWORD
+    seed: Optional[int] = None
+
+
+@dataclass
+class SimulatorStats:
+    connections: int = 0
+    auth_failures: int = 0
+    commands: int = 0
+    command_failures: int = 0
+    drops: int = 0
+    vty_rejections: int = 0
+    active_sessions: int = 0
+    max_active_sessions: int = 0
+
+    def to_dict(self) -> Dict:
+        return dict(self.__dict__)
+
+
+# ===========================================
+# DEVICE PERSONALITIES
+# ===========================================
+
+def _rows(output_size: int, row_bytes: int = 80) -> int:
+    return max(output_size // row_bytes, 2)
+
+
+def _ios_outputs(hostname: str, size: int) -> Dict[str, Callable[[], str]]:
+    def interfaces():
+        lines = ["Interface              IP-Address      OK? Method Status                Protocol"]
+        for i in range(_rows(size)):
+            name = f"GigabitEthernet{i // 48}/{i % 48}"
+            if i % 5 == 4:
+                lines.append(f"{name:<22} unassigned      YES unset  administratively down down    ")
+            else:
+                lines.append(f"{name:<22} {f'10.{i >> 8 & 255}.{i & 255}.1':<15} YES NVRAM  up                    up      ")
+        return "\n".join(lines)
+
+    def running_config():
+        lines = ["Building configuration...", "", "Current configuration : 4096 bytes", "!",
+                 "version 15.2", f"hostname {hostname}", "!"]
+        for i in range(_rows(size, 60)):
+            lines += [f"interface GigabitEthernet{i // 48}/{i % 48}",
+                      f" ip address 10.{i >> 8 & 255}.{i & 255}.1 255.255.255.0", " no shutdown", "!"]
+        return "\n".join(lines + ["end"])
+
+    return {
+        "show version": lambda: (
+            f"Cisco IOS Software, C2960 Software (C2960-LANBASEK9-M), Version 15.2(7)E4, RELEASE SOFTWARE (fc2)\n"
+            f"{hostname} uptime is 12 weeks, 3 days, 4 hours, 2 minutes\n"
+            f"System image file is \"flash:c2960-lanbasek9-mz.152-7.E4.bin\"\n"
+            f"cisco WS-C2960-24TT-L (PowerPC405) processor (revision B0) with 65536K bytes of memory.\n"
+            f"Processor board ID FOC1010X104\n"
+            f"Configuration register is 0xF"
+        ),
+        "show ip interface brief": interfaces,
+        "show running-config": running_config,
+        "show vlan brief": lambda: "\n".join(
+            ["VLAN Name                             Status    Ports",
+             "---- -------------------------------- --------- -------------------------------"] +
+            [f"{v:<4} {f'VLAN{v:04d}':<32} active    Gi0/{v % 48}" for v in range(1, _rows(size) + 1)]
+        ),
+        "show inventory": lambda: (
+            'NAME: "1", DESCR: "WS-C2960-24TT-L"\n'
+            "PID: WS-C2960-24TT-L  , VID: V02  , SN: FOC1010X104"
+        ),
+        "show users": lambda: (
+            "    Line       User       Host(s)              Idle       Location\n"
+            f"*  2 vty 0     {DEFAULT_USERNAME:<10} idle                 00:00:00 127.0.0.1"
+        ),
+        "write memory": lambda: "Building configuration...\n[OK]",
+        "terminal length 0": lambda: "",
+        "terminal width 511": lambda: "",
+    }
+
+
+def _mikrotik_outputs(hostname: str, size: int) -> Dict[str, Callable[[], str]]:
+    def interfaces():
+        lines = ["Flags: D - dynamic, X - disabled, R - running, S - slave ",
+                 " #     NAME                                TYPE       ACTUAL-MTU L2MTU  MAX-L2MTU"]
+        for i in range(_rows(size, 70)):
+            flags = "X " if i % 7 == 0 else "R "
+            lines.append(f"{i:>2}  {flags} ether{i + 1:<31} ether            1500  1598       4074")
+        return "\n".join(lines)
+
+    def addresses():
+        lines = ["Flags: X - disabled, I - invalid, D - dynamic ",
+                 " #   ADDRESS            NETWORK         INTERFACE"]
+        for i in range(_rows(size, 60)):
+            lines.append(f"{i:>2}   {f'10.{i >> 8 & 255}.{i & 255}.1/24':<18} {f'10.{i >> 8 & 255}.{i & 255}.0':<15} ether{i + 1}")
+        return "\n".join(lines)
+
+    def export():
+        lines = ["# oct/18/2026 00:00:00 by RouterOS 6.49.10", "# software id = BENCH-0001", "#",
+                 f"/system identity set name={hostname}", "/ip address"]
+        for i in range(_rows(size, 60)):
+            lines.append(f"add address=10.{i >> 8 & 255}.{i & 255}.1/24 interface=ether{i + 1} network=10.{i >> 8 & 255}.{i & 255}.0")
+        return "\n".join(lines)
+
+    return {
+        "/system resource print": lambda: (
+            "                   uptime: 12w3d4h2m\n"
+            "                  version: 6.49.10 (long-term)\n"
+            "              free-memory: 210.4MiB\n"
+            "             total-memory: 256.0MiB\n"
+            "                      cpu: MIPS 24Kc V7.4\n"
+            "                cpu-count: 1\n"
+            "                 cpu-load: 3%\n"
+            "           board-name: hAP ac^2"
+        ),
+        "/interface print": interfaces,
+        "/ip address print": addresses,
+        "/ip route print": lambda: "\n".join(
+            ["Flags: X - disabled, A - active, D - dynamic, C - connect, S - static ",
+             " #      DST-ADDRESS        PREF-SRC        GATEWAY            DISTANCE"] +
+            [f"{i:>2} ADC  10.{i >> 8 & 255}.{i & 255}.0/24     10.{i >> 8 & 255}.{i & 255}.1       ether{i + 1}                  0"
+             for i in range(_rows(size))]
+        ),
+        "/export compact": export,
+        "/system identity print": lambda: f"  name: {hostname}",
+    }
+
+
+def _ubuntu_outputs(hostname: str, size: int) -> Dict[str, Callable[[], str]]:
+    def addr():
+        blocks = ["1: lo: <LOOPBACK,UP,LOWER_UP> mtu 65536 qdisc noqueue state UNKNOWN group default qlen 1000\n"
+                  "    link/loopback 00:00:00:00:00:00 brd 00:00:00:00:00:00\n"
+                  "    inet 127.0.0.1/8 scope host lo\n"
+                  "       valid_lft forever preferred_lft forever"]
+        for i in range(2, _rows(size, 300) + 2):
+            blocks.append(
+                f"{i}: veth{i}@if{i + 1}: <BROADCAST,MULTICAST,UP,LOWER_UP> mtu 1500 qdisc noqueue state UP group default\n"
+                f"    link/ether 02:42:ac:{i >> 8 & 255:02x}:{i & 255:02x}:02 brd ff:ff:ff:ff:ff:ff link-netnsid 0\n"
+                f"    inet 172.17.{i >> 8 & 255}.{i & 255}/16 brd 172.17.255.255 scope global veth{i}\n"
+                f"       valid_lft forever preferred_lft forever"
+            )
+        return "\n".join(blocks)
+
+    return {
+        "lsb_release -a": lambda: (
+            "Distributor ID:\tUbuntu\nDescription:\tUbuntu 22.04.3 LTS\nRelease:\t22.04\nCodename:\tjammy"
+        ),
+        "ip addr show": addr,
+        "ip route show": lambda: "\n".join(
+            ["default via 172.17.0.1 dev eth0"] +
+            [f"10.{i >> 8 & 255}.{i & 255}.0/24 dev veth{i} proto kernel scope link src 10.{i >> 8 & 255}.{i & 255}.1"
+             for i in range(_rows(size))]
+        ),
+        "ps aux": lambda: "\n".join(
+            ["USER         PID %CPU %MEM    VSZ   RSS TTY      STAT START   TIME COMMAND"] +
+            [f"root     {p:>10}  0.0  0.1  16920  9412 ?        Ss   Oct17   0:01 /usr/sbin/worker --id {p}"
+             for p in range(1, _rows(size) + 1)]
+        ),
+        "df -h": lambda: (
+            "Filesystem      Size  Used Avail Use% Mounted on\n"
+            "/dev/sda1        49G   12G   35G  26% /\n"
+            "tmpfs           2.0G     0  2.0G   0% /dev/shm"
+        ),
+        "free -h": lambda: (
+            "               total        used        free      shared  buff/cache   available\n"
+            "Mem:           3.8Gi       1.1Gi       1.6Gi        12Mi       1.1Gi       2.5Gi\n"
+            "Swap:          2.0Gi          0B       2.0Gi"
+        ),
+        "uname -a": lambda: f"Linux {hostname} 5.15.0-86-generic #96-Ubuntu SMP x86_64 x86_64 x86_64 GNU/Linux",
+        "uptime": lambda: " 00:00:00 up 84 days,  4:02,  1 user,  load average: 0.08, 0.03, 0.01",
+        "whoami": lambda: DEFAULT_USERNAME,
+        "pwd": lambda: f"/home/{DEFAULT_USERNAME}",
+        "hostname": lambda: hostname,
+    }
+
+
+@dataclass
+class _Personality:
+    hostname_prefix: str
+    prompt: Callable[[str], str]
+    outputs: Callable[[str, int], Dict[str, Callable[[], str]]]
+    # (çıktı, exit status) - bilinmeyen komut veya enjekte edilen hata
+    error: Callable[[str], Tuple[str, int]]
+    use_shell: bool = False
+    normalize: Callable[[str], str] = field(default=lambda command: command)
+
+
+# IOS varsayılan sayfa uzunluğu - 'terminal length 0' sayfalamayı kapatır
+_IOS_PAGE_LENGTH = 24
+_IOS_TERMINAL_LENGTH = re.compile(r"^term(inal)?\s+len(gth)?\s+\d+$", re.IGNORECASE)
+_IOS_MORE = b" --More-- "
+
+
+def _ios_error(command: str) -> Tuple[str, int]:
+    return "                ^\n% Invalid input detected at '^' marker.", 1
+
+
+def _mikrotik_error(command: str) -> Tuple[str, int]:
+    word = command.split()[0] if command.split() else command
+    return f"bad command name {word.lstrip('/')} (line 1 column 2)", 1
+
+
+def _ubuntu_error(command: str) -> Tuple[str, int]:
+    word = command.split()[0] if command.split() else command
+    return f"bash: {word}: command not found", 127
+
+
+def _mikrotik_normalize(command: str) -> str:
+    # Sürücü print komutlarına without-paging ekler
+    return command[:-len(" without-paging")] if command.endswith(" without-paging") else command
+
+
+PERSONALITIES: Dict[str, _Personality] = {
+    "cisco_ios": _Personality("R", lambda host: f"{host}#", _ios_outputs, _ios_error, use_shell=True),
+    "mikrotik": _Personality("MikroTik-", lambda host: f"[admin@{host}] > ", _mikrotik_outputs, _mikrotik_error,
+                             normalize=_mikrotik_normalize),
+    "ubuntu": _Personality("ubuntu-", lambda host: f"{DEFAULT_USERNAME}@{host}:~$ ", _ubuntu_outputs, _ubuntu_error),
+}
+
+# Simülatörün tanıdığı komutlar DEVICE_COMMANDS ve sağlık kontrolü listeleriyle aynı kalmalı
+for _device_type, _personality in PERSONALITIES.items():
+    _known = set(_personality.outputs("probe", 160))
+    _expected = set(NetworkDeviceManager.get_device_commands(_device_type).values())
+    _expected.update(NetworkDeviceManager.get_health_check_commands(_device_type))
+    _missing = _expected - _known
+    if _missing:
+        logger.warning(f"Simulator has no output for {_device_type} commands: {sorted(_missing)}")
+
+
+# ===========================================
+# SSH SERVER
+# ===========================================
+
+class _SimulatedSSHServer(asyncssh.SSHServer):
+    def __init__(self, device: "SimulatedDevice"):
+        self._device = device
+        self._counted = False
+
+    def connection_made(self, conn):
+        stats = self._device.stats
+        stats.active_sessions += 1
+        stats.max_active_sessions = max(stats.max_active_sessions, stats.active_sessions)
+        self._counted = True
+
+    def connection_lost(self, exc):
+        if self._counted:
+            self._device.stats.active_sessions -= 1
+            self._counted = False
+
+    def begin_auth(self, username: str) -> bool:
+        return True
+
+    def password_auth_supported(self) -> bool:
+        return True
+
+    def validate_password(self, username: str, password: str) -> bool:
+        device = self._device
+        device.stats.connections += 1
+        settings = device.settings
+        if settings.vty_lines and device.stats.active_sessions > settings.vty_lines:
+            # Tüm VTY hatları dolu - gerçek cihaz girişi reddeder
+            device.stats.vty_rejections += 1
+            return False
+        if device.rng.random() < settings.auth_failure_rate:
+            device.stats.auth_failures += 1
+            return False
+        return username == settings.username and password == settings.password
+
+
+class SimulatedDevice:
+    """Tek portta dinleyen simüle cihaz"""
+
+    def __init__(self, device_type: str, index: int, settings: SimulatorSettings, host: str = "127.0.0.1"):
+        if device_type not in PERSONALITIES:
+            raise ValueError(f"Unsupported simulated device type: {device_type}")
+        self.device_type = device_type
+        self.personality = PERSONALITIES[device_type]
+        self.hostname = f"{self.personality.hostname_prefix}{index}"
+        self.prompt = self.personality.prompt(self.hostname)
+        self.host = host
+        self.port: Optional[int] = None
+        self.settings = settings
+        self.rng = random.Random(None if settings.seed is None else settings.seed + index)
+        self.stats = SimulatorStats()
+        self._outputs = self.personality.outputs(self.hostname, settings.output_size)
+        # Aynı komutun çıktısı bir kez üretilir - simülatör ölçülen sistemin darboğazı olmasın
+        self._rendered: Dict[str, bytes] = {}
+        self._acceptor: Optional[asyncssh.SSHAcceptor] = None
+
+    async def start(self, port: int, host_key: asyncssh.SSHKey):
+        self._acceptor = await asyncssh.create_server(
+            lambda: _SimulatedSSHServer(self),
+            self.host,
+            port,
+            server_host_keys=[host_key],
+            process_factory=self._handle_process,
+            encoding=None,
+            line_editor=False
+        )
+        self.port = self._acceptor.sockets[0].getsockname()[1]
+
+    def close(self):
+        if self._acceptor is not None:
+            self._acceptor.close()
+            self._acceptor = None
+
+    def _render(self, command: str) -> Tuple[bytes, int]:
+        """Komut çıktısı (\\n satır sonlu) ve exit status"""
+        command = self.personality.normalize(command.strip())
+        self.stats.commands += 1
+        if self.rng.random() < self.settings.command_failure_rate:
+            self.stats.command_failures += 1
+            output, status = self.personality.error(command)
+            return output.encode("utf-8"), status
+
+        rendered = self._rendered.get(command)
+        if rendered is None:
+            generate = self._outputs.get(command)
+            if generate is None:
+                if command.startswith("echo "):
+                    return command[5:].strip("'\"").encode("utf-8"), 0
+                output, status = self.personality.error(command)
+                return output.encode("utf-8"), status
+            rendered = self._rendered[command] = generate().encode("utf-8")
+        return rendered, 0
+
+    async def _delay(self) -> bool:
+        """Komut gecikmesi - bağlantı kopması enjekte edildiyse False"""
+        settings = self.settings
+        delay = settings.latency
+        if settings.jitter:
+            delay = max(0.0, delay + self.rng.uniform(-settings.jitter, settings.jitter))
+        await asyncio.sleep(delay)
+        if self.rng.random() < settings.drop_rate:
+            self.stats.drops += 1
+            return False
+        return True
+
+    async def _handle_process(self, process: asyncssh.SSHServerProcess):
+        if process.command is None:
+            await self._interactive_shell(process)
+            return
+
+        if not await self._delay():
+            process.channel.get_connection().abort()
+            return
+        output, status = self._render(process.command)
+        if status == 0 or self.device_type != "ubuntu":
+            process.stdout.write(output)
+        else:
+            process.stderr.write(output)
+        process.exit(status)
+
+    async def _interactive_shell(self, process: asyncssh.SSHServerProcess):
+        """
+        Prompt'lu shell - girilen satır yankılanır, çıktı ve ardından prompt gönderilir
+        cisco_ios'ta configure terminal prompt'u R1(config)# yapar; end/exit geri döner.
+        cisco_ios çıktısı 'terminal length' satırında (varsayılan 24) --More-- ile sayfalanır;
+        boşluk sonraki sayfayı, q kalanını atlayarak prompt'u getirir
+        """
+        base_prompt = prompt = self.prompt.encode("utf-8")
+        config_prompt = f"{self.hostname}(config)#".encode("utf-8")
+        page_length = _IOS_PAGE_LENGTH if self.device_type == "cisco_ios" else 0
+        process.stdout.write(b"\r\n" + prompt)
+        buffer = b""
+        while True:
+            try:
+                data = await process.stdin.read(4096)
+            except (asyncssh.TerminalSizeChanged, asyncssh.BreakReceived):
+                continue
+            if not data:
+                break
+            buffer += data
+            while True:
+                cut = min((i for i in (buffer.find(b"\r"), buffer.find(b"\n")) if i != -1), default=-1)
+                if cut == -1:
+                    break
+                line, buffer = buffer[:cut], buffer[cut + 1:].lstrip(b"\n")
+                command = line.decode("utf-8", errors="replace").strip()
+                if command in ("exit", "logout", "quit") and prompt == base_prompt:
+                    process.exit(0)
+                    return
+                process.stdout.write(line + b"\r\n")
+                if self.device_type == "cisco_ios" and command in ("configure terminal", "conf t", "end", "exit"):
+                    prompt = config_prompt if command.startswith("conf") else base_prompt
+                    process.stdout.write(prompt)
+                    continue
+                if self.device_type == "cisco_ios" and _IOS_TERMINAL_LENGTH.match(command):
+                    page_length = int(command.split()[-1])
+                if command:
+                    if not await self._delay():
+                        process.channel.get_connection().abort()
+                        return
+                    output, _ = self._render(command)
+                    lines = output.split(b"\n") if output else []
+                    while page_length and len(lines) > page_length:
+                        process.stdout.write(b"\r\n".join(lines[:page_length]) + b"\r\n" + _IOS_MORE)
+                        lines = lines[page_length:]
+                        # Devam tuşu satırla birlikte gelmiş olabilir
+                        if not buffer:
+                            buffer = await process.stdin.read(4096)
+                        key, buffer = buffer[:1], buffer[1:]
+                        if key in (b"", b"q", b"Q"):
+                            lines = []
+                    if lines:
+                        process.stdout.write(b"\r\n".join(lines) + b"\r\n")
+                process.stdout.write(prompt)
+        process.exit(0)
+
+
+class DeviceSimulator:
+    """Birden çok simüle cihazı (cihaz başına bir port) yönetir"""
+
+    def __init__(self, settings: Optional[SimulatorSettings] = None, host: str = "127.0.0.1"):
+        self.settings = settings or SimulatorSettings()
+        self.host = host
+        self.devices: List[SimulatedDevice] = []
+        # Anahtar üretimi pahalı - tüm cihazlar aynı host key'i kullanır
+        self._host_key = asyncssh.generate_private_key("ssh-ed25519")
+
+    async def add_device(self, device_type: str, port: int = 0) -> SimulatedDevice:
+        """port=0 ise işletim sistemi boş port atar"""
+        device = SimulatedDevice(device_type, len(self.devices) + 1, self.settings, self.host)
+        await device.start(port, self._host_key)
+        self.devices.append(device)
+        return device
+
+    async def start_fleet(self, count: int, device_types: List[str] = SUPPORTED_TYPES,
+                          base_port: int = 0) -> List[SimulatedDevice]:
+        """count cihazı tipler arasında sırayla dağıtarak başlatır"""
+        started = []
+        for i in range(count):
+            port = base_port + i if base_port else 0
+            started.append(await self.add_device(device_types[i % len(device_types)], port))
+        logger.info(f"Started {count} simulated devices on {self.host}")
+        return started
+
+    def close(self):
+        for device in self.devices:
+            device.close()
+
+    def get_stats(self) -> Dict:
+        totals = SimulatorStats()
+        for device in self.devices:
+            for key, value in device.stats.to_dict().items():
+                # En yoğun cihazdaki eşzamanlı oturum sayısı - toplamı anlamsız
+                merge = max if key == "max_active_sessions" else int.__add__
+                setattr(totals, key, merge(getattr(totals, key), value))
+        return {"devices": len(self.devices), **totals.to_dict()}
+
+
+def settings_from_args(args) -> SimulatorSettings:
+    return SimulatorSettings(
+        latency=args.latency,
+        jitter=args.jitter,
+        output_size=args.output_size,
+        auth_failure_rate=args.auth_failure_rate,
+        command_failure_rate=args.command_failure_rate,
+        drop_rate=args.drop_rate,
+        vty_lines=args.vty_lines,
+        seed=args.seed
+    )
+
+
+def add_simulator_arguments(parser: argparse.ArgumentParser):
+    """Simülatör ayarları - bench_endpoints da aynı argümanları kullanır"""
+    parser.add_argument("--devices", type=int, default=9)
+    parser.add_argument("--types", default=",".join(SUPPORTED_TYPES), help="Virgülle ayrılmış cihaz tipleri")
+    parser.add_argument("--latency", type=float, default=0.05, help="Komut başına gecikme (saniye)")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--output-size", type=int, default=4096, help="Ölçeklenebilir çıktıların boyutu (byte)")
+    parser.add_argument("--auth-failure-rate", type=float, default=0.0)
+    parser.add_argument("--command-failure-rate", type=float, default=0.0)
+    parser.add_argument("--drop-rate", type=float, default=0.0)
+    parser.add_argument("--vty-lines", type=int, default=0, help="Cihaz başına eşzamanlı oturum sınırı (0: sınırsız)")
+    parser.add_argument("--seed", type=int, default=None)
+
+
+async def _main(args):
+    simulator = DeviceSimulator(settings_from_args(args), args.host)
+    devices = await simulator.start_fleet(args.devices, args.types.split(","), args.base_port)
+    for device in devices:
+        print(f"{device.device_type:<10} {device.hostname:<14} {device.host}:{device.port}")
+    print(f"credentials: {DEFAULT_USERNAME}/{DEFAULT_PASSWORD}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        simulator.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local SSH device simulator")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--base-port", type=int, default=2300, help="0: rastgele boş portlar")
+    add_simulator_arguments(parser)
+    logging.basicConfig(level=logging.INFO)
+    # asyncssh kanal açma/kapama başına INFO log basar
+    logging.getLogger("asyncssh").setLevel(logging.WARNING)
+    try:
+        asyncio.run(_main(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,119 @@
+"""
+Local SSH Test Server - Benchmark'lar için asyncssh tabanlı sahte cihaz
+backend/benchmarks/ssh_test_server.py
+
+Kullanım:
+    python -m benchmarks.ssh_test_server --port 2222 --latency 0.2
+"""
+
+import argparse
+import asyncio
+import logging
+
+import asyncssh
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USERNAME = "bench"
+DEFAULT_PASSWORD = "bench"
+
+
+class _BenchSSHServer(asyncssh.SSHServer):
+    """Tek kullanıcı adı/şifre kabul eden minimal SSH sunucusu"""
+
+    def __init__(self, username: str, password: str):
+        self._username = username
+        self._password = password
+
+    def begin_auth(self, username: str) -> bool:
+        return True
+
+    def password_auth_supported(self) -> bool:
+        return True
+
+    def validate_password(self, username: str, password: str) -> bool:
+        return username == self._username and password == self._password
+
+
+def _make_process_handler(latency: float, output_size: int):
+    """Her exec isteğine gecikmeli sabit çıktı döndüren handler üretir"""
+    payload = ("x" * 79 + "\n") * max(output_size // 80, 1)
+
+    async def handle_process(process: asyncssh.SSHServerProcess):
+        if process.command is None:
+            await _interactive_shell(process, latency, payload)
+            return
+        command = process.command
+        await asyncio.sleep(latency)
+        process.stdout.write(f"{command}\n{payload}".encode("utf-8"))
+        process.exit(0)
+
+    return handle_process
+
+
+async def _interactive_shell(process: asyncssh.SSHServerProcess, latency: float, payload: str):
+    """invoke_shell oturumu - prompt durumu (cd) satırlar arasında korunur"""
+    cwd = "~"
+    process.stdout.write(f"bench:{cwd}$ ".encode("utf-8"))
+    while True:
+        try:
+            line = await process.stdin.readline()
+        except asyncssh.TerminalSizeChanged:
+            continue
+        except asyncssh.BreakReceived:
+            break
+        if not line:
+            break
+        command = line.decode("utf-8", errors="replace").strip()
+        if command in ("exit", "logout"):
+            break
+        await asyncio.sleep(latency)
+        if command.startswith("cd "):
+            cwd = command[3:].strip() or "~"
+            output = ""
+        elif command == "pwd":
+            output = f"{cwd}\n"
+        elif command:
+            output = f"{command}\n{payload}"
+        else:
+            output = ""
+        process.stdout.write(f"{output}bench:{cwd}$ ".encode("utf-8"))
+    process.exit(0)
+
+
+async def start_server(
+    host: str = "127.0.0.1",
+    port: int = 2222,
+    latency: float = 0.1,
+    output_size: int = 1024,
+    username: str = DEFAULT_USERNAME,
+    password: str = DEFAULT_PASSWORD
+) -> asyncssh.SSHAcceptor:
+    """Test sunucusunu başlatır ve acceptor nesnesini döner"""
+    host_key = asyncssh.generate_private_key("ssh-ed25519")
+    server = await asyncssh.create_server(
+        lambda: _BenchSSHServer(username, password),
+        host,
+        port,
+        server_host_keys=[host_key],
+        process_factory=_make_process_handler(latency, output_size),
+        encoding=None
+    )
+    logger.info(f"SSH test server listening on {host}:{port}")
+    return server
+
+
+async def _main(args):
+    server = await start_server(args.host, args.port, args.latency, args.output_size)
+    async with server:
+        await server.wait_closed()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local asyncssh test server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=2222)
+    parser.add_argument("--latency", type=float, default=0.1, help="Komut başına gecikme (saniye)")
+    parser.add_argument("--output-size", type=int, default=1024, help="Komut çıktısı boyutu (byte)")
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_main(parser.parse_args()))
@@ -0,0 +1,77 @@
+"""
+Test ortamı - veritabanı, audit ve yedek dizinleri geçici bir klasöre yönlendirilir
+backend/tests/conftest.py
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+import pytest
+
+# app modülleri ortam değişkenlerini import anında okur - önce ayarlanmalı
+_TMP_DIR = Path(tempfile.mkdtemp(prefix="pam-tests-"))
+os.environ.setdefault("DATABASE_PATH", str(_TMP_DIR / "db.json"))
+os.environ.setdefault("AUDIT_LOG_DIR", str(_TMP_DIR / "audit"))
+os.environ.setdefault("CONFIG_BACKUP_DIR", str(_TMP_DIR / "backups"))
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+
+@pytest.fixture
+def client():
+    """Lifespan'ı başlatmayan TestClient - arka plan görevleri çalışmaz"""
+    from fastapi.testclient import TestClient
+    from app.main import app
+    return TestClient(app)
+
+
+def login(client, username: str = "admin", password: str = "admin123") -> dict:
+    """Demo kullanıcıyla giriş yapar, Authorization başlığını döner"""
+    response = client.post("/auth/login", json={"username": username, "password": password})
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+class SimulatorThread:
+    """benchmarks/device_simulator'ı ayrı bir event loop thread'inde çalıştırır"""
+
+    def __init__(self):
+        from benchmarks.device_simulator import DeviceSimulator, SimulatorSettings, DEFAULT_USERNAME, DEFAULT_PASSWORD
+        self.username, self.password = DEFAULT_USERNAME, DEFAULT_PASSWORD
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self._thread.start()
+        self.simulator = self._run(self._create(DeviceSimulator, SimulatorSettings))
+
+    @staticmethod
+    async def _create(simulator_cls, settings_cls):
+        return simulator_cls(settings_cls())
+
+    def _run(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(timeout=30)
+
+    def add_device(self, device_type: str) -> dict:
+        """Simüle cihazı başlatır ve veritabanına ekler - {"id", "ip", "port", ...} döner"""
+        from app.json_db import add_device
+        simulated = self._run(self.simulator.add_device(device_type))
+        device = add_device({
+            "name": f"{simulated.hostname}-{simulated.port}", "ip": "127.0.0.1", "type": device_type
+        })
+        return {**device, "port": simulated.port}
+
+    def close(self):
+        self.loop.call_soon_threadsafe(self.simulator.close)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout=5)
+
+
+@pytest.fixture(scope="session")
+def simulator():
+    pytest.importorskip("asyncssh")
+    sim = SimulatorThread()
+    yield sim
+    sim.close()
@@ -0,0 +1,75 @@
+"""
+Admission kontrolü - cihaz başına slot, FIFO devir ve reddetme yolları
+backend/tests/test_admission.py
+"""
+
+import asyncio
+
+import pytest
+
+from app.utils.admission import AdmissionController, AdmissionRejected
+
+DEVICE = {"id": 1, "type": "cisco_ios", "max_sessions": 1}
+
+
+def test_slot_is_handed_to_waiters_in_order():
+    async def scenario():
+        admission = AdmissionController(queue_timeout=5, max_queue=10)
+        await admission.acquire(DEVICE)
+        order = []
+
+        async def waiter(name):
+            await admission.acquire(DEVICE)
+            order.append(name)
+
+        tasks = [asyncio.create_task(waiter(name)) for name in ("a", "b")]
+        await asyncio.sleep(0)
+        assert admission.get_device_stats(1)["queue_depth"] == 2
+
+        # Slot bırakılınca sayaç düşmeden sıradakine devredilir
+        admission.release(1, held=0.01)
+        await asyncio.sleep(0)
+        assert order == ["a"] and admission.get_device_stats(1)["in_use"] == 1
+        admission.release(1)
+        await asyncio.gather(*tasks)
+        assert order == ["a", "b"]
+        admission.release(1)
+        return admission.get_device_stats(1)
+
+    stats = asyncio.run(scenario())
+    assert stats["in_use"] == 0 and stats["admitted"] == 3 and stats["queued"] == 2
+
+
+def test_waiter_times_out():
+    async def scenario():
+        admission = AdmissionController(queue_timeout=0.05, max_queue=10)
+        await admission.acquire(DEVICE)
+        with pytest.raises(AdmissionRejected) as rejected:
+            await admission.acquire(DEVICE)
+        assert rejected.value.status_code == 429
+        return admission.get_device_stats(1)
+
+    stats = asyncio.run(scenario())
+    assert stats["timeouts"] == 1 and stats["queue_depth"] == 0 and stats["in_use"] == 1
+
+
+def test_full_queue_and_hopeless_wait_are_rejected_immediately():
+    async def scenario():
+        admission = AdmissionController(queue_timeout=5, max_queue=1)
+        await admission.acquire(DEVICE)
+        queued = asyncio.create_task(admission.acquire(DEVICE))
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionRejected, match="queue full"):
+            await admission.acquire(DEVICE)
+        queued.cancel()
+        await asyncio.sleep(0)
+
+        # Ortalama tutma süresi kuyruk süresini aşıyorsa beklemeden reddedilir
+        admission.release(1, held=60)
+        await admission.acquire(DEVICE)
+        with pytest.raises(AdmissionRejected, match="estimated wait"):
+            await admission.acquire(DEVICE)
+        return admission.get_device_stats(1)
+
+    stats = asyncio.run(scenario())
+    assert stats["rejected"] == 2 and stats["timeouts"] == 0
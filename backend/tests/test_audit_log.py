@@ -0,0 +1,145 @@
+"""
+Audit log sorguları - manifest/segment indeksi filtreleri ve cursor sayfalama
+backend/tests/test_audit_log.py
+"""
+
+import time
+
+import pytest
+
+from app.utils import audit_log as audit_module
+from app.utils.audit_log import AuditLog
+
+HOUR = 3600
+
+
+@pytest.fixture
+def populated(tmp_path, monkeypatch):
+    """Üç saatlik segmente dağılmış kayıtlar - son saat aktif, öncekiler kapanmış"""
+    log = AuditLog(directory=tmp_path, enabled=True)
+    now = time.time()
+    start = now - now % HOUR - 2 * HOUR
+    clock = {"now": start}
+    real_time = time.time
+    monkeypatch.setattr(audit_module.time, "time", lambda: clock["now"])
+
+    rows = [
+        # (saat, saniye, user, device_id, action, status)
+        (0, 10, "alice", 1, "command.execute", "success"),
+        (0, 20, "bob", 2, "command.execute", "failure"),
+        (0, 30, "alice", 1, "config.backup", "success"),
+        (1, 10, "bob", 2, "command.execute", "success"),
+        (1, 20, "bob", 2, "shell.input", "success"),
+        (2, 10, "alice", 1, "command.execute", "rejected"),
+        (2, 20, "carol", 3, "command.execute", "success"),
+    ]
+    for hour, second, user, device_id, action, status in rows:
+        clock["now"] = start + hour * HOUR + second
+        log.record(action, status=status, user=user, device_id=device_id, commands=["show version"])
+    monkeypatch.setattr(audit_module.time, "time", real_time)
+    log.flush()
+    return log, start
+
+
+def _keys(result):
+    return [(e["user"], e["device_id"], e["action"], e["status"]) for e in result["entries"]]
+
+
+def test_older_hours_are_sealed_and_indexed(populated):
+    log, _ = populated
+
+    assert len(log._sealed) == 2
+    assert log._active is not None
+    assert (log.directory / audit_module.MANIFEST_NAME).exists()
+    for name in log._sealed:
+        assert (log.directory / f"{name}.idx.json").exists()
+
+
+def test_filters_return_newest_first(populated):
+    log, _ = populated
+
+    assert _keys(log.query(user="alice")) == [
+        ("alice", 1, "command.execute", "rejected"),
+        ("alice", 1, "config.backup", "success"),
+        ("alice", 1, "command.execute", "success"),
+    ]
+    assert _keys(log.query(action="shell.input")) == [("bob", 2, "shell.input", "success")]
+    assert _keys(log.query(user="bob", status="failure")) == [("bob", 2, "command.execute", "failure")]
+    assert _keys(log.query(user="alice", action="config.backup")) == [("alice", 1, "config.backup", "success")]
+    assert log.query(user="nobody")["entries"] == []
+
+
+def test_manifest_skips_segments_without_matches(populated):
+    log, _ = populated
+
+    # carol yalnızca aktif segmentte - kapanmış segmentler açılmaz
+    result = log.query(user="carol")
+    assert len(result["entries"]) == 1
+    assert result["scanned_segments"] == 1
+
+    result = log.query(device_id=2)
+    assert [e["user"] for e in result["entries"]] == ["bob", "bob", "bob"]
+    assert result["scanned_segments"] == 3
+
+
+def test_time_range_uses_index_bounds(populated):
+    log, start = populated
+
+    result = log.query(since=start + HOUR, until=start + HOUR + 15)
+    assert _keys(result) == [("bob", 2, "command.execute", "success")]
+
+    result = log.query(since=start + 2 * HOUR)
+    assert [e["user"] for e in result["entries"]] == ["carol", "alice"]
+    assert result["scanned_segments"] == 1
+
+
+def test_cursor_pages_across_segments(populated):
+    log, _ = populated
+    everything = log.query(limit=100)["entries"]
+    assert len(everything) == 7
+    assert [e["ts"] for e in everything] == sorted((e["ts"] for e in everything), reverse=True)
+
+    pages, cursor = [], None
+    while True:
+        result = log.query(limit=3, cursor=cursor)
+        pages.append(result["entries"])
+        if not result["has_more"]:
+            assert result["next_cursor"] is None
+            break
+        cursor = result["next_cursor"]
+
+    assert [len(page) for page in pages] == [3, 3, 1]
+    assert [e["id"] for page in pages for e in page] == [e["id"] for e in everything]
+
+
+def test_cursor_respects_filters(populated):
+    log, _ = populated
+
+    first = log.query(device_id=2, limit=2)
+    assert first["has_more"]
+    rest = log.query(device_id=2, limit=2, cursor=first["next_cursor"])
+    assert not rest["has_more"]
+    assert _keys(first) + _keys(rest) == [
+        ("bob", 2, "shell.input", "success"),
+        ("bob", 2, "command.execute", "success"),
+        ("bob", 2, "command.execute", "failure"),
+    ]
+
+
+def test_reload_reads_manifest_and_active_segment(populated):
+    log, _ = populated
+    expected = log.query(limit=100)["entries"]
+
+    reloaded = AuditLog(directory=log.directory, enabled=True)
+    result = reloaded.query(limit=100)
+
+    assert [e["id"] for e in result["entries"]] == [e["id"] for e in expected]
+    assert len(reloaded._sealed) == 2
+    assert _keys(reloaded.query(user="bob", action="shell.input")) == [("bob", 2, "shell.input", "success")]
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "eA", audit_module.encode_cursor("other-2024", 1)])
+def test_invalid_cursor_raises(populated, cursor):
+    log, _ = populated
+    with pytest.raises(ValueError):
+        log.query(cursor=cursor)
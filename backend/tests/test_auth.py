@@ -0,0 +1,67 @@
+"""
+Auth router - önbellekli token doğrulama ve oturum iptali
+backend/tests/test_auth.py
+"""
+
+from app.utils.auth_cache import auth_cache
+
+from conftest import login
+
+
+def test_repeated_requests_use_token_cache(client):
+    headers = login(client)
+    before = auth_cache.get_stats()
+
+    for _ in range(3):
+        assert client.get("/auth/me", headers=headers).status_code == 200
+
+    after = auth_cache.get_stats()
+    # İlk istek imzayı doğrulayıp önbelleğe alır, sonrakiler önbellekten çözülür
+    assert after["token_misses"] - before["token_misses"] == 1
+    assert after["token_hits"] - before["token_hits"] == 2
+    assert after["user_hits"] > before["user_hits"]
+
+
+def test_cache_stats_requires_permission(client):
+    admin = login(client)
+    client.post("/auth/users", headers=admin, json={
+        "username": "viewer", "password": "viewer123", "full_name": "Viewer",
+        "email": "viewer@example.com", "permissions": ["device_view"]
+    })
+
+    assert client.get("/auth/cache/stats", headers=login(client, "viewer", "viewer123")).status_code == 403
+    assert client.get("/auth/cache/stats", headers=admin).status_code == 200
+
+
+def test_logout_revokes_cached_token(client):
+    headers = login(client)
+    assert client.get("/auth/me", headers=headers).status_code == 200
+
+    assert client.post("/auth/logout", headers=headers).status_code == 200
+    assert client.get("/auth/me", headers=headers).status_code == 401
+
+
+def _request(headers: dict):
+    from starlette.requests import Request
+    scope = {
+        "type": "http", "method": "GET", "path": "/", "query_string": b"",
+        "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+        "client": ("10.0.0.5", 50000)
+    }
+    return Request(scope)
+
+
+def test_request_actor_requires_verified_token(client):
+    from app.routers.auth import create_access_token, request_actor
+
+    headers = login(client)
+    assert request_actor(_request(headers)) == ("admin", "10.0.0.5")
+
+    # İmzalı ama oturumu olmayan ve imzası bozuk token'lar denetime kullanıcı olarak yazılmaz
+    forged = create_access_token({"sub": "admin", "role": "administrator", "jti": "unknown"})
+    assert request_actor(_request({"Authorization": f"Bearer {forged}"}))[0] is None
+    assert request_actor(_request({"Authorization": headers["Authorization"] + "x"}))[0] is None
+    assert request_actor(_request({}))[0] is None
+
+    client.post("/auth/logout", headers=headers)
+    assert request_actor(_request(headers))[0] is None
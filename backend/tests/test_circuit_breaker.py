@@ -0,0 +1,91 @@
+"""
+Devre kesici - kapalı/açık/yarı açık geçişleri ve kimlik bilgisi devreleri
+backend/tests/test_circuit_breaker.py
+"""
+
+import pytest
+
+from app.utils.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+
+USER, DIGEST = "admin", "digest"
+
+
+def _breaker():
+    return CircuitBreaker(failure_threshold=3, auth_threshold=2, base_backoff=10, max_backoff=100, enabled=True)
+
+
+def _expire(breaker, device_id=1):
+    """Backoff süresini beklemeden dolmuş say"""
+    breaker._device[device_id].open_until = 0.0
+
+
+def test_consecutive_failures_open_the_circuit():
+    breaker = _breaker()
+    for _ in range(2):
+        breaker.record(1, USER, DIGEST, "network", "unreachable")
+    breaker.check(1, USER, DIGEST)
+
+    breaker.record(1, USER, DIGEST, "timeout", "timed out")
+    assert breaker.get_device_stats(1)["device"]["state"] == OPEN
+    with pytest.raises(CircuitOpenError) as rejected:
+        breaker.check(1, USER, DIGEST)
+    assert rejected.value.retry_after >= 1 and rejected.value.failure_class == "timeout"
+    assert breaker.stats["trips"] == 1 and breaker.stats["rejections"] == 1
+
+
+def test_single_probe_closes_circuit_on_success():
+    breaker = _breaker()
+    for _ in range(3):
+        breaker.record(1, USER, DIGEST, "network")
+    _expire(breaker)
+
+    breaker.check(1, USER, DIGEST)
+    assert breaker.begin(1, USER, DIGEST) is True
+    assert breaker.get_device_stats(1)["device"]["state"] == HALF_OPEN
+    # Probe sürerken diğer denemeler reddedilir
+    with pytest.raises(CircuitOpenError):
+        breaker.begin(1, USER, DIGEST)
+
+    breaker.record(1, USER, DIGEST, None, probe=True)
+    assert breaker.get_device_stats(1)["device"]["state"] == CLOSED
+    assert breaker.stats["probe_successes"] == 1
+
+
+def test_failed_probe_reopens_with_longer_backoff():
+    breaker = _breaker()
+    for _ in range(3):
+        breaker.record(1, USER, DIGEST, "network")
+    first = breaker.get_device_stats(1)["device"]["retry_after"]
+    _expire(breaker)
+
+    assert breaker.begin(1, USER, DIGEST)
+    breaker.record(1, USER, DIGEST, "network", probe=True)
+    stats = breaker.get_device_stats(1)["device"]
+    assert stats["state"] == OPEN and stats["trips"] == 2 and not stats["probe_in_flight"]
+    assert stats["retry_after"] > first
+
+
+def test_abandoned_probe_allows_another_probe():
+    breaker = _breaker()
+    for _ in range(3):
+        breaker.record(1, USER, DIGEST, "network")
+    _expire(breaker)
+
+    assert breaker.begin(1, USER, DIGEST)
+    breaker.abandon(1, USER, DIGEST)
+    assert breaker.get_device_stats(1)["device"]["state"] == OPEN
+    assert breaker.begin(1, USER, DIGEST)
+
+
+def test_auth_failures_only_block_that_credential():
+    breaker = _breaker()
+    breaker.record(1, USER, DIGEST, "auth", "Authentication failed")
+    breaker.record(1, USER, DIGEST, "auth", "Authentication failed")
+
+    with pytest.raises(CircuitOpenError, match="authentication for admin failed 2 times"):
+        breaker.check(1, USER, DIGEST)
+    breaker.check(1, USER, "other-digest")
+    assert breaker.get_device_stats(1)["device"]["state"] == CLOSED
+
+    assert breaker.reset(1) == 1
+    breaker.check(1, USER, DIGEST)
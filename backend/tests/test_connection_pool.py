@@ -0,0 +1,42 @@
+"""
+SSH bağlantı havuzu - anahtar ve cihaz bazında boşaltma
+backend/tests/test_connection_pool.py
+"""
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.utils.connection_pool import ssh_pool
+
+
+def _acquire(client, simulator, device):
+    return client.portal.call(ssh_pool.acquire, device, simulator.username, simulator.password, device["port"])
+
+
+def test_changed_ip_does_not_reuse_old_transport(simulator):
+    device = simulator.add_device("cisco_ios")
+    with TestClient(app) as client:
+        entry, success, _ = _acquire(client, simulator, device)
+        assert success
+        ssh_pool.release(entry)
+        misses = ssh_pool.stats["misses"]
+
+        # Aynı id, farklı adres - boştaki transport eski adrese bağlı
+        moved = {**device, "ip": "127.0.0.2"}
+        entry, success, _ = _acquire(client, simulator, moved)
+        assert ssh_pool.stats["misses"] == misses + 1
+        if entry is not None:
+            ssh_pool.release(entry, reusable=False)
+
+
+def test_deleting_device_evicts_idle_connections(simulator):
+    device = simulator.add_device("cisco_ios")
+    with TestClient(app) as client:
+        entry, success, _ = _acquire(client, simulator, device)
+        assert success
+        ssh_pool.release(entry)
+        assert ssh_pool.get_stats()["idle_connections"] == 1
+
+        assert client.delete(f"/devices/{device['id']}").status_code == 200
+        assert ssh_pool.get_stats()["idle_connections"] == 0
+        assert ssh_pool.get_stats()["open_connections"] == 0
@@ -0,0 +1,78 @@
+"""
+Cihaz sürücüleri - simülatör üzerinden shell komut yürütme
+backend/tests/test_drivers.py
+"""
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.utils.connection_pool import ssh_pool
+
+
+def _run(client, simulator, device, coro_factory):
+    async def run():
+        async with ssh_pool.connection(device, simulator.username, simulator.password, device["port"]) as (
+            connector, success, message
+        ):
+            assert success, message
+            return await coro_factory(connector)
+    return client.portal.call(run)
+
+
+def test_shell_driver_ignores_max_channels(simulator, monkeypatch):
+    from app.utils.drivers import DriverShell
+
+    opened = []
+    original_open = DriverShell.open.__func__
+    monkeypatch.setattr(DriverShell, "open", classmethod(
+        lambda cls, *args, **kwargs: opened.append(1) or original_open(cls, *args, **kwargs)
+    ))
+    device = simulator.add_device("cisco_ios")
+    commands = ["show version", "show inventory", "show version", "show inventory"]
+    with TestClient(app) as client:
+        results = _run(client, simulator, device,
+                       lambda connector: connector.execute_multiple_commands(commands, delay=0, max_channels=4))
+
+    # Tek shell kanalı paylaşıldığından komutlar sıralı çalışır, çıktılar karışmaz
+    assert [r["command"] for r in results] == commands
+    assert all(r["success"] for r in results)
+    assert "Cisco IOS Software" in results[0]["stdout"] and "Cisco IOS Software" not in results[1]["stdout"]
+    assert results[0]["stdout"] == results[2]["stdout"]
+    # Eşzamanlı ilk komutlar ayrı shell'ler açmaz
+    assert len(opened) == 1
+
+
+def test_shell_driver_pages_and_tracks_prompt(simulator):
+    from app.utils.drivers import CiscoIOSDriver, DriverShell
+
+    class PagingIOSDriver(CiscoIOSDriver):
+        # terminal length 0 gönderilmez - cihaz çıktıyı --More-- ile sayfalar
+        prep_commands = []
+
+    device = simulator.add_device("cisco_ios")
+    with TestClient(app) as client:
+        unpaged = _run(client, simulator, device, lambda connector: connector.execute_command("show running-config"))
+        entry, success, _ = client.portal.call(
+            ssh_pool.acquire, device, simulator.username, simulator.password, device["port"]
+        )
+        assert success
+        try:
+            # DriverShell bloklayıcıdır - executor yerine doğrudan test thread'inde çalışır
+            shell = DriverShell.open(entry.connector.client.get_transport(), PagingIOSDriver())
+            assert shell.prompt == f"{device['name'].split('-')[0]}#"
+            paged, error = shell.run("show running-config")
+            assert error is None and not shell.dirty
+
+            _, error = shell.run("show bogus")
+            assert error == "% Invalid input detected at '^' marker."
+
+            shell.run("configure terminal")
+            assert shell.dirty
+            shell.close()
+        finally:
+            ssh_pool.release(entry, reusable=False)
+
+    assert unpaged[0] and unpaged[1].count("\n") > 24
+    assert "--More--" not in paged
+    assert paged == unpaged[1]
+    assert not paged.startswith("show running-config") and not paged.endswith("#")
@@ -0,0 +1,65 @@
+"""
+Komut akışı (SSE) - havuz bağlantısının her yolda geri verilmesi ve denetim kaydı
+backend/tests/test_execute_stream.py
+"""
+
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+
+from app.main import app
+from app.routers.connections import StreamCommandRequest, execute_command_stream
+from app.utils.audit_log import audit_log
+from app.utils.connection_pool import ssh_pool
+
+
+def _in_use() -> int:
+    stats = ssh_pool.get_stats()
+    return stats["open_connections"] - stats["idle_connections"]
+
+
+def _payload(simulator, device, command="show version"):
+    return {"device_id": device["id"], "username": simulator.username, "password": simulator.password,
+            "port": device["port"], "command": command}
+
+
+def _last_stream_entry(device_id):
+    audit_log.flush()
+    return audit_log.query(device_id=device_id, action="command.stream", limit=1)["entries"][0]
+
+
+def test_completed_stream_returns_connection(simulator):
+    device = simulator.add_device("cisco_ios")
+    with TestClient(app) as client:
+        response = client.post(f"/connections/execute-stream/{device['id']}", json=_payload(simulator, device))
+        assert response.status_code == 200
+        assert "event: exit" in response.text
+        assert _in_use() == 0
+        assert ssh_pool.get_stats()["idle_connections"] >= 1
+
+    entry = _last_stream_entry(device["id"])
+    assert entry["status"] == "success" and entry["meta"]["exit_status"] == 0
+
+
+def test_unstarted_stream_is_released_by_background_task(simulator):
+    device = simulator.add_device("cisco_ios")
+    http_request = Request({"type": "http", "method": "POST", "path": "/", "headers": [], "client": ("127.0.0.1", 1)})
+    with TestClient(app) as client:
+        # Gövde hiç okunmadan yanıt biter (istemci bağlanır bağlanmaz koptu)
+        response = client.portal.call(
+            execute_command_stream, device["id"], StreamCommandRequest(**_payload(simulator, device)), http_request
+        )
+        assert _in_use() == 1
+        client.portal.call(response.background)
+        assert _in_use() == 0
+
+    entry = _last_stream_entry(device["id"])
+    assert entry["status"] == "failure" and entry["detail"] == "Stream interrupted before completion"
+
+
+def test_connection_failure_is_audited(simulator):
+    device = simulator.add_device("cisco_ios")
+    payload = {**_payload(simulator, device), "password": "wrong"}
+    with TestClient(app) as client:
+        assert client.post(f"/connections/execute-stream/{device['id']}", json=payload).status_code == 400
+
+    assert _last_stream_entry(device["id"])["status"] == "failure"
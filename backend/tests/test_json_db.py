@@ -0,0 +1,101 @@
+"""
+JSON veritabanı - WAL tekrar oynatma, sıkıştırma ve cursor sayfalama
+backend/tests/test_json_db.py
+"""
+
+import json
+
+import pytest
+
+from app import json_db
+
+
+@pytest.fixture
+def db(monkeypatch, tmp_path):
+    """Boş, teste özel bir db.json - modül cache'i yeni yoldan yeniden kurulur"""
+    monkeypatch.setattr(json_db, "DB_PATH", tmp_path / "db.json")
+    monkeypatch.setattr(json_db, "DATABASE_BACKEND", "json")
+    return json_db
+
+
+def _restart(db):
+    """Süreç yeniden başlamış gibi cache'i düşürür - sonraki okuma diskten yapılır"""
+    db._cache.path = None
+
+
+def _add(db, count, device_type="cisco_ios", first=1):
+    return [db.add_device({"name": f"r{i}", "ip": f"10.0.0.{i}", "type": device_type})
+            for i in range(first, first + count)]
+
+
+def test_wal_is_replayed_after_restart(db):
+    _add(db, 3)
+    db.delete_device(2)
+
+    # Snapshot'a dokunulmadı - mutasyonlar yalnızca WAL'da
+    assert json.loads(db.DB_PATH.read_text())["devices"] == []
+    _restart(db)
+    assert [d["id"] for d in db.get_devices()] == [1, 3]
+    assert db.add_device({"name": "r4", "ip": "10.0.0.4", "type": "ubuntu"})["id"] == 4
+
+
+def test_torn_wal_record_is_discarded(db):
+    _add(db, 2)
+    wal = db._wal_path()
+    intact = wal.stat().st_size
+    with open(wal, "a", encoding="utf-8") as f:
+        f.write('{"op":"put_device","device":{"id":3,')
+
+    _restart(db)
+    assert [d["id"] for d in db.get_devices()] == [1, 2]
+    assert wal.stat().st_size == intact
+
+
+def test_wal_is_compacted_at_threshold(db, monkeypatch):
+    monkeypatch.setattr(db, "WAL_COMPACT_THRESHOLD", 3)
+    _add(db, 3)
+
+    assert db._wal_path().read_text() == ""
+    assert [d["id"] for d in json.loads(db.DB_PATH.read_text())["devices"]] == [1, 2, 3]
+
+    _add(db, 1)
+    db.compact_db()
+    _restart(db)
+    assert len(json.loads(db.DB_PATH.read_text())["devices"]) == 4
+    assert len(db.get_devices()) == 4
+
+
+def test_query_devices_pages_by_cursor(db):
+    _add(db, 3)
+    _add(db, 2, device_type="ubuntu", first=4)
+
+    page, next_id = db.query_devices(limit=2)
+    assert [d["id"] for d in page] == [1, 2] and next_id == 2
+    page, next_id = db.query_devices(after_id=next_id, limit=2)
+    assert [d["id"] for d in page] == [3, 4] and next_id == 4
+    page, next_id = db.query_devices(after_id=next_id, limit=2)
+    assert [d["id"] for d in page] == [5] and next_id is None
+
+    assert [d["id"] for d in db.query_devices(device_type="ubuntu")[0]] == [4, 5]
+    assert [d["id"] for d in db.query_devices(ip="10.0.0.0/30")[0]] == [1, 2, 3]
+    assert [d["id"] for d in db.query_devices(ip="10.0.0.5")[0]] == [5]
+
+
+def test_devices_endpoint_cursor_and_etag(db, client):
+    _add(db, 3)
+
+    first = client.get("/devices", params={"limit": 2})
+    assert [d["id"] for d in first.json()["devices"]] == [1, 2]
+    second = client.get("/devices", params={"limit": 2, "cursor": first.json()["next_cursor"]})
+    assert [d["id"] for d in second.json()["devices"]] == [3]
+    assert second.json()["next_cursor"] is None
+    assert client.get("/devices", params={"cursor": "bogus"}).status_code == 400
+
+    etag = first.headers["etag"]
+    assert client.get("/devices", params={"limit": 2}, headers={"If-None-Match": etag}).status_code == 304
+    # Farklı sorgu farklı ETag alır
+    assert client.get("/devices", params={"limit": 1}).headers["etag"] != etag
+
+    # Envanter değişince eski ETag artık eşleşmez
+    _add(db, 1)
+    assert client.get("/devices", params={"limit": 2}, headers={"If-None-Match": etag}).status_code == 200
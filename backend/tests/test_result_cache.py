@@ -0,0 +1,79 @@
+"""
+Komut sonucu önbelleği - bypass sayımı ve cihaz önbelleğinin geçersiz kılınması
+backend/tests/test_result_cache.py
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.utils.result_cache import command_ttl, is_mutating, result_cache
+
+
+@pytest.mark.parametrize("command", [
+    "configure terminal", "conf t", "write memory", "wr", "copy run start", "reload", "clear counters",
+    "no ip route 0.0.0.0 0.0.0.0 10.0.0.1", "shutdown", "/ip address add address=10.0.0.1/24",
+    "/system reboot", "sudo systemctl restart nginx", "rm -rf /tmp/x", "show run | redirect flash:x",
+    "echo hi > /tmp/x", "ls; reboot"
+])
+def test_mutating_commands_are_never_cached(command):
+    assert is_mutating(command)
+    assert command_ttl(command) is None
+
+
+@pytest.mark.parametrize("command, ttl", [
+    ("show version", 300), ("sh  ver", 300), ("show running-config", 60), ("show ip interface brief", 30),
+    ("/system resource print", 300), ("/interface print", 30), ("uptime", 10), ("ip addr show", 30),
+    ("show configuration | display set", 60)
+])
+def test_read_only_commands_have_ttl(command, ttl):
+    assert not is_mutating(command)
+    assert command_ttl(command) == ttl
+
+
+def test_unknown_commands_are_not_cached():
+    assert command_ttl("ping 10.0.0.1") is None
+    assert command_ttl("") is None
+
+
+def _credentials(simulator, device):
+    return {"device_id": device["id"], "username": simulator.username, "password": simulator.password,
+            "port": device["port"]}
+
+
+def _seed(simulator, device, command="show version"):
+    result_cache.record(device["id"], simulator.username, simulator.password, command, True, "cached", "")
+    assert result_cache.get(device["id"], simulator.username, simulator.password, command) is not None
+
+
+def test_quick_info_bypass_counts_once_per_request(simulator):
+    device = simulator.add_device("cisco_ios")
+    before = result_cache.stats["bypasses"]
+    with TestClient(app) as client:
+        response = client.post(f"/connections/quick-info/{device['id']}",
+                                json={**_credentials(simulator, device), "bypass_cache": True})
+    assert response.status_code == 200, response.text
+    assert result_cache.stats["bypasses"] - before == 1
+
+
+def test_mutating_command_invalidates_even_when_it_fails(simulator):
+    device = simulator.add_device("cisco_ios")
+    _seed(simulator, device)
+    with TestClient(app) as client:
+        payload = {**_credentials(simulator, device), "password": "wrong", "command": "configure terminal"}
+        assert client.post(f"/connections/execute/{device['id']}", json=payload).status_code == 400
+    assert result_cache.get(device["id"], simulator.username, simulator.password, "show version") is None
+
+
+def test_changed_config_backup_invalidates(simulator, tmp_path):
+    from app.utils.config_backup import ConfigBackupCollector, ConfigBackupStore
+
+    device = simulator.add_device("cisco_ios")
+    _seed(simulator, device)
+    collector = ConfigBackupCollector(ConfigBackupStore(tmp_path))
+    with TestClient(app) as client:
+        result = client.portal.call(
+            collector.backup_device, device, simulator.username, simulator.password, device["port"]
+        )
+    assert result["status"] == "new_version"
+    assert result_cache.get(device["id"], simulator.username, simulator.password, "show version") is None
@@ -0,0 +1,86 @@
+"""
+Session store - jti doğrulama, iptal ve kalıcı depodan geri yükleme
+backend/tests/test_session_store.py
+"""
+
+import pytest
+
+from app.routers.auth import create_access_token
+from app.utils.session_store import SessionStore
+
+from conftest import login
+
+
+def test_unknown_session_is_not_active():
+    store = SessionStore(path="")
+    session = store.create("alice", 60)
+
+    assert store.is_active(session.session_id)
+    assert not store.is_active("never-issued")
+    assert not store.is_active(None)
+    assert store.get_stats()["unknown_sessions"] == 1
+
+
+def test_revoke_and_revoke_user():
+    store = SessionStore(path="")
+    first = store.create("alice", 60)
+    second = store.create("alice", 60)
+    other = store.create("bob", 60)
+
+    assert store.revoke(first.session_id)
+    assert not store.revoke(first.session_id)
+    assert not store.is_active(first.session_id)
+
+    assert store.revoke_user("alice") == 1
+    assert not store.is_active(second.session_id)
+    assert store.is_active(other.session_id)
+    assert [s.session_id for s in store.list_user("alice", include_revoked=True)] == [second.session_id, first.session_id]
+
+
+def test_oldest_session_revoked_over_per_user_limit():
+    store = SessionStore(path="", max_per_user=2)
+    sessions = [store.create("alice", 60) for _ in range(3)]
+
+    assert not store.is_active(sessions[0].session_id)
+    assert all(store.is_active(s.session_id) for s in sessions[1:])
+
+
+def test_expired_sessions_are_purged():
+    store = SessionStore(path="")
+    live = store.create("alice", 60)
+    expired = store.create("alice", -1)
+
+    assert store.purge_expired() == 1
+    assert not store.is_active(expired.session_id)
+    assert store.is_active(live.session_id)
+
+
+@pytest.mark.parametrize("filename", ["sessions.jsonl", "sessions.db"])
+def test_sessions_and_revocations_survive_restart(tmp_path, filename):
+    path = str(tmp_path / filename)
+    store = SessionStore(path=path)
+    kept = store.create("alice", 60)
+    revoked = store.create("alice", 60)
+    store.revoke(revoked.session_id)
+
+    reloaded = SessionStore(path=path)
+    assert reloaded.is_active(kept.session_id)
+    assert not reloaded.is_active(revoked.session_id)
+    assert reloaded.get_stats()["revoked_active"] == 1
+
+
+def test_token_for_unknown_session_is_rejected(client):
+    # Geçerli imzalı ama depoda oturumu olmayan token (ör. yeniden başlatma öncesi)
+    token = create_access_token({"sub": "admin", "role": "administrator", "jti": "issued-before-restart"})
+    response = client.get("/auth/me", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 401
+
+    assert client.get("/auth/me", headers=login(client)).status_code == 200
+
+
+def test_revoked_session_endpoint(client):
+    headers = login(client)
+    session_id = client.get("/auth/sessions", headers=headers).json()["sessions"][0]["session_id"]
+
+    assert client.delete(f"/auth/sessions/{session_id}", headers=headers).status_code == 200
+    assert client.get("/auth/me", headers=headers).status_code == 401
@@ -0,0 +1,98 @@
+"""
+Shell oturumları - sahiplik kontrolü
+backend/tests/test_shell_sessions.py
+"""
+
+import asyncio
+
+import pytest
+
+from app.utils.shell_sessions import ShellSession, ShellSessionManager, ShellSessionOwnerRequired
+
+
+def _manager_with(owner):
+    manager = ShellSessionManager()
+    session = ShellSession("s" * 32, {"id": 1}, "cisco", entry=None, channel=None, owner=owner)
+    manager._sessions[session.id] = session
+    return manager, session
+
+
+def test_session_is_only_visible_to_its_owner():
+    manager, session = _manager_with("alice")
+
+    assert manager.get(session.id, "alice") is session
+    assert manager.get(session.id, "bob") is None
+    assert manager.get(session.id, None) is None
+    assert [s["handle"] for s in manager.list_sessions(owner="alice")] == [session.handle]
+    assert manager.list_sessions(owner="bob") == []
+
+
+def test_session_without_owner_is_rejected():
+    manager, session = _manager_with(None)
+
+    assert manager.get(session.id, None) is None
+    assert manager.get(session.id, "alice") is None
+
+
+def test_open_requires_owner():
+    with pytest.raises(ShellSessionOwnerRequired):
+        asyncio.run(ShellSessionManager().open({"id": 1, "ip": "192.0.2.1", "name": "r1"}, "cisco", "cisco"))
+
+
+def test_input_lines_apply_editing_and_mask_secrets():
+    _, session = _manager_with("alice")
+
+    assert session.take_input_lines("show ver") == []
+    assert session.take_input_lines("x\x7fsion\r\n\r") == ["show version"]
+    assert session.take_input_lines("\x1b[Ashow clock\r") == ["show clock"]
+
+    session._scrollback.extend(b"R1>enable\r\nPassword: ")
+    assert session.take_input_lines("cisco123\r") == ["********"]
+
+
+def test_shell_endpoints_require_token(client):
+    assert client.get("/connections/shell").status_code in (401, 403)
+    assert client.delete("/connections/shell/" + "s" * 32).status_code in (401, 403)
+
+    with client.websocket_connect("/connections/shell/" + "s" * 32 + "/ws") as socket:
+        assert socket.receive_json() == {"type": "error", "message": "Authentication required"}
+
+
+def test_shell_input_is_audited_per_line(simulator):
+    from fastapi.testclient import TestClient
+    from app.main import app
+    from app.utils.audit_log import audit_log
+    from app.utils.result_cache import result_cache
+
+    from conftest import login
+
+    device = simulator.add_device("cisco_ios")
+    # Oturumun kanal okuyucusu tek bir event loop'a bağlı - lifespan'lı istemci aynı loop'u korur
+    with TestClient(app) as client:
+        response = client.post(f"/connections/shell/{device['id']}", headers=login(client), json={
+            "device_id": device["id"], "username": simulator.username, "password": simulator.password,
+            "port": device["port"]
+        })
+        assert response.status_code == 200, response.text
+        session_id = response.json()["session_id"]
+        token = login(client)["Authorization"].split()[1]
+
+        result_cache.record(device["id"], simulator.username, simulator.password, "show clock", True, "cached", "")
+        with client.websocket_connect(f"/connections/shell/{session_id}/ws?token={token}") as socket:
+            # Satır birden fazla mesaja bölünse de tek kayıt olur
+            for chunk in ("show ver", "sion\r"):
+                socket.send_json({"type": "input", "data": chunk})
+            while "Cisco" not in socket.receive_json().get("data", ""):
+                pass
+        client.delete(f"/connections/shell/{session_id}", headers=login(client))
+
+    # Shell'den girilen satır cihazın önbelleğini siler
+    assert result_cache.get(device["id"], simulator.username, simulator.password, "show clock") is None
+
+    audit_log.flush()
+    actions = [e["action"] for e in audit_log.query(device_id=device["id"], limit=20)["entries"]]
+    assert actions[:4] == ["shell.close", "shell.detach", "shell.input", "shell.attach"]
+    entry = audit_log.query(device_id=device["id"], action="shell.input")["entries"][0]
+    assert entry["commands"] == ["show version"]
+    assert entry["user"] == "admin" and entry["device_username"] == simulator.username
+    assert entry["meta"]["session_id"] == session_id[:8]
@@ -59,12 +59,13 @@ class ApiClient {
         const url = `${this.baseURL}${endpoint}`;
         
         const config = {
+            ...options,
             method,
             headers: {
                 'Content-Type': 'application/json',
+                ...this.authHeaders(),
                 ...options.headers
-            },
-            ...options
+            }
         };
 
         // POST/PUT istekleri için body ekle
@@ -125,6 +126,26 @@ class ApiClient {
         return await response.text();
     }
 
+    /**
+     * Login'de saklanan access token - yoksa null
+     */
+    getAccessToken() {
+        try {
+            const session = JSON.parse(sessionStorage.getItem('pam_user_session') || 'null');
+            return (session && session.accessToken) || null;
+        } catch (error) {
+            return null;
+        }
+    }
+
+    /**
+     * Authorization başlığı - audit kayıtlarındaki kullanıcı token'dan doğrulanır
+     */
+    authHeaders() {
+        const token = this.getAccessToken();
+        return token ? { 'Authorization': `Bearer ${token}` } : {};
+    }
+
     /**
      * Base URL'i değiştir
      */
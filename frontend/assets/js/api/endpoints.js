@@ -13,10 +13,17 @@ class ApiEndpoints {
     // ===========================================
 
     /**
-     * Tüm cihazları listele
+     * Cihazları listele
+     * params (opsiyonel): { limit, cursor, type, name_prefix, ip, fields }
      */
-    async getDevices() {
-        return await this.client.get('/devices');
+    async getDevices(params = null) {
+        if (!params) {
+            return await this.client.get('/devices');
+        }
+        const query = new URLSearchParams(
+            Object.entries(params).filter(([, value]) => value !== undefined && value !== null)
+        );
+        return await this.client.get(`/devices?${query.toString()}`);
     }
 
     /**
@@ -78,10 +85,109 @@ class ApiEndpoints {
         return await this.client.post(`/connections/execute/${deviceId}`, payload);
     }
 
+    /**
+     * Tek komut çalıştır - çıktıyı parça parça onChunk callback'ine akıtır
+     * onChunk({ event: 'stdout'|'stderr'|'exit'|'error', ... })
+     */
+    async executeCommandStream(deviceId, credentials, command, onChunk, options = {}) {
+        const payload = {
+            device_id: deviceId,
+            username: credentials.username,
+            password: credentials.password,
+            command: command,
+            port: credentials.port || 22,
+            max_bytes: options.maxBytes || undefined
+        };
+
+        const response = await fetch(`${this.client.baseURL}/connections/execute-stream/${deviceId}`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json', ...this.client.authHeaders() },
+            body: JSON.stringify(payload)
+        });
+
+        if (!response.ok) {
+            const errorData = await response.json().catch(() => ({}));
+            throw new Error(errorData.detail || `HTTP ${response.status}`);
+        }
+
+        // Server-sent-events satırlarını ayrıştır
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+
+        while (true) {
+            const { done, value } = await reader.read();
+            if (done) break;
+
+            buffer += decoder.decode(value, { stream: true });
+            const events = buffer.split('\n\n');
+            buffer = events.pop();
+
+            for (const raw of events) {
+                const dataLine = raw.split('\n').find(line => line.startsWith('data: '));
+                if (dataLine) {
+                    onChunk(JSON.parse(dataLine.slice(6)));
+                }
+            }
+        }
+    }
+
+    /**
+     * Kalıcı shell oturumu aç - dönen session_id ile WebSocket'e bağlanılır
+     */
+    async openShellSession(deviceId, credentials, options = {}) {
+        const payload = {
+            device_id: deviceId,
+            username: credentials.username,
+            password: credentials.password,
+            port: credentials.port || 22,
+            cols: options.cols || 120,
+            rows: options.rows || 40
+        };
+        return await this.client.post(`/connections/shell/${deviceId}`, payload);
+    }
+
+    /**
+     * Shell oturumunun WebSocket'i - onMessage({ type: 'output'|'closed'|'error', ... })
+     * Dönen nesne: { sendInput(data), resize(cols, rows), close() }
+     */
+    connectShellSocket(sessionId, onMessage, onClose = null) {
+        const wsURL = this.client.baseURL.replace(/^http/, 'ws');
+        // Tarayıcı WebSocket'e başlık ekleyemez - token sorgu parametresiyle gönderilir
+        const token = this.client.getAccessToken();
+        const query = token ? `?token=${encodeURIComponent(token)}` : '';
+        const socket = new WebSocket(`${wsURL}/connections/shell/${encodeURIComponent(sessionId)}/ws${query}`);
+        socket.onmessage = (event) => onMessage(JSON.parse(event.data));
+        socket.onclose = (event) => onClose && onClose(event);
+
+        const send = (message) => {
+            if (socket.readyState === WebSocket.OPEN) {
+                socket.send(JSON.stringify(message));
+            } else if (socket.readyState === WebSocket.CONNECTING) {
+                socket.addEventListener('open', () => socket.send(JSON.stringify(message)), { once: true });
+            }
+        };
+
+        return {
+            socket,
+            sendInput: (data) => send({ type: 'input', data }),
+            resize: (cols, rows) => send({ type: 'resize', cols, rows }),
+            close: () => socket.close()
+        };
+    }
+
+    /**
+     * Shell oturumunu kapat
+     */
+    async closeShellSession(sessionId) {
+        // keepalive - sayfa kapanırken de istek tamamlanır
+        return await this.client.delete(`/connections/shell/${encodeURIComponent(sessionId)}`, { keepalive: true });
+    }
+
     /**
      * Çoklu komut çalıştır
      */
-    async executeMultipleCommands(deviceId, credentials, commands, delay = 1.0) {
+    async executeMultipleCommands(deviceId, credentials, commands, delay = null) {
         const payload = {
             device_id: deviceId,
             username: credentials.username,
@@ -144,6 +250,30 @@ class ApiEndpoints {
         return await this.client.post('/users', userData);
     }
 
+    // ===========================================
+    // AUDIT ENDPOINTS
+    // ===========================================
+
+    /**
+     * Sunucu tarafı audit kayıtları - yeniden eskiye
+     * params (opsiyonel): { user, device_id, action, status, since, until, limit, cursor }
+     * Sonraki sayfa için dönen next_cursor, cursor olarak gönderilir
+     */
+    async getAuditLogs(params = {}) {
+        const query = new URLSearchParams(
+            Object.entries(params).filter(([, value]) => value !== undefined && value !== null && value !== '')
+        );
+        const suffix = query.toString();
+        return await this.client.get(suffix ? `/audit?${suffix}` : '/audit');
+    }
+
+    /**
+     * Audit yazıcı sayaçları ve toplam kayıt
+     */
+    async getAuditStats() {
+        return await this.client.get('/audit/stats');
+    }
+
     // ===========================================
     // SYSTEM ENDPOINTS
     // ===========================================
@@ -184,6 +314,27 @@ class ApiEndpoints {
         return await Promise.allSettled(promises);
     }
 
+    /**
+     * Cihaz grubunda komutları sunucu tarafında paralel çalıştır
+     * selector: { deviceIds, deviceType, allDevices }
+     */
+    async executeFleetCommands(selector, credentials, commands, options = {}) {
+        const payload = {
+            device_ids: selector.deviceIds || null,
+            device_type: selector.deviceType || null,
+            all_devices: !!selector.allDevices,
+            commands: commands,
+            command_key: options.commandKey || null,
+            username: credentials.username,
+            password: credentials.password,
+            port: credentials.port || 22,
+            max_concurrency: options.maxConcurrency || 50,
+            per_type_concurrency: options.perTypeConcurrency || null,
+            device_timeout: options.deviceTimeout || 60
+        };
+        return await this.client.post('/connections/fleet/execute', payload);
+    }
+
     /**
      * Birden fazla cihazın sağlık kontrolü
      */
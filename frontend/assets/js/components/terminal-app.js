@@ -12,6 +12,26 @@ class TerminalAPIClient {
         this.timeout = 30000; // 30 saniye
     }
 
+    /**
+     * Login'de saklanan access token - yoksa null
+     */
+    getAccessToken() {
+        try {
+            const session = JSON.parse(sessionStorage.getItem('pam_user_session') || 'null');
+            return (session && session.accessToken) || null;
+        } catch (error) {
+            return null;
+        }
+    }
+
+    /**
+     * Access token için Authorization başlığı
+     */
+    authHeaders() {
+        const token = this.getAccessToken();
+        return token ? { 'Authorization': `Bearer ${token}` } : {};
+    }
+
     /**
      * HTTP request wrapper
      */
@@ -19,12 +39,13 @@ class TerminalAPIClient {
         const url = this.baseURL + endpoint;
         const config = {
             method: 'GET',
+            timeout: this.timeout,
+            ...options,
             headers: {
                 'Content-Type': 'application/json',
+                ...this.authHeaders(),
                 ...options.headers
-            },
-            timeout: this.timeout,
-            ...options
+            }
         };
 
         if (config.body && typeof config.body === 'object') {
@@ -99,7 +120,7 @@ class TerminalAPIClient {
         return await this.post(`/connections/execute/${deviceId}`, payload);
     }
 
-    async executeMultipleCommands(deviceId, credentials, commands, delay = 1.0) {
+    async executeMultipleCommands(deviceId, credentials, commands, delay = null) {
         const payload = {
             device_id: deviceId,
             username: credentials.username,
@@ -115,6 +136,57 @@ class TerminalAPIClient {
         return await this.get(`/connections/available-commands/${deviceId}`);
     }
 
+    /**
+     * Kalıcı shell oturumu - prompt ve mod (configure terminal, enable) oturum boyunca korunur
+     */
+    async openShellSession(deviceId, credentials, options = {}) {
+        const payload = {
+            device_id: deviceId,
+            username: credentials.username,
+            password: credentials.password,
+            port: credentials.port || 22,
+            cols: options.cols || 120,
+            rows: options.rows || 40
+        };
+        return await this.post(`/connections/shell/${deviceId}`, payload);
+    }
+
+    /**
+     * Shell oturumunun WebSocket'i - onMessage({ type: 'output'|'closed'|'error', ... })
+     */
+    connectShellSocket(sessionId, onMessage, onClose) {
+        const wsURL = this.baseURL.replace(/^http/, 'ws');
+        // Tarayıcı WebSocket'e başlık ekleyemez - token sorgu parametresiyle gönderilir
+        const token = this.getAccessToken();
+        const query = token ? `?token=${encodeURIComponent(token)}` : '';
+        const socket = new WebSocket(`${wsURL}/connections/shell/${encodeURIComponent(sessionId)}/ws${query}`);
+        socket.onmessage = (event) => onMessage(JSON.parse(event.data));
+        socket.onclose = (event) => onClose && onClose(event);
+
+        const send = (message) => {
+            if (socket.readyState === WebSocket.OPEN) {
+                socket.send(JSON.stringify(message));
+            } else if (socket.readyState === WebSocket.CONNECTING) {
+                socket.addEventListener('open', () => socket.send(JSON.stringify(message)), { once: true });
+            }
+        };
+
+        return {
+            socket,
+            sendInput: (data) => send({ type: 'input', data }),
+            resize: (cols, rows) => send({ type: 'resize', cols, rows }),
+            close: () => socket.close()
+        };
+    }
+
+    async closeShellSession(sessionId) {
+        // keepalive - sayfa kapanırken de istek tamamlanır
+        return await this.request(`/connections/shell/${encodeURIComponent(sessionId)}`, {
+            method: 'DELETE',
+            keepalive: true
+        });
+    }
+
     async healthCheck() {
         try {
             const result = await this.get('/health');
@@ -326,6 +398,8 @@ class TerminalSSHService {
         this.api = apiClient;
         this.session = sessionService;
         this.listeners = new Set();
+        // Açık shell oturumu - { deviceId, sessionId, socket }
+        this.shell = null;
     }
 
     async executeCommand(deviceId, credentials, command) {
@@ -371,6 +445,66 @@ class TerminalSSHService {
         }
     }
 
+    /**
+     * Cihazda kalıcı shell açar ve WebSocket'e bağlanır
+     * onEvent({ type: 'output'|'closed'|'error', ... }) - çıktı cihaz ürettikçe gelir
+     */
+    async openShell(deviceId, credentials, onEvent, options = {}) {
+        try {
+            await this.closeShell();
+
+            const result = await this.api.openShellSession(deviceId, credentials, options);
+            if (!result.success) {
+                throw new Error(result.data?.detail || result.error || 'Failed to open shell session');
+            }
+
+            const sessionId = result.data.session_id;
+            const socket = this.api.connectShellSocket(sessionId, onEvent, () => {
+                if (this.shell && this.shell.sessionId === sessionId) {
+                    this.shell = null;
+                    onEvent({ type: 'closed', reason: 'connection lost' });
+                }
+            });
+            this.shell = { deviceId, sessionId, socket };
+
+            this._notifyListeners('shellOpened', { deviceId, handle: result.data.handle });
+            return { success: true, handle: result.data.handle };
+
+        } catch (error) {
+            console.error('Shell session open error:', error);
+            this._notifyListeners('shellError', { deviceId, error: error.message });
+            return { success: false, error: error.message };
+        }
+    }
+
+    get hasShell() {
+        return !!this.shell;
+    }
+
+    sendShellInput(data) {
+        if (!this.shell) {
+            return false;
+        }
+        this.shell.socket.sendInput(data);
+        return true;
+    }
+
+    resizeShell(cols, rows) {
+        if (this.shell) {
+            this.shell.socket.resize(cols, rows);
+        }
+    }
+
+    async closeShell() {
+        const shell = this.shell;
+        if (!shell) return;
+
+        this.shell = null;
+        shell.socket.close();
+        await this.api.closeShellSession(shell.sessionId);
+        this._notifyListeners('shellClosed', { deviceId: shell.deviceId });
+    }
+
     async getAvailableCommands(deviceId) {
         try {
             const result = await this.api.getAvailableCommands(deviceId);
@@ -850,6 +984,13 @@ class TerminalApplication {
             }
         });
         
+        // Sayfa kapanınca sunucudaki shell oturumu da kapatılır
+        window.addEventListener('pagehide', () => {
+            if (this.sshService) {
+                this.sshService.closeShell();
+            }
+        });
+        
         window.addEventListener('resize', () => {
             if (this.terminal) {
                 this.terminal.resize();
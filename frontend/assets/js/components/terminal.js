@@ -13,16 +13,37 @@ class APIClient {
         this.timeout = 30000;
     }
 
+    /**
+     * Login'de saklanan access token - yoksa null
+     */
+    getAccessToken() {
+        try {
+            const session = JSON.parse(sessionStorage.getItem('pam_user_session') || 'null');
+            return (session && session.accessToken) || null;
+        } catch (error) {
+            return null;
+        }
+    }
+
+    /**
+     * Access token için Authorization başlığı
+     */
+    authHeaders() {
+        const token = this.getAccessToken();
+        return token ? { 'Authorization': `Bearer ${token}` } : {};
+    }
+
     async request(endpoint, options = {}) {
         const url = this.baseURL + endpoint;
         const config = {
             method: 'GET',
+            timeout: this.timeout,
+            ...options,
             headers: {
                 'Content-Type': 'application/json',
+                ...this.authHeaders(),
                 ...options.headers
-            },
-            timeout: this.timeout,
-            ...options
+            }
         };
 
         if (config.body && typeof config.body === 'object') {
@@ -90,6 +111,44 @@ class APIClient {
             body: credentials
         });
     }
+
+    async openShellSession(deviceId, credentials, options = {}) {
+        return this.request('/connections/shell/' + deviceId, {
+            method: 'POST',
+            body: { device_id: deviceId, ...credentials, cols: options.cols || 120, rows: options.rows || 40 }
+        });
+    }
+
+    connectShellSocket(sessionId, onMessage, onClose) {
+        // Tarayıcı WebSocket'e başlık ekleyemez - token sorgu parametresiyle gönderilir
+        const token = this.getAccessToken();
+        const query = token ? '?token=' + encodeURIComponent(token) : '';
+        const socket = new WebSocket(this.baseURL.replace(/^http/, 'ws') + '/connections/shell/' + encodeURIComponent(sessionId) + '/ws' + query);
+        socket.onmessage = (event) => onMessage(JSON.parse(event.data));
+        socket.onclose = (event) => onClose && onClose(event);
+
+        const send = (message) => {
+            if (socket.readyState === WebSocket.OPEN) {
+                socket.send(JSON.stringify(message));
+            } else if (socket.readyState === WebSocket.CONNECTING) {
+                socket.addEventListener('open', () => socket.send(JSON.stringify(message)), { once: true });
+            }
+        };
+
+        return {
+            socket,
+            sendInput: (data) => send({ type: 'input', data }),
+            resize: (cols, rows) => send({ type: 'resize', cols, rows }),
+            close: () => socket.close()
+        };
+    }
+
+    async closeShellSession(sessionId) {
+        return this.request('/connections/shell/' + encodeURIComponent(sessionId), {
+            method: 'DELETE',
+            keepalive: true
+        });
+    }
 }
 
 /**
@@ -105,6 +164,53 @@ class SSHService {
         this.api = apiClient;
         this.sessionService = sessionService;
         this.connectionCache = new Map();
+        this.shell = null;
+    }
+
+    async openShell(deviceId, credentials, onEvent, options = {}) {
+        try {
+            await this.closeShell();
+            const result = await this.api.openShellSession(deviceId, credentials, options);
+            const sessionId = result.session_id;
+            const socket = this.api.connectShellSocket(sessionId, onEvent, () => {
+                if (this.shell && this.shell.sessionId === sessionId) {
+                    this.shell = null;
+                    onEvent({ type: 'closed', reason: 'connection lost' });
+                }
+            });
+            this.shell = { deviceId, sessionId, socket };
+            return { success: true, handle: result.handle };
+        } catch (error) {
+            return { success: false, error: error.message };
+        }
+    }
+
+    get hasShell() {
+        return !!this.shell;
+    }
+
+    sendShellInput(data) {
+        if (!this.shell) return false;
+        this.shell.socket.sendInput(data);
+        return true;
+    }
+
+    resizeShell(cols, rows) {
+        if (this.shell) {
+            this.shell.socket.resize(cols, rows);
+        }
+    }
+
+    async closeShell() {
+        const shell = this.shell;
+        if (!shell) return;
+        this.shell = null;
+        shell.socket.close();
+        try {
+            await this.api.closeShellSession(shell.sessionId);
+        } catch (error) {
+            console.warn('Shell session close failed:', error);
+        }
     }
 
     async testConnection(deviceId, credentials) {
@@ -208,6 +314,11 @@ class Terminal {
         this.isExecuting = false;
         this.quickCommands = [];
         
+        // Kalıcı shell oturumu - komutlar WebSocket üzerinden aynı PTY'ye yazılır
+        this.shellActive = false;
+        this.shellStream = null;
+        this.devicePrompt = null;
+        
         this.init();
     }
 
@@ -216,10 +327,130 @@ class Terminal {
         this.setupEventListeners();
         await this.loadQuickCommands();
         this.showWelcomeMessage();
+        if (this.sessionData) {
+            await this.openShell();
+        }
         this.focusInput();
         
     }
 
+    /**
+     * Cihazda kalıcı shell açar - açılamazsa komutlar tek tek /execute ile çalıştırılır
+     */
+    async openShell() {
+        if (!this.sshService || typeof this.sshService.openShell !== 'function') {
+            return;
+        }
+
+        const credentials = {
+            username: this.sessionData.username,
+            password: this.sessionData.password,
+            port: this.sessionData.port
+        };
+        const size = this.measureTerminalSize();
+        const result = await this.sshService.openShell(
+            this.sessionData.deviceId,
+            credentials,
+            (message) => this.handleShellMessage(message),
+            size
+        );
+
+        if (result.success) {
+            this.shellActive = true;
+            this.updateConnectionStatus(true);
+        } else {
+            this.showError('Shell oturumu açılamadı, komutlar tek tek çalıştırılacak: ' + result.error);
+        }
+    }
+
+    handleShellMessage(message) {
+        switch (message.type) {
+            case 'output':
+                this.appendShellText(message.data);
+                break;
+
+            case 'closed':
+                if (!this.shellActive) return;
+                this.shellActive = false;
+                this.devicePrompt = null;
+                this.updatePromptLabel();
+                this.showError('Shell oturumu kapandı (' + (message.reason || 'closed') + '), komutlar tek tek çalıştırılacak');
+                this.eventBus.emit('connectionError', { error: 'Shell session closed: ' + (message.reason || 'closed') });
+                break;
+
+            case 'error':
+                this.showError(message.message || 'Shell error');
+                break;
+        }
+    }
+
+    appendShellText(data) {
+        const output = document.getElementById('terminalOutput');
+        if (!output) return;
+
+        // Araya yerel mesaj girdiyse çıktı yeni bir blokta devam eder
+        if (!this.shellStream || output.lastElementChild !== this.shellStream.parentElement.parentElement) {
+            const block = document.createElement('div');
+            block.className = 'command-output shell-output';
+            block.innerHTML = '<div class="command-result command-success"><div class="command-output-text"></div></div>';
+            output.appendChild(block);
+            this.shellStream = block.querySelector('.command-output-text');
+        }
+
+        this.shellStream.textContent += this.cleanShellText(data);
+        this.updateDevicePrompt();
+        this.scrollToBottom();
+    }
+
+    cleanShellText(text) {
+        // ANSI renk/imleç dizileri ve satır başı karakterleri satır tabanlı görünümde gösterilmez
+        return text
+            .replace(/\x1b\[[0-9;?]*[ -\/]*[@-~]/g, '')
+            .replace(/\x1b\][^\x07]*(\x07|\x1b\\)/g, '')
+            .replace(/\x1b[()][A-Za-z0-9]/g, '')
+            .replace(/\r\n/g, '\n')
+            .replace(/\r/g, '')
+            .replace(/[\x00-\x08\x0b\x0c\x0e-\x1f]/g, '');
+    }
+
+    updateDevicePrompt() {
+        // Son satır prompt'a benziyorsa (R1(config)#, admin@host:~$, [admin@MikroTik] >) giriş etiketine yansıt
+        const text = this.shellStream.textContent;
+        const lastLine = text.slice(text.lastIndexOf('\n') + 1).trim();
+        if (lastLine && lastLine.length <= 64 && /[#>$%\]]$/.test(lastLine)) {
+            this.devicePrompt = lastLine;
+            this.updatePromptLabel();
+        }
+    }
+
+    updatePromptLabel() {
+        const terminalPrompt = document.getElementById('terminalPrompt');
+        if (terminalPrompt) {
+            terminalPrompt.textContent = this.getPrompt();
+        }
+    }
+
+    measureTerminalSize() {
+        const output = document.getElementById('terminalOutput');
+        if (!output || !output.clientWidth) {
+            return { cols: 120, rows: 40 };
+        }
+
+        const probe = document.createElement('span');
+        probe.style.visibility = 'hidden';
+        probe.style.position = 'absolute';
+        probe.textContent = 'M'.repeat(10);
+        output.appendChild(probe);
+        const charWidth = probe.getBoundingClientRect().width / 10 || 8;
+        const lineHeight = probe.getBoundingClientRect().height || 16;
+        probe.remove();
+
+        return {
+            cols: Math.max(80, Math.floor(output.clientWidth / charWidth) - 4),
+            rows: Math.max(24, Math.floor(output.clientHeight / lineHeight))
+        };
+    }
+
     async loadSession() {
         this.sessionData = this.sessionService.getSSHSession();
         
@@ -307,6 +538,14 @@ class Terminal {
                     this.clearTerminal();
                 }
                 break;
+                
+            case 'c':
+                // Seçim yoksa Ctrl+C cihazdaki komutu keser
+                if (e.ctrlKey && this.shellActive && input.selectionStart === input.selectionEnd) {
+                    e.preventDefault();
+                    this.sshService.sendShellInput('\x03');
+                }
+                break;
         }
     }
 
@@ -316,6 +555,12 @@ class Terminal {
         
         const command = input.value.trim();
         
+        // Shell'de boş Enter de cihaza gider (sayfalayıcı, onay soruları)
+        if (!command && this.shellActive) {
+            this.sshService.sendShellInput('\r');
+            return;
+        }
+        
         if (!command || this.isExecuting) return;
         
         if (command !== this.commandHistory[this.commandHistory.length - 1]) {
@@ -337,6 +582,11 @@ class Terminal {
     async handleBuiltInCommand(command) {
         const cmd = command.toLowerCase().trim();
         
+        // Shell açıkken exit/whoami/pwd cihazda çalışır (exit config modundan çıkar)
+        if (this.shellActive && ['exit', 'quit', 'whoami', 'pwd'].includes(cmd)) {
+            return false;
+        }
+        
         switch (cmd) {
             case 'clear':
             case 'cls':
@@ -380,6 +630,11 @@ class Terminal {
     }
 
     async executeRemoteCommand(command) {
+        // Kalıcı shell - komut aynı PTY'ye yazılır, çıktı WebSocket'ten akar
+        if (this.shellActive && this.sshService.sendShellInput(command + '\r')) {
+            return;
+        }
+        
         this.setExecutionState(true);
         
         this.appendOutput({
@@ -592,6 +847,7 @@ class Terminal {
         if (output) {
             output.innerHTML = '';
         }
+        this.shellStream = null;
         this.showWelcomeMessage();
         this.focusInput();
     }
@@ -612,6 +868,7 @@ class Terminal {
                    '• Press Tab for command completion\n' +
                    '• Type \'help\' for available commands\n' +
                    '• Type \'clear\' to clear the screen\n' +
+                   '• Commands run in a persistent shell - modes like configure terminal are kept\n' +
                    '• Use Ctrl+L as shortcut for clear',
             local: true
         };
@@ -637,6 +894,7 @@ class Terminal {
                    '• Tab            - Command completion\n' +
                    '• Ctrl+L         - Clear screen\n' +
                    '• Enter          - Execute command\n' +
+                   '• Ctrl+C         - Interrupt running command\n' +
                    '• Esc            - Clear input\n\n' +
                    'Device Commands:\n' +
                    '• All other commands are executed on the remote device\n' +
@@ -793,6 +1051,10 @@ class Terminal {
 
     disconnect() {
         this.isConnected = false;
+        this.shellActive = false;
+        if (this.sshService && typeof this.sshService.closeShell === 'function') {
+            this.sshService.closeShell();
+        }
         if (this.sessionService && typeof this.sessionService.clearSSHSession === 'function') {
             this.sessionService.clearSSHSession();
         }
@@ -827,6 +1089,9 @@ class Terminal {
     }
 
     getPrompt() {
+        if (this.shellActive && this.devicePrompt) {
+            return this.devicePrompt;
+        }
         return (this.sessionData ? this.sessionData.username : 'user') + '@' + (this.sessionData ? this.sessionData.deviceName : 'device') + ':~$';
     }
 
@@ -865,6 +1130,10 @@ class Terminal {
     }
 
     resize() {
+        if (this.shellActive) {
+            const size = this.measureTerminalSize();
+            this.sshService.resizeShell(size.cols, size.rows);
+        }
         this.scrollToBottom();
     }
 
@@ -983,6 +1252,10 @@ class Terminal {
 
     destroy() {
         this.isConnected = false;
+        this.shellActive = false;
+        if (this.sshService && typeof this.sshService.closeShell === 'function') {
+            this.sshService.closeShell();
+        }
         this.sessionService.clearSSHSession();
     }
 }
@@ -9,6 +9,7 @@ class SSHService {
         this.session = sessionService;
         this.connections = new Map(); // Aktif bağlantıları takip et
         this.listeners = new Set();
+        this.shell = null; // Açık shell oturumu - { deviceId, sessionId, socket }
     }
 
     // ===========================================
@@ -107,7 +108,7 @@ class SSHService {
     /**
      * Birden fazla komut çalıştır
      */
-    async executeMultipleCommands(deviceId, credentials, commands, delay = 1.0) {
+    async executeMultipleCommands(deviceId, credentials, commands, delay = null) {
         try {
             if (!commands || commands.length === 0) {
                 throw new Error('Commands array cannot be empty');
@@ -148,6 +149,80 @@ class SSHService {
         }
     }
 
+    // ===========================================
+    // SHELL SESSIONS
+    // ===========================================
+
+    /**
+     * Kalıcı shell oturumu aç - komutlar aynı PTY'de çalışır, prompt ve mod korunur
+     * onEvent({ type: 'output'|'closed'|'error', ... })
+     */
+    async openShell(deviceId, credentials, onEvent, options = {}) {
+        try {
+            await this.closeShell();
+
+            const result = await this.api.openShellSession(deviceId, credentials, options);
+            if (!result.success) {
+                throw new Error(result.data?.detail || result.error || 'Failed to open shell session');
+            }
+
+            const sessionId = result.data.session_id;
+            const socket = this.api.connectShellSocket(sessionId, onEvent, () => {
+                if (this.shell && this.shell.sessionId === sessionId) {
+                    this.shell = null;
+                    onEvent({ type: 'closed', reason: 'connection lost' });
+                }
+            });
+            this.shell = { deviceId, sessionId, socket };
+
+            this._notifyListeners('shellOpened', { deviceId, handle: result.data.handle });
+            return { success: true, handle: result.data.handle };
+
+        } catch (error) {
+            console.error('SSHService.openShell:', error);
+            this._notifyListeners('shellError', { deviceId, error: error.message });
+
+            return {
+                success: false,
+                error: error.message
+            };
+        }
+    }
+
+    get hasShell() {
+        return !!this.shell;
+    }
+
+    /**
+     * Shell'e ham giriş gönder (komut + '\r', Ctrl+C için '\x03')
+     */
+    sendShellInput(data) {
+        if (!this.shell) {
+            return false;
+        }
+        this.shell.socket.sendInput(data);
+        return true;
+    }
+
+    resizeShell(cols, rows) {
+        if (this.shell) {
+            this.shell.socket.resize(cols, rows);
+        }
+    }
+
+    /**
+     * Shell oturumunu kapat - sunucudaki PTY ve transport bırakılır
+     */
+    async closeShell() {
+        const shell = this.shell;
+        if (!shell) return;
+
+        this.shell = null;
+        shell.socket.close();
+        await this.api.closeShellSession(shell.sessionId);
+        this._notifyListeners('shellClosed', { deviceId: shell.deviceId });
+    }
+
     // ===========================================
     // DEVICE HEALTH & INFO
     // ===========================================